@@ -57,6 +57,7 @@ def main():
         "the width of the Gaussian deconvolution.",
         default=0.15,
     )
+    input_parser.add_bias_field_shrink_factor(default=1)
     input_parser.add_log_config(default=1)
     input_parser.add_verbose(default=0)
 
@@ -87,6 +88,7 @@ def main():
         spline_order=args.spline_order,
         wiener_filter_noise=args.wiener_filter_noise,
         bias_field_fwhm=args.bias_field_fwhm,
+        shrink_factor=args.bias_field_shrink_factor,
     )
     ph.print_info("N4ITK Bias Field Correction ... ", newline=False)
     bias_field_corrector.run_bias_field_correction()
@@ -20,6 +20,7 @@ import niftymic.base.data_writer as dw
 import niftymic.registration.flirt as regflirt
 import niftymic.registration.niftyreg as niftyreg
 import niftymic.registration.simple_itk_registration as regsitk
+import niftymic.registration.registration_cache as regcache
 import niftymic.reconstruction.tikhonov_solver as tk
 import niftymic.reconstruction.primal_dual_solver as pd
 import niftymic.reconstruction.scattered_data_approximation as sda
@@ -28,6 +29,7 @@ import niftymic.utilities.outlier_rejector as outre
 import niftymic.utilities.intensity_correction as ic
 import niftymic.utilities.joint_image_mask_builder as imb
 import niftymic.utilities.segmentation_propagation as segprop
+import niftymic.utilities.pipeline_checkpoint as pc
 import niftymic.utilities.volumetric_reconstruction_pipeline as pipeline
 from niftymic.utilities.input_arparser import InputArgparser
 
@@ -70,6 +72,8 @@ def main():
     input_parser.add_dilation_radius(default=3)
     input_parser.add_extra_frame_target(default=10)
     input_parser.add_bias_field_correction(default=0)
+    input_parser.add_bias_field_shrink_factor(default=1)
+    input_parser.add_n_processes(default=1)
     input_parser.add_intensity_correction(default=1)
     input_parser.add_isotropic_resolution(default=1)
     input_parser.add_log_config(default=1)
@@ -90,6 +94,7 @@ def main():
     input_parser.add_slice_thicknesses(default=None)
     input_parser.add_viewer(default="itksnap")
     input_parser.add_v2v_method(default="RegAladin")
+    input_parser.add_registration_cache()
     input_parser.add_argument(
         "--v2v-robust", "-v2v-robust",
         action='store_true',
@@ -106,6 +111,40 @@ def main():
         "specified interleave (--interleave) are registered until each "
         "slice is registered independently."
     )
+    input_parser.add_option(
+        option_string="--s2v-search-range",
+        type=float,
+        help="Maximum expected displacement (in mm) of slices during "
+        "slice-to-volume registration. If given, the (smoothed) reference "
+        "volume is cropped to the footprint of each slice enlarged by this "
+        "margin before its registration to reduce the computational cost. "
+        "The registration set-up and the smoothed reference are shared by "
+        "all slices. The margin must also cover the optimizer's line search "
+        "steps; if too small, registration results can change.",
+        default=None,
+    )
+    input_parser.add_option(
+        option_string="--s2v-convergence-thresholds",
+        nargs=2,
+        type=float,
+        help="Thresholds of slice transform changes in mm and degrees. If "
+        "given, slices whose slice-to-volume registration changed their "
+        "position by less than both thresholds are skipped in the next cycle "
+        "and registered again in the cycle after to confirm their "
+        "convergence against the updated reference.",
+        default=None,
+    )
+    input_parser.add_option(
+        option_string="--s2v-early-termination",
+        type=int,
+        help="Turn on/off early termination of the two-step cycles once the "
+        "median slice transform changes of a slice-to-volume registration "
+        "cycle are below --s2v-convergence-thresholds. The median is "
+        "computed over the slices registered in that cycle. With outlier "
+        "rejection, the threshold of the final cycle is applied before "
+        "terminating.",
+        default=0,
+    )
     input_parser.add_argument(
         "--sda", "-sda",
         action='store_true',
@@ -122,6 +161,32 @@ def main():
         "transformations to motion correction output directory",
         default=0,
     )
+    input_parser.add_option(
+        option_string="--transforms-format",
+        type=str,
+        help="Format of written motion correction transformations. Either "
+        "'tfm' (one transform file per stack and per slice) or 'npz' (one "
+        "file per stack holding the entire registration history of the "
+        "stack and all its slices).",
+        default="tfm",
+    )
+    input_parser.add_option(
+        option_string="--checkpoints",
+        type=int,
+        help="Turn on/off writing checkpoints of the pipeline state to the "
+        "'checkpoints' folder within the output directory. A checkpoint is "
+        "written after volume-to-volume registration, after the initial "
+        "reconstruction, after each slice-to-volume registration and "
+        "reconstruction step, and after the final reconstruction.",
+        default=0,
+    )
+    input_parser.add_argument(
+        "--resume", "-resume",
+        action='store_true',
+        help="If given, the pipeline is resumed from the latest checkpoint "
+        "available in the output directory (which implies --checkpoints 1). "
+        "The pipeline runs from scratch if no checkpoint is available."
+    )
 
     args = input_parser.parse_args()
     input_parser.print_arguments(args)
@@ -139,6 +204,9 @@ def main():
             "output filename invalid; allowed extensions are: %s" %
             ", ".join(ALLOWED_EXTENSIONS))
 
+    if args.transforms_format not in ["tfm", "npz"]:
+        raise ValueError("transforms-format must be in {tfm, npz}")
+
     if args.alpha_first < args.alpha and not args.sda:
         raise ValueError("It must hold alpha-first >= alpha")
 
@@ -151,6 +219,23 @@ def main():
     if args.log_config:
         input_parser.log_config(os.path.abspath(__file__))
 
+    # Checkpoints of pipeline state to allow resuming interrupted runs
+    checkpoint = None
+    resume_stage = None
+    if args.checkpoints or args.resume:
+        checkpoint = pc.PipelineCheckpoint(
+            os.path.join(dir_output, "checkpoints"))
+        if args.resume:
+            resume_stage = checkpoint.get_latest_stage()
+            if resume_stage is None:
+                ph.print_warning(
+                    "No checkpoint available to resume from. "
+                    "Reconstruction pipeline is run from scratch.")
+            else:
+                checkpoint.read()
+        if resume_stage is None:
+            checkpoint.clear()
+
     # --------------------------------Read Data--------------------------------
     ph.print_title("Read Data")
     data_reader = dr.MultipleImagesReader(
@@ -207,6 +292,8 @@ def main():
         boundary_j=args.boundary_stacks[1],
         boundary_k=args.boundary_stacks[2],
         unit="mm",
+        n4_shrink_factor=args.bias_field_shrink_factor,
+        n_processes=args.n_processes,
     )
     data_preprocessing.run()
     time_data_preprocessing = data_preprocessing.get_computational_time()
@@ -225,7 +312,12 @@ def main():
         reference = st.Stack.from_stack(stacks[target_stack_index])
 
     # ------------------------Volume-to-Volume Registration--------------------
-    if args.two_step_cycles > 0 and len(stacks) > 1:
+    if resume_stage is not None:
+        ph.print_title("Restore Stack Positions from Checkpoint")
+        checkpoint.update_stack_positions(stacks)
+        time_registration = ph.get_zero_time()
+
+    elif args.two_step_cycles > 0 and len(stacks) > 1:
 
         if args.v2v_method == "FLIRT":
             # Define search angle ranges for FLIRT in all three dimensions
@@ -250,12 +342,18 @@ def main():
                 # options="-ln 2",
                 use_verbose=False,
             )
+        if args.registration_cache is not None:
+            registration_cache = regcache.RegistrationCache(
+                args.registration_cache)
+        else:
+            registration_cache = None
         v2vreg = pipeline.VolumeToVolumeRegistration(
             stacks=stacks,
             reference=reference,
             registration_method=vol_registration,
             verbose=debug,
             robust=args.v2v_robust,
+            registration_cache=registration_cache,
         )
         v2vreg.run()
         stacks = v2vreg.get_stacks()
@@ -264,104 +362,140 @@ def main():
     else:
         time_registration = ph.get_zero_time()
 
+    if checkpoint is not None and resume_stage is None:
+        checkpoint.write("v2v", stacks)
+
     # ---------------------------Intensity Correction--------------------------
     if args.intensity_correction:
         ph.print_title("Intensity Correction")
-        intensity_corrector = ic.IntensityCorrection()
+        intensity_corrector = ic.IntensityCorrection(
+            n_processes=args.n_processes)
         intensity_corrector.use_individual_slice_correction(False)
         intensity_corrector.use_reference_mask(True)
         intensity_corrector.use_stack_mask(True)
         intensity_corrector.use_verbose(False)
 
+        indices = [i for i in range(len(stacks)) if i != target_stack_index]
+        intensity_corrector.run_linear_intensity_correction_stacks(
+            [stacks[i] for i in indices],
+            stacks[target_stack_index],
+            interpolator="NearestNeighbor",
+        )
+        stacks_corrected = intensity_corrector.get_intensity_corrected_stacks()
+        coefficients = \
+            intensity_corrector.get_intensity_correction_coefficients_stacks()
+
         for i, stack in enumerate(stacks):
             if i == target_stack_index:
                 ph.print_info("Stack %d (%s): Reference image. Skipped." % (
                     i + 1, stack.get_filename()))
                 continue
-            else:
-                ph.print_info("Stack %d (%s): Intensity Correction ... " % (
-                    i + 1, stack.get_filename()), newline=False)
-            intensity_corrector.set_stack(stack)
-            intensity_corrector.set_reference(
-                stacks[target_stack_index].get_resampled_stack(
-                    resampling_grid=stack.sitk,
-                    interpolator="NearestNeighbor",
-                ))
-            intensity_corrector.run_linear_intensity_correction()
-            stacks[i] = intensity_corrector.get_intensity_corrected_stack()
-            print("done (c1 = %g) " %
-                  intensity_corrector.get_intensity_correction_coefficients())
+            j = indices.index(i)
+            stacks[i] = stacks_corrected[j]
+            ph.print_info("Stack %d (%s): Intensity Correction ... "
+                          "done (c1 = %g) " % (
+                              i + 1, stack.get_filename(), coefficients[j]))
+
+    # Restore slice positions and rejected slices. Intensity correction is
+    # recomputed as it only depends on the stack positions.
+    if resume_stage is not None:
+        ph.print_title("Restore Slice Positions from Checkpoint")
+        stacks = checkpoint.update_slices(stacks)
 
     # ---------------------------Create first volume---------------------------
     time_tmp = ph.start_timing()
 
-    # Isotropic resampling to define HR target space
-    ph.print_title("Reconstruction Space Generation")
-    HR_volume = reference.get_isotropically_resampled_stack(
-        resolution=args.isotropic_resolution)
-    ph.print_info(
-        "Isotropic reconstruction space with %g mm resolution is created" %
-        HR_volume.sitk.GetSpacing()[0])
-
-    if args.reference is None:
-        # Create joint image mask in target space
-        joint_image_mask_builder = imb.JointImageMaskBuilder(
-            stacks=stacks,
-            target=HR_volume,
-            dilation_radius=1,
-        )
-        joint_image_mask_builder.run()
-        HR_volume = joint_image_mask_builder.get_stack()
+    if resume_stage not in [None, "v2v"]:
+        ph.print_title("Restore Reconstruction from Checkpoint")
+        checkpoint.read(stage="initial_reconstruction")
+        HR_volume = checkpoint.get_reconstruction()
+        checkpoint.read()
+        HR_volume_reference = checkpoint.get_reconstruction()
+
+        # Tikhonov solver updates the initial volume in-place in the course of
+        # the two-step cycles
+        if not args.sda:
+            HR_volume = st.Stack.from_sitk_image(
+                image_sitk=HR_volume_reference.sitk,
+                image_sitk_mask=HR_volume.sitk_mask,
+                filename=HR_volume.get_filename(),
+                slice_thickness=HR_volume.get_slice_thickness(),
+            )
+
+    else:
+        # Isotropic resampling to define HR target space
+        ph.print_title("Reconstruction Space Generation")
+        HR_volume = reference.get_isotropically_resampled_stack(
+            resolution=args.isotropic_resolution)
         ph.print_info(
-            "Isotropic reconstruction space is centered around "
-            "joint stack masks. ")
-
-        # Crop to space defined by mask (plus extra margin)
-        HR_volume = HR_volume.get_cropped_stack_based_on_mask(
-            boundary_i=args.extra_frame_target,
-            boundary_j=args.extra_frame_target,
-            boundary_k=args.extra_frame_target,
-            unit="mm",
-        )
+            "Isotropic reconstruction space with %g mm resolution is created" %
+            HR_volume.sitk.GetSpacing()[0])
+
+        if args.reference is None:
+            # Create joint image mask in target space
+            joint_image_mask_builder = imb.JointImageMaskBuilder(
+                stacks=stacks,
+                target=HR_volume,
+                dilation_radius=1,
+            )
+            joint_image_mask_builder.run()
+            HR_volume = joint_image_mask_builder.get_stack()
+            ph.print_info(
+                "Isotropic reconstruction space is centered around "
+                "joint stack masks. ")
+
+            # Crop to space defined by mask (plus extra margin)
+            HR_volume = HR_volume.get_cropped_stack_based_on_mask(
+                boundary_i=args.extra_frame_target,
+                boundary_j=args.extra_frame_target,
+                boundary_k=args.extra_frame_target,
+                unit="mm",
+            )
 
-        # Create first volume
-        # If outlier rejection is activated, eliminate obvious outliers early
-        # from stack and re-run SDA to get initial volume without them
-        ph.print_title("First Estimate of HR Volume")
-        if args.outlier_rejection and threshold_v2v > -1:
-            ph.print_subtitle("SDA Approximation")
+            # Create first volume
+            # If outlier rejection is activated, eliminate obvious outliers
+            # early from stack and re-run SDA to get initial volume without
+            # them
+            ph.print_title("First Estimate of HR Volume")
+            if args.outlier_rejection and threshold_v2v > -1:
+                ph.print_subtitle("SDA Approximation")
+                SDA = sda.ScatteredDataApproximation(
+                    stacks, HR_volume, sigma=args.sigma)
+                SDA.run()
+                HR_volume = SDA.get_reconstruction()
+
+                # Identify and reject outliers
+                ph.print_subtitle("Eliminate slice outliers (%s < %g)" % (
+                    rejection_measure, threshold_v2v))
+                outlier_rejector = outre.OutlierRejector(
+                    stacks=stacks,
+                    reference=HR_volume,
+                    threshold=threshold_v2v,
+                    measure=rejection_measure,
+                    verbose=True,
+                )
+                outlier_rejector.run()
+                stacks = outlier_rejector.get_stacks()
+
+            ph.print_subtitle("SDA Approximation Image")
             SDA = sda.ScatteredDataApproximation(
                 stacks, HR_volume, sigma=args.sigma)
             SDA.run()
             HR_volume = SDA.get_reconstruction()
 
-            # Identify and reject outliers
-            ph.print_subtitle("Eliminate slice outliers (%s < %g)" % (
-                rejection_measure, threshold_v2v))
-            outlier_rejector = outre.OutlierRejector(
-                stacks=stacks,
-                reference=HR_volume,
-                threshold=threshold_v2v,
-                measure=rejection_measure,
-                verbose=True,
-            )
-            outlier_rejector.run()
-            stacks = outlier_rejector.get_stacks()
+            ph.print_subtitle("SDA Approximation Image Mask")
+            SDA = sda.ScatteredDataApproximation(
+                stacks, HR_volume, sigma=args.sigma, sda_mask=True)
+            SDA.run()
+            # HR volume contains updated mask based on SDA
+            HR_volume = SDA.get_reconstruction()
 
-        ph.print_subtitle("SDA Approximation Image")
-        SDA = sda.ScatteredDataApproximation(
-            stacks, HR_volume, sigma=args.sigma)
-        SDA.run()
-        HR_volume = SDA.get_reconstruction()
+            HR_volume.set_filename(SDA.get_setting_specific_filename())
 
-        ph.print_subtitle("SDA Approximation Image Mask")
-        SDA = sda.ScatteredDataApproximation(
-            stacks, HR_volume, sigma=args.sigma, sda_mask=True)
-        SDA.run()
-        # HR volume contains updated mask based on SDA
-        HR_volume = SDA.get_reconstruction()
+        HR_volume_reference = HR_volume
 
-        HR_volume.set_filename(SDA.get_setting_specific_filename())
+        if checkpoint is not None:
+            checkpoint.write("initial_reconstruction", stacks, HR_volume)
 
     time_reconstruction = ph.stop_timing(time_tmp)
 
@@ -371,7 +505,7 @@ def main():
         sitkh.show_stacks(tmp, segmentation=HR_volume, viewer=args.viewer)
 
     # -----------Two-step Slice-to-Volume Registration-Reconstruction----------
-    if args.two_step_cycles > 0:
+    if args.two_step_cycles > 0 and resume_stage != "final_reconstruction":
 
         # Slice-to-volume registration set-up
         if args.metric == "ANTSNeighborhoodCorrelation":
@@ -388,6 +522,7 @@ def main():
             use_multiresolution_framework=args.multiresolution,
             shrink_factors=args.shrink_factors,
             smoothing_sigmas=args.smoothing_sigmas,
+            search_range=args.s2v_search_range,
             initializer_type="SelfGEOMETRY",
             optimizer="ConjugateGradientLineSearch",
             optimizer_params={
@@ -433,7 +568,7 @@ def main():
         two_step_s2v_reg_recon = \
             pipeline.TwoStepSliceToVolumeRegistrationReconstruction(
                 stacks=stacks,
-                reference=HR_volume,
+                reference=HR_volume_reference,
                 registration_method=registration,
                 reconstruction_method=recon_method,
                 cycles=args.two_step_cycles,
@@ -445,6 +580,11 @@ def main():
                 viewer=args.viewer,
                 verbose=args.verbose,
                 use_hierarchical_registration=args.s2v_hierarchical,
+                checkpoint=checkpoint,
+                resume_stage=resume_stage,
+                n_processes=args.n_processes,
+                convergence_thresholds=args.s2v_convergence_thresholds,
+                use_early_termination=args.s2v_early_termination,
             )
         two_step_s2v_reg_recon.run()
         HR_volume_iterations = \
@@ -474,6 +614,7 @@ def main():
                 write_slices=False,
                 write_transforms=True,
                 write_transforms_history=args.transforms_history,
+                transforms_format=args.transforms_format,
             )
 
         if args.outlier_rejection:
@@ -492,48 +633,56 @@ def main():
 
     # ---------------------Final Volumetric Reconstruction---------------------
     ph.print_title("Final Volumetric Reconstruction")
-    if args.sda:
-        recon_method = sda.ScatteredDataApproximation(
-            stacks,
-            HR_volume,
-            sigma=args.alpha,
-            use_masks=args.use_masks_srr,
-        )
+    if resume_stage == "final_reconstruction":
+        HR_volume_final = checkpoint.get_reconstruction()
+
     else:
-        if args.reconstruction_type in ["TVL2", "HuberL2"]:
-            recon_method = pd.PrimalDualSolver(
-                stacks=stacks,
-                reconstruction=HR_volume,
-                reg_type="TV" if args.reconstruction_type == "TVL2" else "huber",
-                iterations=args.iterations,
+        if args.sda:
+            recon_method = sda.ScatteredDataApproximation(
+                stacks,
+                HR_volume,
+                sigma=args.alpha,
                 use_masks=args.use_masks_srr,
             )
         else:
-            recon_method = tk.TikhonovSolver(
-                stacks=stacks,
-                reconstruction=HR_volume,
-                reg_type="TK1" if args.reconstruction_type == "TK1L2" else "TK0",
-                use_masks=args.use_masks_srr,
-            )
-        recon_method.set_alpha(args.alpha)
-        recon_method.set_iter_max(args.iter_max)
-        recon_method.set_verbose(True)
-    recon_method.run()
-    time_reconstruction += recon_method.get_computational_time()
-    HR_volume_final = recon_method.get_reconstruction()
-
-    ph.print_subtitle("Final SDA Approximation Image Mask")
-    SDA = sda.ScatteredDataApproximation(
-        stacks, HR_volume_final, sigma=args.sigma, sda_mask=True)
-    SDA.run()
-    # HR volume contains updated mask based on SDA
-    HR_volume_final = SDA.get_reconstruction()
-    time_reconstruction += SDA.get_computational_time()
+            if args.reconstruction_type in ["TVL2", "HuberL2"]:
+                recon_method = pd.PrimalDualSolver(
+                    stacks=stacks,
+                    reconstruction=HR_volume,
+                    reg_type="TV" if args.reconstruction_type == "TVL2" else "huber",
+                    iterations=args.iterations,
+                    use_masks=args.use_masks_srr,
+                )
+            else:
+                recon_method = tk.TikhonovSolver(
+                    stacks=stacks,
+                    reconstruction=HR_volume,
+                    reg_type="TK1" if args.reconstruction_type == "TK1L2" else "TK0",
+                    use_masks=args.use_masks_srr,
+                )
+            recon_method.set_alpha(args.alpha)
+            recon_method.set_iter_max(args.iter_max)
+            recon_method.set_verbose(True)
+        recon_method.run()
+        time_reconstruction += recon_method.get_computational_time()
+        HR_volume_final = recon_method.get_reconstruction()
+
+        ph.print_subtitle("Final SDA Approximation Image Mask")
+        SDA = sda.ScatteredDataApproximation(
+            stacks, HR_volume_final, sigma=args.sigma, sda_mask=True)
+        SDA.run()
+        # HR volume contains updated mask based on SDA
+        HR_volume_final = SDA.get_reconstruction()
+        time_reconstruction += SDA.get_computational_time()
+        HR_volume_final.set_filename(
+            recon_method.get_setting_specific_filename())
+
+        if checkpoint is not None:
+            checkpoint.write("final_reconstruction", stacks, HR_volume_final)
 
     elapsed_time_total = ph.stop_timing(time_start)
 
     # Write SRR result
-    HR_volume_final.set_filename(recon_method.get_setting_specific_filename())
     dw.DataWriter.write_image(HR_volume_final.sitk, args.output)
     dw.DataWriter.write_mask(
         HR_volume_final.sitk_mask, ph.append_to_filename(args.output, "_mask"))
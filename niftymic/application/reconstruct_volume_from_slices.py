@@ -51,6 +51,7 @@ def main():
     input_parser.add_extra_frame_target(default=10)
     input_parser.add_isotropic_resolution(default=None)
     input_parser.add_intensity_correction(default=1)
+    input_parser.add_n_processes(default=1)
     input_parser.add_reconstruction_space(default=None)
     input_parser.add_minimizer(default="lsmr")
     input_parser.add_iter_max(default=10)
@@ -143,30 +144,33 @@ def main():
     # ---------------------------Intensity Correction--------------------------
     if args.intensity_correction and not args.mask:
         ph.print_title("Intensity Correction")
-        intensity_corrector = ic.IntensityCorrection()
+        intensity_corrector = ic.IntensityCorrection(
+            n_processes=args.n_processes)
         intensity_corrector.use_individual_slice_correction(False)
         intensity_corrector.use_stack_mask(True)
         intensity_corrector.use_reference_mask(True)
         intensity_corrector.use_verbose(False)
 
+        indices = [i for i in range(len(stacks)) if i != target_stack_index]
+        intensity_corrector.run_linear_intensity_correction_stacks(
+            [stacks[i] for i in indices],
+            stacks[target_stack_index],
+            interpolator="NearestNeighbor",
+        )
+        stacks_corrected = intensity_corrector.get_intensity_corrected_stacks()
+        coefficients = \
+            intensity_corrector.get_intensity_correction_coefficients_stacks()
+
         for i, stack in enumerate(stacks):
             if i == target_stack_index:
                 ph.print_info("Stack %d (%s): Reference image. Skipped." % (
                     i + 1, stack.get_filename()))
                 continue
-            else:
-                ph.print_info("Stack %d (%s): Intensity Correction ... " % (
-                    i + 1, stack.get_filename()), newline=False)
-            intensity_corrector.set_stack(stack)
-            intensity_corrector.set_reference(
-                stacks[target_stack_index].get_resampled_stack(
-                    resampling_grid=stack.sitk,
-                    interpolator="NearestNeighbor",
-                ))
-            intensity_corrector.run_linear_intensity_correction()
-            stacks[i] = intensity_corrector.get_intensity_corrected_stack()
-            print("done (c1 = %g) " %
-                  intensity_corrector.get_intensity_correction_coefficients())
+            j = indices.index(i)
+            stacks[i] = stacks_corrected[j]
+            ph.print_info("Stack %d (%s): Intensity Correction ... "
+                          "done (c1 = %g) " % (
+                              i + 1, stack.get_filename(), coefficients[j]))
 
     # -------------------------Volumetric Reconstruction-----------------------
     ph.print_title("Volumetric Reconstruction")
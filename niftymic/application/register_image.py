@@ -17,7 +17,9 @@ import pysitk.simple_itk_helper as sitkh
 
 import niftymic.base.stack as st
 import niftymic.base.data_reader as dr
+import niftymic.base.stack_transforms as stt
 import niftymic.registration.niftyreg as niftyreg
+import niftymic.registration.registration_cache as regcache
 import niftymic.registration.transform_initializer as tinit
 from niftymic.utilities.input_arparser import InputArgparser
 
@@ -65,6 +67,7 @@ def main():
         "RegAladin registrations."
     )
     input_parser.add_dir_input_mc()
+    input_parser.add_registration_cache()
     input_parser.add_verbose(default=0)
     input_parser.add_log_config(default=1)
 
@@ -105,6 +108,110 @@ def main():
         DIR_TMP,
         ph.append_to_filename(os.path.basename(args.moving), "_warped"))
 
+    register(args, fixed, moving, path_to_tmp_output, debug)
+    ph.print_info("Registration transformation written to '%s'" % args.output)
+
+    if args.dir_input_mc is not None:
+        ph.print_title("Update Motion-Correction Transformations")
+        transform_sitk = sitkh.read_transform_sitk(
+            args.output, inverse=1)
+
+        if args.dir_input_mc.endswith("/"):
+            subdir_mc = args.dir_input_mc.split("/")[-2]
+        else:
+            subdir_mc = args.dir_input_mc.split("/")[-1]
+        dir_output_mc = os.path.join(dir_output, subdir_mc)
+
+        ph.create_directory(dir_output_mc, delete_files=True)
+        pattern = REGEX_FILENAMES + "[.]tfm"
+        p = re.compile(pattern)
+        trafos = [t for t in os.listdir(args.dir_input_mc) if p.match(t)]
+        for t in trafos:
+            path_to_input_transform = os.path.join(args.dir_input_mc, t)
+            path_to_output_transform = os.path.join(dir_output_mc, t)
+            t_sitk = sitkh.read_transform_sitk(path_to_input_transform)
+            t_sitk = sitkh.get_composite_sitk_affine_transform(
+                transform_sitk, t_sitk)
+            sitk.WriteTransform(t_sitk, path_to_output_transform)
+        ph.print_info("%d transformations written to '%s'" % (
+            len(trafos), dir_output_mc))
+
+        # Update consolidated stack transform files
+        p = re.compile(REGEX_FILENAMES + "[.]npz")
+        trafos = [t for t in os.listdir(args.dir_input_mc) if p.match(t)]
+        for t in trafos:
+            stack_transforms = stt.StackTransforms.from_filename(
+                os.path.join(args.dir_input_mc, t))
+            stack_transforms.update_motion_correction(transform_sitk)
+            stack_transforms.write(os.path.join(dir_output_mc, t))
+        if len(trafos) > 0:
+            ph.print_info("%d stack transformation files written to '%s'" % (
+                len(trafos), dir_output_mc))
+
+        # Copy rejected_slices.json file
+        path_to_rejected_slices = os.path.join(
+            args.dir_input_mc, "rejected_slices.json")
+        if ph.file_exists(path_to_rejected_slices):
+            ph.copy_file(path_to_rejected_slices, dir_output_mc)
+
+    if args.verbose:
+        cmd_args = ["simplereg_resample"]
+        cmd_args.append("-f %s" % args.fixed)
+        cmd_args.append("-m %s" % args.moving)
+        cmd_args.append("-t %s" % args.output)
+        cmd_args.append("-o %s" % path_to_tmp_output)
+        ph.execute_command(" ".join(cmd_args))
+
+        ph.show_niftis([args.fixed, path_to_tmp_output])
+
+    elapsed_time_total = ph.stop_timing(time_start)
+
+    # Summary
+    ph.print_title("Summary")
+    print("Computational Time: %s" % (elapsed_time_total))
+
+    return 0
+
+
+##
+# Register moving to fixed and write the obtained transform to args.output.
+# With given registration cache, a previously obtained transform for
+# identical images, method and initialization is written instead.
+# \date       2026-10-19 09:52:14+0000
+#
+# \param      args                Parsed arguments of main
+# \param      fixed               Fixed image as Stack object
+# \param      moving              Moving image as Stack object
+# \param      path_to_tmp_output  Path to warped moving image, string
+# \param      debug               Debug output of executed commands, bool
+#
+def register(args, fixed, moving, path_to_tmp_output, debug):
+
+    if args.registration_cache is not None:
+        registration_cache = regcache.RegistrationCache(
+            args.registration_cache)
+        if args.initial_transform is not None:
+            transform_init_sitk = sitkh.read_transform_sitk(
+                args.initial_transform)
+        else:
+            transform_init_sitk = None
+        registration_cache_key = registration_cache.get_key(
+            fixed_sitk=fixed.sitk,
+            moving_sitk=moving.sitk,
+            method=args.method,
+            fixed_sitk_mask=fixed.sitk_mask
+            if args.fixed_mask is not None else None,
+            moving_sitk_mask=moving.sitk_mask
+            if args.moving_mask is not None else None,
+            options="init_pca=%s" % args.init_pca,
+            transform_init_sitk=transform_init_sitk,
+        )
+        transform_sitk = registration_cache.read_transform_sitk(
+            registration_cache_key)
+        if transform_sitk is not None:
+            sitk.WriteTransform(transform_sitk, args.output)
+            return
+
     # ---------------------------- Initialization ----------------------------
     if args.initial_transform is None and args.init_pca:
         ph.print_title("Estimate (initial) transformation using PCA")
@@ -208,56 +315,10 @@ def main():
         cmd = "simplereg_transform -flirt2sitk '%s' '%s' '%s' '%s'" % (
             path_to_transform_flirt, args.fixed, args.moving, args.output)
         ph.execute_command(cmd, verbose=False)
-    ph.print_info("Registration transformation written to '%s'" % args.output)
-
-    if args.dir_input_mc is not None:
-        ph.print_title("Update Motion-Correction Transformations")
-        transform_sitk = sitkh.read_transform_sitk(
-            args.output, inverse=1)
-
-        if args.dir_input_mc.endswith("/"):
-            subdir_mc = args.dir_input_mc.split("/")[-2]
-        else:
-            subdir_mc = args.dir_input_mc.split("/")[-1]
-        dir_output_mc = os.path.join(dir_output, subdir_mc)
 
-        ph.create_directory(dir_output_mc, delete_files=True)
-        pattern = REGEX_FILENAMES + "[.]tfm"
-        p = re.compile(pattern)
-        trafos = [t for t in os.listdir(args.dir_input_mc) if p.match(t)]
-        for t in trafos:
-            path_to_input_transform = os.path.join(args.dir_input_mc, t)
-            path_to_output_transform = os.path.join(dir_output_mc, t)
-            t_sitk = sitkh.read_transform_sitk(path_to_input_transform)
-            t_sitk = sitkh.get_composite_sitk_affine_transform(
-                transform_sitk, t_sitk)
-            sitk.WriteTransform(t_sitk, path_to_output_transform)
-        ph.print_info("%d transformations written to '%s'" % (
-            len(trafos), dir_output_mc))
-
-        # Copy rejected_slices.json file
-        path_to_rejected_slices = os.path.join(
-            args.dir_input_mc, "rejected_slices.json")
-        if ph.file_exists(path_to_rejected_slices):
-            ph.copy_file(path_to_rejected_slices, dir_output_mc)
-
-    if args.verbose:
-        cmd_args = ["simplereg_resample"]
-        cmd_args.append("-f %s" % args.fixed)
-        cmd_args.append("-m %s" % args.moving)
-        cmd_args.append("-t %s" % args.output)
-        cmd_args.append("-o %s" % path_to_tmp_output)
-        ph.execute_command(" ".join(cmd_args))
-
-        ph.show_niftis([args.fixed, path_to_tmp_output])
-
-    elapsed_time_total = ph.stop_timing(time_start)
-
-    # Summary
-    ph.print_title("Summary")
-    print("Computational Time: %s" % (elapsed_time_total))
-
-    return 0
+    if args.registration_cache is not None:
+        registration_cache.write_transform_sitk(
+            registration_cache_key, sitkh.read_transform_sitk(args.output))
 
 
 if __name__ == '__main__':
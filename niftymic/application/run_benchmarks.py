@@ -0,0 +1,140 @@
+##
+# \file run_benchmarks.py
+# \brief      Script to benchmark the computationally expensive parts of the
+#             reconstruction pipeline on synthetic data.
+#
+# Wall times, peak memory and scaling exponents are written to a JSON file.
+# If a baseline JSON file is given, the script exits with a non-zero code in
+# case of performance regressions.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import sys
+import itertools
+
+import pysitk.python_helper as ph
+
+from niftymic.benchmark.benchmarks import BENCHMARKS
+from niftymic.benchmark.benchmark_runner import BenchmarkRunner, SIZES
+from niftymic.utilities.input_arparser import InputArgparser
+
+
+def main():
+
+    input_parser = InputArgparser(
+        description="Benchmark the computationally expensive parts of the "
+        "reconstruction pipeline on synthetic data. "
+        "Problem sizes are either given as predefined sizes (--sizes) or as "
+        "all combinations of --n-stacks, --n-slices and --hr-sizes to obtain "
+        "scaling curves.",
+    )
+    input_parser.add_output(
+        help="Path to output JSON file holding the benchmark results.",
+        required=True)
+    input_parser.add_option(
+        option_string="--benchmarks",
+        nargs="+",
+        type=str,
+        help="Benchmarks to run. Options: %s." % (
+            ", ".join(sorted(BENCHMARKS.keys()))),
+        default=sorted(BENCHMARKS.keys()))
+    input_parser.add_option(
+        option_string="--sizes",
+        nargs="+",
+        type=str,
+        help="Predefined problem sizes. Options: %s." % (
+            ", ".join(sorted(SIZES.keys()))),
+        default=["small"])
+    input_parser.add_option(
+        option_string="--n-stacks",
+        nargs="+",
+        type=int,
+        help="Numbers of stacks.")
+    input_parser.add_option(
+        option_string="--n-slices",
+        nargs="+",
+        type=int,
+        help="Numbers of slices per stack.")
+    input_parser.add_option(
+        option_string="--hr-sizes",
+        nargs="+",
+        type=int,
+        help="Numbers of voxels of the high-resolution volume along each "
+        "axis.")
+    input_parser.add_option(
+        option_string="--repeats",
+        type=int,
+        help="Number of timed executions per benchmark and problem size.",
+        default=3)
+    input_parser.add_option(
+        option_string="--interpolator",
+        type=str,
+        help="Interpolator to simulate the slice acquisition of the "
+        "synthetic stacks.",
+        default="Linear")
+    input_parser.add_option(
+        option_string="--baseline",
+        type=str,
+        help="Path to JSON file of a previous benchmark run to check for "
+        "performance regressions.")
+    input_parser.add_option(
+        option_string="--tolerance",
+        type=float,
+        help="Tolerated relative increase in wall time compared to the "
+        "baseline.",
+        default=0.2)
+    input_parser.add_verbose(default=1)
+
+    args = input_parser.parse_args()
+    input_parser.print_arguments(args)
+
+    if any(a is not None for a in [args.n_stacks, args.n_slices,
+                                   args.hr_sizes]):
+        n_stacks = args.n_stacks or [SIZES["small"]["n_stacks"]]
+        n_slices = args.n_slices or [SIZES["small"]["n_slices"]]
+        hr_sizes = args.hr_sizes or [SIZES["small"]["hr_size"]]
+        sizes = [
+            {"n_stacks": a, "n_slices": b, "hr_size": c}
+            for a, b, c in itertools.product(n_stacks, n_slices, hr_sizes)
+        ]
+    else:
+        for size in args.sizes:
+            if size not in SIZES.keys():
+                raise IOError("Size '%s' not known. Options: %s" % (
+                    size, ", ".join(sorted(SIZES.keys()))))
+        sizes = [SIZES[size] for size in args.sizes]
+
+    benchmark_runner = BenchmarkRunner(
+        benchmarks=args.benchmarks,
+        sizes=sizes,
+        repeats=args.repeats,
+        interpolator=args.interpolator,
+        verbose=args.verbose,
+    )
+    benchmark_runner.run()
+    benchmark_runner.write_results(args.output)
+
+    if args.baseline is not None:
+        regressions = benchmark_runner.get_regressions(
+            args.baseline, tolerance=args.tolerance)
+        for regression in regressions:
+            ph.print_warning(
+                "Regression '%s' (n_stacks=%d, n_slices=%d, hr_size=%d): "
+                "%.3fs vs %.3fs (baseline)" % (
+                    regression["benchmark"],
+                    regression["n_stacks"],
+                    regression["n_slices"],
+                    regression["hr_size"],
+                    regression["wall_time_min"],
+                    regression["wall_time_min_baseline"]))
+        if len(regressions) > 0:
+            return 1
+        ph.print_info("No regressions compared to baseline")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,6 +20,7 @@ import nsol.deconvolution_solver_parameter_study_interface as \
     deconv_interface
 import pysitk.python_helper as ph
 from niftymic.utilities.input_arparser import InputArgparser
+from niftymic.utilities.parameter_study_runner import ParameterStudyRunner
 
 
 def main():
@@ -61,6 +62,13 @@ def main():
     input_parser.add_use_masks_srr(default=0)
     input_parser.add_verbose(default=1)
     input_parser.add_slice_thicknesses(default=None)
+    input_parser.add_n_processes(default=1)
+    input_parser.add_option(
+        option_string="--warm-start",
+        type=int,
+        help="Turn on/off warm start of the solver with the solution "
+        "obtained for the neighbouring regularization parameter alpha.",
+        default=0)
     input_parser.add_argument(
         "--append", "-append",
         action='store_true',
@@ -200,10 +208,15 @@ def main():
     parameter_study = parameter_study_interface.get_parameter_study()
 
     # Run parameter study
-    parameter_study.run()
+    parameter_study_runner = ParameterStudyRunner(
+        parameter_study=parameter_study,
+        n_processes=args.n_processes,
+        use_warm_start=args.warm_start,
+    )
+    parameter_study_runner.run()
 
     print("\nComputational time for Deconvolution Parameter Study %s: %s" %
-          (name, parameter_study.get_computational_time()))
+          (name, parameter_study_runner.get_computational_time()))
 
     return 0
 
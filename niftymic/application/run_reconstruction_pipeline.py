@@ -23,6 +23,7 @@ import niftymic.validation.export_side_by_side_simulated_vs_original_slice_compa
     export_side_by_side_simulated_vs_original_slice_comparison
 from niftymic.utilities.input_arparser import InputArgparser
 import niftymic.utilities.template_stack_estimator as tse
+import niftymic.utilities.stage_scheduler as stsch
 
 from niftymic.definitions import DIR_TEMPLATES
 
@@ -56,6 +57,8 @@ def main():
     input_parser.add_reference()
     input_parser.add_reference_mask()
     input_parser.add_bias_field_correction(default=1)
+    input_parser.add_bias_field_shrink_factor(default=1)
+    input_parser.add_n_processes(default=1)
     input_parser.add_intensity_correction(default=1)
     input_parser.add_iter_max(default=10)
     input_parser.add_two_step_cycles(default=3)
@@ -90,6 +93,13 @@ def main():
         type=str,
         help="Set initial transform to be used for register_image.",
         default=None)
+    input_parser.add_registration_cache()
+    input_parser.add_option(
+        option_string="--skip-up-to-date",
+        type=int,
+        help="Turn on/off skipping of stages whose outputs exist and whose "
+        "inputs and parameters are unchanged since their last execution.",
+        default=1)
     input_parser.add_outlier_rejection(default=1)
     input_parser.add_threshold_first(default=0.5)
     input_parser.add_threshold(default=0.8)
@@ -146,31 +156,40 @@ def main():
     srr_slice_coverage = os.path.join(
         dir_output_diagnostics, "%s_template_slicecoverage.nii.gz" % filename_srr)
 
+    scheduler = stsch.StageScheduler(
+        path_to_hashes=os.path.join(args.dir_output, "pipeline_stages.json"),
+        n_processes=args.n_processes,
+        skip_up_to_date=args.skip_up_to_date,
+    )
+
+    # Single quotes around individual filenames account for whitespaces
+    quote = lambda f: "'%s'" % f
+
+    # --------------------------Bias Field Correction-------------------------
+    if args.bias_field_correction:
+        filenames = [os.path.join(dir_output_preprocessing, os.path.basename(f))
+                     for f in args.filenames]
+    else:
+        filenames = args.filenames
+    stages_bias = []
+
     if args.bias_field_correction and args.run_bias_field_correction:
         for i, f in enumerate(args.filenames):
-            output = os.path.join(
-                dir_output_preprocessing, os.path.basename(f))
-            cmd_args = []
+            cmd_args = ["niftymic_correct_bias_field"]
             cmd_args.append("--filename '%s'" % f)
             cmd_args.append("--filename-mask '%s'" % args.filenames_masks[i])
-            cmd_args.append("--output '%s'" % output)
+            cmd_args.append("--output '%s'" % filenames[i])
+            cmd_args.append("--bias-field-shrink-factor %d" %
+                            args.bias_field_shrink_factor)
             # cmd_args.append("--verbose %d" % args.verbose)
             cmd_args.append("--log-config %d" % args.log_config)
-            cmd = "niftymic_correct_bias_field %s" % (" ").join(cmd_args)
-            time_start_bias = ph.start_timing()
-            exit_code = ph.execute_command(cmd)
-            if exit_code != 0:
-                raise RuntimeError("Bias field correction failed")
-        elapsed_time_bias = ph.stop_timing(time_start_bias)
-        filenames = [os.path.join(dir_output_preprocessing, os.path.basename(f))
-                     for f in args.filenames]
-    elif args.bias_field_correction and not args.run_bias_field_correction:
-        elapsed_time_bias = ph.get_zero_time()
-        filenames = [os.path.join(dir_output_preprocessing, os.path.basename(f))
-                     for f in args.filenames]
-    else:
-        elapsed_time_bias = ph.get_zero_time()
-        filenames = args.filenames
+            stages_bias.append("bias_field_correction_%d" % i)
+            scheduler.add_stage(
+                stages_bias[-1],
+                (" ").join(cmd_args),
+                inputs=[f, args.filenames_masks[i]],
+                outputs=[filenames[i]],
+            )
 
     # Specify target stack for intensity correction and reconstruction space
     if args.target_stack is None:
@@ -184,15 +203,16 @@ def main():
                 "--filenames")
         target_stack = filenames[target_stack_index]
 
-    # Add single quotes around individual filenames to account for whitespaces
-    filenames = ["'" + f + "'" for f in filenames]
-    filenames_masks = ["'" + f + "'" for f in args.filenames_masks]
+    # ---------------------Reconstruction in Subject Space--------------------
+    dir_motion_correction_subject_space = os.path.join(
+        dir_output_recon_subject_space, "motion_correction")
 
     if args.run_recon_subject_space:
 
         cmd_args = ["niftymic_reconstruct_volume"]
-        cmd_args.append("--filenames %s" % (" ").join(filenames))
-        cmd_args.append("--filenames-masks %s" % (" ").join(filenames_masks))
+        cmd_args.append("--filenames %s" % (" ").join(map(quote, filenames)))
+        cmd_args.append("--filenames-masks %s" %
+                        (" ").join(map(quote, args.filenames_masks)))
         cmd_args.append("--multiresolution %d" % args.multiresolution)
         cmd_args.append("--target-stack '%s'" % target_stack)
         cmd_args.append("--output '%s'" % srr_subject)
@@ -223,65 +243,58 @@ def main():
             cmd_args.append("--v2v-robust")
         if args.s2v_hierarchical:
             cmd_args.append("--s2v-hierarchical")
-
-        cmd = (" ").join(cmd_args)
-        time_start_volrec = ph.start_timing()
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            raise RuntimeError("Reconstruction in subject space failed")
-
-        # Compute SRR mask in subject space
-        # (Approximated using SDA within reconstruct_volume)
-        if 0:
-            dir_motion_correction = os.path.join(
-                dir_output_recon_subject_space, "motion_correction")
-            cmd_args = ["niftymic_reconstruct_volume_from_slices"]
-            cmd_args.append("--filenames %s" % " ".join(filenames_masks))
-            cmd_args.append("--dir-input-mc '%s'" % dir_motion_correction)
-            cmd_args.append("--output '%s'" % srr_subject_mask)
-            cmd_args.append("--reconstruction-space '%s'" % srr_subject)
-            cmd_args.append("--suffix-mask '%s'" % args.suffix_mask)
-            cmd_args.append("--mask")
-            cmd_args.append("--log-config %d" % args.log_config)
-            if args.slice_thicknesses is not None:
-                cmd_args.append("--slice-thicknesses %s" %
-                                " ".join(map(str, args.slice_thicknesses)))
-            if args.sda:
-                cmd_args.append("--sda")
-                cmd_args.append("--alpha 1")
+        if args.registration_cache is not None:
+            cmd_args.append(
+                "--registration-cache '%s'" % args.registration_cache)
+
+        scheduler.add_stage(
+            "recon_subject_space",
+            (" ").join(cmd_args),
+            inputs=filenames + args.filenames_masks + [
+                f for f in [args.reference, args.reference_mask]
+                if f is not None],
+            outputs=[
+                srr_subject,
+                srr_subject_mask,
+                dir_motion_correction_subject_space,
+            ],
+            dependencies=stages_bias,
+        )
+
+    # --------------------Reconstruction in Template Space--------------------
+    dir_motion_correction_template_space = os.path.join(
+        dir_output_recon_template_space, "motion_correction")
+
+    # Template is selected based on estimated gestational age (if not given)
+    # which requires the subject space reconstruction to be completed
+    template_space = {}
+
+    def get_template():
+        if "template" not in template_space:
+            if args.gestational_age is None:
+                template_stack_estimator = \
+                    tse.TemplateStackEstimator.from_mask(srr_subject_mask)
+                gestational_age = template_stack_estimator.get_estimated_gw()
+                ph.print_info(
+                    "Estimated gestational age: %d" % gestational_age)
             else:
-                cmd_args.append("--alpha 0.1")
-                cmd_args.append("--iter-max 5")
-            cmd = (" ").join(cmd_args)
-            ph.execute_command(cmd)
-
-        elapsed_time_volrec = ph.stop_timing(time_start_volrec)
-    else:
-        elapsed_time_volrec = ph.get_zero_time()
-
-    if args.run_recon_template_space:
-
-        if args.gestational_age is None:
-            template_stack_estimator = \
-                tse.TemplateStackEstimator.from_mask(srr_subject_mask)
-            gestational_age = template_stack_estimator.get_estimated_gw()
-            ph.print_info("Estimated gestational age: %d" % gestational_age)
-        else:
-            gestational_age = args.gestational_age
-
-        template = os.path.join(
-            DIR_TEMPLATES, "STA%d.nii.gz" % gestational_age)
-        template_mask = os.path.join(
-            DIR_TEMPLATES, "STA%d_mask.nii.gz" % gestational_age)
-
-        # Register SRR to template space
+                gestational_age = args.gestational_age
+            template_space["template"] = os.path.join(
+                DIR_TEMPLATES, "STA%d.nii.gz" % gestational_age)
+            template_space["template_mask"] = os.path.join(
+                DIR_TEMPLATES, "STA%d_mask.nii.gz" % gestational_age)
+        return template_space["template"], template_space["template_mask"]
+
+    # Register SRR to template space
+    def register_template_space():
+        template, template_mask = get_template()
         cmd_args = ["niftymic_register_image"]
         cmd_args.append("--fixed '%s'" % template)
         cmd_args.append("--moving '%s'" % srr_subject)
         cmd_args.append("--fixed-mask '%s'" % template_mask)
         cmd_args.append("--moving-mask '%s'" % srr_subject_mask)
-        cmd_args.append("--dir-input-mc '%s'" % os.path.join(
-            dir_output_recon_subject_space, "motion_correction"))
+        cmd_args.append("--dir-input-mc '%s'" %
+                        dir_motion_correction_subject_space)
         cmd_args.append("--output '%s'" % trafo_template)
         cmd_args.append("--verbose %s" % args.verbose)
         cmd_args.append("--log-config %d" % args.log_config)
@@ -290,18 +303,20 @@ def main():
         else:
             cmd_args.append(
                 "--initial-transform '%s'" % args.initial_transform)
-        cmd = (" ").join(cmd_args)
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            raise RuntimeError("Registration to template space failed")
-
-        # Compute SRR in template space
-        dir_input_mc = os.path.join(
-            dir_output_recon_template_space, "motion_correction")
+        if args.registration_cache is not None:
+            cmd_args.append(
+                "--registration-cache '%s'" % args.registration_cache)
+        return ph.execute_command((" ").join(cmd_args))
+
+    # Compute SRR in template space
+    def recon_template_space():
+        template = get_template()[0]
         cmd_args = ["niftymic_reconstruct_volume_from_slices"]
-        cmd_args.append("--filenames %s" % (" ").join(filenames))
-        cmd_args.append("--filenames-masks %s" % (" ").join(filenames_masks))
-        cmd_args.append("--dir-input-mc '%s'" % dir_input_mc)
+        cmd_args.append("--filenames %s" % (" ").join(map(quote, filenames)))
+        cmd_args.append("--filenames-masks %s" %
+                        (" ").join(map(quote, args.filenames_masks)))
+        cmd_args.append("--dir-input-mc '%s'" %
+                        dir_motion_correction_template_space)
         cmd_args.append("--output '%s'" % srr_template)
         cmd_args.append("--reconstruction-space '%s'" % template)
         cmd_args.append("--target-stack '%s'" % target_stack)
@@ -315,125 +330,138 @@ def main():
                             " ".join(map(str, args.slice_thicknesses)))
         if args.sda:
             cmd_args.append("--sda")
-
-        cmd = (" ").join(cmd_args)
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            raise RuntimeError("Reconstruction in template space failed")
-
-        # Compute SRR mask in template space
-        if 1:
-            dir_motion_correction = os.path.join(
-                dir_output_recon_template_space, "motion_correction")
-            cmd_args = ["niftymic_reconstruct_volume_from_slices"]
-            cmd_args.append("--filenames %s" % " ".join(filenames_masks))
-            cmd_args.append("--dir-input-mc '%s'" % dir_motion_correction)
-            cmd_args.append("--output '%s'" % srr_template_mask)
-            cmd_args.append("--reconstruction-space '%s'" % srr_template)
-            cmd_args.append("--suffix-mask '%s'" % args.suffix_mask)
-            cmd_args.append("--log-config %d" % args.log_config)
-            cmd_args.append("--mask")
-            if args.slice_thicknesses is not None:
-                cmd_args.append("--slice-thicknesses %s" %
-                                " ".join(map(str, args.slice_thicknesses)))
-            if args.sda:
-                cmd_args.append("--sda")
-                cmd_args.append("--alpha 1")
-            else:
-                cmd_args.append("--alpha 0.1")
-                cmd_args.append("--iter-max 5")
-            cmd = (" ").join(cmd_args)
-            ph.execute_command(cmd)
-
-        # Copy SRR to output directory
-        if 0:
-            output = "%sSRR_Stacks%d.nii.gz" % (
-                args.prefix_output, len(args.filenames))
-            path_to_output = os.path.join(args.dir_output, output)
-            cmd = "cp -p '%s' '%s'" % (srr_template, path_to_output)
-            exit_code = ph.execute_command(cmd)
-            if exit_code != 0:
-                raise RuntimeError("Copy of SRR to output directory failed")
-
-        # Multiply template mask with reconstruction
-        if 0:
-            cmd_args = ["niftymic_multiply"]
-            fnames = [
-                srr_template,
-                srr_template_mask,
-            ]
-            output_masked = "Masked_%s" % output
-            path_to_output_masked = os.path.join(args.dir_output, output_masked)
-            cmd_args.append("--filenames %s" % " ".join(fnames))
-            cmd_args.append("--output '%s'" % path_to_output_masked)
-            cmd = (" ").join(cmd_args)
-            exit_code = ph.execute_command(cmd)
-            if exit_code != 0:
-                raise RuntimeError("SRR brain masking failed")
-
+        return ph.execute_command((" ").join(cmd_args))
+
+    # Compute SRR mask in template space
+    cmd_args = ["niftymic_reconstruct_volume_from_slices"]
+    cmd_args.append("--filenames %s" %
+                    " ".join(map(quote, args.filenames_masks)))
+    cmd_args.append("--dir-input-mc '%s'" %
+                    dir_motion_correction_template_space)
+    cmd_args.append("--output '%s'" % srr_template_mask)
+    cmd_args.append("--reconstruction-space '%s'" % srr_template)
+    cmd_args.append("--suffix-mask '%s'" % args.suffix_mask)
+    cmd_args.append("--log-config %d" % args.log_config)
+    cmd_args.append("--mask")
+    if args.slice_thicknesses is not None:
+        cmd_args.append("--slice-thicknesses %s" %
+                        " ".join(map(str, args.slice_thicknesses)))
+    if args.sda:
+        cmd_args.append("--sda")
+        cmd_args.append("--alpha 1")
     else:
-        elapsed_time_template = ph.get_zero_time()
+        cmd_args.append("--alpha 0.1")
+        cmd_args.append("--iter-max 5")
+    cmd_recon_template_space_mask = (" ").join(cmd_args)
 
+    if args.run_recon_template_space:
+        scheduler.add_stage(
+            "register_template_space",
+            register_template_space,
+            signature="%s %s %s" % (
+                args.gestational_age, args.initial_transform, args.verbose),
+            inputs=[
+                srr_subject,
+                srr_subject_mask,
+                dir_motion_correction_subject_space,
+            ],
+            outputs=[trafo_template, dir_motion_correction_template_space],
+            dependencies=["recon_subject_space"],
+        )
+        scheduler.add_stage(
+            "recon_template_space",
+            recon_template_space,
+            signature="%s %s %s %s %s %s" % (
+                target_stack, args.iter_max, args.alpha, args.suffix_mask,
+                args.slice_thicknesses, args.sda),
+            inputs=filenames + args.filenames_masks + [
+                dir_motion_correction_template_space],
+            outputs=[srr_template],
+            dependencies=["register_template_space"],
+        )
+        scheduler.add_stage(
+            "recon_template_space_mask",
+            cmd_recon_template_space_mask,
+            inputs=args.filenames_masks + [
+                dir_motion_correction_template_space, srr_template],
+            outputs=[srr_template_mask],
+            dependencies=["recon_template_space"],
+        )
+
+    # -------------------------------Diagnostics------------------------------
     if args.run_diagnostics:
 
-        dir_input_mc = os.path.join(
-            dir_output_recon_template_space, "motion_correction")
+        dir_input_mc = dir_motion_correction_template_space
         dir_output_orig_vs_proj = os.path.join(
             dir_output_diagnostics, "original_vs_projected")
         dir_output_selfsimilarity = os.path.join(
             dir_output_diagnostics, "selfsimilarity")
-        dir_output_orig_vs_proj_pdf = os.path.join(
-            dir_output_orig_vs_proj, "pdf")
+        dir_output_side_by_side = os.path.join(
+            dir_output_diagnostics, "side_by_side")
 
         # Show slice coverage over reconstruction space
         exe = os.path.abspath(show_slice_coverage.__file__)
         cmd_args = ["python %s" % exe]
-        cmd_args.append("--filenames %s" % (" ").join(filenames))
+        cmd_args.append("--filenames %s" % (" ").join(map(quote, filenames)))
         cmd_args.append("--dir-input-mc '%s'" % dir_input_mc)
         cmd_args.append("--reconstruction-space '%s'" % srr_template)
         cmd_args.append("--output '%s'" % srr_slice_coverage)
-        cmd = (" ").join(cmd_args)
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            raise RuntimeError("Slice coverage visualization failed")
-
-        # Get simulated/projected slices
+        scheduler.add_stage(
+            "slice_coverage",
+            (" ").join(cmd_args),
+            inputs=filenames + [dir_input_mc, srr_template],
+            outputs=[srr_slice_coverage],
+            dependencies=["recon_template_space"],
+        )
+
+        # Get simulated/projected slices for each stack independently
+        stages_simulation = []
         exe = os.path.abspath(simulate_stacks_from_reconstruction.__file__)
-        cmd_args = ["python %s" % exe]
-        cmd_args.append("--filenames %s" % (" ").join(filenames))
-        if args.filenames_masks is not None:
-            cmd_args.append("--filenames-masks %s" %
-                            (" ").join(filenames_masks))
-        cmd_args.append("--dir-input-mc '%s'" % dir_input_mc)
-        cmd_args.append("--dir-output '%s'" % dir_output_orig_vs_proj)
-        cmd_args.append("--reconstruction '%s'" % srr_template)
-        cmd_args.append("--copy-data 1")
-        if args.slice_thicknesses is not None:
-            cmd_args.append("--slice-thicknesses %s" %
-                            " ".join(map(str, args.slice_thicknesses)))
-        # cmd_args.append("--verbose %s" % args.verbose)
-        cmd = (" ").join(cmd_args)
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            raise RuntimeError("SRR slice projections failed")
+        for i, f in enumerate(filenames):
+            cmd_args = ["python %s" % exe]
+            cmd_args.append("--filenames '%s'" % f)
+            cmd_args.append("--filenames-masks '%s'" %
+                            args.filenames_masks[i])
+            cmd_args.append("--dir-input-mc '%s'" % dir_input_mc)
+            cmd_args.append("--dir-output '%s'" % dir_output_orig_vs_proj)
+            cmd_args.append("--reconstruction '%s'" % srr_template)
+            cmd_args.append("--copy-data 1")
+            if args.slice_thicknesses is not None:
+                cmd_args.append("--slice-thicknesses %s" %
+                                args.slice_thicknesses[i])
+            # cmd_args.append("--verbose %s" % args.verbose)
+            stages_simulation.append("simulate_stack_%d" % i)
+            scheduler.add_stage(
+                stages_simulation[-1],
+                (" ").join(cmd_args),
+                inputs=[f, args.filenames_masks[i], dir_input_mc,
+                        srr_template],
+                outputs=[os.path.join(
+                    dir_output_orig_vs_proj, os.path.basename(f))],
+                dependencies=["recon_template_space"],
+            )
 
         filenames_simulated = [
-            "'%s" % os.path.join(dir_output_orig_vs_proj, os.path.basename(f))
+            os.path.join(dir_output_orig_vs_proj, os.path.basename(f))
             for f in filenames]
 
         # Evaluate slice similarities to ground truth
         exe = os.path.abspath(evaluate_simulated_stack_similarity.__file__)
         cmd_args = ["python %s" % exe]
-        cmd_args.append("--filenames %s" % (" ").join(filenames_simulated))
-        if args.filenames_masks is not None:
-            cmd_args.append("--filenames-masks %s" %
-                            (" ").join(filenames_masks))
+        cmd_args.append("--filenames %s" %
+                        (" ").join(map(quote, filenames_simulated)))
+        cmd_args.append("--filenames-masks %s" %
+                        (" ").join(map(quote, args.filenames_masks)))
         cmd_args.append("--measures NCC SSIM")
         cmd_args.append("--dir-output '%s'" % dir_output_selfsimilarity)
-        cmd = (" ").join(cmd_args)
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            raise RuntimeError("Evaluation of stack similarities failed")
+        cmd_args.append("--n-processes %d" % args.n_processes)
+        scheduler.add_stage(
+            "evaluate_stack_similarity",
+            (" ").join(cmd_args),
+            inputs=[dir_output_orig_vs_proj],
+            outputs=[dir_output_selfsimilarity],
+            dependencies=stages_simulation,
+        )
 
         # Generate figures showing the quantitative comparison
         exe = os.path.abspath(
@@ -441,29 +469,38 @@ def main():
         cmd_args = ["python %s" % exe]
         cmd_args.append("--dir-input '%s'" % dir_output_selfsimilarity)
         cmd_args.append("--dir-output '%s'" % dir_output_selfsimilarity)
-        cmd = (" ").join(cmd_args)
-        exit_code = ph.execute_command(cmd)
-        if exit_code != 0:
-            ph.print_warning("Visualization of stack similarities failed")
-
-        # Generate pdfs showing all the side-by-side comparisons
-        if 0:
-            exe = os.path.abspath(
-                export_side_by_side_simulated_vs_original_slice_comparison.__file__)
+        scheduler.add_stage(
+            "show_stack_similarity",
+            (" ").join(cmd_args),
+            dependencies=["evaluate_stack_similarity"],
+            required=False,
+        )
+
+        # Export side-by-side comparison of original and simulated slices
+        exe = os.path.abspath(
+            export_side_by_side_simulated_vs_original_slice_comparison.__file__)
+        for i, f in enumerate(filenames_simulated):
             cmd_args = ["python %s" % exe]
-            cmd_args.append("--filenames %s" % (" ").join(filenames_simulated))
-            cmd_args.append("--dir-output '%s'" % dir_output_orig_vs_proj_pdf)
-            cmd = "python %s %s" % (exe, (" ").join(cmd_args))
-            cmd = (" ").join(cmd_args)
-            exit_code = ph.execute_command(cmd)
-            if exit_code != 0:
-                raise RuntimeError("Generation of PDF overview failed")
+            cmd_args.append("--filenames '%s'" % f)
+            cmd_args.append("--dir-output '%s'" % dir_output_side_by_side)
+            scheduler.add_stage(
+                "export_side_by_side_%d" % i,
+                (" ").join(cmd_args),
+                inputs=[f, os.path.join(
+                    dir_output_orig_vs_proj,
+                    "Simulated_%s" % os.path.basename(f))],
+                outputs=[os.path.join(
+                    dir_output_side_by_side,
+                    "%s.pdf" % ph.strip_filename_extension(
+                        os.path.basename(f))[0])],
+                dependencies=[stages_simulation[i]],
+                required=False,
+            )
+
+    scheduler.run()
 
     ph.print_title("Summary")
-    print("Computational Time for Bias Field Correction: %s" %
-          elapsed_time_bias)
-    print("Computational Time for Volumetric Reconstruction: %s" %
-          elapsed_time_volrec)
+    scheduler.print_computational_times()
     print("Computational Time for Pipeline: %s" %
           ph.stop_timing(time_start))
 
@@ -0,0 +1,97 @@
+##
+# \file show_reconstruction_parameter_study.py
+# \brief      Script to show and analyse the results of a reconstruction
+#             parameter study.
+#
+# Results are read from the binary results store written by
+# niftymic_run_reconstruction_parameter_study. Measures and reconstructions
+# are only read for the visualized parameter configurations. Studies
+# without results store are read from nsol's text files.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import nsol.application.show_parameter_study as show_ps
+from nsol.reader_parameter_study import ReaderParameterStudy
+import pysitk.python_helper as ph
+
+from niftymic.utilities.input_arparser import InputArgparser
+from niftymic.utilities.parameter_study_runner import \
+    ReaderParameterStudyResultsStore, get_path_to_results_store
+
+
+def main():
+
+    input_parser = InputArgparser(
+        description="Show and analyse stored reconstruction parameter study.",
+    )
+    input_parser.add_dir_input(
+        help="Input directory where parameter study results are located.",
+        required=True)
+    input_parser.add_study_name(required=True)
+    input_parser.add_option(
+        option_string="--dir-output-figures",
+        type=str,
+        help="Output directory to write figures to.")
+    input_parser.add_option(
+        option_string="--colormap",
+        type=str,
+        help="Colormap to visualize 2D reconstructions.",
+        default="Greys_r")
+    input_parser.add_reference(required=False)
+    input_parser.add_reference_mask()
+    input_parser.add_option(
+        option_string="--show-reconstructions",
+        type=int,
+        help="Turn on/off visualization of reconstructions",
+        default=1)
+
+    args = input_parser.parse_args()
+    input_parser.print_arguments(args)
+
+    if ph.file_exists(get_path_to_results_store(
+            args.dir_input, args.study_name)):
+        parameter_study_reader = ReaderParameterStudyResultsStore(
+            directory=args.dir_input, name=args.study_name)
+    else:
+        ph.print_info("No results store found. Read text files ... ")
+        parameter_study_reader = ReaderParameterStudy(
+            directory=args.dir_input, name=args.study_name)
+    parameter_study_reader.read_study()
+
+    parameters_dic = parameter_study_reader.get_parameters()
+
+    # Get lines in result files associated to varying 'alpha'
+    lines = []
+    if len(parameters_dic.keys()) == 1:
+        lines.append(
+            parameter_study_reader.get_lines_to_parameters(parameters_dic))
+    else:
+        for k in parameters_dic.keys():
+            if k == "alpha":
+                continue
+            for val in parameters_dic[k]:
+                p = {"alpha": parameters_dic["alpha"]}
+                p[k] = val
+                lines.append(parameter_study_reader.get_lines_to_parameters(p))
+
+    show_ps.show_L_curve(
+        parameter_study_reader, lines, args.dir_output_figures)
+    show_ps.show_measures(
+        parameter_study_reader, lines, args.dir_output_figures)
+
+    if args.show_reconstructions:
+        show_ps.show_reconstructions(
+            parameter_study_reader,
+            lines,
+            args.dir_output_figures,
+            colormap=args.colormap,
+            reference=args.reference,
+            reference_mask=args.reference_mask)
+
+    return 0
+
+
+if __name__ == '__main__':
+    main()
@@ -30,6 +30,7 @@ def main():
     input_parser.add_output(required=True)
     input_parser.add_dir_input_mc()
     input_parser.add_slice_thicknesses()
+    input_parser.add_n_processes(default=1)
     input_parser.add_verbose(default=0)
 
     args = input_parser.parse_args()
@@ -47,6 +48,7 @@ def main():
     slice_coverage = sc.SliceCoverage(
         stacks=stacks,
         reconstruction_sitk=reconstruction_space_sitk,
+        n_processes=args.n_processes,
     )
     slice_coverage.run()
 
@@ -19,6 +19,7 @@ import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
 import niftymic.base.stack as st
+import niftymic.base.stack_transforms as stt
 import niftymic.base.exceptions as exceptions
 import niftymic.utilities.motion_updater as mu
 from niftymic.definitions import ALLOWED_EXTENSIONS
@@ -504,6 +505,9 @@ class TransformationDataReader(DataReader):
 ##
 # Reads slice transformations stored in the format 'filename_slice#.tfm'.
 #
+# Slice transformations stored in a single 'filename.npz' file (see
+# StackTransforms) are read too and take precedence over *.tfm files.
+#
 # Rationale: Read only slice transformations associated with
 # 'motion_correction' export achieved by the volumetric reconstruction
 # algorithm
@@ -539,6 +543,15 @@ class SliceTransformationDirectoryReader(TransformationDataReader):
             self._transforms_sitk[fname][slice_number] = \
                 self._get_sitk_transform_from_filepath(path)
 
+        p = re.compile("(" + REGEX_FILENAMES + ")[.]npz")
+        for f in os.listdir(directory):
+            if not p.match(f):
+                continue
+            stack_transforms = stt.StackTransforms.from_filename(
+                os.path.join(directory, f))
+            self._transforms_sitk[p.match(f).group(1)] = \
+                stack_transforms.get_slice_motion_correction_transforms()
+
 
 ##
 # Reads all transformations in a given directory and stores them in an ordered
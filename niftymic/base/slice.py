@@ -20,8 +20,15 @@ from niftymic.definitions import VIEWER
 
 # In addition to the nifti-image as being stored as sitk.Image for a single
 #  3D slice \f$ \in R^3 \times R^3 \times 1\f$ the class Slice
-#  also contains additional variables helpful to work with the data
-class Slice:
+#  also contains additional variables helpful to work with the data.
+#  As for Stack, a missing mask is represented by an implicit unity mask which
+#  only gets materialized if sitk_mask/itk_mask are accessed explicitly.
+class Slice(object):
+
+    def __init__(self):
+        self._is_unity_mask = True
+        self._sitk_mask = None
+        self._itk_mask = None
 
     # Create Slice instance with additional information to actual slice
     #  \param[in] slice_sitk 3D slice in \R x \R x 1, sitk.Image object
@@ -65,9 +72,6 @@ class Slice:
                     "Given image and its mask do not occupy the same space: %s" %
                     e.message)
             slice.itk_mask = sitkh.get_itk_from_sitk_image(slice.sitk_mask)
-        else:
-            slice.sitk_mask = slice._generate_identity_mask()
-            slice.itk_mask = sitkh.get_itk_from_sitk_image(slice.sitk_mask)
 
         # slice._sitk_upsampled = None
 
@@ -133,10 +137,9 @@ class Slice:
 
         # Append masks (if provided)
         if file_path_mask is None:
-            slice.sitk_mask = slice._generate_identity_mask()
             if verbose:
                 ph.print_info(
-                    "Identity mask created for '%s'." % (file_path))
+                    "Unity mask assumed for '%s'." % (file_path))
 
         else:
             if not ph.file_exists(file_path_mask):
@@ -150,8 +153,7 @@ class Slice:
                 raise IOError(
                     "Given image and its mask do not occupy the same space: %s" %
                     e.message)
-
-        slice.itk_mask = sitkh.get_itk_from_sitk_image(slice.sitk_mask)
+            slice.itk_mask = sitkh.get_itk_from_sitk_image(slice.sitk_mask)
 
         # Store current affine transform of image
         slice._affine_transform_sitk = sitkh.get_sitk_affine_transform_from_sitk_image(
@@ -170,10 +172,13 @@ class Slice:
 
     # Copy constructor
     #  \param[in] slice_to_copy Slice object to be copied
+    #  \param[in] slice_sitk If given, the image data of the copied slice
+    #                        are replaced by the ones of this sitk.Image
+    #                        object (position in physical space is kept)
     #  \return copied Slice object
     # TODO: That's not really well done!
     @classmethod
-    def from_slice(cls, slice_to_copy):
+    def from_slice(cls, slice_to_copy, slice_sitk=None):
         slice = cls()
 
         if not isinstance(slice_to_copy, Slice):
@@ -181,11 +186,16 @@ class Slice:
                              type(slice_to_copy))
 
         # Copy image slice and mask
-        slice.sitk = sitk.Image(slice_to_copy.sitk)
+        if slice_sitk is None:
+            slice.sitk = sitk.Image(slice_to_copy.sitk)
+        else:
+            slice.sitk = sitk.Image(slice_sitk)
+            slice.sitk.CopyInformation(slice_to_copy.sitk)
         slice.itk = sitkh.get_itk_from_sitk_image(slice.sitk)
 
-        slice.sitk_mask = sitk.Image(slice_to_copy.sitk_mask)
-        slice.itk_mask = sitkh.get_itk_from_sitk_image(slice.sitk_mask)
+        if not slice_to_copy.is_unity_mask():
+            slice.sitk_mask = sitk.Image(slice_to_copy.sitk_mask)
+            slice.itk_mask = sitkh.get_itk_from_sitk_image(slice.sitk_mask)
 
         slice._filename = slice_to_copy.get_filename()
         slice._slice_number = slice_to_copy.get_slice_number()
@@ -309,6 +319,41 @@ class Slice:
         self._history_affine_transforms = [a for a in registration_history[0]]
         self._history_motion_corrections = [t for t in registration_history[1]]
 
+    def is_unity_mask(self):
+        return self._is_unity_mask
+
+    ##
+    # Mask of slice as sitk.Image object. In case of a unity mask, the image
+    # gets only generated (and cached) when accessed.
+    # \date       2026-10-18 11:02:37+0000
+    #
+    @property
+    def sitk_mask(self):
+        if self._sitk_mask is None:
+            self._sitk_mask = self._generate_identity_mask()
+        return self._sitk_mask
+
+    ##
+    # Set mask of slice. Setting it to None resets it to an implicit unity
+    # mask.
+    # \date       2026-10-18 11:02:37+0000
+    #
+    @sitk_mask.setter
+    def sitk_mask(self, sitk_mask):
+        self._sitk_mask = sitk_mask
+        self._itk_mask = None
+        self._is_unity_mask = sitk_mask is None
+
+    @property
+    def itk_mask(self):
+        if self._itk_mask is None:
+            self._itk_mask = sitkh.get_itk_from_sitk_image(self.sitk_mask)
+        return self._itk_mask
+
+    @itk_mask.setter
+    def itk_mask(self, itk_mask):
+        self._itk_mask = itk_mask
+
     # Display slice with external viewer (ITK-Snap)
     #  \param[in] show_segmentation display slice with or without associated segmentation (default=0)
     def show(self, show_segmentation=0, label=None, viewer=VIEWER, verbose=True):
@@ -361,7 +406,7 @@ class Slice:
                 self.sitk, "%s.nii.gz" % full_file_name, verbose=False)
 
             # Write mask to specified location if given
-            if self.sitk_mask is not None:
+            if not self._is_unity_mask:
                 nda = sitk.GetArrayFromImage(self.sitk_mask)
 
                 # Write mask if it does not consist of only ones
@@ -418,13 +463,14 @@ class Slice:
         self.itk.SetOrigin(origin)
         self.itk.SetDirection(sitkh.get_itk_from_sitk_direction(direction))
 
-        # Update image mask objects
-        if self.sitk_mask is not None:
-            self.sitk_mask.SetOrigin(origin)
-            self.sitk_mask.SetDirection(direction)
+        # Update image mask objects (only if materialized)
+        if self._sitk_mask is not None:
+            self._sitk_mask.SetOrigin(origin)
+            self._sitk_mask.SetDirection(direction)
 
-            self.itk_mask.SetOrigin(origin)
-            self.itk_mask.SetDirection(
+        if self._itk_mask is not None:
+            self._itk_mask.SetOrigin(origin)
+            self._itk_mask.SetDirection(
                 sitkh.get_itk_from_sitk_direction(direction))
 
     # ## Upsample slices in k-direction to in-plane resolution.
@@ -462,7 +508,7 @@ class Slice:
     # Create a binary mask consisting of ones
     #  \return binary_mask as sitk.Image object consisting of ones
     def _generate_identity_mask(self):
-        shape = sitk.GetArrayFromImage(self.sitk).shape
+        shape = self.sitk.GetSize()[::-1]
         nda = np.ones(shape, dtype=np.uint8)
 
         binary_mask = sitk.GetImageFromArray(nda)
@@ -19,6 +19,7 @@ import simplereg.resampler
 import niftymic.base.slice as sl
 import niftymic.base.exceptions as exceptions
 import niftymic.base.data_writer as dw
+import niftymic.base.stack_transforms as stt
 
 from niftymic.definitions import ALLOWED_EXTENSIONS, VIEWER
 
@@ -27,10 +28,17 @@ from niftymic.definitions import ALLOWED_EXTENSIONS, VIEWER
 # In addition to the nifti-image (stored as sitk.Image object) this class Stack
 # also contains additional variables helpful to work with the data.
 #
-class Stack:
+# If no mask is given, the stack is associated with an implicit unity mask,
+# i.e. a mask consisting of ones only. It is only materialized as image in
+# case sitk_mask/itk_mask are accessed explicitly. Masking operations shall
+# check is_unity_mask() first so as to avoid this.
+#
+class Stack(object):
 
     def __init__(self):
         self._is_unity_mask = True
+        self._sitk_mask = None
+        self._itk_mask = None
         self._deleted_slices = []
         self._history_affine_transforms = []
         self._history_motion_corrections = []
@@ -80,12 +88,11 @@ class Stack:
         else:
             stack._slice_thickness = slice_thickness
 
-        # Append masks (either provided or binary mask)
+        # Append masks (either provided or implicit unity mask)
         if file_path_mask is None:
-            stack.sitk_mask = stack._generate_identity_mask()
             if verbose:
                 ph.print_info(
-                    "Identity mask created for '%s'." % (file_path))
+                    "Unity mask assumed for '%s'." % (file_path))
 
         else:
             if not ph.file_exists(file_path_mask):
@@ -99,10 +106,7 @@ class Stack:
                 raise IOError(
                     "Given image and its mask do not occupy the same space: %s" %
                     e.message)
-            stack._is_unity_mask = False
-
-        # Append itk object
-        stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
+            stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
 
         # Store current affine transform of image
         stack._affine_transform_sitk = sitkh.get_sitk_affine_transform_from_sitk_image(
@@ -188,7 +192,7 @@ class Stack:
         else:
             stack._slice_thickness = slice_thickness
 
-        # Append masks (either provided or binary mask)
+        # Append masks (either provided or implicit unity mask)
         if suffix_mask is not None and \
             os.path.isfile(dir_input +
                            prefix_stack + suffix_mask + ".nii.gz"):
@@ -196,11 +200,6 @@ class Stack:
                 dir_input + prefix_stack + suffix_mask + ".nii.gz",
                 sitk.sitkUInt8)
             stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
-            stack._is_unity_mask = False
-        else:
-            stack.sitk_mask = stack._generate_identity_mask()
-            stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
-            stack._is_unity_mask = True
 
         # Get slices
         if dic_slice_filenames is None:
@@ -283,25 +282,19 @@ class Stack:
         stack._filename = filename
         stack._dir = None
 
-        # Append masks (if provided)
+        # Append masks (if provided and not consisting of ones only)
         if image_sitk_mask is not None:
-            stack.sitk_mask = image_sitk_mask
             try:
                 # ensure mask occupies the same physical space
-                stack.sitk_mask.CopyInformation(stack.sitk)
+                image_sitk_mask.CopyInformation(stack.sitk)
             except RuntimeError as e:
                 raise IOError(
                     "Given image and its mask do not occupy the same space: %s" %
                     e.message)
-            stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
-            if sitk.GetArrayFromImage(stack.sitk_mask).prod() == 1:
-                stack._is_unity_mask = True
-            else:
-                stack._is_unity_mask = False
-        else:
-            stack.sitk_mask = stack._generate_identity_mask()
-            stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
-            stack._is_unity_mask = True
+            if sitk.GetArrayFromImage(image_sitk_mask).prod() != 1:
+                stack.sitk_mask = image_sitk_mask
+                stack.itk_mask = sitkh.get_itk_from_sitk_image(
+                    stack.sitk_mask)
 
         # Extract all slices and their masks from the stack and store them
         if extract_slices:
@@ -333,11 +326,16 @@ class Stack:
     # \param      cls            The cls
     # \param      stack_to_copy  Stack object to be copied
     # \param      filename       The filename
+    # \param      image_sitk     If given, the image data of the copied stack
+    #                            and its slices are replaced by the ones of
+    #                            this sitk.Image object (same grid as
+    #                            stack_to_copy); slice positions and
+    #                            registration histories are kept
     #
     # \return     copied Stack object TODO: That's not really well done
     #
     @classmethod
-    def from_stack(cls, stack_to_copy, filename=None):
+    def from_stack(cls, stack_to_copy, filename=None, image_sitk=None):
         stack = cls()
 
         if not isinstance(stack_to_copy, Stack):
@@ -345,14 +343,21 @@ class Stack:
                              type(stack_to_copy))
 
         # Copy image stack and mask
-        stack.sitk = sitk.Image(stack_to_copy.sitk)
+        if image_sitk is None:
+            stack.sitk = sitk.Image(stack_to_copy.sitk)
+        else:
+            if image_sitk.GetSize() != stack_to_copy.sitk.GetSize():
+                raise ValueError(
+                    "Given image and stack do not have the same size")
+            stack.sitk = sitk.Image(image_sitk)
+            stack.sitk.CopyInformation(stack_to_copy.sitk)
         stack.itk = sitkh.get_itk_from_sitk_image(stack.sitk)
 
         stack._slice_thickness = stack_to_copy.get_slice_thickness()
 
-        stack.sitk_mask = sitk.Image(stack_to_copy.sitk_mask)
-        stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
-        stack._is_unity_mask = stack_to_copy.is_unity_mask()
+        if not stack_to_copy.is_unity_mask():
+            stack.sitk_mask = sitk.Image(stack_to_copy.sitk_mask)
+            stack.itk_mask = sitkh.get_itk_from_sitk_image(stack.sitk_mask)
 
         if filename is None:
             stack._filename = stack_to_copy.get_filename()
@@ -372,8 +377,21 @@ class Stack:
             stack._slices = [None] * stack._N_slices
             slices_to_copy = stack_to_copy.get_slices()
 
+            # Slice numbers refer to the slice index within the image volume
+            # (up to an offset in case the first slices were deleted)
+            if image_sitk is not None:
+                slice_number_offset = np.min(
+                    [s.get_slice_number() for s in slices_to_copy] +
+                    stack_to_copy.get_deleted_slice_numbers())
+
             for j, slice_j in enumerate(slices_to_copy):
-                stack._slices[j] = sl.Slice.from_slice(slice_j)
+                if image_sitk is None:
+                    slice_sitk = None
+                else:
+                    k = int(slice_j.get_slice_number() - slice_number_offset)
+                    slice_sitk = image_sitk[:, :, k:k + 1]
+                stack._slices[j] = sl.Slice.from_slice(
+                    slice_j, slice_sitk=slice_sitk)
         else:
             stack._N_slices = 0
             stack._slices = None
@@ -526,6 +544,38 @@ class Stack:
     def is_unity_mask(self):
         return self._is_unity_mask
 
+    ##
+    # Mask of stack as sitk.Image object. In case of a unity mask, the image
+    # gets only generated (and cached) when accessed.
+    # \date       2026-10-18 11:02:37+0000
+    #
+    @property
+    def sitk_mask(self):
+        if self._sitk_mask is None:
+            self._sitk_mask = self._generate_identity_mask()
+        return self._sitk_mask
+
+    ##
+    # Set mask of stack. Setting it to None resets it to an implicit unity
+    # mask.
+    # \date       2026-10-18 11:02:37+0000
+    #
+    @sitk_mask.setter
+    def sitk_mask(self, sitk_mask):
+        self._sitk_mask = sitk_mask
+        self._itk_mask = None
+        self._is_unity_mask = sitk_mask is None
+
+    @property
+    def itk_mask(self):
+        if self._itk_mask is None:
+            self._itk_mask = sitkh.get_itk_from_sitk_image(self.sitk_mask)
+        return self._itk_mask
+
+    @itk_mask.setter
+    def itk_mask(self, itk_mask):
+        self._itk_mask = itk_mask
+
     # Display stack with external viewer (ITK-Snap)
     #  \param[in][in] show_segmentation display stack with or without associated segmentation (default=0)
     def show(self, show_segmentation=0, label=None, viewer=VIEWER, verbose=True):
@@ -555,6 +605,8 @@ class Stack:
     #  \param[in] directory string specifying where the output will be written to (default="/tmp/")
     #  \param[in] filename string specifying the filename. If not given the assigned one within Stack will be chosen.
     #  \param[in] write_slices boolean indicating whether each Slice of the stack shall be written (default=False)
+    #  \param[in] transforms_format either "tfm" (one sitk transform file for stack and each slice) or "npz" (single
+    #             array-backed file holding the entire registration history of stack and its slices)
     def write(self,
               directory,
               filename=None,
@@ -564,8 +616,12 @@ class Stack:
               write_transforms=False,
               suffix_mask="_mask",
               write_transforms_history=False,
+              transforms_format="tfm",
               ):
 
+        if transforms_format not in ["tfm", "npz"]:
+            raise ValueError("transforms_format must be either 'tfm' or 'npz'")
+
         # Create directory if not existing
         ph.create_directory(directory)
 
@@ -579,14 +635,21 @@ class Stack:
         if write_stack:
             dw.DataWriter.write_image(self.sitk, "%s.nii.gz" % full_file_name)
 
-        # Write mask to specified location if given
-        if self.sitk_mask is not None:
-            # nda = sitk.GetArrayFromImage(self.sitk_mask)
-
-            # Write mask if it does not consist of only ones
-            if not self._is_unity_mask and write_mask:
-                dw.DataWriter.write_mask(
-                    self.sitk_mask, "%s%s.nii.gz" % (full_file_name, suffix_mask))
+        # Write mask if it does not consist of only ones
+        if not self._is_unity_mask and write_mask:
+            dw.DataWriter.write_mask(
+                self.sitk_mask, "%s%s.nii.gz" % (full_file_name, suffix_mask))
+
+        # Write registration history of stack and all its slices to one file
+        if write_transforms and transforms_format == "npz":
+            path_to_transforms = os.path.join(
+                directory, self.get_filename() + ".npz")
+            ph.print_info("Write %s slice transforms to %s ... " % (
+                self.get_filename(), path_to_transforms), newline=False)
+            stt.StackTransforms.from_stack(self).write(path_to_transforms)
+            print("done")
+            write_transforms = False
+            write_transforms_history = False
 
         if write_transforms:
             stack_transform_sitk = self._history_motion_corrections[-1]
@@ -704,15 +767,18 @@ class Stack:
         self.sitk.SetOrigin(origin)
         self.sitk.SetDirection(direction)
 
-        self.sitk_mask.SetOrigin(origin)
-        self.sitk_mask.SetDirection(direction)
-
         self.itk.SetOrigin(origin)
         self.itk.SetDirection(sitkh.get_itk_from_sitk_direction(direction))
 
-        self.itk_mask.SetOrigin(origin)
-        self.itk_mask.SetDirection(
-            sitkh.get_itk_from_sitk_direction(direction))
+        # Update image mask objects (only if materialized)
+        if self._sitk_mask is not None:
+            self._sitk_mask.SetOrigin(origin)
+            self._sitk_mask.SetDirection(direction)
+
+        if self._itk_mask is not None:
+            self._itk_mask.SetOrigin(origin)
+            self._itk_mask.SetDirection(
+                sitkh.get_itk_from_sitk_direction(direction))
 
     ##
     #       Gets the resampled stack from slices.
@@ -928,11 +994,15 @@ class Stack:
     def get_stack_multiplied_with_mask(self, filename=None, mask_sitk=None):
 
         if mask_sitk is None:
-            mask_sitk = self.sitk_mask
+            if self._is_unity_mask:
+                image_sitk = sitk.Image(self.sitk)
+            else:
+                mask_sitk = self.sitk_mask
 
         # Multiply stack with its mask
-        image_sitk = self.sitk * \
-            sitk.Cast(mask_sitk, self.sitk.GetPixelIDValue())
+        if mask_sitk is not None:
+            image_sitk = self.sitk * \
+                sitk.Cast(mask_sitk, self.sitk.GetPixelIDValue())
 
         if filename is None:
             filename = self.get_filename()
@@ -1244,13 +1314,17 @@ class Stack:
                 "slice_numbers must correspond to the number of slices "
                 "of the image volume")
 
-        # Extract slices and add masks
+        # Extract slices and add masks (unity masks are kept implicit)
         for i in range(0, self._N_slices):
+            if self._is_unity_mask:
+                slice_sitk_mask = None
+            else:
+                slice_sitk_mask = self.sitk_mask[:, :, i:i + 1]
             slices[i] = sl.Slice.from_sitk_image(
                 slice_sitk=self.sitk[:, :, i:i + 1],
                 filename=self._filename,
                 slice_number=slice_numbers[i],
-                slice_sitk_mask=self.sitk_mask[:, :, i:i + 1],
+                slice_sitk_mask=slice_sitk_mask,
                 slice_thickness=slice_thickness,
             )
 
@@ -1259,7 +1333,7 @@ class Stack:
     # Create a binary mask consisting of ones
     #  \return binary_mask as sitk.Image object consisting of ones
     def _generate_identity_mask(self):
-        shape = sitk.GetArrayFromImage(self.sitk).shape
+        shape = self.sitk.GetSize()[::-1]
         nda = np.ones(shape, dtype=np.uint8)
 
         binary_mask = sitk.GetImageFromArray(nda)
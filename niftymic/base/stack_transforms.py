@@ -0,0 +1,291 @@
+##
+# \file stack_transforms.py
+# \brief      Array-backed representation of the registration history of a
+#             stack and all its slices.
+#
+# It allows storing all stack and slice transformations in a single
+# compressed NumPy archive (*.npz) per stack instead of one *.tfm file per
+# slice.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+import pysitk.simple_itk_helper as sitkh
+
+
+##
+# Registration history of a stack and its slices.
+#
+# Each transform is represented by a row holding its matrix (9), translation
+# (3) and center (3). Slice histories are concatenated and split according to
+# their respective lengths.
+# \date       2026-10-18 13:02:11+0000
+#
+class StackTransforms(object):
+
+    # Keys of arrays that define the registration history
+    _keys = [
+        "stack_affine_transforms",
+        "stack_motion_corrections",
+        "slice_numbers",
+        "deleted_slices",
+        "slice_affine_transforms",
+        "slice_affine_transforms_lengths",
+        "slice_motion_corrections",
+        "slice_motion_corrections_lengths",
+    ]
+
+    ##
+    # Store arrays defining the registration history
+    # \date       2026-10-18 13:02:45+0000
+    #
+    # \param      self      The object
+    # \param      filename  Filename of associated stack, string
+    # \param      data      Dictionary holding the arrays as specified by
+    #                       _keys
+    #
+    def __init__(self, filename, data):
+        self._filename = filename
+        self._data = data
+
+    ##
+    # Create registration history representation from Stack object
+    # \date       2026-10-18 13:03:22+0000
+    #
+    # \param      cls    The cls
+    # \param      stack  Stack object
+    #
+    # \return     StackTransforms object
+    #
+    @classmethod
+    def from_stack(cls, stack):
+        data = {}
+
+        affine_transforms, motion_corrections = \
+            stack.get_registration_history()
+        data["stack_affine_transforms"] = \
+            cls.get_transforms_nda(affine_transforms)
+        data["stack_motion_corrections"] = \
+            cls.get_transforms_nda(motion_corrections)
+        data["deleted_slices"] = np.array(
+            stack.get_deleted_slice_numbers(), dtype=int)
+
+        slices = stack.get_slices()
+        data["slice_numbers"] = np.array(
+            [s.get_slice_number() for s in slices], dtype=int)
+
+        histories = [s.get_registration_history() for s in slices]
+        for i, name in enumerate(
+                ["slice_affine_transforms", "slice_motion_corrections"]):
+            transforms_nda = [cls.get_transforms_nda(h[i]) for h in histories]
+            data[name] = np.concatenate(
+                [np.zeros((0, 15))] + transforms_nda)
+            data[name + "_lengths"] = np.array(
+                [t.shape[0] for t in transforms_nda], dtype=int)
+
+        return cls(stack.get_filename(), data)
+
+    ##
+    # Create registration history representation from dictionary, e.g. as
+    # read from a NumPy archive
+    # \date       2026-10-18 13:04:10+0000
+    #
+    # \param      cls     The cls
+    # \param      data    Dictionary holding (at least) the arrays specified
+    #                     by _keys and 'filename' with added prefix
+    # \param      prefix  Prefix of keys, string
+    #
+    # \return     StackTransforms object
+    #
+    @classmethod
+    def from_dictionary(cls, data, prefix=""):
+        return cls(
+            str(data[prefix + "filename"]),
+            {k: np.array(data[prefix + k]) for k in cls._keys})
+
+    ##
+    # Read registration history representation from NumPy archive
+    # \date       2026-10-18 13:04:38+0000
+    #
+    # \param      cls           The cls
+    # \param      path_to_file  Path to *.npz file, string
+    #
+    # \return     StackTransforms object
+    #
+    @classmethod
+    def from_filename(cls, path_to_file):
+        if not ph.file_exists(path_to_file):
+            raise IOError("File '%s' does not exist" % path_to_file)
+        with np.load(path_to_file) as data:
+            return cls.from_dictionary(data)
+
+    ##
+    # Gets the dictionary representation of the registration history.
+    # \date       2026-10-18 13:05:02+0000
+    #
+    # \param      self    The object
+    # \param      prefix  Prefix to be added to each key, string
+    #
+    # \return     Dictionary of numpy arrays
+    #
+    def get_dictionary(self, prefix=""):
+        data = {prefix + k: v for k, v in self._data.items()}
+        data[prefix + "filename"] = np.array(self._filename)
+        return data
+
+    ##
+    # Writes the registration history as compressed NumPy archive
+    # \date       2026-10-18 13:05:27+0000
+    #
+    # \param      self          The object
+    # \param      path_to_file  Path to *.npz file, string
+    #
+    def write(self, path_to_file):
+        ph.create_directory(os.path.dirname(path_to_file))
+        np.savez_compressed(path_to_file, **self.get_dictionary())
+
+    def get_filename(self):
+        return self._filename
+
+    def get_slice_numbers(self):
+        return [int(i) for i in self._data["slice_numbers"]]
+
+    def get_deleted_slice_numbers(self):
+        return [int(i) for i in self._data["deleted_slices"]]
+
+    # Get history of affine transforms and motion corrections of stack
+    #  \return list of sitk.AffineTransform objects
+    def get_stack_registration_history(self):
+        return (
+            self.get_transforms_sitk(self._data["stack_affine_transforms"]),
+            self.get_transforms_sitk(self._data["stack_motion_corrections"]),
+        )
+
+    def get_stack_motion_correction_transform(self):
+        return self.get_transforms_sitk(
+            self._data["stack_motion_corrections"][-1:])[0]
+
+    ##
+    # Gets the registration histories of all slices.
+    # \date       2026-10-18 13:06:01+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary slice number -> (affine transforms, motion
+    #             corrections) as lists of sitk.AffineTransform objects
+    #
+    def get_slice_registration_histories(self):
+        affine_transforms = self._split(
+            self._data["slice_affine_transforms"],
+            self._data["slice_affine_transforms_lengths"])
+        motion_corrections = self._split(
+            self._data["slice_motion_corrections"],
+            self._data["slice_motion_corrections_lengths"])
+        return {
+            slice_number: (
+                self.get_transforms_sitk(affine_transforms[i]),
+                self.get_transforms_sitk(motion_corrections[i]),
+            )
+            for i, slice_number in enumerate(self.get_slice_numbers())
+        }
+
+    ##
+    # Gets the latest motion correction transforms of all slices, i.e. the
+    # transforms otherwise written to filename_slice#.tfm files.
+    # \date       2026-10-18 13:06:37+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary slice number -> sitk.AffineTransform
+    #
+    def get_slice_motion_correction_transforms(self):
+        indices = np.cumsum(self._data["slice_motion_corrections_lengths"]) - 1
+        transforms_sitk = self.get_transforms_sitk(
+            self._data["slice_motion_corrections"][indices])
+        return dict(zip(self.get_slice_numbers(), transforms_sitk))
+
+    ##
+    # Compose the latest motion corrections of stack and all its slices with
+    # given transform, i.e. same as Stack.update_motion_correction in terms
+    # of motion correction history
+    # \date       2026-10-18 13:07:15+0000
+    #
+    # \param      self                   The object
+    # \param      affine_transform_sitk  The affine transform sitk
+    #
+    def update_motion_correction(self, affine_transform_sitk):
+        transform_nda = self.get_transforms_nda([affine_transform_sitk])
+
+        stack_motion_corrections = self._data["stack_motion_corrections"]
+        self._data["stack_motion_corrections"] = np.concatenate((
+            stack_motion_corrections,
+            self._get_composite_transforms_nda(
+                transform_nda, stack_motion_corrections[-1:])))
+
+        motion_corrections = self._split(
+            self._data["slice_motion_corrections"],
+            self._data["slice_motion_corrections_lengths"])
+        motion_corrections = [
+            np.concatenate((m, self._get_composite_transforms_nda(
+                transform_nda, m[-1:])))
+            for m in motion_corrections
+        ]
+        self._data["slice_motion_corrections"] = np.concatenate(
+            [np.zeros((0, 15))] + motion_corrections)
+        self._data["slice_motion_corrections_lengths"] += 1
+
+    ##
+    # Gets the array representation of transforms.
+    # \date       2026-10-18 13:08:02+0000
+    #
+    # \param      transforms_sitk  List of sitk.AffineTransform or
+    #                              sitk.Euler3DTransform objects
+    #
+    # \return     (N x 15)-numpy array; each row holds matrix (9),
+    #             translation (3) and center (3)
+    #
+    @staticmethod
+    def get_transforms_nda(transforms_sitk):
+        return np.array([
+            np.concatenate((t.GetMatrix(), t.GetTranslation(), t.GetCenter()))
+            for t in transforms_sitk
+        ], dtype=np.float64).reshape(-1, 15)
+
+    ##
+    # Gets the transforms from their array representation.
+    # \date       2026-10-18 13:08:31+0000
+    #
+    # \param      transforms_nda  (N x 15)-numpy array
+    #
+    # \return     List of sitk.AffineTransform objects
+    #
+    @staticmethod
+    def get_transforms_sitk(transforms_nda):
+        transforms_sitk = []
+        for row in transforms_nda:
+            transform_sitk = sitk.AffineTransform(3)
+            transform_sitk.SetMatrix(row[0:9])
+            transform_sitk.SetTranslation(row[9:12])
+            transform_sitk.SetCenter(row[12:15])
+            transforms_sitk.append(transform_sitk)
+        return transforms_sitk
+
+    @staticmethod
+    def _split(transforms_nda, lengths):
+        if len(lengths) == 0:
+            return []
+        return np.split(transforms_nda, np.cumsum(lengths)[:-1])
+
+    @classmethod
+    def _get_composite_transforms_nda(cls, transform_outer, transform_inner):
+        return cls.get_transforms_nda([
+            sitkh.get_composite_sitk_affine_transform(
+                cls.get_transforms_sitk(transform_outer)[0],
+                cls.get_transforms_sitk(transform_inner)[0])
+        ])
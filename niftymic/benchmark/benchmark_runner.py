@@ -0,0 +1,315 @@
+##
+# \file benchmark_runner.py
+# \brief      Run benchmarks for several problem sizes and report wall time,
+#             peak memory and scaling behaviour in JSON format.
+#
+# Each benchmark and problem size is executed in a freshly spawned process
+# so that the peak resident set size (RSS) is not affected by previous runs.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import sys
+import json
+import timeit
+import platform
+import itertools
+import multiprocessing
+
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+from niftymic.benchmark.benchmarks import BENCHMARKS
+from niftymic.benchmark.synthetic_data import SyntheticData
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Predefined problem sizes
+SIZES = {
+    "small": {"n_stacks": 3, "n_slices": 16, "hr_size": 48},
+    "medium": {"n_stacks": 3, "n_slices": 32, "hr_size": 96},
+    "large": {"n_stacks": 6, "n_slices": 48, "hr_size": 128},
+}
+
+# Problem size parameters
+SIZE_PARAMETERS = ["n_stacks", "n_slices", "hr_size"]
+
+
+##
+# Class to run benchmarks and to compare their results against a baseline
+# \date       2026-10-18 18:18:11+0000
+#
+class BenchmarkRunner(object):
+
+    ##
+    # Store benchmark settings
+    # \date       2026-10-18 18:18:40+0000
+    #
+    # \param      self              The object
+    # \param      benchmarks        Names of benchmarks as given in BENCHMARKS,
+    #                               list of strings
+    # \param      sizes             Problem sizes, list of dictionaries with
+    #                               keys 'n_stacks', 'n_slices', 'hr_size'
+    # \param      repeats           Number of timed executions per benchmark
+    #                               and problem size, int
+    # \param      interpolator      Interpolator to simulate slice acquisition
+    # \param      seed              Seed for synthetic data, int
+    # \param      use_subprocesses  Run each benchmark and problem size in a
+    #                               spawned process, bool
+    # \param      verbose           Verbose output, bool
+    #
+    def __init__(self,
+                 benchmarks=sorted(BENCHMARKS.keys()),
+                 sizes=[SIZES["small"]],
+                 repeats=3,
+                 interpolator="Linear",
+                 seed=0,
+                 use_subprocesses=True,
+                 verbose=True,
+                 ):
+        for benchmark in benchmarks:
+            if benchmark not in BENCHMARKS.keys():
+                raise ValueError("Benchmark '%s' not known. Options: %s" % (
+                    benchmark, ", ".join(sorted(BENCHMARKS.keys()))))
+
+        self._benchmarks = benchmarks
+        self._sizes = sizes
+        self._repeats = repeats
+        self._interpolator = interpolator
+        self._seed = seed
+        self._use_subprocesses = use_subprocesses
+        self._verbose = verbose
+
+        self._results = None
+
+    ##
+    # Gets the benchmark results.
+    # \date       2026-10-18 18:19:21+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary with keys 'info' (machine and software
+    #             information), 'results' (one record per benchmark and
+    #             problem size) and 'scaling' (fitted exponents of wall time
+    #             w.r.t. each problem size parameter)
+    #
+    def get_results(self):
+        if self._results is None:
+            raise RuntimeError("Execute 'run' first")
+        return self._results
+
+    def write_results(self, path_to_file):
+        ph.write_to_file(
+            path_to_file,
+            json.dumps(self.get_results(), indent=2, sort_keys=True),
+            access_mode="w",
+            verbose=self._verbose)
+
+    def run(self):
+        records = []
+        for benchmark, size in itertools.product(
+                self._benchmarks, self._sizes):
+            if self._verbose:
+                ph.print_info("Benchmark '%s' (%s) ... " % (
+                    benchmark, ", ".join(
+                        "%s=%d" % (k, size[k]) for k in SIZE_PARAMETERS)))
+
+            benchmark_input = (
+                benchmark, size, self._repeats, self._interpolator,
+                self._seed)
+            record = self._run_benchmark(benchmark_input)
+            records.append(record)
+
+            if self._verbose:
+                ph.print_info(
+                    "Benchmark '%s': wall time %.3fs (min), "
+                    "peak RSS %.1f MB" % (
+                        benchmark, record["wall_time_min"],
+                        record["peak_rss_mb"] or np.nan))
+
+        self._results = {
+            "info": self._get_info(),
+            "results": records,
+            "scaling": self._get_scaling(records),
+        }
+
+    ##
+    # Compare benchmark results against a previous run.
+    # \date       2026-10-18 18:20:02+0000
+    #
+    # \param      self              The object
+    # \param      path_to_baseline  Path to JSON file written by
+    #                               write_results, string
+    # \param      tolerance         Relative increase of minimal wall time
+    #                               tolerated, float
+    #
+    # \return     List of dictionaries describing each regression
+    #
+    def get_regressions(self, path_to_baseline, tolerance=0.2):
+        with open(path_to_baseline) as json_file:
+            baseline = json.load(json_file)
+
+        baseline_records = {
+            self._get_record_key(r): r for r in baseline["results"]}
+
+        regressions = []
+        for record in self.get_results()["results"]:
+            key = self._get_record_key(record)
+            if key not in baseline_records:
+                continue
+            ratio = record["wall_time_min"] / \
+                max(baseline_records[key]["wall_time_min"], 1e-9)
+            if ratio > 1 + tolerance:
+                regression = {k: record[k]
+                              for k in ["benchmark"] + SIZE_PARAMETERS}
+                regression["wall_time_min"] = record["wall_time_min"]
+                regression["wall_time_min_baseline"] = \
+                    baseline_records[key]["wall_time_min"]
+                regression["ratio"] = ratio
+                regressions.append(regression)
+
+        return regressions
+
+    def _run_benchmark(self, benchmark_input):
+        if self._use_subprocesses:
+            try:
+                context = multiprocessing.get_context("spawn")
+            except AttributeError:
+                # Python 2: spawn not available
+                context = None
+            if context is not None:
+                pool = context.Pool(1)
+                try:
+                    return pool.apply(_run_benchmark, (benchmark_input,))
+                finally:
+                    pool.close()
+                    pool.join()
+            ph.print_warning(
+                "Spawning processes is not supported. Benchmark executed "
+                "in current process; peak RSS includes previous runs.")
+        return _run_benchmark(benchmark_input)
+
+    @staticmethod
+    def _get_record_key(record):
+        return tuple([record["benchmark"]] +
+                     [record[k] for k in SIZE_PARAMETERS])
+
+    @staticmethod
+    def _get_info():
+        return {
+            "time_stamp": ph.get_time_stamp(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": multiprocessing.cpu_count(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "SimpleITK": sitk.Version_VersionString(),
+        }
+
+    ##
+    # Gets the scaling exponents of the minimal wall time w.r.t. each problem
+    # size parameter, i.e. the slope of the log-log fit using all records
+    # where only this parameter varies. Exponents of several such series are
+    # averaged.
+    # \date       2026-10-18 18:21:32+0000
+    #
+    # \param      records  List of benchmark records
+    #
+    # \return     Dictionary benchmark -> parameter -> exponent
+    #
+    @staticmethod
+    def _get_scaling(records):
+        scaling = {}
+        for benchmark in sorted(set(r["benchmark"] for r in records)):
+            records_benchmark = [
+                r for r in records if r["benchmark"] == benchmark]
+            for parameter in SIZE_PARAMETERS:
+                others = [p for p in SIZE_PARAMETERS if p != parameter]
+                series = {}
+                for r in records_benchmark:
+                    series.setdefault(
+                        tuple(r[p] for p in others), []).append(r)
+
+                exponents = []
+                for rs in series.values():
+                    x = [r[parameter] for r in rs]
+                    y = [r["wall_time_min"] for r in rs]
+                    if len(set(x)) < 2 or min(y) <= 0:
+                        continue
+                    exponents.append(
+                        np.polyfit(np.log(x), np.log(y), 1)[0])
+
+                if len(exponents) > 0:
+                    scaling.setdefault(benchmark, {})[parameter] = \
+                        float(np.mean(exponents))
+        return scaling
+
+
+##
+# Gets the peak resident set size of the current process in MB
+# \date       2026-10-18 18:22:10+0000
+#
+# \return     Peak RSS in MB or None if not available on this platform
+#
+def _get_peak_rss_mb():
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Bytes on macOS, kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak_rss / 1024. ** 2
+    return peak_rss / 1024.
+
+
+##
+# Run a single benchmark for a given problem size.
+#
+# Module-level function so that it can be executed in a spawned process.
+# \date       2026-10-18 18:22:41+0000
+#
+# \param      benchmark_input  tuple of benchmark name, problem size
+#                              dictionary, number of repeats, interpolator and
+#                              seed
+#
+# \return     Benchmark record as dictionary
+#
+def _run_benchmark(benchmark_input):
+    name, size, repeats, interpolator, seed = benchmark_input
+
+    synthetic_data = SyntheticData(
+        n_stacks=size["n_stacks"],
+        n_slices=size["n_slices"],
+        hr_size=size["hr_size"],
+        interpolator=interpolator,
+        seed=seed,
+    )
+    synthetic_data.run()
+    peak_rss_set_up_mb = _get_peak_rss_mb()
+
+    benchmark = BENCHMARKS[name]()
+    wall_times = []
+    for i in range(repeats):
+        benchmark.set_up(synthetic_data)
+        time_start = timeit.default_timer()
+        benchmark.run()
+        wall_times.append(timeit.default_timer() - time_start)
+
+    record = {"benchmark": name}
+    record.update({k: int(size[k]) for k in SIZE_PARAMETERS})
+    record.update(synthetic_data.get_problem_size())
+    record.update({
+        "repeats": repeats,
+        "wall_times": wall_times,
+        "wall_time_min": float(np.min(wall_times)),
+        "wall_time_median": float(np.median(wall_times)),
+        "peak_rss_mb": _get_peak_rss_mb(),
+        "peak_rss_set_up_mb": peak_rss_set_up_mb,
+    })
+    return record
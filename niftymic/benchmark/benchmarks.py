@@ -0,0 +1,191 @@
+##
+# \file benchmarks.py
+# \brief      Benchmarks of the computationally expensive parts of the
+#             volumetric reconstruction pipeline.
+#
+# Each benchmark is set up with synthetic data (not timed) before the timed
+# execution of its hot path.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import numpy as np
+import SimpleITK as sitk
+from abc import ABCMeta, abstractmethod
+
+import niftymic.base.stack as st
+import niftymic.reconstruction.tikhonov_solver as tk
+import niftymic.reconstruction.scattered_data_approximation as sda
+import niftymic.registration.simple_itk_registration as regsitk
+import niftymic.utilities.outlier_rejector as outre
+import niftymic.utilities.volumetric_reconstruction_pipeline as pipeline
+
+
+##
+# Abstract class of a benchmark
+# \date       2026-10-18 18:12:03+0000
+#
+class Benchmark(object):
+    __metaclass__ = ABCMeta
+
+    def __init__(self):
+        self._hr_volume = None
+        self._stacks = None
+
+    ##
+    # Set up benchmark with (copies of) synthetic data; not timed.
+    # \date       2026-10-18 18:12:31+0000
+    #
+    # \param      self            The object
+    # \param      synthetic_data  SyntheticData object after 'run'
+    #
+    def set_up(self, synthetic_data):
+        self._hr_volume = synthetic_data.get_hr_volume()
+        self._stacks = synthetic_data.get_stacks()
+        self._set_up()
+
+    ##
+    # Execute timed hot path of benchmark
+    # \date       2026-10-18 18:12:55+0000
+    #
+    @abstractmethod
+    def run(self):
+        pass
+
+    def _set_up(self):
+        pass
+
+
+##
+# Evaluate the forward operator MAx of the solver
+# \date       2026-10-18 18:13:20+0000
+#
+class SolverForwardOperatorBenchmark(Benchmark):
+
+    def _set_up(self):
+        self._solver = tk.TikhonovSolver(
+            stacks=self._stacks,
+            reconstruction=self._hr_volume,
+            verbose=0,
+        )
+        self._x = sitk.GetArrayFromImage(self._hr_volume.sitk).flatten()
+
+    def run(self):
+        self._solver._MA(self._x)
+
+
+##
+# Evaluate the adjoint operator A'My of the solver
+# \date       2026-10-18 18:13:44+0000
+#
+class SolverAdjointOperatorBenchmark(Benchmark):
+
+    def _set_up(self):
+        self._solver = tk.TikhonovSolver(
+            stacks=self._stacks,
+            reconstruction=self._hr_volume,
+            verbose=0,
+        )
+        self._y = np.concatenate([
+            sitk.GetArrayFromImage(s.sitk).flatten()
+            for stack in self._stacks for s in stack.get_slices()
+        ])
+
+    def run(self):
+        self._solver._A_adj_M(self._y)
+
+
+##
+# Scattered data approximation of the HR volume
+# \date       2026-10-18 18:14:10+0000
+#
+class ScatteredDataApproximationBenchmark(Benchmark):
+
+    def _set_up(self):
+        self._sda = sda.ScatteredDataApproximation(
+            self._stacks,
+            self._hr_volume,
+            sigma=1,
+            use_masks=True,
+            verbose=False,
+        )
+
+    def run(self):
+        self._sda.run()
+
+
+##
+# Slice-to-volume registration of all slices with the settings used by
+# niftymic_reconstruct_volume
+# \date       2026-10-18 18:14:38+0000
+#
+class SliceToVolumeRegistrationBenchmark(Benchmark):
+
+    def _set_up(self):
+        registration = regsitk.SimpleItkRegistration(
+            moving=self._hr_volume,
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            interpolator="Linear",
+            metric="Correlation",
+            use_multiresolution_framework=False,
+            initializer_type="SelfGEOMETRY",
+            optimizer="ConjugateGradientLineSearch",
+            optimizer_params={
+                "learningRate": 1,
+                "numberOfIterations": 100,
+                "lineSearchUpperLimit": 2,
+            },
+            scales_estimator="Jacobian",
+            use_verbose=False,
+        )
+        self._s2v_registration = pipeline.SliceToVolumeRegistration(
+            stacks=self._stacks,
+            reference=self._hr_volume,
+            registration_method=registration,
+            verbose=False,
+        )
+
+    def run(self):
+        self._s2v_registration.run()
+
+
+##
+# Outlier rejection based on slice similarities between simulated and
+# acquired slices
+# \date       2026-10-18 18:15:02+0000
+#
+class OutlierRejectionBenchmark(Benchmark):
+
+    def _set_up(self):
+        self._outlier_rejector = outre.OutlierRejector(
+            stacks=self._stacks,
+            reference=self._hr_volume,
+            threshold=0.8,
+            verbose=False,
+        )
+
+    def run(self):
+        self._outlier_rejector.run()
+
+
+##
+# Copy of all stacks including their slices
+# \date       2026-10-18 18:15:25+0000
+#
+class StackCopyBenchmark(Benchmark):
+
+    def run(self):
+        [st.Stack.from_stack(stack) for stack in self._stacks]
+
+
+# Available benchmarks
+BENCHMARKS = {
+    "solver_MA": SolverForwardOperatorBenchmark,
+    "solver_A_adj_M": SolverAdjointOperatorBenchmark,
+    "sda": ScatteredDataApproximationBenchmark,
+    "s2v_registration": SliceToVolumeRegistrationBenchmark,
+    "outlier_rejection": OutlierRejectionBenchmark,
+    "stack_copy": StackCopyBenchmark,
+}
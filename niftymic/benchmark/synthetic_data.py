@@ -0,0 +1,217 @@
+##
+# \file synthetic_data.py
+# \brief      Generate synthetic high-resolution volumes and motion-corrupted
+#             low-resolution stacks of slices for benchmarking.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import numpy as np
+import SimpleITK as sitk
+
+import niftymic.base.stack as st
+import niftymic.validation.slice_acquisition as sa
+import niftymic.validation.motion_simulator as ms
+
+
+##
+# Class to generate a synthetic high-resolution (HR) volume and stacks of
+# slices acquired from it.
+#
+# The HR volume is a smooth ellipsoidal phantom with a few spherical
+# inclusions covering a fixed field of view. Stacks are acquired in
+# alternating axial, coronal and sagittal orientation, slightly rotated, and
+# their slices are subsequently displaced by random rigid motion.
+# \date       2026-10-18 18:05:11+0000
+#
+class SyntheticData(object):
+
+    ##
+    # Store settings of synthetic data
+    # \date       2026-10-18 18:05:42+0000
+    #
+    # \param      self             The object
+    # \param      n_stacks         Number of stacks, int
+    # \param      n_slices         Number of slices per stack, int
+    # \param      hr_size          Number of voxels of the HR volume along
+    #                              each axis, int
+    # \param      field_of_view    Field of view of HR volume and stacks in
+    #                              mm, float
+    # \param      interpolator     Interpolator used to simulate the slice
+    #                              acquisition, e.g. 'Linear' or
+    #                              'OrientedGaussian'
+    # \param      angle_max_deg    Maximum rotation of simulated slice motion
+    #                              in degrees, float
+    # \param      translation_max  Maximum translation of simulated slice
+    #                              motion in mm, float
+    # \param      seed             Seed of random number generator, int
+    #
+    def __init__(self,
+                 n_stacks=3,
+                 n_slices=20,
+                 hr_size=64,
+                 field_of_view=96.,
+                 interpolator="Linear",
+                 angle_max_deg=3,
+                 translation_max=2,
+                 seed=0,
+                 ):
+        self._n_stacks = n_stacks
+        self._n_slices = n_slices
+        self._hr_size = hr_size
+        self._field_of_view = float(field_of_view)
+        self._interpolator = interpolator
+        self._angle_max_deg = angle_max_deg
+        self._translation_max = translation_max
+        self._seed = seed
+
+        self._hr_volume = None
+        self._stacks = None
+
+    def get_hr_volume(self):
+        return st.Stack.from_stack(self._hr_volume)
+
+    def get_stacks(self):
+        return [st.Stack.from_stack(s) for s in self._stacks]
+
+    ##
+    # Gets the problem size, i.e. the total number of slice and HR voxels.
+    # \date       2026-10-18 18:06:31+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary with keys 'n_slice_voxels' and 'n_hr_voxels'
+    #
+    def get_problem_size(self):
+        return {
+            "n_slice_voxels": int(self._n_stacks * self._n_slices *
+                                  self._hr_size ** 2),
+            "n_hr_voxels": int(self._hr_size ** 3),
+        }
+
+    def run(self):
+        random_state = np.random.RandomState(self._seed)
+
+        self._hr_volume = self._get_hr_volume()
+        self._stacks = [
+            self._get_stack(i, random_state) for i in range(self._n_stacks)
+        ]
+
+    ##
+    # Gets the HR phantom volume (including its mask) centered at the origin
+    # \date       2026-10-18 18:07:02+0000
+    #
+    def _get_hr_volume(self):
+        spacing = self._field_of_view / self._hr_size
+        x = (np.arange(self._hr_size) - (self._hr_size - 1) / 2.) * spacing
+        z, y, x = np.meshgrid(x, x, x, indexing="ij")
+
+        # Ellipsoid with semi-axes relative to field of view
+        a, b, c = 0.4 * self._field_of_view, 0.32 * self._field_of_view, \
+            0.36 * self._field_of_view
+        r2 = (x / a) ** 2 + (y / b) ** 2 + (z / c) ** 2
+        nda_mask = (r2 <= 1).astype(np.uint8)
+        nda = 100. * np.exp(-r2) * nda_mask
+
+        # Spherical inclusions with different intensities
+        for center, radius, intensity in [
+            ((0.1, 0.05, 0.), 0.08, 80.),
+            ((-0.12, -0.08, 0.05), 0.06, -40.),
+            ((0., 0.12, -0.1), 0.05, 60.),
+        ]:
+            center = np.array(center) * self._field_of_view
+            radius *= self._field_of_view
+            inside = (x - center[0]) ** 2 + (y - center[1]) ** 2 + \
+                (z - center[2]) ** 2 <= radius ** 2
+            nda[inside] += intensity
+
+        origin = -np.ones(3) * (self._hr_size - 1) / 2. * spacing
+
+        image_sitk = sitk.GetImageFromArray(nda)
+        image_sitk.SetSpacing((spacing, spacing, spacing))
+        image_sitk.SetOrigin(origin)
+        mask_sitk = sitk.GetImageFromArray(nda_mask)
+        mask_sitk.CopyInformation(image_sitk)
+
+        return st.Stack.from_sitk_image(
+            image_sitk=image_sitk,
+            slice_thickness=float(spacing),
+            filename="HR_volume",
+            image_sitk_mask=mask_sitk,
+            extract_slices=False,
+        )
+
+    ##
+    # Gets a stack acquired from the HR volume with slice motion.
+    # \date       2026-10-18 18:08:20+0000
+    #
+    # \param      self          The object
+    # \param      i             Stack index, int
+    # \param      random_state  numpy RandomState
+    #
+    # \return     Stack object
+    #
+    def _get_stack(self, i, random_state):
+        in_plane_spacing = self._field_of_view / self._hr_size
+        slice_thickness = self._field_of_view / self._n_slices
+        size = (self._hr_size, self._hr_size, self._n_slices)
+        spacing = np.array([in_plane_spacing, in_plane_spacing,
+                            slice_thickness])
+
+        # Axial, coronal, sagittal orientations plus small rotation
+        orientation = [(0, 0, 0), (np.pi / 2., 0, 0), (0, np.pi / 2., 0)]
+        angles = np.array(orientation[i % 3]) + \
+            random_state.uniform(-0.1, 0.1, 3)
+        rotation_sitk = sitk.Euler3DTransform()
+        rotation_sitk.SetRotation(*angles)
+        direction = np.array(rotation_sitk.GetMatrix()).reshape(3, 3)
+
+        # Stack centered at origin
+        origin = -direction.dot((np.array(size) - 1) / 2. * spacing)
+
+        template_sitk = sitk.Image(
+            [int(s) for s in size], sitk.sitkFloat64)
+        template_sitk.SetSpacing(spacing)
+        template_sitk.SetOrigin(origin)
+        template_sitk.SetDirection(direction.flatten())
+        mask_sitk = sitk.Resample(
+            self._hr_volume.sitk_mask, template_sitk, sitk.Euler3DTransform(),
+            sitk.sitkNearestNeighbor, 0, sitk.sitkUInt8)
+
+        template = st.Stack.from_sitk_image(
+            image_sitk=template_sitk,
+            slice_thickness=float(slice_thickness),
+            filename="stack%d" % i,
+            image_sitk_mask=mask_sitk,
+            extract_slices=False,
+        )
+
+        slice_acquisition = sa.StaticSliceAcquisition(
+            stack_slice=template,
+            reference=self._hr_volume,
+            interpolator=self._interpolator,
+        )
+        slice_acquisition.run()
+        acquired = slice_acquisition.get_output()
+
+        stack = st.Stack.from_sitk_image(
+            image_sitk=acquired.sitk,
+            slice_thickness=float(slice_thickness),
+            filename="stack%d" % i,
+            image_sitk_mask=mask_sitk,
+        )
+
+        # Displace slices by random rigid motion
+        motion_simulator = ms.RandomRigidMotionSimulator(
+            dimension=3,
+            angle_max_deg=self._angle_max_deg,
+            translation_max=self._translation_max)
+        motion_simulator.simulate_motion(
+            seed=self._seed + i, simulations=self._n_slices)
+        transforms_sitk = motion_simulator.get_transforms_sitk()
+        for slice in stack.get_slices():
+            slice.update_motion_correction(
+                transforms_sitk[slice.get_slice_number()])
+
+        return stack
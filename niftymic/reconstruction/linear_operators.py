@@ -10,6 +10,7 @@
 # Import libraries
 import itk
 import numpy as np
+import SimpleITK as sitk
 
 import pysitk.simple_itk_helper as sitkh
 
@@ -81,6 +82,13 @@ class LinearOperators(object):
         self._masking = itk.MultiplyImageFilter[
             image_type, image_type, image_type].New()
 
+        # Allocate and initialize nearest neighbour resampler for masks
+        self._resampler_mask = sitk.ResampleImageFilter()
+        self._resampler_mask.SetInterpolator(sitk.sitkNearestNeighbor)
+        self._resampler_mask.SetDefaultPixelValue(0)
+
+        self._itk2np = itk.PyBuffer[image_type]
+
         self._get_covariance = {
             "full_3D": self._get_covariance_full_3d,
             "only_in_plane": self._get_covariance_only_in_plane,
@@ -163,9 +171,8 @@ class LinearOperators(object):
 
         # Update stack/slice mask, in case provided for reconstruction
         if not reconstruction.is_unity_mask():
-            slice_tmp = reconstruction.get_resampled_stack(
-                stack_slice.sitk, interpolator=interpolator_mask)
-            simulated_sitk_mask = slice_tmp.sitk_mask
+            simulated_sitk_mask = self._get_resampled_mask_sitk(
+                reconstruction.sitk_mask, stack_slice.sitk)
 
             # PSF-aware resampling omitted as results less plausible for mask
             # simulated_itk_mask = self.A_itk(
@@ -193,6 +200,76 @@ class LinearOperators(object):
 
         return simulated
 
+    ##
+    # Perform forward operation for all slices of a stack.
+    #
+    # The simulated slices are written into one preallocated array (and mask
+    # array) where the first index corresponds to the slice number. Slices
+    # not contained in the stack, e.g. deleted slices, keep the default pixel
+    # value. Slice masks are obtained by nearest neighbour resampling of the
+    # reconstruction mask (if given), same as for A.
+    # \date       2026-10-18 14:40:12+0000
+    #
+    # \param      self                 The object
+    # \param      reconstruction       Reconstruction image as Stack object
+    # \param      stack                Stack object whose slices define the
+    #                                   output spaces and orientations for PSF
+    # \param      N_slices             Number of slices of output array; if
+    #                                   None, it is given by the stack size or
+    #                                   the largest slice number
+    # \param      default_pixel_value  Pixel value of slices not contained in
+    #                                   stack
+    #
+    # \return     Simulated slices as (N_slices x ny x nx)-numpy array and
+    #             associated masks as numpy array of same shape; the latter
+    #             is None in case reconstruction holds a unity mask
+    #
+    def A_stack(self,
+                reconstruction,
+                stack,
+                N_slices=None,
+                default_pixel_value=0.,
+                ):
+
+        slices = stack.get_slices()
+
+        if N_slices is None:
+            N_slices = max([stack.sitk.GetSize()[-1]] +
+                           [s.get_slice_number() + 1 for s in slices])
+        shape = (N_slices, ) + stack.sitk.GetSize()[0:2][::-1]
+
+        nda = np.ones(shape) * default_pixel_value
+
+        use_mask = not reconstruction.is_unity_mask()
+        if use_mask:
+            reconstruction_sitk_mask = reconstruction.sitk_mask
+            nda_mask = np.zeros(shape, dtype=sitk.GetArrayViewFromImage(
+                reconstruction_sitk_mask).dtype)
+        else:
+            nda_mask = None
+
+        for slice in slices:
+            i_slice = slice.get_slice_number()
+
+            in_plane_res = slice.get_inplane_resolution()
+            slice_spacing = np.array(
+                [in_plane_res, in_plane_res, slice.get_slice_thickness()])
+
+            simulated_itk = self.A_itk(
+                reconstruction_itk=reconstruction.itk,
+                slice_itk=slice.itk,
+                slice_spacing=slice_spacing,
+            )
+            nda[i_slice, :, :] = self._itk2np.GetArrayFromImage(
+                simulated_itk)[0, :, :]
+
+            if use_mask:
+                nda_mask[i_slice, :, :] = sitk.GetArrayViewFromImage(
+                    self._get_resampled_mask_sitk(
+                        reconstruction_sitk_mask, slice.sitk))[0, :, :]
+
+        return nda, nda_mask
+
     ##
     # Perform backward operation on slice image, i.e.
     # \f$z = B^* D^* y =: A^*(y)
@@ -242,12 +319,17 @@ class LinearOperators(object):
     #
     # \param      self            The object
     # \param      image_itk       Image as itk.Image object
-    # \param      image_itk_mask  Image mask as itk.Image object
+    # \param      image_itk_mask  Image mask as itk.Image object. If None, a
+    #                             unity mask is assumed and image_itk is
+    #                             returned as is.
     #
     # \return     Masked image as itk.Image object
     #
     def M_itk(self, image_itk, image_itk_mask):
 
+        if image_itk_mask is None:
+            return image_itk
+
         self._masking.SetInput1(image_itk_mask)
         self._masking.SetInput2(image_itk)
         self._masking.UpdateLargestPossibleRegion()
@@ -258,6 +340,12 @@ class LinearOperators(object):
 
         return Mk_slice_itk
 
+    def _get_resampled_mask_sitk(self, image_sitk_mask, reference_sitk):
+        self._resampler_mask.SetReferenceImage(reference_sitk)
+        self._resampler_mask.SetOutputPixelType(
+            image_sitk_mask.GetPixelIDValue())
+        return self._resampler_mask.Execute(image_sitk_mask)
+
     def _get_covariance_full_3d(
         self,
         reconstruction_itk,
@@ -203,11 +203,11 @@ class ScatteredDataApproximation:
             # Resample warped stack masks
             stack_sitk_mask = sitk.Resample(
                 self._stacks[i].sitk_mask,
-                self._HR_volume.sitk_mask,
+                self._HR_volume.sitk,
                 sitk.Euler3DTransform(),
                 sitk.sitkNearestNeighbor,
                 0,
-                self._HR_volume.sitk_mask.GetPixelIDValue())
+                sitk.sitkUInt8)
 
             # Get arrays of resampled warped stack and mask
             array_mask_tmp = sitk.GetArrayFromImage(
@@ -258,11 +258,11 @@ class ScatteredDataApproximation:
             # Resample warped stack masks
             stack_sitk_mask = sitk.Resample(
                 self._stacks[i].sitk_mask,
-                self._HR_volume.sitk_mask,
+                self._HR_volume.sitk,
                 sitk.Euler3DTransform(),
                 sitk.sitkNearestNeighbor,
                 0,
-                self._HR_volume.sitk_mask.GetPixelIDValue())
+                sitk.sitkUInt8)
 
             # Get arrays of resampled warped stack and mask
             array_mask_tmp = sitk.GetArrayFromImage(
@@ -296,6 +296,8 @@ class ScatteredDataApproximation:
 
     @staticmethod
     def _get_masked_image_slice(slice):
+        if slice.is_unity_mask():
+            return slice.sitk
         slice_sitk = slice.sitk * \
             sitk.Cast(slice.sitk_mask, slice.sitk.GetPixelIDValue())
         return slice_sitk
@@ -384,11 +384,8 @@ class Solver(object):
                 i_max = i_min + N_slice_voxels
 
                 # Apply M_k y_k
-                if self._use_masks:
-                    slice_itk = self._linear_operators.M_itk(
-                        slice_j.itk, slice_j.itk_mask)
-                else:
-                    slice_itk = slice_j.itk
+                slice_itk = self._linear_operators.M_itk(
+                    slice_j.itk, self._get_slice_itk_mask(slice_j))
                 slice_nda_vec = self._itk2np.GetArrayFromImage(
                     slice_itk).flatten()
 
@@ -422,12 +419,9 @@ class Solver(object):
         Ak_reconstruction_itk = self._linear_operators.A_itk(
             reconstruction_itk, slice_k.itk, slice_spacing)
 
-        if not self._use_masks:
-            return Ak_reconstruction_itk
-
         # Compute M_k A_k x
         Ak_reconstruction_itk = self._linear_operators.M_itk(
-            Ak_reconstruction_itk, slice_k.itk_mask)
+            Ak_reconstruction_itk, self._get_slice_itk_mask(slice_k))
 
         return Ak_reconstruction_itk
 
@@ -445,11 +439,8 @@ class Solver(object):
     def _Ak_adj_Mk(self, slice_itk, slice_k):
 
         # Compute M_k y_k
-        if self._use_masks:
-            Mk_slice_itk = self._linear_operators.M_itk(
-                slice_itk, slice_k.itk_mask)
-        else:
-            Mk_slice_itk = slice_itk
+        Mk_slice_itk = self._linear_operators.M_itk(
+            slice_itk, self._get_slice_itk_mask(slice_k))
 
         # Get slice spacing relevant for Gaussian blurring estimate
         in_plane_res = slice_k.get_inplane_resolution()
@@ -566,6 +557,22 @@ class Solver(object):
 
         return A_adj_M_y
 
+    ##
+    # Gets the slice mask used for the masking operator M_k.
+    # \date       2026-10-18 11:14:05+0000
+    #
+    # \param      self     The object
+    # \param      slice_k  Slice object
+    #
+    # \return     Slice mask as itk.Image object or None if no masking is
+    #             required, i.e. if masks are not used or the slice holds a
+    #             unity mask.
+    #
+    def _get_slice_itk_mask(self, slice_k):
+        if not self._use_masks or slice_k.is_unity_mask():
+            return None
+        return slice_k.itk_mask
+
     #
     # Convert numpy data array (vector format) back to itk.Image object
     # \date       2017-07-25 15:15:53+0100
@@ -12,8 +12,10 @@
 
 # Import libraries
 import SimpleITK as sitk
-import itk
 import numpy as np
+from datetime import timedelta
+from scipy.ndimage import gaussian_filter
+from scipy.ndimage import map_coordinates
 
 import niftymic.base.slice as sl
 import niftymic.base.stack as st
@@ -122,6 +124,25 @@ class IntraStackRegistration(StackRegistrationBase):
     #                                                            "identity",
     #                                                            "gradient_magnitude",
     #                                                            "partial_derivative"
+    # \param      use_multiresolution_framework                  Estimate
+    #                                                            parameters
+    #                                                            coarse-to-fine
+    #                                                            on in-plane
+    #                                                            downsampled
+    #                                                            slices, bool
+    # \param      shrink_factors                                 In-plane
+    #                                                            shrink factor
+    #                                                            for each
+    #                                                            resolution
+    #                                                            level, list of
+    #                                                            int
+    # \param      smoothing_sigmas                               In-plane
+    #                                                            Gaussian
+    #                                                            smoothing in
+    #                                                            mm for each
+    #                                                            resolution
+    #                                                            level, list of
+    #                                                            float
     #
     def __init__(self,
                  stack=None,
@@ -145,6 +166,9 @@ class IntraStackRegistration(StackRegistrationBase):
                  prior_intensity_correction_coefficients=np.array([1, 0]),
                  prior_scale=1.0,
                  image_transform_reference_fit_term="identity",
+                 use_multiresolution_framework=False,
+                 shrink_factors=[2, 1],
+                 smoothing_sigmas=[1, 0],
                  ):
 
         # Run constructor of superclass
@@ -177,10 +201,25 @@ class IntraStackRegistration(StackRegistrationBase):
             "similarity": self._new_similarity_transform_sitk,
             "affine": self._new_affine_transform_sitk
         }
-        self._new_transform_itk = {
-            "rigid": self._new_rigid_transform_itk,
-            "similarity": self._new_similarity_transform_itk,
-            "affine": self._new_affine_transform_itk
+
+        # Dictionaries to get the transform matrices and translations and the
+        # Jacobians w.r.t. the transform parameters for all slices
+        self._get_transform_matrices = {
+            "rigid": self._get_rigid_transform_matrices,
+            "similarity": self._get_similarity_transform_matrices,
+            "affine": self._get_affine_transform_matrices
+        }
+        self._get_transform_jacobians = {
+            "rigid": self._get_rigid_transform_jacobians,
+            "similarity": self._get_similarity_transform_jacobians,
+            "affine": self._get_affine_transform_jacobians
+        }
+
+        # Spline orders of scipy.ndimage.map_coordinates to warp slices
+        # according to chosen interpolator
+        self._interpolator_order = {
+            "NearestNeighbor": 0,
+            "Linear": 1,
         }
 
         # Chosen intensity correction type
@@ -267,6 +306,14 @@ class IntraStackRegistration(StackRegistrationBase):
         self._use_stack_mask_reference_fit_term = self._use_stack_mask
         self._use_stack_mask_neighbour_fit_term = self._use_stack_mask
 
+        # Coarse-to-fine estimation of parameters
+        self._use_multiresolution_framework = use_multiresolution_framework
+        self._shrink_factors = shrink_factors
+        self._smoothing_sigmas = smoothing_sigmas
+
+        # Parameters estimated at the previous (coarser) resolution level
+        self._parameters_previous_level = None
+
     ##
     # Sets the transform type.
     # \date       2016-11-10 01:53:58+0000
@@ -389,6 +436,29 @@ class IntraStackRegistration(StackRegistrationBase):
     def use_stack_mask_neighbour_fit_term(self, flag):
         self._use_stack_mask_neighbour_fit_term = flag
 
+    ##
+    # Use multiresolution framework, i.e. estimate the parameters on in-plane
+    # downsampled slices first and refine them at higher resolution levels.
+    # \date       2026-10-18 19:54:02+0000
+    #
+    # \param      self  The object
+    # \param      flag  The flag
+    #
+    def use_multiresolution_framework(self, flag):
+        self._use_multiresolution_framework = flag
+
+    def set_shrink_factors(self, shrink_factors):
+        self._shrink_factors = shrink_factors
+
+    def get_shrink_factors(self):
+        return self._shrink_factors
+
+    def set_smoothing_sigmas(self, smoothing_sigmas):
+        self._smoothing_sigmas = smoothing_sigmas
+
+    def get_smoothing_sigmas(self):
+        return self._smoothing_sigmas
+
     def get_final_cost(self):
         if self._final_cost is None:
             self._compute_statistics_residuals_ell2()
@@ -492,6 +562,135 @@ class IntraStackRegistration(StackRegistrationBase):
             self._alpha_neighbour,
             self._alpha_parameter))
 
+    ##
+    # Estimate the parameters either at full resolution or coarse-to-fine,
+    # i.e. the parameters obtained for in-plane downsampled slices (and
+    # reference) initialize the optimisation at the next finer level.
+    # \date       2026-10-18 19:56:37+0000
+    #
+    # \param      self  The object
+    #
+    def _run_optimization(self):
+
+        if not self._use_multiresolution_framework:
+            StackRegistrationBase._run_optimization(self)
+            return
+
+        if len(self._shrink_factors) != len(self._smoothing_sigmas):
+            raise ValueError(
+                "Number of shrink factors and smoothing sigmas must match")
+
+        stack = self._stack
+        reference = self._reference
+        elapsed_times = []
+
+        for shrink_factor, smoothing_sigma in zip(
+                self._shrink_factors, self._smoothing_sigmas):
+            print("Resolution level: shrink factor %d, smoothing sigma %g" % (
+                shrink_factor, smoothing_sigma))
+
+            self._stack = self._get_stack_at_resolution_level(
+                stack, shrink_factor, smoothing_sigma)
+            if reference is not None:
+                self._reference = self._get_stack_at_resolution_level(
+                    reference, shrink_factor, smoothing_sigma)
+
+            StackRegistrationBase._run_optimization(self)
+            elapsed_times.append(self._elapsed_time)
+
+            self._parameters_previous_level = self._parameters
+
+        self._stack = stack
+        self._reference = reference
+        self._parameters_previous_level = None
+        self._elapsed_time = sum(elapsed_times, timedelta(0))
+
+    ##
+    # Gets the stack smoothed and downsampled in-plane for a resolution level.
+    # \date       2026-10-18 19:58:20+0000
+    #
+    # Voxel (i, j) of the downsampled grid coincides with voxel (i * f, j * f)
+    # of the original grid, i.e. origin and direction of the stack and of all
+    # its (possibly motion corrected) slices are kept. Hence, the 2D slice
+    # coordinates and thus the transform parameters are identical at all
+    # resolution levels.
+    #
+    # \param      self             The object
+    # \param      stack            The stack as Stack object
+    # \param      shrink_factor    The in-plane shrink factor f, int
+    # \param      smoothing_sigma  The in-plane Gaussian smoothing in mm
+    #
+    # \return     The stack at resolution level as Stack object
+    #
+    def _get_stack_at_resolution_level(self,
+                                       stack,
+                                       shrink_factor,
+                                       smoothing_sigma):
+
+        if shrink_factor == 1 and smoothing_sigma == 0:
+            return stack
+
+        shrink_factor = int(shrink_factor)
+        spacing = np.array(stack.sitk.GetSpacing())
+
+        nda = sitk.GetArrayFromImage(stack.sitk).astype(np.float64)
+        if smoothing_sigma > 0:
+            nda = gaussian_filter(
+                nda, sigma=(0,
+                            smoothing_sigma / spacing[1],
+                            smoothing_sigma / spacing[0]))
+        nda_mask = sitk.GetArrayFromImage(stack.sitk_mask)
+
+        image_sitk = sitk.GetImageFromArray(
+            nda[:, ::shrink_factor, ::shrink_factor])
+        image_sitk.SetOrigin(stack.sitk.GetOrigin())
+        image_sitk.SetDirection(stack.sitk.GetDirection())
+        image_sitk.SetSpacing(
+            spacing * np.array([shrink_factor, shrink_factor, 1]))
+        image_sitk_mask = sitk.GetImageFromArray(
+            nda_mask[:, ::shrink_factor, ::shrink_factor])
+        image_sitk_mask.CopyInformation(image_sitk)
+
+        stack_level = st.Stack.from_sitk_image(
+            image_sitk=image_sitk,
+            slice_thickness=float(stack.get_slice_thickness()),
+            filename=stack.get_filename(),
+            image_sitk_mask=image_sitk_mask)
+
+        # Slice numbers refer to the slice index within the image volume (up
+        # to an offset in case the first slices were deleted); cf.
+        # Stack.from_stack
+        slices = {s.get_slice_number(): s for s in stack.get_slices()}
+        slice_number_offset = np.min(
+            list(slices.keys()) + stack.get_deleted_slice_numbers())
+
+        # Keep position of each slice and delete the ones not kept in stack
+        slices_deleted = []
+        for k in range(image_sitk.GetDepth()):
+            slice_number = k + slice_number_offset
+            slice_sitk = image_sitk[:, :, k:k + 1]
+            slice_sitk_mask = image_sitk_mask[:, :, k:k + 1]
+            if slice_number in slices:
+                slice_3D = slices[slice_number]
+                slice_sitk.SetOrigin(slice_3D.sitk.GetOrigin())
+                slice_sitk.SetDirection(slice_3D.sitk.GetDirection())
+            slice_sitk_mask.CopyInformation(slice_sitk)
+            slice_level = sl.Slice.from_sitk_image(
+                slice_sitk=slice_sitk,
+                filename=stack.get_filename(),
+                slice_number=slice_number,
+                slice_sitk_mask=slice_sitk_mask,
+                slice_thickness=stack.get_slice_thickness(),
+            )
+            stack_level.set_slice(slice_level, k)
+            if slice_number not in slices:
+                slices_deleted.append(slice_level)
+
+        for slice_level in slices_deleted:
+            stack_level.delete_slice(slice_level)
+
+        return stack_level
+
     ##
     # { function_description }
     # \date       2016-11-08 14:59:26+0000
@@ -500,6 +699,11 @@ class IntraStackRegistration(StackRegistrationBase):
     #
     def _run_registration_pipeline_initialization(self):
 
+        if self._interpolator not in self._interpolator_order.keys():
+            raise ValueError("Interpolator " + self._interpolator +
+                             " not possible.\nAllowed values: " +
+                             str(self._interpolator_order.keys()))
+
         self._transform_type_dofs = len(
             self._new_transform_sitk[self._transform_type]().GetParameters())
 
@@ -511,6 +715,7 @@ class IntraStackRegistration(StackRegistrationBase):
         self._slices_2D = self._get_projected_2D_slices_of_stack(
             self._stack, registration_image_type="identity")
 
+
         # If reference is given, precompute required data
         if self._reference is not None:
 
@@ -638,12 +843,23 @@ class IntraStackRegistration(StackRegistrationBase):
             self._slice_grid_2D_sitk = sitk.Image(self._slices_2D[0].sitk)
 
         # Get inital transform and the respective initial transform parameters
-        # used for further optimisation
-        self._transforms_2D_sitk, parameters = \
-            self._get_initial_transforms_and_parameters[
-                self._transform_initializer_type]()
-
-        if self._intensity_correction_type_slice_neighbour_fit is not None:
+        # used for further optimisation. At finer resolution levels, keep the
+        # transforms (i.e. their centers) of the previous level
+        if self._parameters_previous_level is None:
+            self._transforms_2D_sitk, parameters = \
+                self._get_initial_transforms_and_parameters[
+                    self._transform_initializer_type]()
+
+        # Precompute geometry to warp all slices at once
+        self._initialize_warping_of_slices()
+
+        # Transform parameters are given in physical space and, together with
+        # the intensity correction coefficients, initialize the optimisation
+        # at the finer resolution level directly
+        if self._parameters_previous_level is not None:
+            parameters = np.array(self._parameters_previous_level)
+
+        elif self._intensity_correction_type_slice_neighbour_fit is not None:
             parameters_intensity = \
                 self._get_initial_intensity_correction_parameters[
                     self._intensity_correction_initializer_type]()
@@ -660,6 +876,60 @@ class IntraStackRegistration(StackRegistrationBase):
         # Store number of degrees of freedom for overall optimization
         self._optimization_dofs = self._parameters.shape[1]
 
+    ##
+    # Precompute the slice data arrays and the geometry required to warp all
+    # slices onto the slice grid in one go.
+    # \date       2026-10-18 19:18:44+0000
+    #
+    # Physical points x of the slice grid are mapped by the in-plane transform
+    # T(theta_i, x) = A_i (x - c_i) + c_i + t_i and converted to continuous
+    # indices of slice i.
+    #
+    # \param      self  The object
+    #
+    def _initialize_warping_of_slices(self):
+
+        # Slice data arrays as (N_slices x Ny x Nx)-arrays
+        self._slices_2D_nda = np.array([
+            sitk.GetArrayFromImage(slice_2D.sitk)
+            for slice_2D in self._slices_2D], dtype=np.float64)
+        self._slices_2D_nda_mask = np.array([
+            sitk.GetArrayFromImage(slice_2D.sitk_mask)
+            for slice_2D in self._slices_2D])
+
+        # Maps from physical space to continuous (x, y)-index of each slice
+        self._slices_2D_physical_to_index = np.array([
+            np.linalg.inv(sitkh.get_sitk_affine_matrix_from_sitk_image(
+                slice_2D.sitk).reshape(2, 2))
+            for slice_2D in self._slices_2D])
+        self._slices_2D_origins = np.array([
+            slice_2D.sitk.GetOrigin() for slice_2D in self._slices_2D])
+
+        # Physical points of slice grid as (N_slice_voxels x dim)-array in
+        # order of the flattened data array
+        grid_sitk = self._slice_grid_2D_sitk
+        self._slice_grid_2D_shape = (
+            self._N_slices, grid_sitk.GetHeight(), grid_sitk.GetWidth())
+        self._slice_grid_2D_spacing = np.array(grid_sitk.GetSpacing())
+        self._slice_grid_2D_direction = np.array(
+            grid_sitk.GetDirection()).reshape(2, 2)
+        indices = sitkh.get_indices_array_to_flattened_sitk_image_data_array(
+            grid_sitk)
+        points = sitkh.get_sitk_affine_matrix_from_sitk_image(
+            grid_sitk).reshape(2, 2).dot(indices).transpose() + \
+            np.array(grid_sitk.GetOrigin())
+
+        # Centers of transforms and grid points relative to them as
+        # (N_slices x N_slice_voxels x dim)-array
+        self._transforms_2D_centers = np.array([
+            transform_2D_sitk.GetFixedParameters()[0:2]
+            for transform_2D_sitk in self._transforms_2D_sitk])
+        self._slice_grid_2D_points_centered = points[np.newaxis, :, :] - \
+            self._transforms_2D_centers[:, np.newaxis, :]
+
+        # Warped slices shared by residual and Jacobian evaluations
+        self._warped_slices_2D_cache = {}
+
     ##
     # Based on the residual functions below and the chosen settings, this
     # function returns the residual call used for the least_squares method
@@ -710,7 +980,6 @@ class IntraStackRegistration(StackRegistrationBase):
             if self._image_transform_reference_fit_term in ["identity"]:
                 self._get_residual_reference_fit_total = lambda x: \
                     self._get_residual_reference_fit(
-                        self._slices_2D,
                         self._reference_nda,
                         "identity",
                         x)
@@ -718,7 +987,6 @@ class IntraStackRegistration(StackRegistrationBase):
             if self._image_transform_reference_fit_term in ["gradient_magnitude"]:
                 self._get_residual_reference_fit_total = \
                     lambda x: self._get_residual_reference_fit(
-                        self._slices_2D,
                         self._gradient_magnitude_reference_nda,
                         "gradient_magnitude",
                         x)
@@ -727,12 +995,10 @@ class IntraStackRegistration(StackRegistrationBase):
                 self._get_residual_reference_fit_total = \
                     lambda x: np.concatenate((
                         self._get_residual_reference_fit(
-                            self._slices_2D,
                             self._dx_reference_nda,
                             "dx",
                             x),
                         self._get_residual_reference_fit(
-                            self._slices_2D,
                             self._dy_reference_nda,
                             "dy",
                             x)
@@ -828,20 +1094,20 @@ class IntraStackRegistration(StackRegistrationBase):
             if self._image_transform_reference_fit_term in ["identity"]:
                 self._get_jacobian_residual_reference_fit_total = \
                     lambda x: self._get_jacobian_residual_reference_fit(
-                        self._slices_2D, "identity", x)
+                        "identity", x)
 
             elif self._image_transform_reference_fit_term in ["gradient_magnitude"]:
                 self._get_jacobian_residual_reference_fit_total = \
                     lambda x: self._get_jacobian_residual_reference_fit(
-                        self._slices_2D, "gradient_magnitude", x)
+                        "gradient_magnitude", x)
 
             elif self._image_transform_reference_fit_term in ["partial_derivative"]:
                 self._get_jacobian_residual_reference_fit_total = \
                     lambda x: np.concatenate((
                         self._get_jacobian_residual_reference_fit(
-                            self._slices_2D, "dx", x),
+                            "dx", x),
                         self._get_jacobian_residual_reference_fit(
-                            self._slices_2D, "dy", x)
+                            "dy", x)
                     ))
 
             if alpha_reference < self._ZERO:
@@ -886,7 +1152,6 @@ class IntraStackRegistration(StackRegistrationBase):
     # all slices i.
     #
     # \param      self            The object
-    # \param      slices_2D       The slices 2d
     # \param      reference_nda   The reference nda
     # \param      trafo           The trafo
     # \param      parameters_vec  The parameters vector
@@ -895,7 +1160,6 @@ class IntraStackRegistration(StackRegistrationBase):
     #             numpy array
     #
     def _get_residual_reference_fit(self,
-                                    slices_2D,
                                     reference_nda,
                                     trafo,
                                     parameters_vec):
@@ -905,42 +1169,29 @@ class IntraStackRegistration(StackRegistrationBase):
 
         # Reshape parameters for easier access
         parameters = parameters_vec.reshape(-1, self._optimization_dofs)
+        parameters_transform = parameters[:, 0:self._transform_type_dofs]
+
+        # Get slice_i(T(theta_i, x)) for all slices with applied image
+        # transform, i.e. gradients etc
+        slices_nda = self._get_warped_slices_nda(parameters_transform, trafo)
+        if self._use_stack_mask_reference_fit_term:
+            slices_nda_mask = self._get_warped_slices_nda_mask(
+                parameters_transform)
 
         # Compute residuals between each slice and reference
         for i in range(0, self._N_slices):
 
-            # Get slice_i(T(theta_i, x))
-            self._transforms_2D_sitk[i].SetParameters(
-                parameters[i, 0:self._transform_type_dofs])
-            slice_i_sitk = sitk.Resample(
-                slices_2D[i].sitk,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i],
-                self._interpolator_sitk)
-
-            # Apply image transform, i.e. gradients etc
-            slice_i_sitk = self._apply_image_transform[trafo](slice_i_sitk)
-
-            # Extract data array
-            slice_i_nda = sitk.GetArrayFromImage(slice_i_sitk)
-
             # Correct intensities according to chosen model
             slice_i_nda = self._apply_intensity_correction[
                 self._intensity_correction_type_reference_fit](
-                slice_i_nda, parameters[i, self._transform_type_dofs:])
+                slices_nda[i], parameters[i, self._transform_type_dofs:])
 
             # Compute residual slice_i(T(theta_i, x)) - ref(x))
             residual_slice_nda = slice_i_nda - reference_nda[i, :, :]
 
             # Incorporate mask computations
             if self._use_stack_mask_reference_fit_term:
-                slice_i_sitk_mask = sitk.Resample(
-                    slices_2D[i].sitk_mask,
-                    self._slice_grid_2D_sitk,
-                    self._transforms_2D_sitk[i],
-                    sitk.sitkNearestNeighbor)
-                slice_i_nda_mask = sitk.GetArrayFromImage(slice_i_sitk_mask)
-                residual_slice_nda *= slice_i_nda_mask
+                residual_slice_nda *= slices_nda_mask[i]
 
             if self._use_reference_mask:
                 residual_slice_nda *= self._reference_nda_mask[i, :, :]
@@ -959,7 +1210,6 @@ class IntraStackRegistration(StackRegistrationBase):
     # \date       2016-11-21 20:09:36+0000
     #
     # \param      self            The object
-    # \param      slices_2D       The slices 2d
     # \param      trafo           The trafo
     # \param      parameters_vec  The parameters vector
     #
@@ -968,7 +1218,6 @@ class IntraStackRegistration(StackRegistrationBase):
     #             array
     #
     def _get_jacobian_residual_reference_fit(self,
-                                             slices_2D,
                                              trafo,
                                              parameters_vec):
 
@@ -982,73 +1231,39 @@ class IntraStackRegistration(StackRegistrationBase):
 
         # Reshape parameters for easier access
         parameters = parameters_vec.reshape(-1, self._optimization_dofs)
+        parameters_transform = parameters[:, 0:self._transform_type_dofs]
 
-        # Compute Jacobian of residuals between each slice and reference
-        for i in range(0, self._N_slices):
-
-            # Update transforms
-            parameters_slice = parameters[i, 0:self._transform_type_dofs]
-            self._transforms_2D_sitk[i].SetParameters(parameters_slice)
-            self._transforms_2D_itk[i].SetParameters(
-                itk.OptimizerParameters[itk.D](parameters_slice))
-
-            # Get slice_i(T(theta, x))
-            slice_i_sitk = sitk.Resample(
-                slices_2D[i].sitk,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i],
-                self._interpolator_sitk)
+        # Get Jacobian of all slices w.r.t to transform parameters
+        jacobians_nda = self._get_warped_slices_jacobian_nda(
+            parameters_transform, trafo)
 
-            # Apply image transform, i.e. gradients etc
-            slice_i_sitk = self._apply_image_transform[trafo](slice_i_sitk)
-
-            # Get d[slice(T(theta, x))]/dx as (Ny x Nx x dim)-array
-            dslice_i_nda = self._get_gradient_image_nda_from_sitk_image(
-                slice_i_sitk)
-
-            # Get slice data array (used for intensity correction parameter
-            # gradient)
-            slice_i_nda = sitk.GetArrayFromImage(slice_i_sitk)
-
-            # Incorporate mask computations
-            if self._use_stack_mask_reference_fit_term:
-                # Slice mask
-                slice_i_sitk_mask = sitk.Resample(
-                    slices_2D[i].sitk_mask,
-                    self._slice_grid_2D_sitk,
-                    self._transforms_2D_sitk[i],
-                    sitk.sitkNearestNeighbor)
-                slice_i_nda_mask = sitk.GetArrayFromImage(slice_i_sitk_mask)
-
-                # Mask data
-                slice_i_nda *= slice_i_nda_mask
-
-                # Mask gradient data
-                dslice_i_nda *= slice_i_nda_mask[:, :, np.newaxis]
-
-                # ph.show_2D_array_list
-
-            if self._use_reference_mask:
-                # Reference mask
-                reference_i_nda_mask = self._reference_nda_mask[i, :, :]
-
-                # Mask data
-                slice_i_nda *= reference_i_nda_mask
-
-                # Mask gradient data
-                dslice_i_nda *= reference_i_nda_mask[:, :, np.newaxis]
+        # Get slice data arrays (used for intensity correction parameter
+        # gradient)
+        slices_nda = self._get_warped_slices_nda(parameters_transform, trafo)
+
+        # Incorporate mask computations. Masking the Jacobian rows is
+        # equivalent to masking the slice gradient data.
+        if self._use_stack_mask_reference_fit_term:
+            slices_nda_mask = self._get_warped_slices_nda_mask(
+                parameters_transform)
+            slices_nda = slices_nda * slices_nda_mask
+            jacobians_nda = jacobians_nda * slices_nda_mask.reshape(
+                self._N_slices, self._N_slice_voxels, 1)
+
+        if self._use_reference_mask:
+            slices_nda = slices_nda * self._reference_nda_mask
+            jacobians_nda = jacobians_nda * self._reference_nda_mask.reshape(
+                self._N_slices, self._N_slice_voxels, 1)
 
-            # Get Jacobian of slice w.r.t to transform parameters
-            jacobian_slice_nda = \
-                self._get_gradient_with_respect_to_transform_parameters(
-                    dslice_i_nda, self._transforms_2D_itk[i], slice_i_sitk)
+        # Compute Jacobian of residuals between each slice and reference
+        for i in range(0, self._N_slices):
 
             # Get d[slice_i(T(theta_i, x))]/dtheta_i:
             # Add Jacobian w.r.t. to intensity correction parameters
             jacobian_slice_i_tmp = \
                 self._add_gradient_with_respect_to_intensity_correction_parameters[
                     self._intensity_correction_type_reference_fit](
-                        jacobian_slice_nda, slice_i_nda)
+                        jacobians_nda[i], slices_nda[i])
 
             # Second dimension is decided by intensity_correction_type_slice_neighbour_fit
             # as being of "higher order"
@@ -1085,53 +1300,28 @@ class IntraStackRegistration(StackRegistrationBase):
 
         # Reshape parameters for easier access
         parameters = parameters_vec.reshape(-1, self._optimization_dofs)
+        parameters_transform = parameters[:, 0:self._transform_type_dofs]
 
-        # Update transform
+        # Get slice_i(T(theta_i, x)) for all slices
+        slices_nda = self._get_warped_slices_nda(parameters_transform)
+        if self._use_stack_mask_neighbour_fit_term:
+            slices_nda_mask = self._get_warped_slices_nda_mask(
+                parameters_transform)
+
+        # Correct intensities according to chosen model for i=0
         i = 0
-        parameters_slice_i = parameters[i, 0:self._transform_type_dofs]
-        self._transforms_2D_sitk[i].SetParameters(parameters_slice_i)
-
-        # Get slice_i(T(theta_i, x)) for i=0
-        slice_i_sitk = sitk.Resample(
-            self._slices_2D[i].sitk,
-            self._slice_grid_2D_sitk,
-            self._transforms_2D_sitk[i],
-            self._interpolator_sitk)
-        slice_i_nda = sitk.GetArrayFromImage(slice_i_sitk)
-
-        # Correct intensities according to chosen model
         slice_i_nda = self._apply_intensity_correction[
             self._intensity_correction_type_slice_neighbour_fit](
-            slice_i_nda, parameters[i, self._transform_type_dofs:])
-
-        if self._use_stack_mask_neighbour_fit_term:
-            slice_i_sitk_mask = sitk.Resample(
-                self._slices_2D[i].sitk_mask,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i],
-                sitk.sitkNearestNeighbor)
-            slice_i_nda_mask = sitk.GetArrayFromImage(slice_i_sitk_mask)
+            slices_nda[i], parameters[i, self._transform_type_dofs:])
 
         # Compute residuals for neighbouring slices
         for i in range(0, self._N_slices - 1):
 
-            # Update transform
-            parameters_slice_ip1 = parameters[
-                i + 1, 0:self._transform_type_dofs]
-            self._transforms_2D_sitk[i + 1].SetParameters(parameters_slice_ip1)
-
-            # Get slice_{i+1}(T(theta_{i+1}, x))
-            slice_ip1_sitk = sitk.Resample(
-                self._slices_2D[i + 1].sitk,
-                self._slice_grid_2D_sitk,
-                self._transforms_2D_sitk[i + 1],
-                self._interpolator_sitk)
-            slice_ip1_nda = sitk.GetArrayFromImage(slice_ip1_sitk)
-
             # Correct intensities according to chosen model
             slice_ip1_nda = self._apply_intensity_correction[
                 self._intensity_correction_type_slice_neighbour_fit](
-                slice_ip1_nda, parameters[i + 1, self._transform_type_dofs:])
+                slices_nda[i + 1],
+                parameters[i + 1, self._transform_type_dofs:])
 
             # Compute residual slice_i(T(theta_i, x)) -
             # slice_{i+1}(T(theta_{i+1}, x))
@@ -1139,18 +1329,8 @@ class IntraStackRegistration(StackRegistrationBase):
 
             # Eliminate residual for non-masked regions
             if self._use_stack_mask_neighbour_fit_term:
-                slice_ip1_sitk_mask = sitk.Resample(
-                    self._slices_2D[i + 1].sitk_mask,
-                    self._slice_grid_2D_sitk,
-                    self._transforms_2D_sitk[i + 1],
-                    sitk.sitkNearestNeighbor)
-                slice_ip1_nda_mask = sitk.GetArrayFromImage(
-                    slice_ip1_sitk_mask)
-
-                residual_slice_nda = residual_slice_nda * slice_i_nda_mask * \
-                    slice_ip1_nda_mask
-
-                slice_i_nda_mask = slice_ip1_nda_mask
+                residual_slice_nda = residual_slice_nda * \
+                    slices_nda_mask[i] * slices_nda_mask[i + 1]
 
             # Set residual for current slice difference
             residual[i, :] = residual_slice_nda.flatten()
@@ -1181,154 +1361,239 @@ class IntraStackRegistration(StackRegistrationBase):
 
         # Reshape parameters for easier access
         parameters = parameters_vec.reshape(-1, self._optimization_dofs)
+        parameters_transform = parameters[:, 0:self._transform_type_dofs]
 
-        # Update transforms
-        i = 0
-        parameters_slice_i = parameters[i, 0:self._transform_type_dofs]
-        self._transforms_2D_sitk[i].SetParameters(parameters_slice_i)
-        self._transforms_2D_itk[i].SetParameters(
-            itk.OptimizerParameters[itk.D](parameters_slice_i))
+        # Get d[slice_i(T(theta_i, x))]/dtheta_i w.r.t. transform parameters
+        # for all slices
+        jacobians_nda = self._get_warped_slices_jacobian_nda(
+            parameters_transform)
+
+        # Get slice data arrays (used for intensity correction parameter
+        # gradient)
+        slices_nda = self._get_warped_slices_nda(parameters_transform)
+        if self._use_stack_mask_neighbour_fit_term:
+            slices_nda = slices_nda * self._get_warped_slices_nda_mask(
+                parameters_transform)
 
-        # Get d[slice_i(T(theta_i, x))]/dtheta_i
-        jacobian_slice_i = self._get_jacobian_slice_in_slice_neighbours_fit(
-            self._slices_2D[i],
-            self._transforms_2D_sitk[i],
-            self._transforms_2D_itk[i])
+        # Add Jacobian w.r.t. to intensity correction parameters
+        jacobians_slice = [
+            self._add_gradient_with_respect_to_intensity_correction_parameters[
+                self._intensity_correction_type_slice_neighbour_fit](
+                    jacobians_nda[i], slices_nda[i])
+            for i in range(0, self._N_slices)
+        ]
 
         # Compute Jacobian of residuals
         for i in range(0, self._N_slices - 1):
 
-            # Update transforms
-            parameters_slice_ip1 = parameters[
-                i + 1, 0:self._transform_type_dofs]
-            self._transforms_2D_sitk[i + 1].SetParameters(parameters_slice_ip1)
-            self._transforms_2D_itk[i + 1].SetParameters(
-                itk.OptimizerParameters[itk.D](parameters_slice_ip1))
-
-            # Get d[slice_{i+1}(T(theta_{i+1}, x))]/dtheta_{i+1}
-            jacobian_slice_ip1 = \
-                self._get_jacobian_slice_in_slice_neighbours_fit(
-                    self._slices_2D[i + 1],
-                    self._transforms_2D_sitk[i + 1],
-                    self._transforms_2D_itk[i + 1])
-
             # Set elements in Jacobian for entire stack
             jacobian[i * self._N_slice_voxels:
                      (i + 1) * self._N_slice_voxels,
                      i * self._optimization_dofs:
-                     (i + 1) * self._optimization_dofs] = jacobian_slice_i
+                     (i + 1) * self._optimization_dofs] = jacobians_slice[i]
             jacobian[i * self._N_slice_voxels:
                      (i + 1) * self._N_slice_voxels,
                      (i + 1) * self._optimization_dofs:
-                     (i + 2) * self._optimization_dofs] = -jacobian_slice_ip1
-
-            # Prepare for next iteration
-            jacobian_slice_i = jacobian_slice_ip1
+                     (i + 2) * self._optimization_dofs] = \
+                -jacobians_slice[i + 1]
 
         return jacobian
 
     ##
-    # Gets the Jacobian of a slice based on the spatial transformation.
-    # \date       2016-11-21 18:23:53+0000
+    # Gets the cached data of all slices warped by the given in-plane
+    # transform parameters.
+    # \date       2026-10-18 18:41:07+0000
+    #
+    # The residuals and Jacobians of the reference and the neighbour fit terms
+    # are evaluated for identical parameter vectors. Hence, the slices (and
+    # their masks) are warped only once per parameter vector and all derived
+    # quantities, i.e. image transforms, data arrays and Jacobian blocks, are
+    # computed on demand and kept until the parameters change. Cached arrays
+    # must not be modified in-place.
+    #
+    # \param      self                  The object
+    # \param      parameters_transform  The transform parameters of all slices
+    #                                   as (N_slices x transform_type_dofs)
+    #                                   numpy array
+    #
+    # \return     Dictionary of derived quantities of the warped slices
+    #
+    def _get_warped_slices_cache(self, parameters_transform):
+        key = np.array(parameters_transform, dtype=np.float64).tobytes()
+        if self._warped_slices_2D_cache.get("key") != key:
+            self._warped_slices_2D_cache = {"key": key}
+        return self._warped_slices_2D_cache
+
+    ##
+    # Gets the continuous indices of the slice grid points mapped into each
+    # slice by the respective in-plane transform, i.e. the sampling positions
+    # of slice_i(T(theta_i, x)).
+    # \date       2026-10-18 19:20:31+0000
+    #
+    # \param      self                  The object
+    # \param      parameters_transform  The transform parameters of all slices
+    #                                   as (N_slices x transform_type_dofs)
+    #                                   numpy array
+    #
+    # \return     Coordinates (slice, row, column) for map_coordinates as (3 x
+    #             N_slices * N_slice_voxels) numpy array and flag whether each
+    #             position lies inside the slice as (N_slices x Ny x Nx) numpy
+    #             array
+    #
+    def _get_warped_slices_coordinates(self, parameters_transform):
+        cache = self._get_warped_slices_cache(parameters_transform)
+        name = "coordinates"
+        if name not in cache:
+            matrices, translations = self._get_transform_matrices[
+                self._transform_type](parameters_transform)
+
+            # T(theta_i, x) = A_i (x - c_i) + c_i + t_i as (N_slices x
+            # N_slice_voxels x dim) array
+            points = np.einsum(
+                "nij,npj->npi", matrices, self._slice_grid_2D_points_centered)
+            points += (self._transforms_2D_centers + translations)[
+                :, np.newaxis, :]
+
+            # Continuous (x, y)-indices within each slice
+            indices = np.einsum(
+                "nij,npj->npi",
+                self._slices_2D_physical_to_index,
+                points - self._slices_2D_origins[:, np.newaxis, :])
+
+            # Same convention as sitk.Resample: Positions outside the slice
+            # (beyond half a voxel) are set to zero
+            size = np.array(self._slices_2D_nda.shape[:0:-1])
+            is_inside = np.all(
+                (indices >= -0.5) & (indices < size - 0.5), axis=2)
+
+            coordinates = np.zeros((3, indices.shape[0], indices.shape[1]))
+            coordinates[0, :, :] = np.arange(
+                self._N_slices)[:, np.newaxis]
+            coordinates[1, :, :] = indices[:, :, 1]
+            coordinates[2, :, :] = indices[:, :, 0]
+
+            cache[name] = (
+                coordinates.reshape(3, -1),
+                is_inside.reshape(self._slice_grid_2D_shape),
+            )
+        return cache[name]
+
+    ##
+    # Gets the slices warped by the transform parameters, i.e.
+    # slice_i(T(theta_i, x)) for all i, with applied image transform.
+    # \date       2026-10-18 18:41:52+0000
+    #
+    # \param      self                  The object
+    # \param      parameters_transform  The transform parameters of all slices
+    #                                   as (N_slices x transform_type_dofs)
+    #                                   numpy array
+    # \param      trafo                 The image transform, e.g. "identity"
+    #
+    # \return     The warped slices as (N_slices x Ny x Nx) numpy array
+    #
+    def _get_warped_slices_nda(self, parameters_transform, trafo="identity"):
+        cache = self._get_warped_slices_cache(parameters_transform)
+        name = ("slices_nda", trafo)
+        if name not in cache:
+            if trafo in ["identity"]:
+                coordinates, is_inside = \
+                    self._get_warped_slices_coordinates(parameters_transform)
+                slices_nda = map_coordinates(
+                    self._slices_2D_nda,
+                    coordinates,
+                    order=self._interpolator_order[self._interpolator],
+                    mode="nearest")
+                cache[name] = slices_nda.reshape(
+                    self._slice_grid_2D_shape) * is_inside
+            else:
+                cache[name] = self._apply_image_transform[trafo](
+                    self._get_warped_slices_nda(parameters_transform))
+        return cache[name]
+
+    def _get_warped_slices_nda_mask(self, parameters_transform):
+        cache = self._get_warped_slices_cache(parameters_transform)
+        name = "slices_nda_mask"
+        if name not in cache:
+            coordinates, is_inside = self._get_warped_slices_coordinates(
+                parameters_transform)
+            slices_nda_mask = map_coordinates(
+                self._slices_2D_nda_mask,
+                coordinates,
+                order=0,
+                mode="nearest")
+            cache[name] = slices_nda_mask.reshape(
+                self._slice_grid_2D_shape) * is_inside
+        return cache[name]
+
+    ##
+    # Gets the Jacobian of the warped slices with applied image transform
+    # w.r.t. the transform parameters (without masking and intensity
+    # correction).
+    # \date       2026-10-18 18:42:35+0000
     #
     # Compute the Jacobian
     # \f$ \frac{dI(T(\theta, x))}{d\theta} =
     # \frac{dI}{dy}(T(\theta,x))\,\frac{dT}{d\theta}(\theta, x)
-    # \f$. It also considers the (affine) intensity correction model
-    #
-    # \param      self            The object
-    # \param      slice           The slice
-    # \param      transform_sitk  The transform sitk
-    # \param      transform_itk   The transform itk
-    #
-    # \return     The Jacobian of a slice as (N_slice_voxels x
-    #             transform_type_dofs)-array.
-    #
-    def _get_jacobian_slice_in_slice_neighbours_fit(self,
-                                                    slice,
-                                                    transform_sitk,
-                                                    transform_itk):
-
-        # Get slice(T(theta, x))
-        slice_sitk = sitk.Resample(
-            slice.sitk,
-            self._slice_grid_2D_sitk,
-            transform_sitk,
-            self._interpolator_sitk)
-
-        # Get d[slice(T(theta, x))]/dx as (Ny x Nx x dim)-array
-        dslice_nda = self._get_gradient_image_nda_from_sitk_image(slice_sitk)
-
-        # Get slice data array (used for intensity correction parameter
-        # gradient)
-        slice_nda = sitk.GetArrayFromImage(slice_sitk)
-
-        if self._use_stack_mask_neighbour_fit_term:
-            slice_sitk_mask = sitk.Resample(
-                slice.sitk_mask,
-                self._slice_grid_2D_sitk,
-                transform_sitk,
-                sitk.sitkNearestNeighbor)
-            slice_nda_mask = sitk.GetArrayFromImage(slice_sitk_mask)
-
-            # slice_nda *= slice_nda_mask[:,:,np.newaxis]
-            slice_nda *= slice_nda_mask
-
-        # Get Jacobian of slice w.r.t to transform parameters
-        jacobian_slice_nda = \
-            self._get_gradient_with_respect_to_transform_parameters(
-                dslice_nda, transform_itk, slice_sitk)
-
-        # Add Jacobian w.r.t. to intensity correction parameters
-        jacobian_slice_nda = \
-            self._add_gradient_with_respect_to_intensity_correction_parameters[
-                self._intensity_correction_type_slice_neighbour_fit](
-                    jacobian_slice_nda, slice_nda)
-
-        return jacobian_slice_nda
+    # \f$ for all slices.
+    #
+    # \param      self                  The object
+    # \param      parameters_transform  The transform parameters of all slices
+    #                                   as (N_slices x transform_type_dofs)
+    #                                   numpy array
+    # \param      trafo                 The image transform, e.g. "identity"
+    #
+    # \return     The Jacobian as (N_slices x N_slice_voxels x
+    #             transform_type_dofs) numpy array
+    #
+    def _get_warped_slices_jacobian_nda(self,
+                                        parameters_transform,
+                                        trafo="identity"):
+        cache = self._get_warped_slices_cache(parameters_transform)
+        name = ("jacobians_nda", trafo)
+        if name not in cache:
+
+            # Get d[slice(T(theta, x))]/dx as (N_slices x N_slice_voxels x
+            # dim)-array
+            dslices_nda = self._get_gradient_image_nda(
+                self._get_warped_slices_nda(parameters_transform, trafo))
+            dslices_nda = dslices_nda.reshape(
+                self._N_slices, self._N_slice_voxels, -1)
+
+            # Get d[T(theta, x)]/dtheta as (N_slices x N_slice_voxels x dim x
+            # transform_type_dofs)-array
+            dT_nda = self._get_transform_jacobians[self._transform_type](
+                parameters_transform)
+
+            cache[name] = np.einsum("npi,npid->npd", dslices_nda, dT_nda)
+        return cache[name]
 
     ##
-    # Gets the gradient with respect to transform parameters of all voxels
-    # within a slice.
-    # \date       2017-07-15 23:03:10+0100
+    # Gets the gradient images of slices on the slice grid, i.e. central
+    # differences with zero-flux Neumann boundary conditions in physical
+    # space as computed by sitk.GradientImageFilter.
+    # \date       2026-10-18 19:22:10+0000
     #
-    # \param      self           The object
-    # \param      dslice_nda     The dslice nda
-    # \param      transform_itk  The transform itk
-    # \param      slice_sitk     The slice sitk
+    # \param      self        The object
+    # \param      slices_nda  The slices as (N_slices x Ny x Nx) numpy array
     #
-    # \return     The gradient with respect to transform parameters;
-    #             (N_slice_voxels x transform_type_dofs) numpy array
+    # \return     The gradient images as (N_slices x Ny x Nx x dim) numpy
+    #             array
     #
-    def _get_gradient_with_respect_to_transform_parameters(self,
-                                                           dslice_nda,
-                                                           transform_itk,
-                                                           slice_sitk):
-
-        # Reshape to (N_slice_voxels x dim)-array
-        dslice_nda = dslice_nda.reshape(self._N_slice_voxels, -1)
-
-        # Get d[T(theta, x)]/dtheta as (N_slice_voxels x dim x
-        # transform_type_dofs)-array
-        dT_nda = \
-            sitkh.get_numpy_array_of_jacobian_itk_transform_applied_on_sitk_image(
-                transform_itk, slice_sitk)
-
-        # Compute Jacobian for slice as (N_slice_voxels x
-        # transform_type_dofs)-array
-        jacobian_slice = np.sum(dslice_nda[:, :, np.newaxis] * dT_nda, axis=1)
-
-        return jacobian_slice
-
-    def _get_gradient_image_nda_from_sitk_image(self, slice_sitk):
-
-        # Compute d[slice(T(theta, x))]/dx
-        dslice_sitk = self._gradient_image_filter_sitk.Execute(slice_sitk)
+    def _get_gradient_image_nda(self, slices_nda):
+        slices_nda = np.pad(
+            slices_nda, ((0, 0), (1, 1), (1, 1)), mode="edge")
+        spacing = self._slice_grid_2D_spacing
 
-        # Get associated (Ny x Nx x dim)-array
-        dslice_nda = sitk.GetArrayFromImage(dslice_sitk)
+        # Derivatives along the image axes
+        dslices_nda = np.zeros(self._slice_grid_2D_shape + (2,))
+        dslices_nda[..., 0] = (slices_nda[:, 1:-1, 2:] -
+                               slices_nda[:, 1:-1, :-2]) / (2. * spacing[0])
+        dslices_nda[..., 1] = (slices_nda[:, 2:, 1:-1] -
+                               slices_nda[:, :-2, 1:-1]) / (2. * spacing[1])
 
-        return dslice_nda
+        # Derivatives along the physical axes
+        return np.einsum(
+            "...j,ij->...i", dslices_nda, self._slice_grid_2D_direction)
 
     # ##
     # # Gets the residual parameters for all optimization parameters
@@ -1465,31 +1730,21 @@ class IntraStackRegistration(StackRegistrationBase):
     # \f$ \partial_y \f$ and \f$ |\nabla | \f$.
     # \date       2016-12-01 03:08:50+0000
     #
-    # \param      self           The object
-    # \param      slice_2D_sitk  The slice 2d sitk
+    # \param      self        The object
+    # \param      slices_nda  The slices as (N_slices x Ny x Nx) numpy array
     #
-    def _apply_image_transform_identity(self, slice_2D_sitk):
-        return slice_2D_sitk
+    def _apply_image_transform_identity(self, slices_nda):
+        return slices_nda
 
-    def _apply_image_transform_dx(self, slice_2D_sitk):
-        dx_slice_2D_sitk = self._get_dx_image_sitk(slice_2D_sitk)
-        # Debug
-        # sitkh.show_sitk_image([slice_2D_sitk, dx_slice_2D_sitk], title=["original", "dx"])
-        return dx_slice_2D_sitk
+    def _apply_image_transform_dx(self, slices_nda):
+        return self._get_gradient_image_nda(slices_nda)[..., 0]
 
-    def _apply_image_transform_dy(self, slice_2D_sitk):
-        dy_slice_2D_sitk = self._get_dy_image_sitk(slice_2D_sitk)
-        # Debug
-        # sitkh.show_sitk_image([slice_2D_sitk, dy_slice_2D_sitk], title=["original", "dy"])
-        return dy_slice_2D_sitk
+    def _apply_image_transform_dy(self, slices_nda):
+        return self._get_gradient_image_nda(slices_nda)[..., 1]
 
-    def _apply_image_transform_gradient_magnitude(self, slice_2D_sitk):
-        gradient_magnitude_slice_2D_sitk = \
-            self._gradient_magnitude_filter_sitk.Execute(
-                slice_2D_sitk)
-        # Debug
-        # sitkh.show_sitk_image([slice_2D_sitk, gradient_magnitude_slice_2D_sitk], title=["original", "gradient_magnitude"])
-        return gradient_magnitude_slice_2D_sitk
+    def _apply_image_transform_gradient_magnitude(self, slices_nda):
+        return np.sqrt(np.sum(
+            self._get_gradient_image_nda(slices_nda)**2, axis=-1))
 
     def _get_dx_image_sitk(self, image_sitk):
         dimage_sitk = self._gradient_image_filter_sitk.Execute(image_sitk)
@@ -1984,20 +2239,111 @@ class IntraStackRegistration(StackRegistrationBase):
     def _new_rigid_transform_sitk(self):
         return sitk.Euler2DTransform()
 
-    def _new_rigid_transform_itk(self):
-        return itk.Euler2DTransform.New()
-
     def _new_similarity_transform_sitk(self):
         return sitk.Similarity2DTransform()
 
-    def _new_similarity_transform_itk(self):
-        return itk.Similarity2DTransform.New()
-
     def _new_affine_transform_sitk(self):
         return sitk.AffineTransform(2)
 
-    def _new_affine_transform_itk(self):
-        return itk.AffineTransform.D2.New()
+    ##
+    # Gets the matrices A_i and translations t_i of the in-plane transforms
+    # T(theta_i, x) = A_i (x - c_i) + c_i + t_i of all slices, i.e. with the
+    # parametrizations of sitk.Euler2DTransform, sitk.Similarity2DTransform
+    # and sitk.AffineTransform(2), respectively.
+    # \date       2026-10-18 19:24:02+0000
+    #
+    # \param      self                  The object
+    # \param      parameters_transform  The transform parameters of all slices
+    #                                   as (N_slices x transform_type_dofs)
+    #                                   numpy array
+    #
+    # \return     Matrices as (N_slices x dim x dim) and translations as
+    #             (N_slices x dim) numpy arrays
+    #
+    def _get_rigid_transform_matrices(self, parameters_transform):
+        matrices = self._get_rotation_matrices(parameters_transform[:, 0])
+        return matrices, parameters_transform[:, 1:3]
+
+    def _get_similarity_transform_matrices(self, parameters_transform):
+        matrices = self._get_rotation_matrices(parameters_transform[:, 1]) * \
+            parameters_transform[:, 0, np.newaxis, np.newaxis]
+        return matrices, parameters_transform[:, 2:4]
+
+    def _get_affine_transform_matrices(self, parameters_transform):
+        matrices = parameters_transform[:, 0:4].reshape(-1, 2, 2)
+        return matrices, parameters_transform[:, 4:6]
+
+    ##
+    # Gets the Jacobians of the in-plane transforms of all slices w.r.t. their
+    # transform parameters evaluated at the slice grid points.
+    # \date       2026-10-18 19:24:48+0000
+    #
+    # \param      self                  The object
+    # \param      parameters_transform  The transform parameters of all slices
+    #                                   as (N_slices x transform_type_dofs)
+    #                                   numpy array
+    #
+    # \return     Jacobians as (N_slices x N_slice_voxels x dim x
+    #             transform_type_dofs) numpy array
+    #
+    def _get_rigid_transform_jacobians(self, parameters_transform):
+        dT_nda = np.zeros((self._N_slices, self._N_slice_voxels, 2, 3))
+
+        # Derivative w.r.t. angle
+        dT_nda[:, :, :, 0] = np.einsum(
+            "nij,npj->npi",
+            self._get_rotation_matrices_derivative(
+                parameters_transform[:, 0]),
+            self._slice_grid_2D_points_centered)
+
+        # Derivatives w.r.t. translation
+        dT_nda[:, :, :, 1:3] = np.eye(2)
+
+        return dT_nda
+
+    def _get_similarity_transform_jacobians(self, parameters_transform):
+        dT_nda = np.zeros((self._N_slices, self._N_slice_voxels, 2, 4))
+
+        # Derivative w.r.t. scale
+        dT_nda[:, :, :, 0] = np.einsum(
+            "nij,npj->npi",
+            self._get_rotation_matrices(parameters_transform[:, 1]),
+            self._slice_grid_2D_points_centered)
+
+        # Derivative w.r.t. angle
+        dT_nda[:, :, :, 1] = np.einsum(
+            "nij,npj->npi",
+            self._get_rotation_matrices_derivative(
+                parameters_transform[:, 1]) *
+            parameters_transform[:, 0, np.newaxis, np.newaxis],
+            self._slice_grid_2D_points_centered)
+
+        # Derivatives w.r.t. translation
+        dT_nda[:, :, :, 2:4] = np.eye(2)
+
+        return dT_nda
+
+    def _get_affine_transform_jacobians(self, parameters_transform):
+        dT_nda = np.zeros((self._N_slices, self._N_slice_voxels, 2, 6))
+
+        # Derivatives w.r.t. matrix elements (row-major)
+        dT_nda[:, :, 0, 0:2] = self._slice_grid_2D_points_centered
+        dT_nda[:, :, 1, 2:4] = self._slice_grid_2D_points_centered
+
+        # Derivatives w.r.t. translation
+        dT_nda[:, :, :, 4:6] = np.eye(2)
+
+        return dT_nda
+
+    @staticmethod
+    def _get_rotation_matrices(angles):
+        cos, sin = np.cos(angles), np.sin(angles)
+        return np.array([[cos, -sin], [sin, cos]]).transpose(2, 0, 1)
+
+    @staticmethod
+    def _get_rotation_matrices_derivative(angles):
+        cos, sin = np.cos(angles), np.sin(angles)
+        return np.array([[-sin, -cos], [cos, -sin]]).transpose(2, 0, 1)
 
     ##
     # Perform motion correction based on performed registration to get motion
@@ -2128,11 +2474,12 @@ class IntraStackRegistration(StackRegistrationBase):
             spacing[0:-1] *= scale
 
             slices_corrected[i].sitk.SetSpacing(spacing)
-            slices_corrected[i].sitk_mask.SetSpacing(spacing)
             slices_corrected[i].itk = sitkh.get_itk_from_sitk_image(
                 slices_corrected[i].sitk)
-            slices_corrected[i].itk_mask = \
-                sitkh.get_itk_from_sitk_image(slices_corrected[i].sitk_mask)
+            if not slices_corrected[i].is_unity_mask():
+                slices_corrected[i].sitk_mask.SetSpacing(spacing)
+                slices_corrected[i].itk_mask = sitkh.get_itk_from_sitk_image(
+                    slices_corrected[i].sitk_mask)
 
             # Update affine transform (including scaling information)
             affine_3D_sitk = sitk.AffineTransform(3)
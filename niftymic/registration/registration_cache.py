@@ -0,0 +1,208 @@
+##
+# \file registration_cache.py
+# \brief      Class to store and retrieve registration transforms on disk so
+#             that identical registrations are not re-run.
+#
+# Transforms are stored as <key>.tfm whereby the key is an MD5 hash of the
+# fixed and moving images (intensities and geometry), the used masks, the
+# registration method and its settings, and the initial transform.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import hashlib
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+import pysitk.simple_itk_helper as sitkh
+
+
+##
+# Class to cache registration transforms keyed by image content and
+# registration parameters
+# \date       2026-10-19 09:12:31+0000
+#
+class RegistrationCache(object):
+
+    ##
+    # Store cache directory
+    # \date       2026-10-19 09:12:58+0000
+    #
+    # \param      self       The object
+    # \param      directory  Directory where transforms are written to/read
+    #                        from, string
+    # \param      verbose    Verbose output, bool
+    #
+    def __init__(self, directory, verbose=True):
+        self._directory = directory
+        self._verbose = verbose
+
+    def get_directory(self):
+        return self._directory
+
+    ##
+    # Gets the cache key of a registration.
+    # \date       2026-10-19 09:13:40+0000
+    #
+    # \param      self                 The object
+    # \param      fixed_sitk           Fixed image as sitk.Image
+    # \param      moving_sitk          Moving image as sitk.Image
+    # \param      method               Name of registration method, string
+    # \param      fixed_sitk_mask      Fixed mask as sitk.Image or None
+    # \param      moving_sitk_mask     Moving mask as sitk.Image or None
+    # \param      options              Registration settings, string
+    # \param      transform_init_sitk  Initial transform as sitk.Transform or
+    #                                  None
+    #
+    # \return     MD5 hex digest as string
+    #
+    def get_key(self,
+                fixed_sitk,
+                moving_sitk,
+                method,
+                fixed_sitk_mask=None,
+                moving_sitk_mask=None,
+                options="",
+                transform_init_sitk=None,
+                ):
+        md5 = hashlib.md5()
+        md5.update(("%s\n%s\n" % (method, options)).encode("utf-8"))
+        for image_sitk in [
+                fixed_sitk, moving_sitk, fixed_sitk_mask, moving_sitk_mask]:
+            self._update_hash_image(md5, image_sitk)
+
+        if transform_init_sitk is None:
+            md5.update(b"None\n")
+        else:
+            md5.update(("%s\n%s\n%s\n" % (
+                transform_init_sitk.GetName(),
+                repr(tuple(transform_init_sitk.GetParameters())),
+                repr(tuple(transform_init_sitk.GetFixedParameters())),
+            )).encode("utf-8"))
+
+        return md5.hexdigest()
+
+    ##
+    # Gets the cache key of a registration defined by a RegistrationMethod
+    # object.
+    #
+    # Settings are given by all attributes of primitive type; verbosity and
+    # (cached) SimpleITK objects are ignored.
+    # \date       2026-10-19 09:14:52+0000
+    #
+    # \param      self                 The object
+    # \param      registration_method  RegistrationMethod object with set
+    #                                  fixed and moving images
+    #
+    # \return     MD5 hex digest as string
+    #
+    def get_key_from_registration_method(self, registration_method):
+        settings = [
+            (k, v) for k, v in sorted(vars(registration_method).items())
+            if "verbose" not in k and "sitk" not in k and
+            self._is_primitive(v)
+        ]
+
+        fixed = registration_method.get_fixed()
+        moving = registration_method.get_moving()
+        return self.get_key(
+            fixed_sitk=fixed.sitk,
+            moving_sitk=moving.sitk,
+            method=registration_method.__class__.__name__,
+            fixed_sitk_mask=fixed.sitk_mask
+            if registration_method._use_fixed_mask else None,
+            moving_sitk_mask=moving.sitk_mask
+            if registration_method._use_moving_mask else None,
+            options=repr(settings),
+        )
+
+    ##
+    # Reads the cached transform.
+    # \date       2026-10-19 09:15:30+0000
+    #
+    # \param      self  The object
+    # \param      key   Cache key as obtained by get_key, string
+    #
+    # \return     Transform as sitk.Transform or None if not cached
+    #
+    def read_transform_sitk(self, key):
+        path_to_transform = self._get_path_to_transform(key)
+        if not ph.file_exists(path_to_transform):
+            return None
+
+        if self._verbose:
+            ph.print_info("Registration transform read from cache '%s'" % (
+                path_to_transform))
+        return sitkh.read_transform_sitk(path_to_transform)
+
+    ##
+    # Writes the transform to the cache.
+    #
+    # The transform is written to a temporary file first so that concurrent
+    # or interrupted runs never leave a partially written transform behind.
+    # \date       2026-10-19 09:16:02+0000
+    #
+    # \param      self            The object
+    # \param      key             Cache key as obtained by get_key, string
+    # \param      transform_sitk  Transform as sitk.Transform
+    #
+    def write_transform_sitk(self, key, transform_sitk):
+        ph.create_directory(self._directory)
+        path_to_transform = self._get_path_to_transform(key)
+        path_to_tmp = os.path.join(
+            self._directory, "%s_%d.tmp.tfm" % (key, os.getpid()))
+        sitk.WriteTransform(transform_sitk, path_to_tmp)
+        os.rename(path_to_tmp, path_to_transform)
+
+    ##
+    # Run registration method unless its result is cached already
+    # \date       2026-10-19 09:16:47+0000
+    #
+    # \param      self                 The object
+    # \param      registration_method  RegistrationMethod object with set
+    #                                  fixed and moving images
+    #
+    # \return     Registration transform as sitk.Transform
+    #
+    def run(self, registration_method):
+        key = self.get_key_from_registration_method(registration_method)
+        transform_sitk = self.read_transform_sitk(key)
+        if transform_sitk is None:
+            registration_method.run()
+            transform_sitk = \
+                registration_method.get_registration_transform_sitk()
+            self.write_transform_sitk(key, transform_sitk)
+        return transform_sitk
+
+    def _get_path_to_transform(self, key):
+        return os.path.join(self._directory, "%s.tfm" % key)
+
+    @staticmethod
+    def _update_hash_image(md5, image_sitk):
+        if image_sitk is None:
+            md5.update(b"None\n")
+            return
+
+        md5.update(("%s\n%s\n%s\n%s\n%s\n" % (
+            image_sitk.GetPixelIDTypeAsString(),
+            repr(image_sitk.GetSize()),
+            repr(image_sitk.GetSpacing()),
+            repr(image_sitk.GetOrigin()),
+            repr(image_sitk.GetDirection()),
+        )).encode("utf-8"))
+        nda = np.ascontiguousarray(sitk.GetArrayViewFromImage(image_sitk))
+        md5.update(nda.tobytes())
+
+    @staticmethod
+    def _is_primitive(value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return True
+        if isinstance(value, (list, tuple)):
+            return all(RegistrationCache._is_primitive(v) for v in value)
+        if isinstance(value, dict):
+            return all(RegistrationCache._is_primitive(v)
+                       for v in value.values())
+        return False
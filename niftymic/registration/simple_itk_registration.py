@@ -8,6 +8,7 @@
 
 # Import libraries
 import os
+import itertools
 import numpy as np
 import itk
 import SimpleITK as sitk
@@ -18,7 +19,6 @@ from ast import literal_eval
 
 import pysitk.simple_itk_helper as sitkh
 import pysitk.python_helper as ph
-import simplereg.simple_itk_registration
 
 import niftymic.base.psf as psf
 import niftymic.base.stack as st
@@ -60,6 +60,7 @@ class SimpleItkRegistration(AffineRegistrationMethod):
         use_multiresolution_framework=False,
         shrink_factors=[2, 1],
         smoothing_sigmas=[1, 0],
+        search_range=None,
         use_verbose=False,
     ):
 
@@ -94,11 +95,68 @@ class SimpleItkRegistration(AffineRegistrationMethod):
         self._shrink_factors = shrink_factors
         self._smoothing_sigmas = smoothing_sigmas
 
+        # Maximum expected displacement of the fixed image in mm used to crop
+        # the moving image for each registration
+        self._search_range = search_range
+
+        # Registration method set up once per moving image, moving mask and
+        # settings
+        self._registration_method_sitk = None
+        self._registration_method_sitk_moving = None
+        self._registration_method_sitk_settings = None
+
+        # Blurred moving image (oriented PSF) as tuple of moving image, sigma
+        # and blurred image
+        self._moving_sitk_blurred = None
+
+        # Smoothed moving images of all resolution levels as tuple of moving
+        # image and list of smoothed images
+        self._moving_sitk_pyramid = None
+
+    ##
+    # Shallow copy of the registration method which sets up its own SimpleITK
+    # registration method. Thus, copies can be run concurrently, e.g. in
+    # separate threads.
+    # \date       2026-10-18 22:16:05+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Copy of the registration method
+    #
+    def __copy__(self):
+        registration = self.__class__.__new__(self.__class__)
+        registration.__dict__.update(self.__dict__)
+
+        registration._registration_method_sitk = None
+        registration._registration_method_sitk_moving = None
+        registration._registration_method_sitk_settings = None
+        registration._moving_sitk_blurred = None
+        registration._moving_sitk_pyramid = None
+
+        return registration
+
     # Use multiresolution framework
     #  \param[in] flag boolean
     def use_multiresolution_framework(self, flag):
         self._use_multiresolution_framework = flag
 
+    ##
+    # Sets the search range, i.e. the maximum expected displacement of the
+    # fixed image during registration in mm. If given, the moving image is
+    # cropped to the region the fixed image can reach before each
+    # registration. It must also cover the optimizer's line search probes.
+    # Otherwise, results can differ from the uncropped registration.
+    # \date       2026-10-19 15:02:44+0000
+    #
+    # \param      self          The object
+    # \param      search_range  The search range in mm as float or None
+    #
+    def set_search_range(self, search_range):
+        self._search_range = search_range
+
+    def get_search_range(self):
+        return self._search_range
+
     # Decide whether oriented PSF shall be applied, i.e. blur moving image
     #  with (axis aligned) Gaussian kernel given by the relative position of
     #  the coordinate systems of fixed and moving
@@ -150,75 +208,446 @@ class SimpleItkRegistration(AffineRegistrationMethod):
         else:
             self._scales_estimator = scales_estimator
 
+    ##
+    # Register fixed to moving image. The SimpleITK registration method is
+    # set up once for the moving image and the chosen settings and only the
+    # fixed image changes between calls, e.g. for all slices during
+    # slice-to-volume registration.
+    #
+    # With the multiresolution framework, each resolution level is run as
+    # separate registration. The smoothed moving images of all levels are
+    # computed once and shared between calls, whereas SimpleITK would smooth
+    # the moving image again at every level of every call.
+    #
+    # With search range, each (smoothed) moving image is cropped to the
+    # footprint of the fixed image enlarged by the search range. The moving
+    # mask is not cropped as it is evaluated in physical space.
+    # \date       2026-10-18 20:24:51+0000
+    #
+    # \param      self  The object
+    #
     def _run(self):
 
-        if self._use_fixed_mask:
-            fixed_sitk_mask = self._fixed.sitk_mask
+        registration_method_sitk = self._get_registration_method_sitk()
+        moving_sitk = self._get_moving_sitk()
+
+        registration_transform_sitk = \
+            self._get_initial_transform_sitk(moving_sitk)
+
+        if self._use_verbose:
+            self._print_info_text()
+
+        if self._use_multiresolution_framework:
+            moving_sitk_pyramid = self._get_moving_sitk_pyramid(moving_sitk)
+            levels = zip(self._shrink_factors, self._smoothing_sigmas,
+                         moving_sitk_pyramid)
         else:
-            fixed_sitk_mask = None
+            levels = [(1, 0, moving_sitk)]
+
+        region = self._get_moving_region(
+            moving_sitk, registration_transform_sitk)
+
+        for shrink_factor, smoothing_sigma, moving_sitk_level in levels:
+            if region is not None:
+                moving_sitk_level = moving_sitk_level[region]
+
+            fixed_sitk, fixed_sitk_mask = self._get_fixed_sitk_at_level(
+                shrink_factor, smoothing_sigma)
+
+            registration_method_sitk.SetInitialTransform(
+                registration_transform_sitk, inPlace=True)
+            if self._use_fixed_mask:
+                registration_method_sitk.SetMetricFixedMask(fixed_sitk_mask)
+
+            registration_transform_sitk = registration_method_sitk.Execute(
+                fixed_sitk, moving_sitk_level)
+
+            if self._use_verbose and self._use_multiresolution_framework:
+                ph.print_info(
+                    "Level (shrink factor %s, smoothing sigma %s): "
+                    "Final metric value: %s" % (
+                        shrink_factor, smoothing_sigma,
+                        registration_method_sitk.GetMetricValue()))
+
+        self._registration_transform_sitk = \
+            self._get_transform_sitk_of_registration_type(
+                registration_transform_sitk)
+
+        if self._use_verbose:
+            ph.print_info("Summary SimpleItkRegistration:")
+            ph.print_info("\tOptimizer\'s stopping condition: %s" % (
+                registration_method_sitk.GetOptimizerStopConditionDescription()))
+            ph.print_info("\tFinal metric value: %s" % (
+                registration_method_sitk.GetMetricValue()))
+            sitkh.print_sitk_transform(self._registration_transform_sitk)
+
+    ##
+    # Gets the SimpleITK registration method configured for the current
+    # moving image and settings. It is only created if the moving image or
+    # mask (or their position) or any setting changed since the last call.
+    # Images are compared by identity of their sitk.Image objects as the
+    # moving Stack might be updated in place, e.g. the reconstruction between
+    # two slice-to-volume registration cycles.
+    # \date       2026-10-18 20:26:13+0000
+    #
+    # \param      self  The object
+    #
+    # \return     The registration method as sitk.ImageRegistrationMethod
+    #
+    def _get_registration_method_sitk(self):
+
+        settings = (
+            self._moving.sitk.GetOrigin(),
+            self._moving.sitk.GetDirection(),
+            self._use_fixed_mask,
+            self._use_moving_mask,
+            self._interpolator,
+            self._metric,
+            str(self._metric_params),
+            self._optimizer,
+            str(self._optimizer_params),
+            self._scales_estimator,
+            self._use_multiresolution_framework,
+            str(self._shrink_factors),
+            str(self._smoothing_sigmas),
+        )
+        moving = (self._moving.sitk, self._moving.sitk_mask)
+        if self._registration_method_sitk is not None and \
+                self._registration_method_sitk_moving[0] is moving[0] and \
+                self._registration_method_sitk_moving[1] is moving[1] and \
+                self._registration_method_sitk_settings == settings:
+            return self._registration_method_sitk
+
+        if self._metric_params is not None:
+            if type(self._metric_params) is not dict:
+                raise IOError("metric_params must be of type dict")
+            if not self._metric_params:
+                raise IOError("metric_params cannot be an empty dict")
+
+        registration_method_sitk = sitk.ImageRegistrationMethod()
 
         if self._use_moving_mask:
-            moving_sitk_mask = self._moving.sitk_mask
+            # Recasting avoids problems which can occur for some images
+            registration_method_sitk.SetMetricMovingMask(
+                sitk.Cast(self._moving.sitk_mask, sitk.sitkUInt8))
+
+        registration_method_sitk.SetInterpolator(
+            eval("sitk.sitk%s" % (self._interpolator)))
+
+        if self._metric_params is None:
+            eval("registration_method_sitk.SetMetricAs%s" % (self._metric))()
+        else:
+            eval("registration_method_sitk.SetMetricAs%s" % (self._metric))(
+                **self._metric_params)
+
+        eval("registration_method_sitk.SetOptimizerAs%s" % (self._optimizer))(
+            **self._optimizer_params)
+
+        # Estimate scales of transform parameters, e.g. from the maximum voxel
+        # shift in physical space caused by a parameter change
+        eval("registration_method_sitk.SetOptimizerScalesFrom%s" % (
+            self._scales_estimator))()
+
+        if self._use_multiresolution_framework and \
+                len(self._shrink_factors) != len(self._smoothing_sigmas):
+            raise ValueError(
+                "Number of shrink factors and smoothing sigmas must match")
+
+        self._registration_method_sitk = registration_method_sitk
+        self._registration_method_sitk_moving = moving
+        self._registration_method_sitk_settings = settings
+
+        # Blurred and smoothed moving images depend on the moving image
+        self._moving_sitk_blurred = None
+        self._moving_sitk_pyramid = None
+
+        return self._registration_method_sitk
+
+    ##
+    # Gets the moving image used for registration. With oriented PSF, the
+    # moving image is blurred with an (axis aligned) Gaussian whose
+    # covariance depends on the relative position of fixed and moving image.
+    # The blurred moving image is kept for subsequent calls with identical
+    # covariance, e.g. for all slices of a stack.
+    # \date       2026-10-18 20:28:40+0000
+    #
+    # \param      self  The object
+    #
+    # \return     The moving image as sitk.Image object
+    #
+    def _get_moving_sitk(self):
+
+        if not self._use_oriented_psf:
+            return self._moving.sitk
+
+        # Get oriented Gaussian covariance matrix
+        cov_HR_coord = psf.PSF(
+        ).get_covariance_matrix_in_reconstruction_space(
+            self._fixed, self._moving)
+        sigma_axis_aligned = np.sqrt(np.diagonal(cov_HR_coord))
+
+        if self._moving_sitk_blurred is not None and \
+                self._moving_sitk_blurred[0] is self._moving.itk and \
+                np.array_equal(
+                    self._moving_sitk_blurred[1], sigma_axis_aligned):
+            return self._moving_sitk_blurred[2]
+
+        # Create recursive YVV Gaussianfilter
+        image_type = itk.Image[itk.D, self._fixed.sitk.GetDimension()]
+        gaussian_yvv = itk.SmoothingRecursiveYvvGaussianImageFilter[
+            image_type, image_type].New()
+
+        # Feed Gaussian filter with axis aligned covariance matrix
+        print("Oriented PSF blurring with (axis aligned) sigma = " +
+              str(sigma_axis_aligned))
+        print("\t(Based on computed covariance matrix = ")
+        for i in range(0, 3):
+            print("\t\t" + str(cov_HR_coord[i, :]))
+        print("\twith square root of diagonal " +
+              str(np.diagonal(cov_HR_coord)) + ")")
+
+        gaussian_yvv.SetInput(self._moving.itk)
+        gaussian_yvv.SetSigmaArray(sigma_axis_aligned)
+        gaussian_yvv.Update()
+        moving_itk = gaussian_yvv.GetOutput()
+        moving_itk.DisconnectPipeline()
+        moving_sitk = sitkh.get_sitk_from_itk_image(moving_itk)
+
+        self._moving_sitk_blurred = (
+            self._moving.itk, sigma_axis_aligned, moving_sitk)
+
+        return moving_sitk
+
+    ##
+    # Gets the moving image smoothed for each resolution level of the
+    # multiresolution framework, i.e. the Gaussian smoothing (in physical
+    # units) SimpleITK would apply at each level. The moving image is not
+    # shrunk as the resolution of each level is given by the fixed image. The
+    # images are kept for subsequent calls with the same moving image, e.g.
+    # for all slices of a slice-to-volume registration cycle.
+    # \date       2026-10-18 21:02:37+0000
+    #
+    # \param      self         The object
+    # \param      moving_sitk  The moving image as sitk.Image object
+    #
+    # \return     List of smoothed moving images as sitk.Image objects
+    #
+    def _get_moving_sitk_pyramid(self, moving_sitk):
+
+        if self._moving_sitk_pyramid is not None and \
+                self._moving_sitk_pyramid[0] is moving_sitk:
+            return self._moving_sitk_pyramid[1]
+
+        moving_sitk_pyramid = [
+            self._get_smoothed_sitk(moving_sitk, smoothing_sigma)
+            for smoothing_sigma in self._smoothing_sigmas
+        ]
+        self._moving_sitk_pyramid = (moving_sitk, moving_sitk_pyramid)
+
+        return moving_sitk_pyramid
+
+    ##
+    # Gets the region of the moving image the fixed image can reach during
+    # registration, i.e. the bounding box of the fixed image mapped by the
+    # initial transform and enlarged by the search range plus one voxel for
+    # interpolation.
+    # \date       2026-10-19 15:05:31+0000
+    #
+    # \param      self            The object
+    # \param      moving_sitk     The moving image as sitk.Image object
+    # \param      transform_sitk  The initial transform as sitk.Transform
+    #                             object
+    #
+    # \return     Region as tuple of slice objects; None if no search range
+    #             is given or the region covers the entire moving image
+    #
+    def _get_moving_region(self, moving_sitk, transform_sitk):
+
+        if self._search_range is None:
+            return None
+
+        # Fixed image corners (including voxel extent) in moving voxel space
+        fixed_sitk = self._fixed.sitk
+        indices = np.array([
+            moving_sitk.TransformPhysicalPointToContinuousIndex(
+                transform_sitk.TransformPoint(
+                    fixed_sitk.TransformContinuousIndexToPhysicalPoint(
+                        corner)))
+            for corner in itertools.product(
+                *[[-0.5, n - 0.5] for n in fixed_sitk.GetSize()])
+        ])
+
+        margin = self._search_range / np.array(moving_sitk.GetSpacing()) + 1
+        size = np.array(moving_sitk.GetSize())
+        lower = np.maximum(0, np.floor(
+            np.min(indices, axis=0) - margin)).astype(int)
+        upper = np.minimum(size, np.ceil(
+            np.max(indices, axis=0) + margin).astype(int) + 1)
+
+        if np.any(lower >= upper) or \
+                (np.all(lower == 0) and np.all(upper == size)):
+            return None
+
+        return tuple(slice(a, b) for a, b in zip(lower, upper))
+
+    ##
+    # Gets the fixed image and its mask at a resolution level of the
+    # multiresolution framework. Axes with fewer voxels than the shrink
+    # factor, e.g. the through-plane direction of a slice, are not shrunk.
+    # \date       2026-10-18 21:04:10+0000
+    #
+    # \param      self             The object
+    # \param      shrink_factor    The shrink factor of the level, int
+    # \param      smoothing_sigma  The smoothing sigma of the level in
+    #                              physical units, float
+    #
+    # \return     Tuple of fixed image and fixed mask as sitk.Image objects
+    #
+    def _get_fixed_sitk_at_level(self, shrink_factor, smoothing_sigma):
+
+        fixed_sitk = self._get_smoothed_sitk(
+            self._fixed.sitk, smoothing_sigma)
+        fixed_sitk_mask = self._fixed.sitk_mask
+
+        if shrink_factor != 1:
+            shrink_factors = [min(shrink_factor, n)
+                              for n in fixed_sitk.GetSize()]
+            fixed_sitk = sitk.Shrink(fixed_sitk, shrink_factors)
+            fixed_sitk_mask = sitk.Shrink(fixed_sitk_mask, shrink_factors)
+
+        return fixed_sitk, fixed_sitk_mask
+
+    ##
+    # Smooth image with a Gaussian kernel whose standard deviation is given in
+    # physical units. Axes with fewer than four voxels, e.g. the through-plane
+    # direction of a slice, are not smoothed.
+    # \date       2026-10-18 21:05:52+0000
+    #
+    # \param      image_sitk       The image as sitk.Image object
+    # \param      smoothing_sigma  The standard deviation in physical units,
+    #                              float
+    #
+    # \return     The smoothed image as sitk.Image object
+    #
+    @staticmethod
+    def _get_smoothed_sitk(image_sitk, smoothing_sigma):
+        if smoothing_sigma == 0:
+            return image_sitk
+
+        # Recursive Gaussian filter requires at least four voxels per axis
+        if min(image_sitk.GetSize()) >= 4:
+            smoothed_sitk = sitk.SmoothingRecursiveGaussian(
+                image_sitk, float(smoothing_sigma))
         else:
-            moving_sitk_mask = None
-
-        # Blur moving image with oriented Gaussian prior to the registration
-        if self._use_oriented_psf:
-
-            # Get oriented Gaussian covariance matrix
-            cov_HR_coord = psf.PSF(
-            ).get_covariance_matrix_in_reconstruction_space(
-                self._fixed, self._moving)
-
-            # Create recursive YVV Gaussianfilter
-            image_type = itk.Image[itk.D, self._fixed.sitk.GetDimension()]
-            gaussian_yvv = itk.SmoothingRecursiveYvvGaussianImageFilter[
-                image_type, image_type].New()
-
-            # Feed Gaussian filter with axis aligned covariance matrix
-            sigma_axis_aligned = np.sqrt(np.diagonal(cov_HR_coord))
-            print("Oriented PSF blurring with (axis aligned) sigma = " +
-                  str(sigma_axis_aligned))
-            print("\t(Based on computed covariance matrix = ")
-            for i in range(0, 3):
-                print("\t\t" + str(cov_HR_coord[i, :]))
-            print("\twith square root of diagonal " +
-                  str(np.diagonal(cov_HR_coord)) + ")")
-
-            gaussian_yvv.SetInput(self._moving.itk)
-            gaussian_yvv.SetSigmaArray(sigma_axis_aligned)
-            gaussian_yvv.Update()
-            moving_itk = gaussian_yvv.GetOutput()
-            moving_itk.DisconnectPipeline()
-            moving_sitk = sitkh.get_sitk_from_itk_image(moving_itk)
+            variance = [float(smoothing_sigma) ** 2 if n >= 4 else 0.
+                        for n in image_sitk.GetSize()]
+            smoothed_sitk = sitk.DiscreteGaussian(image_sitk, variance)
+
+        return sitk.Cast(smoothed_sitk, image_sitk.GetPixelIDValue())
+
+    ##
+    # Gets the initial transform for the current fixed image.
+    # \date       2026-10-18 20:30:02+0000
+    #
+    # \param      self         The object
+    # \param      moving_sitk  The moving image as sitk.Image object
+    #
+    # \return     The initial transform as sitk.Transform object
+    #
+    def _get_initial_transform_sitk(self, moving_sitk):
+
+        dimension = self._fixed.sitk.GetDimension()
+
+        if self._registration_type == "Rigid":
+            # VersorRigid2DTransform does not exist, unfortunately
+            if dimension == 2:
+                initial_transform_sitk = sitk.Euler2DTransform()
+            else:
+                initial_transform_sitk = sitk.VersorRigid3DTransform()
+
+        elif self._registration_type == "Similarity":
+            initial_transform_sitk = eval(
+                "sitk.Similarity%dDTransform()" % (dimension))
+
+        elif self._registration_type == "Affine":
+            initial_transform_sitk = sitk.AffineTransform(dimension)
 
         else:
-            moving_sitk = self._moving.sitk
-
-        self._registration_method = \
-            simplereg.simple_itk_registration.SimpleItkRegistration(
-                fixed_sitk=self._fixed.sitk,
-                moving_sitk=moving_sitk,
-                fixed_sitk_mask=fixed_sitk_mask,
-                moving_sitk_mask=moving_sitk_mask,
-                registration_type=self._registration_type,
-                interpolator=self._interpolator,
-                metric=self._metric,
-                metric_params=self._metric_params,
-                optimizer=self._optimizer,
-                optimizer_params=self._optimizer_params,
-                initializer_type=self._initializer_type,
-                use_multiresolution_framework=self._use_multiresolution_framework,
-                optimizer_scales=self._scales_estimator,
-                shrink_factors=self._shrink_factors,
-                smoothing_sigmas=self._smoothing_sigmas,
-                verbose=self._use_verbose,
-            )
-
-        self._registration_method.run()
+            raise ValueError("Registration type '%s' not known." %
+                             (self._registration_type))
+
+        if self._initializer_type is None:
+            return initial_transform_sitk
+
+        if self._initializer_type in ["MOMENTS", "GEOMETRY"]:
+            initializer_moving_sitk = moving_sitk
+            initializer_type = self._initializer_type
+        elif self._initializer_type == "SelfMOMENTS":
+            initializer_moving_sitk = self._fixed.sitk
+            initializer_type = "MOMENTS"
+        elif self._initializer_type == "SelfGEOMETRY":
+            initializer_moving_sitk = self._fixed.sitk
+            initializer_type = "GEOMETRY"
+        else:
+            raise ValueError("Initializer type '%s' unknown"
+                             % (self._initializer_type))
 
-        self._registration_transform_sitk = \
-            self._registration_method.get_registration_transform_sitk()
+        return sitk.CenteredTransformInitializer(
+            self._fixed.sitk,
+            initializer_moving_sitk,
+            initial_transform_sitk,
+            eval("sitk.CenteredTransformInitializerFilter.%s" % (
+                initializer_type)))
+
+    ##
+    # Gets the obtained registration transform as transform of the chosen
+    # registration type. Rigid 3D transforms are returned as
+    # sitk.Euler3DTransform.
+    # \date       2026-10-18 20:31:17+0000
+    #
+    # \param      self                         The object
+    # \param      registration_transform_sitk  The registration transform
+    #
+    # \return     The registration transform as sitk.Transform object
+    #
+    def _get_transform_sitk_of_registration_type(
+            self, registration_transform_sitk):
+
+        dimension = self._fixed.sitk.GetDimension()
+
+        if self._registration_type == "Rigid":
+            if dimension == 2:
+                return sitk.Euler2DTransform(registration_transform_sitk)
+
+            # Transform from VersorRigid to Euler
+            versor_rigid_sitk = sitk.VersorRigid3DTransform(
+                registration_transform_sitk)
+            transform_sitk = sitk.Euler3DTransform()
+            transform_sitk.SetMatrix(versor_rigid_sitk.GetMatrix())
+            transform_sitk.SetTranslation(versor_rigid_sitk.GetTranslation())
+            transform_sitk.SetCenter(versor_rigid_sitk.GetCenter())
+            return transform_sitk
+
+        elif self._registration_type == "Similarity":
+            return eval("sitk.Similarity%dDTransform" % (dimension))(
+                registration_transform_sitk)
+
+        return sitk.AffineTransform(registration_transform_sitk)
+
+    def _print_info_text(self):
+        ph.print_info("Registration: SimpleITK")
+        ph.print_info("Transform Model: %s" % (self._registration_type))
+        ph.print_info("Interpolator: %s" % (self._interpolator))
+        ph.print_info("Metric: %s" % (self._metric))
+        ph.print_info("CenteredTransformInitializer: %s" %
+                      (self._initializer_type))
+        ph.print_info("Optimizer: %s" % (self._optimizer))
+        ph.print_info("Optimizer Scales Estimator: %s" %
+                      (self._scales_estimator))
+        ph.print_info("Use Multiresolution Framework: %s" %
+                      (self._use_multiresolution_framework))
+        ph.print_info("Use Fixed Mask: %s" % (self._use_fixed_mask))
+        ph.print_info("Use Moving Mask: %s" % (self._use_moving_mask))
 
     def _get_warped_moving_sitk(self):
         warped_moving_sitk = sitk.Resample(
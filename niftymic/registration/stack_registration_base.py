@@ -14,7 +14,6 @@
 from abc import ABCMeta, abstractmethod
 import sys
 import SimpleITK as sitk
-import itk
 import numpy as np
 import time
 from datetime import timedelta
@@ -427,6 +426,21 @@ class StackRegistrationBase(object):
     #
     def run(self):
 
+        # Estimate transform (and intensity correction) parameters
+        self._run_optimization()
+
+        # Apply motion correction and compute slice transforms
+        self._apply_motion_correction()
+
+    ##
+    # Initialize the registration pipeline and estimate the parameters by
+    # running the chosen optimizer
+    # \date       2026-10-18 19:52:16+0000
+    #
+    # \param      self  The object
+    #
+    def _run_optimization(self):
+
         print_precisicion = 3
         print_suppress = True
 
@@ -473,16 +487,6 @@ class StackRegistrationBase(object):
             # Each slice with the same scaling
             x_scale = np.tile(scale, self._parameters.shape[0])
 
-        # HACK
-        self._transforms_2D_itk = [None]*self._N_slices
-        for i in range(0, self._N_slices):
-            self._transforms_2D_itk[i] = self._new_transform_itk[
-                self._transform_type]()
-            self._transforms_2D_itk[i].SetParameters(
-                itk.OptimizerParameters[itk.D](self._transforms_2D_sitk[i].GetParameters()))
-            self._transforms_2D_itk[i].SetFixedParameters(itk.OptimizerParameters[itk.D](
-                self._transforms_2D_sitk[i].GetFixedParameters()))
-
         # Get cost function and its Jacobian w.r.t. the parameters
         fun = self._get_residual_call()
         jac = self._get_jacobian_residual_call()
@@ -529,9 +533,6 @@ class StackRegistrationBase(object):
         #     print("Final values = ")
         #     print(self._parameters)
 
-        # Apply motion correction and compute slice transforms
-        self._apply_motion_correction()
-
     ##
     # Use scipy.opimize.least_squares solver
     #
@@ -553,6 +554,10 @@ class StackRegistrationBase(object):
     #
     def _run_optimizer_minimize(self, fun, jac, x0, method, loss, iter_max, verbose, x_scale):
 
+        # Cost and its gradient are evaluated for identical parameters and
+        # both require the residual
+        fun = self._get_call_cached_for_last_parameters(fun)
+
         # Convert to cost and gradient of cost function.
         fun_ = lambda x: lf.get_ell2_cost_from_residual(
             fun(x),
@@ -572,6 +577,28 @@ class StackRegistrationBase(object):
         )
         return res.x
 
+    ##
+    # Gets a call which stores its result for the most recently evaluated
+    # parameter vector and reuses it in case of repeated evaluation.
+    # \date       2026-10-18 18:40:13+0000
+    #
+    # \param      call  Function of the parameter vector, e.g. residual call
+    #
+    # \return     Function of the parameter vector
+    #
+    @staticmethod
+    def _get_call_cached_for_last_parameters(call):
+        cache = {}
+
+        def cached_call(x):
+            key = np.array(x, dtype=np.float64).tobytes()
+            if cache.get("key") != key:
+                cache["value"] = call(x)
+                cache["key"] = key
+            return cache["value"]
+
+        return cached_call
+
     @abstractmethod
     def _print_info_text_least_squares(self):
         pass
@@ -9,6 +9,7 @@
 import os
 import numpy as np
 import SimpleITK as sitk
+from scipy.ndimage import map_coordinates
 
 import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
@@ -16,7 +17,6 @@ import nsol.principal_component_analysis as pca
 from nsol.similarity_measures import SimilarityMeasures
 
 import niftymic.base.stack as st
-import niftymic.validation.image_similarity_evaluator as ise
 import niftymic.utilities.template_stack_estimator as tse
 
 from niftymic.definitions import DIR_TMP
@@ -28,11 +28,28 @@ from niftymic.definitions import DIR_TMP
 #
 class TransformInitializer(object):
 
+    ##
+    # Store images and settings
+    # \date       2026-10-18 22:31:40+0000
+    #
+    # \param      self                        The object
+    # \param      fixed                       Fixed image as Stack object
+    # \param      moving                      Moving image as Stack object
+    # \param      similarity_measure          Similarity measure to select
+    #                                         best initialization, string
+    # \param      refine_pca_initializations  Refine PCA initializations by
+    #                                         rigid registrations, bool
+    # \param      max_samples                 Maximum number of fixed mask
+    #                                         voxels to evaluate the
+    #                                         similarity measure on; all
+    #                                         voxels are used if None, int
+    #
     def __init__(self,
                  fixed,
                  moving,
                  similarity_measure="NMI",
                  refine_pca_initializations=False,
+                 max_samples=100000,
                  ):
         if not isinstance(fixed, st.Stack):
             raise TypeError("Fixed image must be of type 'Stack'.")
@@ -44,6 +61,7 @@ class TransformInitializer(object):
         self._moving = moving
         self._similarity_measure = similarity_measure
         self._refine_pca_initializations = refine_pca_initializations
+        self._max_samples = max_samples
 
         self._initial_transform_sitk = None
 
@@ -108,11 +126,8 @@ class TransformInitializer(object):
             mask_nda)
 
         # [z, y, x] x n_points to [x, y, z] x n_points
-        points = np.array(np.where(mask_nda > 0))[::-1, :]
-        n_points = len(points[0])
-        for i in range(n_points):
-            points[:, i] = mask_sitk.TransformIndexToPhysicalPoint(
-                [int(j) for j in points[:, i]])
+        points = TransformInitializer.get_physical_points(
+            mask_sitk, np.array(np.where(mask_nda > 0))[::-1, :])
 
         if robust:
             pca_mask = pca.AdmmRobustPrincipalComponentAnalysis(
@@ -128,55 +143,130 @@ class TransformInitializer(object):
 
         return pca_mask
 
+    ##
+    # Gets the physical points of voxel indices, i.e. the image's affine
+    # given by direction, spacing and origin applied to all indices at once.
+    # \date       2026-10-18 22:33:05+0000
+    #
+    # \param      image_sitk  Image as sitk.Image object
+    # \param      indices     Voxel indices as [x, y, z] x n_points array
+    #
+    # \return     Physical points as [x, y, z] x n_points array
+    #
+    @staticmethod
+    def get_physical_points(image_sitk, indices):
+        dimension = image_sitk.GetDimension()
+        direction = np.array(image_sitk.GetDirection()).reshape(
+            dimension, dimension)
+        spacing = np.array(image_sitk.GetSpacing())
+        origin = np.array(image_sitk.GetOrigin())
+
+        return (direction * spacing).dot(indices) + origin[:, np.newaxis]
+
+    ##
+    # Gets the continuous voxel indices of physical points, i.e. the inverse
+    # of get_physical_points.
+    # \date       2026-10-18 22:33:49+0000
+    #
+    # \param      image_sitk  Image as sitk.Image object
+    # \param      points      Physical points as [x, y, z] x n_points array
+    #
+    # \return     Continuous indices as [x, y, z] x n_points array
+    #
+    @staticmethod
+    def get_continuous_indices(image_sitk, points):
+        dimension = image_sitk.GetDimension()
+        direction = np.array(image_sitk.GetDirection()).reshape(
+            dimension, dimension)
+        spacing = np.array(image_sitk.GetSpacing())
+        origin = np.array(image_sitk.GetOrigin())
+
+        return np.linalg.solve(
+            direction * spacing, points - origin[:, np.newaxis])
+
+    ##
+    # Gets the transform leading to the highest similarity between fixed and
+    # warped moving image. The similarity is evaluated on (a subset of) the
+    # fixed mask voxels. The moving image is linearly interpolated at the
+    # transformed voxel positions of all transforms at once.
+    # \date       2026-10-18 22:35:12+0000
+    #
+    # \param      self             The object
+    # \param      transformations  List of sitk.Euler3DTransform objects
+    # \param      debug            Show warped images, bool
+    #
+    # \return     Transform of highest similarity as sitk.Euler3DTransform
+    #
     def _get_best_transform(self, transformations, debug=False):
 
         if self._refine_pca_initializations:
             transformations = self._run_registrations(transformations)
 
-        warps = []
-        for transform_sitk in transformations:
-            warped_moving_sitk = sitk.Resample(
-                self._moving.sitk,
-                self._fixed.sitk,
-                transform_sitk,
-                sitk.sitkLinear,
-            )
-            warps.append(
-                st.Stack.from_sitk_image(
-                    warped_moving_sitk,
-                    extract_slices=False,
-                    slice_thickness=self._fixed.get_slice_thickness(),
-                ))
-
-        image_similarity_evaluator = ise.ImageSimilarityEvaluator(
-            stacks=warps,
-            reference=self._fixed,
-            measures=[self._similarity_measure],
-            use_reference_mask=True,
-            verbose=False,
-        )
+        # Fixed mask voxels as [x, y, z] x n_points
+        fixed_nda = sitk.GetArrayFromImage(self._fixed.sitk)
+        indices = np.array(np.where(
+            sitk.GetArrayFromImage(self._fixed.sitk_mask) > 0))
+        if indices.shape[1] == 0:
+            raise RuntimeError(
+                "Support to evaluate similarity measures is zero")
+        if self._max_samples is not None and \
+                indices.shape[1] > self._max_samples:
+            step = int(np.ceil(indices.shape[1] / float(self._max_samples)))
+            indices = indices[:, ::step]
+        fixed_values = fixed_nda[tuple(indices)]
+        points = self.get_physical_points(
+            self._fixed.sitk, indices[::-1, :])
+
+        # Transformed points of all transforms, i.e. T(x) = A(x - c) + c + t
+        points_transformed = np.concatenate([
+            np.array(transform_sitk.GetMatrix()).reshape(3, 3).dot(
+                points - np.array(transform_sitk.GetCenter())[:, np.newaxis])
+            + (np.array(transform_sitk.GetCenter()) +
+               np.array(transform_sitk.GetTranslation()))[:, np.newaxis]
+            for transform_sitk in transformations
+        ], axis=1)
+
+        # Linear interpolation of moving image; zero outside image domain as
+        # for sitk.Resample
+        moving_nda = sitk.GetArrayFromImage(self._moving.sitk)
+        continuous_indices = self.get_continuous_indices(
+            self._moving.sitk, points_transformed)[::-1, :]
+        warped_values = map_coordinates(
+            moving_nda, continuous_indices, order=1, mode="nearest")
+        size = np.array(moving_nda.shape)[:, np.newaxis]
+        is_outside = np.any(
+            (continuous_indices < -0.5) | (continuous_indices > size - 0.5),
+            axis=0)
+        warped_values[is_outside] = 0
+        warped_values = warped_values.reshape(len(transformations), -1)
+
         ph.print_info(
             "Find best aligning transform as measured by %s" %
             self._similarity_measure)
-        image_similarity_evaluator.compute_similarities()
-        similarities = image_similarity_evaluator.get_similarities()
+        similarities = [
+            SimilarityMeasures.similarity_measures[self._similarity_measure](
+                x, fixed_values) for x in warped_values
+        ]
 
         # get transform which leads to highest similarity
-        index = np.argmax(similarities[self._similarity_measure])
+        index = np.argmax(similarities)
         transform_init_sitk = transformations[index]
 
         if debug:
             labels = ["attempt%d" % (d + 1)
                       for d in range(len(transformations))]
             labels[index] = "best"
-            foo = [w.sitk for w in warps]
+            foo = [sitk.Resample(
+                self._moving.sitk,
+                self._fixed.sitk,
+                transform_sitk,
+                sitk.sitkLinear,
+            ) for transform_sitk in transformations]
             foo.insert(0, self._fixed.sitk)
             labels.insert(0, "fixed")
             sitkh.show_sitk_image(foo, label=labels)
             for i in range(len(transformations)):
-                print("%s: %.6f" % (
-                    labels[1 + i], similarities[self._similarity_measure][i])
-                )
+                print("%s: %.6f" % (labels[1 + i], similarities[i]))
 
         return transform_init_sitk
 
@@ -37,6 +37,11 @@ class DataPreprocessing:
     # \param      boundary_k                added value to third coordinate
     #                                       (can also be negative)
     # \param      unit                      Unit can either be "mm" or "voxel"
+    # \param      n4_shrink_factor          In-plane shrink factor used for
+    #                                       bias field estimation, int
+    # \param      n_processes               Number of processes to run the
+    #                                       bias field correction of stacks
+    #                                       concurrently, int
     # \param      cls   The cls
     #
     def __init__(self,
@@ -50,6 +55,8 @@ class DataPreprocessing:
                  boundary_j=0,
                  boundary_k=0,
                  unit="mm",
+                 n4_shrink_factor=1,
+                 n_processes=1,
                  ):
 
         self._use_N4BiasFieldCorrector = use_N4BiasFieldCorrector
@@ -61,6 +68,8 @@ class DataPreprocessing:
         self._boundary_j = boundary_j
         self._boundary_k = boundary_k
         self._unit = unit
+        self._n4_shrink_factor = n4_shrink_factor
+        self._n_processes = n_processes
 
         # Number of stacks
         self._N_stacks = len(stacks)
@@ -131,37 +140,39 @@ class DataPreprocessing:
 
         # N4 Bias Field Correction
         if self._use_N4BiasFieldCorrector:
-            bias_field_corrector = n4bfc.N4BiasFieldCorrection()
-
-            for i in range(0, self._N_stacks):
-                ph.print_info(
-                    "Perform N4 Bias Field Correction for stack %d ... "
-                    % (i+1), newline=False)
-                bias_field_corrector.set_stack(self._stacks[i])
-                bias_field_corrector.run_bias_field_correction()
-                self._stacks[i] = \
-                    bias_field_corrector.get_bias_field_corrected_stack()
-                print("done")
+            bias_field_corrector = n4bfc.N4BiasFieldCorrection(
+                shrink_factor=self._n4_shrink_factor,
+                n_processes=self._n_processes,
+            )
+            ph.print_info(
+                "Perform N4 Bias Field Correction for %d stacks ... "
+                % self._N_stacks, newline=False)
+            bias_field_corrector.run_bias_field_correction_stacks(
+                self._stacks)
+            self._stacks = \
+                bias_field_corrector.get_bias_field_corrected_stacks()
+            print("done")
 
         # Linear Intensity Correction
         if self._use_intensity_correction:
             stacks_to_intensity_correct = list(
                 set(range(0, self._N_stacks)) - set([self._target_stack_index]))
 
-            intensity_corrector = ic.IntensityCorrection()
+            intensity_corrector = ic.IntensityCorrection(
+                n_processes=self._n_processes)
             intensity_corrector.use_individual_slice_correction(False)
             intensity_corrector.use_reference_mask(True)
             intensity_corrector.use_verbose(True)
 
-            for i in stacks_to_intensity_correct:
-                stack = self._stacks[i]
-                intensity_corrector.set_stack(stack)
-                intensity_corrector.set_reference(
-                    target.get_resampled_stack(resampling_grid=stack.sitk))
-                # intensity_corrector.run_affine_intensity_correction()
-                intensity_corrector.run_linear_intensity_correction()
-                self._stacks[
-                    i] = intensity_corrector.get_intensity_corrected_stack()
+            # intensity_corrector.run_affine_intensity_correction_stacks(...)
+            intensity_corrector.run_linear_intensity_correction_stacks(
+                [self._stacks[i] for i in stacks_to_intensity_correct],
+                target,
+            )
+            for i, stack in zip(
+                    stacks_to_intensity_correct,
+                    intensity_corrector.get_intensity_corrected_stacks()):
+                self._stacks[i] = stack
         self._computational_time = ph.stop_timing(time_start)
 
     # Get preprocessed stacks
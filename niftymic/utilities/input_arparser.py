@@ -754,6 +754,26 @@ class InputArgparser(object):
     ):
         self._add_argument(dict(locals()))
 
+    def add_bias_field_shrink_factor(
+        self,
+        option_string="--bias-field-shrink-factor",
+        type=int,
+        help="In-plane shrink factor used for N4 bias field estimation. The "
+        "bias field is estimated on the shrunk image and evaluated at full "
+        "resolution to correct the image.",
+        default=1,
+    ):
+        self._add_argument(dict(locals()))
+
+    def add_n_processes(
+        self,
+        option_string="--n-processes",
+        type=int,
+        help="Number of processes used to process stacks concurrently.",
+        default=1,
+    ):
+        self._add_argument(dict(locals()))
+
     def add_intensity_correction(
         self,
         option_string="--intensity-correction",
@@ -970,6 +990,19 @@ class InputArgparser(object):
     ):
         self._add_argument(dict(locals()))
 
+    def add_registration_cache(
+        self,
+        option_string="--registration-cache",
+        type=str,
+        help="Directory to cache rigid volume registration transforms. "
+        "If given, registrations of identical images, masks, methods, "
+        "options and initial transforms are not re-run but their transforms "
+        "are read from this directory.",
+        default=None,
+        required=False,
+    ):
+        self._add_argument(dict(locals()))
+
     ##
     # Parse the provided configuration file
     #
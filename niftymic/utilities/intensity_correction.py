@@ -9,6 +9,7 @@
 
 # Import libraries
 import sys
+import multiprocessing
 import SimpleITK as sitk
 import numpy as np
 from scipy.optimize import least_squares
@@ -47,6 +48,9 @@ class IntensityCorrection(object):
     #                                              each slice independently;
     #                                              bool
     # \param      use_verbose                      Verbose; bool
+    # \param      n_processes                      Number of processes to
+    #                                              correct multiple stacks
+    #                                              concurrently, int
     #
     def __init__(self,
                  stack=None,
@@ -57,6 +61,7 @@ class IntensityCorrection(object):
                  use_verbose=False,
                  additional_stack=None,
                  prefix_corrected="",
+                 n_processes=1,
                  ):
 
         if stack is not None:
@@ -81,9 +86,9 @@ class IntensityCorrection(object):
         else:
             self._reference = None
 
-        self._apply_intensity_correction = {
-            "linear": self._apply_linear_intensity_correction,
-            "affine": self._apply_affine_intensity_correction,
+        self._get_intensity_correction_coefficients = {
+            "linear": self._get_linear_intensity_correction_coefficients,
+            "affine": self._get_affine_intensity_correction_coefficients,
         }
 
         self._use_verbose = use_verbose
@@ -91,6 +96,10 @@ class IntensityCorrection(object):
         self._use_stack_mask = use_stack_mask
         self._use_individual_slice_correction = use_individual_slice_correction
         self._prefix_corrected = prefix_corrected
+        self._n_processes = n_processes
+
+        self._stacks_corrected = None
+        self._correction_coefficients_stacks = None
 
     ##
     #       Sets the stack.
@@ -140,6 +149,9 @@ class IntensityCorrection(object):
     def use_stack_mask(self, use_stack_mask):
         self._use_stack_mask = use_stack_mask
 
+    def set_n_processes(self, n_processes):
+        self._n_processes = n_processes
+
     ##
     # Sets the use individual slice correction.
     # \date       2016-11-22 22:47:47+0000
@@ -179,6 +191,22 @@ class IntensityCorrection(object):
     def get_intensity_correction_coefficients(self):
         return np.array(self._correction_coefficients)
 
+    def get_intensity_corrected_stacks(self):
+        return [st.Stack.from_stack(s) for s in self._stacks_corrected]
+
+    ##
+    # Gets the intensity correction coefficients obtained for each stack
+    # by run_*_intensity_correction_stacks.
+    # \date       2026-10-18 16:21:09+0000
+    #
+    # \param      self  The object
+    #
+    # \return     List of intensity correction coefficients; see
+    #             get_intensity_correction_coefficients
+    #
+    def get_intensity_correction_coefficients_stacks(self):
+        return [np.array(c) for c in self._correction_coefficients_stacks]
+
     ##
     #       Clip lower intensities based on percentile threshold
     # \date       2016-11-05 22:59:08+0000
@@ -240,23 +268,168 @@ class IntensityCorrection(object):
         self._stack, self._correction_coefficients, self._additional_stack = self._run_intensity_correction(
             "affine")
 
+    ##
+    # Run linear intensity correction for multiple stacks against a common
+    # reference; see run_intensity_correction_stacks.
+    # \date       2026-10-18 16:21:43+0000
+    #
+    def run_linear_intensity_correction_stacks(self, stacks, reference,
+                                               interpolator="Linear"):
+        self.run_intensity_correction_stacks(
+            stacks, reference, "linear", interpolator=interpolator)
+
+    ##
+    # Run affine intensity correction for multiple stacks against a common
+    # reference; see run_intensity_correction_stacks.
+    # \date       2026-10-18 16:21:58+0000
+    #
+    def run_affine_intensity_correction_stacks(self, stacks, reference,
+                                               interpolator="Linear"):
+        self.run_intensity_correction_stacks(
+            stacks, reference, "affine", interpolator=interpolator)
+
+    ##
+    # Run intensity correction for multiple stacks against a common reference
+    # (e.g. the target stack) which does not need to be in the same space as
+    # the stacks.
+    #
+    # For each stack, only the reference image (and mask) arrays are resampled
+    # onto the stack grid to compute the correction coefficients, i.e. no
+    # resampled Stack objects are created. Stacks are processed concurrently
+    # in separate processes if n_processes > 1.
+    # \date       2026-10-18 16:22:31+0000
+    #
+    # \param      self              The object
+    # \param      stacks            List of Stack objects to be corrected
+    # \param      reference         Stack object used as reference for
+    #                               intensities
+    # \param      correction_model  The correction model. Either 'linear' or
+    #                               'affine'
+    # \param      interpolator      Interpolator to resample the reference
+    #                               image, e.g. 'Linear' or 'NearestNeighbor'
+    #
+    def run_intensity_correction_stacks(self,
+                                        stacks,
+                                        reference,
+                                        correction_model,
+                                        interpolator="Linear"):
+
+        if correction_model not in self._get_intensity_correction_coefficients:
+            raise ValueError(
+                "Correction model must be one of %s" %
+                sorted(self._get_intensity_correction_coefficients.keys()))
+
+        ic_inputs = [
+            self._get_intensity_correction_input(
+                stack, reference, correction_model, interpolator)
+            for stack in stacks
+        ]
+
+        n_processes = max(1, min(self._n_processes, len(stacks)))
+        if n_processes > 1:
+            pool = multiprocessing.Pool(n_processes)
+            try:
+                correction_coefficients = pool.map(
+                    _compute_intensity_correction_coefficients, ic_inputs)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            correction_coefficients = [
+                _compute_intensity_correction_coefficients(ic_input)
+                for ic_input in ic_inputs
+            ]
+
+        self._stacks_corrected = []
+        self._correction_coefficients_stacks = []
+        for stack, coefficients in zip(stacks, correction_coefficients):
+            nda = self._apply_intensity_correction(
+                sitk.GetArrayFromImage(stack.sitk), coefficients)
+            stack_corrected = self._create_stack_from_corrected_intensity_array(
+                nda, stack)
+            stack_corrected.set_filename(
+                self._prefix_corrected + stack.get_filename())
+            self._stacks_corrected.append(stack_corrected)
+
+            # Stack-wise correction returns c1 (linear) and [c1, c0] (affine)
+            if not self._use_individual_slice_correction:
+                coefficients = coefficients[0]
+                if correction_model in ["linear"]:
+                    coefficients = coefficients[0]
+            self._correction_coefficients_stacks.append(coefficients)
+
+            if self._use_verbose:
+                ph.print_info("%s: %s = %s" % (
+                    stack.get_filename(),
+                    "c1" if correction_model in ["linear"] else "(c1, c0)",
+                    coefficients))
+
+    ##
+    # Gets the picklable input for _compute_intensity_correction_coefficients.
+    # \date       2026-10-18 16:23:14+0000
+    #
+    # \param      self              The object
+    # \param      stack             Stack object to be corrected
+    # \param      reference         Stack object used as reference
+    # \param      correction_model  The correction model, string
+    # \param      interpolator      Interpolator to resample the reference
+    #
+    # \return     tuple of image/mask arrays and image geometries
+    #
+    def _get_intensity_correction_input(self,
+                                        stack,
+                                        reference,
+                                        correction_model,
+                                        interpolator):
+
+        nda_mask = None
+        if self._use_stack_mask and not stack.is_unity_mask():
+            nda_mask = sitk.GetArrayFromImage(stack.sitk_mask)
+
+        # Reference mask is resampled also if unity to exclude voxels outside
+        # the reference field of view
+        nda_reference_mask = None
+        if self._use_reference_mask:
+            nda_reference_mask = sitk.GetArrayFromImage(reference.sitk_mask)
+
+        parameters = {
+            "correction_model": correction_model,
+            "interpolator": interpolator,
+            "use_individual_slice_correction":
+                self._use_individual_slice_correction,
+        }
+
+        return (
+            sitk.GetArrayFromImage(stack.sitk),
+            nda_mask,
+            self._get_image_geometry(stack.sitk),
+            sitk.GetArrayFromImage(reference.sitk),
+            nda_reference_mask,
+            self._get_image_geometry(reference.sitk),
+            parameters,
+        )
+
+    @staticmethod
+    def _get_image_geometry(image_sitk):
+        return (
+            image_sitk.GetSpacing(),
+            image_sitk.GetOrigin(),
+            image_sitk.GetDirection(),
+        )
+
     ##
     #       Execute respective intensity correction model.
     # \date       2016-11-05 23:06:37+0000
     #
+    # Coefficients of all slices are obtained at once from masked per-slice
+    # sums in case of individual slice correction.
+    #
     # \param      self              The object
     # \param      correction_model  The correction model. Either 'linear' or
     #                               'affine'
     #
     def _run_intensity_correction(self, correction_model):
 
-        N_slices = self._stack.get_number_of_slices()
-
-        if correction_model in ["linear"]:
-            correction_coefficients = np.zeros((N_slices, 1))
-        elif correction_model in ["affine"]:
-            correction_coefficients = np.zeros((N_slices, 2))
-
         # Gets the required data arrays to perform intensity correction
         nda, nda_reference, nda_mask, nda_additional_stack = self._get_data_arrays_prior_to_intensity_correction()
 
@@ -264,44 +437,37 @@ class IntensityCorrection(object):
             if self._use_verbose:
                 ph.print_info("Run " + correction_model +
                               " intensity correction for each slice individually")
-            for i in range(0, N_slices):
-                if self._use_verbose:
-                    sys.stdout.write("Slice %2d/%d: " %
-                                     (i, self._stack.get_number_of_slices() - 1))
-                    sys.stdout.flush()
-                if self._additional_stack is None:
-                    nda[i, :, :], correction_coefficients[i, :] = self._apply_intensity_correction[
-                        correction_model](nda[i, :, :], nda_reference[i, :, :], nda_mask[i, :, :])
-                else:
-                    nda[i, :, :], correction_coefficients[i, :], nda_additional_stack[i, :, :] = self._apply_intensity_correction[
-                        correction_model](nda[i, :, :], nda_reference[i, :, :], nda_mask[i, :, :], nda_additional_stack[i, :, :])
+            shape = (nda.shape[0], -1)
         else:
             if self._use_verbose:
                 ph.print_info("Run " + correction_model +
                               " intensity correction uniformly for entire stack")
-            if self._additional_stack is None:
-                nda, cc = \
-                    self._apply_intensity_correction[
-                        correction_model](nda, nda_reference, nda_mask)
-            else:
-                nda, cc, nda_additional_stack = self._apply_intensity_correction[
-                    correction_model](nda, nda_reference, nda_mask, nda_additional_stack)
-            correction_coefficients = cc
+            shape = (1, -1)
 
-        # debug
-        # tmp_corr = sitk.GetImageFromArray(nda)
-        # tmp_corr.CopyInformation(self._stack.sitk)
-        # tmp_mask = sitk.GetImageFromArray(nda_mask)
-        # tmp_mask.CopyInformation(self._stack.sitk_mask)
-        # sitkh.show_sitk_image(
-        #     [
-        #         tmp_corr,
-        #         self._stack.sitk,
-        #         self._reference.sitk,
-        #     ],
-        #     segmentation=tmp_mask,
-        #     label=["corr", "orig", "ref"]
-        # )
+        # (N x DOF)-array with N = N_slices or 1
+        correction_coefficients = self._get_intensity_correction_coefficients[
+            correction_model](
+                nda.reshape(shape),
+                nda_reference.reshape(shape),
+                nda_mask.reshape(shape))
+
+        if self._use_verbose:
+            for i in range(correction_coefficients.shape[0]):
+                ph.print_info("%s = (%s)" % (
+                    "c1" if correction_model in ["linear"] else "(c1, c0)",
+                    ", ".join(["%.3f" % c for c in correction_coefficients[i]])
+                ))
+
+        nda = self._apply_intensity_correction(nda, correction_coefficients)
+        if self._additional_stack is not None:
+            nda_additional_stack = self._apply_intensity_correction(
+                nda_additional_stack, correction_coefficients)
+
+        # Stack-wise correction returns c1 (linear) and [c1, c0] (affine)
+        if not self._use_individual_slice_correction:
+            correction_coefficients = correction_coefficients[0]
+            if correction_model in ["linear"]:
+                correction_coefficients = correction_coefficients[0]
 
         # Create Stack instance with correct image header information
         if self._additional_stack is None:
@@ -310,83 +476,118 @@ class IntensityCorrection(object):
             return self._create_stack_from_corrected_intensity_array(nda, self._stack), correction_coefficients, self._create_stack_from_corrected_intensity_array(nda_additional_stack, self._additional_stack)
 
     ##
-    #       Perform affine intensity correction via normal equations
+    #       Compute affine intensity correction coefficients via normal
+    #             equations for each row
     # \date       2016-11-05 23:10:49+0000
     #
-    # \param      self                  The object
-    # \param      nda                   Data array to be corrected
-    # \param      nda_mask              Mask to be used
-    # \param      nda_reference  Masked reference data array used to
-    #                                   compute coefficients
+    # Model: y = x*c1 + c0 = [x, 1]*[c1, c0]' = A*[c1,c0] whereby the normal
+    # equations (A'A)*[c1, c0]' = A'y only require masked sums.
     #
-    # \return     intensity corrected data array as np.array
+    # \param      nda            (N x M)-data array to be corrected
+    # \param      nda_reference  (N x M)-reference data array used to
+    #                            compute coefficients
+    # \param      nda_mask       (N x M)-mask to be used
     #
-    def _apply_affine_intensity_correction(self, nda, nda_reference, nda_mask, nda_additional_stack=None):
-
-        # Find masked indices
-        indices = np.where(nda_mask > 0)
+    # \return     (N x 2)-array holding [c1, c0] for each row
+    #
+    @staticmethod
+    def _get_affine_intensity_correction_coefficients(
+            nda, nda_reference, nda_mask):
 
-        # Model: y = x*c1 + c0 = [x, 1]*[c1, c0]' = A*[c1,c0]
-        x = nda[indices].flatten().astype('double')
-        y = nda_reference[indices].flatten().astype('double')
+        n, x, y, xx, xy = IntensityCorrection._get_masked_sums(
+            nda, nda_reference, nda_mask)
 
         # Solve via normal equations: [c1, c0] = (A'A)^{-1}A'y
-        A = np.ones((x.size, 2))
-        A[:, 0] = x
+        AtA = np.zeros((n.size, 2, 2))
+        AtA[:, 0, 0] = xx
+        AtA[:, 0, 1] = x
+        AtA[:, 1, 0] = x
+        AtA[:, 1, 1] = n
+        Aty = np.stack((xy, y), axis=1)
 
-        B = np.linalg.pinv(A.transpose().dot(A)).dot(A.transpose())
-        c1, c0 = B.dot(y)
+        coefficients = np.einsum("nij,nj->ni", np.linalg.pinv(AtA), Aty)
 
-        if np.isnan(c1) or np.isnan(c0):
+        if np.isnan(coefficients).any():
+            c1, c0 = coefficients[np.where(np.isnan(coefficients))[0][0]]
             raise RuntimeError(
                 "Invalid value encountered during affine intensity correction "
                 "(c1, c0) = (%f, %f)" % (c1, c0))
 
-        if self._use_verbose:
-            ph.print_info("(c1, c0) = (%.3f, %.3f)" % (c1, c0))
-
-        if nda_additional_stack is None:
-            return nda * c1 + c0, np.array([c1, c0])
-        else:
-            return nda * c1 + c0, np.array([c1, c0]), nda_additional_stack * c1 + c0
+        return coefficients
 
     ##
-    #       Perform linear intensity correction via normal equations
+    #       Compute linear intensity correction coefficients via normal
+    #             equations for each row
     # \date       2016-11-05 23:12:13+0000
     #
-    # \param      self                  The object
-    # \param      nda                   Data array to be corrected
-    # \param      nda_mask            Mask to be used
-    # \param      nda_reference  Masked reference data array used to
-    #                                   compute coefficients
+    # Model: y = x*c1, i.e. c1 = x'y/(x'x)
     #
-    # \return     intensity corrected data array as np.array
+    # \param      nda            (N x M)-data array to be corrected
+    # \param      nda_reference  (N x M)-reference data array used to
+    #                            compute coefficients
+    # \param      nda_mask       (N x M)-mask to be used
     #
-    def _apply_linear_intensity_correction(self, nda, nda_reference, nda_mask, nda_additional_stack=None):
-
-        # Find masked indices
-        indices = np.where(nda_mask > 0)
+    # \return     (N x 1)-array holding c1 for each row
+    #
+    @staticmethod
+    def _get_linear_intensity_correction_coefficients(
+            nda, nda_reference, nda_mask):
 
-        # Model: y = x*c1
-        x = nda[indices].flatten().astype('double')
-        y = nda_reference[indices].flatten().astype('double')
+        n, x, y, xx, xy = IntensityCorrection._get_masked_sums(
+            nda, nda_reference, nda_mask)
 
-        # ph.show_2D_array_list([nda, nda_reference])
-        # Solve via normal equations: c1 = x'y/(x'x)
-        c1 = x.dot(y) / x.dot(x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c1 = xy / xx
 
-        if np.isnan(c1):
+        if np.isnan(c1).any():
             raise RuntimeError(
                 "Invalid value encountered during linear intensity correction "
-                "(c1 = %f)" % c1)
+                "(c1 = %f)" % c1[np.isnan(c1)][0])
 
-        if self._use_verbose:
-            ph.print_info("c1 = %.3f" % (c1))
+        return c1.reshape(-1, 1)
 
-        if nda_additional_stack is None:
-            return nda * c1, c1
-        else:
-            return nda * c1, c1, nda_additional_stack * c1
+    ##
+    # Gets the masked sums (n, sum x, sum y, sum x^2, sum x*y) for each row
+    # \date       2026-10-18 16:04:21+0000
+    #
+    # \param      nda            (N x M)-data array x
+    # \param      nda_reference  (N x M)-reference data array y
+    # \param      nda_mask       (N x M)-mask
+    #
+    # \return     Tuple of N-arrays
+    #
+    @staticmethod
+    def _get_masked_sums(nda, nda_reference, nda_mask):
+        mask = nda_mask > 0
+        x = np.where(mask, nda, 0).astype(np.float64)
+        y = np.where(mask, nda_reference, 0).astype(np.float64)
+
+        n = np.sum(mask, axis=1).astype(np.float64)
+        sum_x = np.sum(x, axis=1)
+        sum_y = np.sum(y, axis=1)
+        sum_xx = np.einsum("ij,ij->i", x, x)
+        sum_xy = np.einsum("ij,ij->i", x, y)
+
+        return n, sum_x, sum_y, sum_xx, sum_xy
+
+    ##
+    # Apply intensity correction coefficients, i.e. c1*nda (+ c0), to each
+    # slice or the entire data array.
+    # \date       2026-10-18 16:05:02+0000
+    #
+    # \param      nda                      Data array to be corrected
+    # \param      correction_coefficients  (N x DOF)-array with N being the
+    #                                      number of slices of nda or 1
+    #
+    # \return     intensity corrected data array as np.array
+    #
+    @staticmethod
+    def _apply_intensity_correction(nda, correction_coefficients):
+        shape = (-1, ) + (1, ) * (nda.ndim - 1)
+        nda = nda * correction_coefficients[:, 0].reshape(shape)
+        if correction_coefficients.shape[1] > 1:
+            nda += correction_coefficients[:, 1].reshape(shape)
+        return nda
 
     ##
     #       Gets the data arrays prior to intensity correction.
@@ -450,42 +651,75 @@ class IntensityCorrection(object):
         image_sitk = sitk.GetImageFromArray(nda)
         image_sitk.CopyInformation(stack.sitk)
 
-        # Potentially, #slices < #slices_ic as some slices might have been
-        # deleted.
-        slices = stack.get_slices()
-
-        helper_slice_numbers = stack.get_deleted_slice_numbers()
-        helper_slice_numbers.append(slices[0].get_slice_number())
-        helper_slice_numbers.append(slices[-1].get_slice_number())
-        slice_numbers = np.arange(np.min(helper_slice_numbers),
-                                  np.max(helper_slice_numbers) + 1)
-
-        stack_ic = st.Stack.from_sitk_image(
-            image_sitk=image_sitk,
-            slice_thickness=stack.get_slice_thickness(),
-            filename=stack.get_filename(),
-            image_sitk_mask=stack.sitk_mask,
-            slice_numbers=slice_numbers,
-        )
-
-        # Update registration history of stack
-        stack_ic.set_registration_history(
-            stack.get_registration_history())
+        # Keep slices (including their positions and registration histories)
+        # but replace their data by the corrected ones
+        return st.Stack.from_stack(stack, image_sitk=image_sitk)
 
-        # Update registration history of (kept) slices
-        kept_slice_numbers = [s.get_slice_number() for s in slices]
-        slices_ic = stack_ic.get_slices()
-        for slice_ic in slices_ic:
-            slice_number = slice_ic.get_slice_number()
 
-            # Update registration of kept slice
-            if slice_number in kept_slice_numbers:
-                index = kept_slice_numbers.index(slice_number)
-                slice_ic.set_registration_history(
-                    slices[index].get_registration_history())
-
-            # Otherwise, delete slices
-            else:
-                stack_ic.delete_slice(slice_ic)
+##
+# Compute intensity correction coefficients of a stack given a reference in
+# a different space.
+#
+# Module-level function so that it can be executed by a multiprocessing pool.
+# The reference image (and mask) is resampled onto the stack grid and the
+# coefficients are computed from the arrays directly.
+# \date       2026-10-18 16:24:02+0000
+#
+# \param      ic_input  tuple of stack image and mask arrays (or None), stack
+#                       geometry, reference image and mask arrays (or None),
+#                       reference geometry and dictionary of parameters
+#
+# \return     (N x DOF)-array of correction coefficients with N = N_slices
+#             for individual slice correction and 1 otherwise
+#
+def _compute_intensity_correction_coefficients(ic_input):
+    nda, nda_mask, geometry, nda_reference, nda_reference_mask, \
+        geometry_reference, parameters = ic_input
 
-        return stack_ic
+    def get_image_sitk(nda, geometry):
+        image_sitk = sitk.GetImageFromArray(nda)
+        image_sitk.SetSpacing(geometry[0])
+        image_sitk.SetOrigin(geometry[1])
+        image_sitk.SetDirection(geometry[2])
+        return image_sitk
+
+    image_sitk = get_image_sitk(nda, geometry)
+    interpolator = getattr(sitk, "sitk" + parameters["interpolator"])
+
+    nda_reference = sitk.GetArrayFromImage(sitk.Resample(
+        get_image_sitk(nda_reference, geometry_reference),
+        image_sitk,
+        sitk.Euler3DTransform(),
+        interpolator,
+        0.,
+        sitk.sitkFloat64,
+    ))
+
+    if nda_mask is None:
+        nda_mask = np.ones_like(nda, dtype=np.uint8)
+
+    if nda_reference_mask is not None:
+        nda_mask = nda_mask * sitk.GetArrayFromImage(sitk.Resample(
+            get_image_sitk(
+                nda_reference_mask.astype(np.uint8), geometry_reference),
+            image_sitk,
+            sitk.Euler3DTransform(),
+            sitk.sitkNearestNeighbor,
+            0,
+            sitk.sitkUInt8,
+        ))
+
+    if parameters["use_individual_slice_correction"]:
+        shape = (nda.shape[0], -1)
+    else:
+        shape = (1, -1)
+
+    get_coefficients = {
+        "linear": IntensityCorrection._get_linear_intensity_correction_coefficients,
+        "affine": IntensityCorrection._get_affine_intensity_correction_coefficients,
+    }[parameters["correction_model"]]
+
+    return get_coefficients(
+        nda.reshape(shape),
+        nda_reference.reshape(shape),
+        nda_mask.reshape(shape))
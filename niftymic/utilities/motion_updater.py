@@ -17,6 +17,7 @@ import pysitk.python_helper as ph
 import pysitk.simple_itk_helper as sitkh
 
 import niftymic.base.stack as st
+import niftymic.base.stack_transforms as stt
 import niftymic.base.exceptions as exceptions
 
 
@@ -32,6 +33,10 @@ import niftymic.base.exceptions as exceptions
 # -# filenameA_slice[0-9]+.tfm: Transformations to be applied to individual
 #    slices of stack with filename 'filenameA'. If a slice transformation file
 #    is not provided, the respective slice will be deleted from the stack
+#
+# Alternatively, a single filenameA.npz file (see StackTransforms) can hold
+# both stack and all slice transformations of stack 'filenameA'. If
+# available, it takes precedence over the *.tfm files.
 # \date       2018-11-11 16:21:00+0000
 #
 class MotionUpdater(object):
@@ -87,14 +92,19 @@ class MotionUpdater(object):
         for i in range(len(self._stacks)):
             stack_name = self._stacks[i].get_filename()
 
+            path_to_stack_transforms = os.path.join(
+                abs_path_to_directory, "%s.npz" % stack_name)
+            if ph.file_exists(path_to_stack_transforms):
+                transform_stack_sitk, transform_stack_sitk_inv, \
+                    dic_slice_transforms = self._get_transforms_from_npz(
+                        path_to_stack_transforms)
+            else:
+                transform_stack_sitk, transform_stack_sitk_inv, \
+                    dic_slice_transforms = self._get_transforms_from_tfm(
+                        abs_path_to_directory, stack_name)
+
             # update stack position
-            path_to_stack_transform = os.path.join(
-                abs_path_to_directory, "%s.tfm" % stack_name)
-            if ph.file_exists(path_to_stack_transform):
-                transform_stack_sitk = sitkh.read_transform_sitk(
-                    path_to_stack_transform)
-                transform_stack_sitk_inv = sitkh.read_transform_sitk(
-                    path_to_stack_transform, inverse=True)
+            if transform_stack_sitk is not None:
                 self._stacks[i].update_motion_correction(
                     transform_stack_sitk)
                 ph.print_info(
@@ -103,21 +113,12 @@ class MotionUpdater(object):
                 transform_stack_sitk_inv = sitk.Euler3DTransform()
 
             # update slice positions
-            pattern_trafo_slices = stack_name + self._prefix_slice + \
-                "([0-9]+)[.]tfm"
-            p = re.compile(pattern_trafo_slices)
-            dic_slice_transforms = {
-                int(p.match(f).group(1)): os.path.join(
-                    abs_path_to_directory, p.match(f).group(0))
-                for f in os.listdir(abs_path_to_directory) if p.match(f)
-            }
             slices = self._stacks[i].get_slices()
             for i_slice in range(self._stacks[i].get_number_of_slices()):
                 if i_slice in dic_slice_transforms.keys() and \
                         self._check_against_json[bool_check](
                             stack_name, i_slice):
-                    transform_slice_sitk = sitkh.read_transform_sitk(
-                        dic_slice_transforms[i_slice])
+                    transform_slice_sitk = dic_slice_transforms[i_slice]
                     transform_slice_sitk = \
                         sitkh.get_composite_sitk_affine_transform(
                             transform_slice_sitk, transform_stack_sitk_inv)
@@ -180,6 +181,62 @@ class MotionUpdater(object):
     def get_data(self):
         return self._stacks
 
+    ##
+    # Gets the stack and slice transformations from *.tfm files.
+    # \date       2026-10-18 13:21:48+0000
+    #
+    # \param      self        The object
+    # \param      directory   Path to motion-correction directory, string
+    # \param      stack_name  The stack name; string
+    #
+    # \return     Stack transform and its inverse (None if not available)
+    #             and dictionary slice number -> slice transform
+    #
+    def _get_transforms_from_tfm(self, directory, stack_name):
+        path_to_stack_transform = os.path.join(
+            directory, "%s.tfm" % stack_name)
+        if ph.file_exists(path_to_stack_transform):
+            transform_stack_sitk = sitkh.read_transform_sitk(
+                path_to_stack_transform)
+            transform_stack_sitk_inv = sitkh.read_transform_sitk(
+                path_to_stack_transform, inverse=True)
+        else:
+            transform_stack_sitk = None
+            transform_stack_sitk_inv = None
+
+        pattern_trafo_slices = stack_name + self._prefix_slice + \
+            "([0-9]+)[.]tfm"
+        p = re.compile(pattern_trafo_slices)
+        dic_slice_transforms = {
+            int(p.match(f).group(1)): sitkh.read_transform_sitk(
+                os.path.join(directory, p.match(f).group(0)))
+            for f in os.listdir(directory) if p.match(f)
+        }
+
+        return transform_stack_sitk, transform_stack_sitk_inv, \
+            dic_slice_transforms
+
+    ##
+    # Gets the stack and slice transformations from a single *.npz file.
+    # \date       2026-10-18 13:22:30+0000
+    #
+    # \param      self                      The object
+    # \param      path_to_stack_transforms  Path to *.npz file, string
+    #
+    # \return     Stack transform, its inverse and dictionary slice number
+    #             -> slice transform
+    #
+    def _get_transforms_from_npz(self, path_to_stack_transforms):
+        stack_transforms = stt.StackTransforms.from_filename(
+            path_to_stack_transforms)
+        transform_stack_sitk = \
+            stack_transforms.get_stack_motion_correction_transform()
+        return (
+            transform_stack_sitk,
+            sitk.AffineTransform(transform_stack_sitk.GetInverse()),
+            stack_transforms.get_slice_motion_correction_transforms(),
+        )
+
     ##
     # Check slice_number of stack_name with entries in rejected_slices.json
     # file. If there is a match, reject the slice
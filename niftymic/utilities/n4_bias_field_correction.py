@@ -11,6 +11,7 @@
 import os
 import sys
 import itk
+import multiprocessing
 import SimpleITK as sitk
 import numpy as np
 
@@ -21,11 +22,30 @@ import niftymic.base.stack as st
 
 
 ##
-# Class implementing the segmentation propagation from one image to another
+# Class implementing the N4ITK bias field correction of stacks
 # \date       2017-05-10 23:48:08+0100
 #
 class N4BiasFieldCorrection(object):
 
+    ##
+    # Store parameters for N4 bias field correction
+    # \date       2026-10-18 13:41:52+0000
+    #
+    # \param      self                   The object
+    # \param      stack                  Stack object to be corrected
+    # \param      use_mask               Use stack mask for estimation, bool
+    # \param      convergence_threshold  The convergence threshold
+    # \param      spline_order           The spline order
+    # \param      wiener_filter_noise    The wiener filter noise
+    # \param      bias_field_fwhm        The bias field fwhm
+    # \param      prefix_corrected       Prefix of corrected stack filename
+    # \param      shrink_factor          In-plane shrink factor, int. The bias
+    #                                    field is estimated on the shrunk
+    #                                    image and evaluated at full
+    #                                    resolution to correct the stack
+    # \param      n_processes            Number of processes to correct
+    #                                    multiple stacks concurrently, int
+    #
     def __init__(self,
                  stack=None,
                  use_mask=True,
@@ -34,6 +54,8 @@ class N4BiasFieldCorrection(object):
                  wiener_filter_noise=0.11,
                  bias_field_fwhm=0.15,
                  prefix_corrected="",
+                 shrink_factor=1,
+                 n_processes=1,
                  ):
 
         self._stack = stack
@@ -43,16 +65,28 @@ class N4BiasFieldCorrection(object):
         self._wiener_filter_noise = wiener_filter_noise
         self._bias_field_fwhm = bias_field_fwhm
         self._prefix_corrected = prefix_corrected
+        self._shrink_factor = shrink_factor
+        self._n_processes = n_processes
 
         self._stack_corrected = None
+        self._stacks_corrected = None
         self._computational_time = ph.get_zero_time()
 
     def set_stack(self, stack):
         self._stack = stack
 
+    def set_shrink_factor(self, shrink_factor):
+        self._shrink_factor = shrink_factor
+
+    def set_n_processes(self, n_processes):
+        self._n_processes = n_processes
+
     def get_bias_field_corrected_stack(self):
         return st.Stack.from_stack(self._stack_corrected)
 
+    def get_bias_field_corrected_stacks(self):
+        return [st.Stack.from_stack(s) for s in self._stacks_corrected]
+
     def get_computational_time(self):
         return self._computational_time
 
@@ -60,39 +94,164 @@ class N4BiasFieldCorrection(object):
 
         time_start = ph.start_timing()
 
-        bias_field_corrector = sitk.N4BiasFieldCorrectionImageFilter()
+        self._stack_corrected = self._get_bias_field_corrected_stack(
+            self._stack, _run_n4_bias_field_correction(
+                self._get_n4_input(self._stack, number_of_threads=None)))
+
+        # Get computational time
+        self._computational_time = ph.stop_timing(time_start)
+
+        # Debug
+        # sitkh.show_stacks([self._stack, self._stack_corrected], label=["orig", "corr"])
+
+    ##
+    # Run bias field correction for multiple stacks. Stacks are corrected
+    # concurrently in separate processes if n_processes > 1.
+    # \date       2026-10-18 13:43:26+0000
+    #
+    # \param      self    The object
+    # \param      stacks  List of Stack objects
+    #
+    def run_bias_field_correction_stacks(self, stacks):
+
+        time_start = ph.start_timing()
+
+        n_processes = max(1, min(self._n_processes, len(stacks)))
+        if n_processes > 1:
+            # Share available cores among processes as N4 is multi-threaded
+            number_of_threads = max(
+                1, multiprocessing.cpu_count() // n_processes)
+            n4_inputs = [self._get_n4_input(s, number_of_threads)
+                         for s in stacks]
+            pool = multiprocessing.Pool(n_processes)
+            try:
+                ndas = pool.map(_run_n4_bias_field_correction, n4_inputs)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            ndas = [_run_n4_bias_field_correction(
+                self._get_n4_input(s, number_of_threads=None))
+                for s in stacks]
+
+        self._stacks_corrected = [
+            self._get_bias_field_corrected_stack(stack, nda)
+            for stack, nda in zip(stacks, ndas)
+        ]
+
+        self._computational_time = ph.stop_timing(time_start)
+
+    ##
+    # Gets the picklable input for _run_n4_bias_field_correction.
+    # \date       2026-10-18 13:44:12+0000
+    #
+    # \param      self               The object
+    # \param      stack              Stack object
+    # \param      number_of_threads  Number of threads used by N4 filter; None
+    #                                for default
+    #
+    # \return     tuple of image/mask arrays, image geometry and parameters
+    #
+    def _get_n4_input(self, stack, number_of_threads):
+        if self._use_mask and not stack.is_unity_mask():
+            nda_mask = sitk.GetArrayFromImage(stack.sitk_mask)
+        else:
+            nda_mask = None
+
+        parameters = {
+            "convergence_threshold": self._convergence_threshold,
+            "spline_order": self._spline_order,
+            "wiener_filter_noise": self._wiener_filter_noise,
+            "bias_field_fwhm": self._bias_field_fwhm,
+            "shrink_factor": self._shrink_factor,
+            "number_of_threads": number_of_threads,
+        }
 
-        bias_field_corrector.SetBiasFieldFullWidthAtHalfMaximum(
-            self._bias_field_fwhm)
-        bias_field_corrector.SetConvergenceThreshold(
-            self._convergence_threshold)
-        bias_field_corrector.SetSplineOrder(self._spline_order)
-        bias_field_corrector.SetWienerFilterNoise(self._wiener_filter_noise)
+        return (
+            sitk.GetArrayFromImage(stack.sitk),
+            nda_mask,
+            stack.sitk.GetSpacing(),
+            stack.sitk.GetOrigin(),
+            stack.sitk.GetDirection(),
+            parameters,
+        )
+
+    def _get_bias_field_corrected_stack(self, stack, nda):
+        image_sitk = sitk.GetImageFromArray(nda)
+        image_sitk.CopyInformation(stack.sitk)
 
-        if self._use_mask:
-            image_sitk = bias_field_corrector.Execute(
-                self._stack.sitk, self._stack.sitk_mask)
+        if stack.is_unity_mask():
+            image_sitk_mask = None
         else:
-            image_sitk = bias_field_corrector.Execute(self._stack.sitk)
-
-        # Reading of image might lead to slight differences
-        stack_corrected_sitk_mask = sitk.Resample(
-            self._stack.sitk_mask,
-            image_sitk,
-            sitk.Euler3DTransform(),
-            sitk.sitkNearestNeighbor,
-            0,
-            self._stack.sitk_mask.GetPixelIDValue())
-
-        self._stack_corrected = st.Stack.from_sitk_image(
+            image_sitk_mask = stack.sitk_mask
+
+        return st.Stack.from_sitk_image(
             image_sitk=image_sitk,
-            image_sitk_mask=stack_corrected_sitk_mask,
-            filename=self._prefix_corrected + self._stack.get_filename(),
-            slice_thickness=self._stack.get_slice_thickness(),
+            image_sitk_mask=image_sitk_mask,
+            filename=self._prefix_corrected + stack.get_filename(),
+            slice_thickness=stack.get_slice_thickness(),
         )
 
-        # Get computational time
-        self._computational_time = ph.stop_timing(time_start)
 
-        # Debug
-        # sitkh.show_stacks([self._stack, self._stack_corrected], label=["orig", "corr"])
+##
+# Run N4 bias field correction on image array.
+#
+# Module-level function so that it can be executed by a multiprocessing pool.
+# If a shrink factor > 1 is given, the bias field is estimated on the
+# in-plane shrunk image and evaluated on the full-resolution grid.
+# \date       2026-10-18 13:45:03+0000
+#
+# \param      n4_input  tuple of image array, mask array (or None), spacing,
+#                       origin, direction and dictionary of N4 parameters
+#
+# \return     Bias field corrected image as numpy array
+#
+def _run_n4_bias_field_correction(n4_input):
+    nda, nda_mask, spacing, origin, direction, parameters = n4_input
+
+    image_sitk = sitk.GetImageFromArray(nda)
+    image_sitk.SetSpacing(spacing)
+    image_sitk.SetOrigin(origin)
+    image_sitk.SetDirection(direction)
+
+    if nda_mask is not None:
+        image_sitk_mask = sitk.GetImageFromArray(nda_mask.astype(np.uint8))
+        image_sitk_mask.CopyInformation(image_sitk)
+    else:
+        image_sitk_mask = None
+
+    bias_field_corrector = sitk.N4BiasFieldCorrectionImageFilter()
+
+    bias_field_corrector.SetBiasFieldFullWidthAtHalfMaximum(
+        parameters["bias_field_fwhm"])
+    bias_field_corrector.SetConvergenceThreshold(
+        parameters["convergence_threshold"])
+    bias_field_corrector.SetSplineOrder(parameters["spline_order"])
+    bias_field_corrector.SetWienerFilterNoise(
+        parameters["wiener_filter_noise"])
+    if parameters["number_of_threads"] is not None:
+        bias_field_corrector.SetNumberOfThreads(
+            parameters["number_of_threads"])
+
+    shrink_factor = int(parameters["shrink_factor"])
+    if shrink_factor > 1:
+        # Shrink in-plane only as stacks are typically thick-sliced
+        shrink_factors = [shrink_factor, shrink_factor, 1]
+        args = [sitk.Shrink(image_sitk, shrink_factors)]
+        if image_sitk_mask is not None:
+            args.append(sitk.Shrink(image_sitk_mask, shrink_factors))
+        bias_field_corrector.Execute(*args)
+
+        # Evaluate bias field on full-resolution grid
+        log_bias_field_sitk = sitk.Cast(
+            bias_field_corrector.GetLogBiasFieldAsImage(image_sitk),
+            image_sitk.GetPixelID())
+        image_corrected_sitk = image_sitk / sitk.Exp(log_bias_field_sitk)
+
+    else:
+        args = [image_sitk]
+        if image_sitk_mask is not None:
+            args.append(image_sitk_mask)
+        image_corrected_sitk = bias_field_corrector.Execute(*args)
+
+    return sitk.GetArrayFromImage(image_corrected_sitk)
@@ -0,0 +1,432 @@
+##
+# \file parameter_study_runner.py
+# \brief      Execute nsol solver parameter studies with concurrently processed
+#             parameter configurations and warm starts.
+#
+# The result files are identical in format to the ones written by
+# nsol.solver_parameter_study.SolverParameterStudy.run so that they can be
+# read with nsol.reader_parameter_study.ReaderParameterStudy. In addition, all
+# results are written to a single binary ResultsStore file which provides
+# random access to the measures and reconstructions of individual parameter
+# configurations (see ReaderParameterStudyResultsStore).
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import itertools
+import multiprocessing
+
+import numpy as np
+import six
+
+import pysitk.python_helper as ph
+from nsol.reader_parameter_study import ReaderParameterStudy
+
+from niftymic.utilities.results_store import ResultsStore
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+# Parameter study executed by the worker processes. Processes are forked so
+# that the solver including its (read-only) operators and the precomputed
+# data b = My is shared with the workers without pickling.
+_parameter_study = None
+
+
+##
+# Class to run an nsol solver parameter study, e.g. as obtained from
+# nsol.deconvolution_solver_parameter_study_interface.
+# \date       2026-10-18 17:02:41+0000
+#
+class ParameterStudyRunner(object):
+
+    ##
+    # Store parameter study and execution settings
+    # \date       2026-10-18 17:03:05+0000
+    #
+    # \param      self             The object
+    # \param      parameter_study  nsol SolverParameterStudy object
+    # \param      n_processes      Number of processes to run parameter
+    #                              configurations concurrently, int
+    # \param      use_warm_start   Initialize the solver with the solution
+    #                              obtained for the neighbouring
+    #                              regularization parameter alpha (with
+    #                              otherwise identical parameters), bool
+    #
+    def __init__(self,
+                 parameter_study,
+                 n_processes=1,
+                 use_warm_start=False,
+                 ):
+        self._parameter_study = parameter_study
+        self._n_processes = n_processes
+        self._use_warm_start = use_warm_start
+
+        self._computational_time = None
+
+    def get_computational_time(self):
+        return self._computational_time
+
+    ##
+    # Run parameter study and write results to files
+    # \date       2026-10-18 17:03:41+0000
+    #
+    # \param      self  The object
+    #
+    def run(self):
+        global _parameter_study
+
+        study = self._parameter_study
+        parameters = study.get_parameters()
+
+        # Same set up as in nsol's SolverParameterStudy.run
+        study._observer.set_name(study.get_parameter_study_name())
+        study._observer.clear_x_list()
+        study._solver.set_observer(study._observer)
+
+        bool_prev_study = ph.file_exists(study._get_path_to_file_parameters())
+        if not study._append or not bool_prev_study:
+            study._create_file_parameters()
+            study._create_files_measures()
+            study._create_file_computational_time()
+            study._append = False
+        else:
+            ph.print_info("Append previous study ... ")
+            study._check_that_studies_match()
+
+        results_store = ResultsStore(get_path_to_results_store(
+            study._directory, study.get_parameter_study_name()))
+        if study._append and ph.file_exists(
+                results_store.get_path_to_file()):
+            results_store.read()
+        else:
+            if study._append:
+                ph.print_warning(
+                    "Results store '%s' not found. Only appended results "
+                    "will be stored" % results_store.get_path_to_file())
+            results_store.create(self._get_results_store_info(study))
+
+        if study._append:
+            reader_parameter_study = ReaderParameterStudy(
+                directory=study._directory,
+                name=study.get_parameter_study_name())
+            reader_parameter_study.read_study()
+            previous_iterations = len(
+                reader_parameter_study.get_parameters_to_line().keys())
+            dic_x = dict(reader_parameter_study.get_reconstructions())
+        else:
+            previous_iterations = 0
+            dic_x = {
+                k: v for k, v in six.iteritems(study._reconstruction_info)}
+
+        time_start = ph.start_timing()
+
+        configurations = list(itertools.product(*parameters.values()))
+        chains = self._get_chains(list(parameters.keys()), configurations)
+
+        _parameter_study = (
+            study, configurations, study._solver.get_x0(),
+            self._use_warm_start)
+
+        # Write results in order of configurations as soon as available
+        results = {}
+        next_index = [0]
+
+        def write_available_results():
+            while next_index[0] in results:
+                i = next_index[0]
+                self._write_result(
+                    study, results_store, results.pop(i),
+                    i + previous_iterations, dic_x)
+                next_index[0] += 1
+
+        try:
+            n_processes = max(1, min(self._n_processes, len(chains)))
+            pool = None
+            if n_processes > 1:
+                try:
+                    context = multiprocessing.get_context("fork")
+                except AttributeError:
+                    # Python 2 always forks on POSIX
+                    context = multiprocessing
+                except ValueError:
+                    ph.print_warning(
+                        "Forking processes is not supported. "
+                        "Parameter configurations are run sequentially.")
+                    context = None
+                if context is not None:
+                    pool = context.Pool(n_processes)
+
+            if pool is not None:
+                try:
+                    for chain_results in pool.imap_unordered(
+                            _run_parameter_configurations, chains):
+                        results.update(chain_results)
+                        write_available_results()
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for chain in chains:
+                    results.update(_run_parameter_configurations(chain))
+                    write_available_results()
+        finally:
+            _parameter_study = None
+
+            # Write reconstructions obtained so far in nsol's format. Unlike
+            # nsol, the file is not rewritten after each configuration since
+            # all results are incrementally added to the results store
+            if next_index[0] > 0:
+                study._write_to_file_reconstructions(dic_x)
+
+        # Reset solver to initial value
+        study._solver.set_x0(study._solver.get_x0())
+
+        self._computational_time = ph.stop_timing(time_start)
+        study._computational_time = self._computational_time
+
+    ##
+    # Group parameter configurations into chains that are executed
+    # sequentially within one process.
+    #
+    # With warm start, a chain consists of configurations that only differ in
+    # alpha, sorted by alpha. Long chains are split to keep all processes
+    # busy (at the cost of a cold start at the beginning of each chain).
+    # \date       2026-10-18 17:05:11+0000
+    #
+    # \param      self            The object
+    # \param      keys            Names of varying parameters, list of strings
+    # \param      configurations  List of parameter value tuples
+    #
+    # \return     List of lists of configuration indices
+    #
+    def _get_chains(self, keys, configurations):
+        if not self._use_warm_start or "alpha" not in keys:
+            return [[i] for i in range(len(configurations))]
+
+        k_alpha = keys.index("alpha")
+        groups = {}
+        for i, vals in enumerate(configurations):
+            key = tuple(v for k, v in enumerate(vals) if k != k_alpha)
+            groups.setdefault(key, []).append(i)
+        chains = [
+            sorted(g, key=lambda i: float(configurations[i][k_alpha]))
+            for g in groups.values()
+        ]
+
+        while len(chains) < self._n_processes:
+            chain = max(chains, key=len)
+            if len(chain) < 2:
+                break
+            chains.remove(chain)
+            chains.extend([chain[:len(chain) // 2], chain[len(chain) // 2:]])
+
+        return sorted(chains)
+
+    ##
+    # Gets the general study information stored in the results store
+    # \date       2026-10-18 17:41:13+0000
+    #
+    @staticmethod
+    def _get_results_store_info(study):
+        return {
+            "header": study._get_fileheader(),
+            "parameters": list(study.get_parameters().keys()),
+            "measures": list(study._observer.get_measures().keys()),
+            "reconstruction_info": {
+                k: np.asarray(v).tolist()
+                for k, v in six.iteritems(study._reconstruction_info)
+            },
+        }
+
+    ##
+    # Write results of a parameter configuration to the study files as done
+    # by nsol's SolverParameterStudy and add them to the results store.
+    # \date       2026-10-18 17:06:02+0000
+    #
+    @staticmethod
+    def _write_result(study, results_store, result, iteration, dic_x):
+        dic_parameter, measures, computational_time, x = result
+
+        for measure in measures:
+            study._add_to_file_measures(
+                measure, measures[measure].reshape(1, -1))
+        study._add_to_file_computational_time(computational_time)
+        study._add_to_file_parameters(dic_parameter)
+
+        dic_x[str(iteration)] = x
+
+        arrays = dict(measures)
+        arrays["x"] = x
+        results_store.add_record(
+            key=[dic_parameter[k] for k in study.get_parameters().keys()],
+            arrays=arrays,
+            attributes={"computational_time": str(computational_time)},
+        )
+
+
+##
+# Run a chain of parameter configurations of the (global) parameter study.
+#
+# Module-level function so that it can be executed by a multiprocessing pool.
+# \date       2026-10-18 17:06:41+0000
+#
+# \param      chain  List of configuration indices
+#
+# \return     Dictionary mapping configuration index to tuple of parameter
+#             dictionary, measures, computational time and last iterate
+#
+def _run_parameter_configurations(chain):
+    study, configurations, x0, use_warm_start = _parameter_study
+    solver = study._solver
+    observer = study._observer
+    keys = list(study.get_parameters().keys())
+
+    results = {}
+    x_prev = None
+    for i in chain:
+        ph.print_title("%s: Iteration %d/%d" % (
+            study.get_parameter_study_name(), i + 1, len(configurations)))
+
+        dic_parameter = {}
+        for j, key in enumerate(keys):
+            getattr(solver, "set_%s" % key)(configurations[i][j])
+            dic_parameter[key] = str(getattr(solver, "get_%s" % key)())
+            ph.print_info(key + " = %s" % (dic_parameter[key]))
+
+        if use_warm_start and x_prev is not None:
+            solver.set_x0(x_prev)
+        else:
+            solver.set_x0(x0)
+
+        observer.clear_x_list()
+        solver.run()
+        observer.compute_measures()
+
+        measures = {
+            m: np.array(v) for m, v in six.iteritems(observer.get_measures())}
+        x_prev = solver.get_x()
+
+        results[i] = (
+            dic_parameter,
+            measures,
+            observer.get_computational_time(),
+            np.array(observer.get_x_list()[-1], dtype=np.float16),
+        )
+
+    observer.clear_x_list()
+
+    return results
+
+
+##
+# Gets the path to the results store of a parameter study
+# \date       2026-10-18 17:42:02+0000
+#
+# \param      directory  Directory of parameter study, string
+# \param      name       Name of parameter study, string
+#
+# \return     Path to results store file, string
+#
+def get_path_to_results_store(directory, name):
+    return os.path.join(directory, "%s_results.zip" % name)
+
+
+##
+# Reader for parameter studies written to a results store.
+#
+# Provides the interface of nsol's ReaderParameterStudy (and can hence be used
+# with the visualization functions of nsol.application.show_parameter_study)
+# but only reads the parameter information on read_study. Measures and
+# reconstructions are read on demand.
+# \date       2026-10-18 17:43:10+0000
+#
+class ReaderParameterStudyResultsStore(ReaderParameterStudy):
+
+    def __init__(self, directory, name):
+        ReaderParameterStudy.__init__(self, directory=directory, name=name)
+        self._results_store = ResultsStore(
+            get_path_to_results_store(directory, name))
+
+    def get_results_store(self):
+        return self._results_store
+
+    ##
+    # Reads the parameter configurations of the specified parameter study.
+    # \date       2026-10-18 17:43:52+0000
+    #
+    # \param      self  The object
+    #
+    def read_study(self):
+        self._results_store.read()
+        info = self._results_store.get_info()
+
+        self._measures = list(info["measures"])
+        if len(self._measures) == 0:
+            raise RuntimeError("No measures to study '%s' found in '%s'"
+                               % (self._name, self._directory))
+
+        # Same format as the lines of nsol's parameter file
+        self._lines_params = ["\t".join(info["parameters"])] + [
+            "\t".join(key) for key in self._results_store.get_keys()]
+        self._parameters_dic = self._get_parameters()
+
+    def get_file_header(self):
+        self._check_that_study_was_read()
+        return self._results_store.get_info()["header"]
+
+    ##
+    # Gets the results for selected measure for all parameter configurations
+    # (rows) and all iterations (columns).
+    # \date       2026-10-18 17:44:31+0000
+    #
+    def get_results(self, measure):
+        self._check_that_study_was_read()
+        return np.array(self._results_store.get_arrays(measure))
+
+    ##
+    # Gets the reconstructions as read-only dictionary-like object which reads
+    # requested reconstructions on demand.
+    # \date       2026-10-18 17:45:02+0000
+    #
+    def get_reconstructions(self):
+        self._check_that_study_was_read()
+        return _ResultsStoreReconstructions(self._results_store)
+
+
+##
+# Read-only mapping from reconstruction info keys and line numbers, as
+# provided by nsol's reconstruction npz-file, to the stored data.
+# \date       2026-10-18 17:45:40+0000
+#
+class _ResultsStoreReconstructions(Mapping):
+
+    def __init__(self, results_store):
+        self._results_store = results_store
+        self._reconstruction_info = \
+            results_store.get_info()["reconstruction_info"]
+        self._keys = results_store.get_keys()
+
+    def __getitem__(self, key):
+        if key in self._reconstruction_info:
+            return self._reconstruction_info[key]
+        try:
+            line = int(key)
+        except ValueError:
+            raise KeyError(key)
+        if line < 0 or line >= len(self._keys):
+            raise KeyError(key)
+        return self._results_store.get_arrays("x", indices=[line])[0]
+
+    def __iter__(self):
+        for key in self._reconstruction_info:
+            yield key
+        for line in range(len(self._keys)):
+            yield str(line)
+
+    def __len__(self):
+        return len(self._reconstruction_info) + len(self._keys)
@@ -0,0 +1,283 @@
+##
+# \file pipeline_checkpoint.py
+# \brief      Class to write and read checkpoints of the reconstruction
+#             pipeline state so that interrupted runs can be resumed.
+#
+# Each checkpoint is a single compressed NumPy archive (*.npz) holding the
+# registration history of all stacks and their slices, the rejected slices
+# and, if available, the current reconstruction including its mask.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import re
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+import niftymic.base.stack as st
+import niftymic.base.stack_transforms as stt
+import niftymic.base.exceptions as exceptions
+
+
+##
+# Class to write and read checkpoints of the reconstruction pipeline.
+#
+# Checkpoints are stored as checkpoint_<index>_<stage>.npz in the given
+# directory whereby the index reflects the order in which the stages were
+# written.
+# \date       2026-10-18 12:20:41+0000
+#
+class PipelineCheckpoint(object):
+
+    ##
+    # Store directory and check for existing checkpoints
+    # \date       2026-10-18 12:21:03+0000
+    #
+    # \param      self       The object
+    # \param      directory  Directory where checkpoints are written to/read
+    #                        from, string
+    # \param      verbose    Verbose output, bool
+    #
+    def __init__(self, directory, verbose=True):
+        self._directory = directory
+        self._verbose = verbose
+
+        self._pattern = re.compile("checkpoint_([0-9]+)_(.+)[.]npz$")
+        self._data = None
+
+    ##
+    # Delete all existing checkpoints in directory
+    # \date       2026-10-18 12:21:39+0000
+    #
+    def clear(self):
+        for path_to_file in self._get_paths_to_checkpoints():
+            os.remove(path_to_file)
+
+    ##
+    # Gets the stage names of all available checkpoints in the order they
+    # were written.
+    # \date       2026-10-18 12:22:02+0000
+    #
+    # \return     List of stage names as strings
+    #
+    def get_stages(self):
+        return [self._pattern.match(os.path.basename(f)).group(2)
+                for f in self._get_paths_to_checkpoints()]
+
+    ##
+    # Gets the name of the latest stage
+    # \date       2026-10-18 12:22:31+0000
+    #
+    # \return     Stage name as string or None if no checkpoint is available
+    #
+    def get_latest_stage(self):
+        stages = self.get_stages()
+        if len(stages) == 0:
+            return None
+        return stages[-1]
+
+    ##
+    # Writes the checkpoint for the given stage.
+    #
+    # The archive is written to a temporary file first and then moved in
+    # place so that an interrupted write never leaves a corrupt checkpoint.
+    # \date       2026-10-18 12:22:57+0000
+    #
+    # \param      self            The object
+    # \param      stage           Name of stage, string
+    # \param      stacks          List of Stack objects
+    # \param      reconstruction  Current reconstruction as Stack object
+    #                             (optional)
+    #
+    def write(self, stage, stacks, reconstruction=None):
+        ph.create_directory(self._directory)
+
+        paths = self._get_paths_to_checkpoints()
+        if len(paths) == 0:
+            index = 0
+        else:
+            index = int(self._pattern.match(
+                os.path.basename(paths[-1])).group(1)) + 1
+
+        data = {
+            "stage": np.array(stage),
+            "stack_filenames": np.array(
+                [stack.get_filename() for stack in stacks]),
+        }
+        for i, stack in enumerate(stacks):
+            data.update(stt.StackTransforms.from_stack(
+                stack).get_dictionary("stack%d_" % i))
+
+        if reconstruction is not None:
+            data.update(self._get_reconstruction_data(reconstruction))
+
+        path_to_file = os.path.join(
+            self._directory, "checkpoint_%03d_%s.npz" % (index, stage))
+        path_to_tmp = os.path.join(
+            self._directory, "checkpoint_%03d_%s_tmp.npz" % (index, stage))
+        np.savez_compressed(path_to_tmp, **data)
+        os.rename(path_to_tmp, path_to_file)
+
+        if self._verbose:
+            ph.print_info("Checkpoint '%s' written to %s" % (
+                stage, path_to_file))
+
+    ##
+    # Reads the checkpoint of the given stage.
+    # \date       2026-10-18 12:24:16+0000
+    #
+    # \param      self   The object
+    # \param      stage  Name of stage, string; if None, the latest stage is
+    #                    read
+    #
+    def read(self, stage=None):
+        paths = self._get_paths_to_checkpoints()
+        if stage is not None:
+            paths = [f for f in paths
+                     if self._pattern.match(os.path.basename(f)).group(2) ==
+                     stage]
+        if len(paths) == 0:
+            raise exceptions.FileNotExistent(
+                os.path.join(self._directory, "checkpoint_*_%s.npz" % (
+                    "*" if stage is None else stage)))
+
+        path_to_file = paths[-1]
+        with np.load(path_to_file) as data:
+            self._data = {k: data[k] for k in data.files}
+
+        if self._verbose:
+            ph.print_info("Checkpoint '%s' read from %s" % (
+                self.get_stage(), path_to_file))
+
+    def get_stage(self):
+        return str(self._data["stage"])
+
+    ##
+    # Update the stack positions, i.e. the stack-level registration history,
+    # according to the read checkpoint. Slices are not updated.
+    # \date       2026-10-18 12:25:07+0000
+    #
+    # \param      self    The object
+    # \param      stacks  List of Stack objects
+    #
+    # \post       Stack positions of stacks are updated in-place
+    #
+    def update_stack_positions(self, stacks):
+        for stack in stacks:
+            stack_transforms = stt.StackTransforms.from_dictionary(
+                self._data, self._get_stack_prefix(stack))
+            stack.set_registration_history(
+                stack_transforms.get_stack_registration_history())
+
+    ##
+    # Update the slice positions and remove rejected slices according to the
+    # read checkpoint. Stacks without remaining slices are removed.
+    # \date       2026-10-18 12:25:44+0000
+    #
+    # \param      self    The object
+    # \param      stacks  List of Stack objects
+    #
+    # \return     List of Stack objects with at least one remaining slice
+    #
+    def update_slices(self, stacks):
+        stacks_kept = []
+        for stack in stacks:
+            prefix = self._get_stack_filename_prefix(stack)
+            if prefix is None:
+                ph.print_info(
+                    "Stack '%s' removed as not contained in checkpoint" %
+                    stack.get_filename())
+                continue
+
+            histories = stt.StackTransforms.from_dictionary(
+                self._data, prefix).get_slice_registration_histories()
+
+            for slice in stack.get_slices():
+                slice_number = slice.get_slice_number()
+                if slice_number not in histories.keys():
+                    stack.delete_slice(slice)
+                    continue
+                slice.set_registration_history(histories[slice_number])
+
+            if stack.get_number_of_slices() > 0:
+                stacks_kept.append(stack)
+            elif self._verbose:
+                ph.print_info("Stack '%s' removed entirely." %
+                              stack.get_filename())
+
+        return stacks_kept
+
+    ##
+    # Gets the reconstruction stored in the read checkpoint.
+    # \date       2026-10-18 12:26:38+0000
+    #
+    # \return     Reconstruction as Stack object or None if not available
+    #
+    def get_reconstruction(self):
+        if "reconstruction" not in self._data.keys():
+            return None
+
+        image_sitk = self._get_image_sitk(
+            self._data["reconstruction"], "reconstruction_")
+
+        if "reconstruction_mask" in self._data.keys():
+            image_sitk_mask = self._get_image_sitk(
+                self._data["reconstruction_mask"], "reconstruction_")
+        else:
+            image_sitk_mask = None
+
+        return st.Stack.from_sitk_image(
+            image_sitk=image_sitk,
+            image_sitk_mask=image_sitk_mask,
+            filename=str(self._data["reconstruction_filename"]),
+            slice_thickness=float(image_sitk.GetSpacing()[-1]),
+        )
+
+    def _get_paths_to_checkpoints(self):
+        if not ph.directory_exists(self._directory):
+            return []
+        filenames = [f for f in os.listdir(self._directory)
+                     if self._pattern.match(f) and not f.endswith("_tmp.npz")]
+        filenames = sorted(
+            filenames, key=lambda f: int(self._pattern.match(f).group(1)))
+        return [os.path.join(self._directory, f) for f in filenames]
+
+    def _get_stack_filename_prefix(self, stack):
+        filenames = self._data["stack_filenames"].tolist()
+        if stack.get_filename() not in filenames:
+            return None
+        return "stack%d_" % filenames.index(stack.get_filename())
+
+    def _get_stack_prefix(self, stack):
+        prefix = self._get_stack_filename_prefix(stack)
+        if prefix is None:
+            raise ValueError(
+                "Stack '%s' is not contained in checkpoint '%s'" % (
+                    stack.get_filename(), self.get_stage()))
+        return prefix
+
+    def _get_reconstruction_data(self, reconstruction):
+        data = {
+            "reconstruction": sitk.GetArrayFromImage(reconstruction.sitk),
+            "reconstruction_origin": np.array(reconstruction.sitk.GetOrigin()),
+            "reconstruction_spacing": np.array(
+                reconstruction.sitk.GetSpacing()),
+            "reconstruction_direction": np.array(
+                reconstruction.sitk.GetDirection()),
+            "reconstruction_filename": np.array(reconstruction.get_filename()),
+        }
+        if not reconstruction.is_unity_mask():
+            data["reconstruction_mask"] = sitk.GetArrayFromImage(
+                reconstruction.sitk_mask).astype(np.uint8)
+        return data
+
+    def _get_image_sitk(self, nda, prefix):
+        image_sitk = sitk.GetImageFromArray(nda)
+        image_sitk.SetOrigin(self._data[prefix + "origin"])
+        image_sitk.SetSpacing(self._data[prefix + "spacing"])
+        image_sitk.SetDirection(self._data[prefix + "direction"])
+        return image_sitk
@@ -0,0 +1,253 @@
+##
+# \file results_store.py
+# \brief      Binary store for evaluation results such as parameter study
+#             measures, reconstructions and similarities.
+#
+# All results are stored in a single zip archive. Each record is identified by
+# a key (tuple of strings, e.g. the parameter values of a study
+# configuration or a stack name) and holds a set of named numpy arrays stored
+# in .npy format as individual archive members. Thus, single arrays can be
+# read without parsing the entire archive, and records can be appended
+# without rewriting previously stored ones. Archive layout:
+#
+#   info.json           General information on the stored results
+#   <i>/record.json     Key and attributes of record i
+#   <i>/<name>.npy      Array 'name' of record i
+#
+# A record is complete once its record.json is written. Members of incomplete
+# records, e.g. of an interrupted run, are ignored and their index is never
+# reused.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import io
+import os
+import re
+import json
+import zipfile
+
+import numpy as np
+
+import pysitk.python_helper as ph
+
+
+##
+# Class to write and read results to/from a single binary, indexed file
+# \date       2026-10-18 17:31:12+0000
+#
+class ResultsStore(object):
+
+    ##
+    # Store path to results file
+    # \date       2026-10-18 17:31:40+0000
+    #
+    # \param      self          The object
+    # \param      path_to_file  Path to results store file, string
+    #
+    def __init__(self, path_to_file):
+        self._path_to_file = path_to_file
+
+        # Index built by 'read'
+        self._info = None
+        self._keys = None
+        self._attributes = None
+        self._array_names = None
+
+        # Archive indices of (complete) records and index of next record
+        self._indices = None
+        self._next_index = None
+
+    def get_path_to_file(self):
+        return self._path_to_file
+
+    ##
+    # Create a new (empty) results store; an existing file is overwritten.
+    # \date       2026-10-18 17:32:15+0000
+    #
+    # \param      self  The object
+    # \param      info  General information on the stored results as
+    #                   JSON-serializable dictionary
+    #
+    def create(self, info=None):
+        if info is None:
+            info = {}
+        ph.create_directory(os.path.dirname(
+            os.path.abspath(self._path_to_file)))
+        with zipfile.ZipFile(
+                self._path_to_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("info.json", json.dumps(info))
+
+        self._info = dict(info)
+        self._keys = []
+        self._attributes = []
+        self._array_names = []
+        self._indices = []
+        self._next_index = 0
+
+    ##
+    # Append a record to the results store. If a record with the same key
+    # exists already, the key refers to the appended record thereafter.
+    # \date       2026-10-18 17:33:02+0000
+    #
+    # \param      self        The object
+    # \param      key         Key of record as tuple of strings
+    # \param      arrays      Dictionary of named arrays, i.e. name -> numpy
+    #                         array
+    # \param      attributes  Additional JSON-serializable dictionary
+    #
+    def add_record(self, key, arrays, attributes=None):
+        if attributes is None:
+            attributes = {}
+        if not ph.file_exists(self._path_to_file):
+            raise IOError("Results store '%s' does not exist. "
+                          "Execute 'create' first" % self._path_to_file)
+        if self._keys is None:
+            self.read()
+
+        key = tuple(str(k) for k in key)
+        index = self._next_index
+        record = {
+            "key": list(key),
+            "arrays": list(arrays.keys()),
+            "attributes": attributes,
+        }
+        with zipfile.ZipFile(
+                self._path_to_file, "a", zipfile.ZIP_DEFLATED) as zf:
+            for name, nda in arrays.items():
+                zf.writestr(
+                    "%d/%s.npy" % (index, name), self._get_npy_bytes(nda))
+
+            # Record information written last to mark complete record
+            zf.writestr("%d/record.json" % index, json.dumps(record))
+
+        self._keys.append(key)
+        self._attributes.append(attributes)
+        self._array_names.append(record["arrays"])
+        self._indices.append(index)
+        self._next_index = index + 1
+
+    ##
+    # Read the index of the results store, i.e. the information and the keys,
+    # array names and attributes of all records. Arrays are not read.
+    # \date       2026-10-18 17:34:20+0000
+    #
+    # \param      self  The object
+    #
+    def read(self):
+        if not ph.file_exists(self._path_to_file):
+            raise IOError("Results store '%s' does not exist" %
+                          self._path_to_file)
+
+        p = re.compile("([0-9]+)/record[.]json$")
+        p_member = re.compile("([0-9]+)/")
+        with zipfile.ZipFile(self._path_to_file, "r") as zf:
+            self._info = json.loads(zf.read("info.json").decode("utf-8"))
+
+            names = zf.namelist()
+            indices = sorted(
+                int(p.match(f).group(1)) for f in names if p.match(f))
+            records = [
+                json.loads(zf.read("%d/record.json" % i).decode("utf-8"))
+                for i in indices
+            ]
+
+            # Members of incomplete records occupy their index as well
+            self._next_index = 1 + max(
+                [-1] + [int(p_member.match(f).group(1))
+                        for f in names if p_member.match(f)])
+
+        self._keys = [tuple(r["key"]) for r in records]
+        self._attributes = [r["attributes"] for r in records]
+        self._array_names = [r["arrays"] for r in records]
+        self._indices = indices
+
+    def get_info(self):
+        self._check_that_store_was_read()
+        return dict(self._info)
+
+    ##
+    # Gets the keys of all records in order of insertion
+    # \date       2026-10-18 17:35:01+0000
+    #
+    # \param      self  The object
+    #
+    # \return     List of tuples of strings
+    #
+    def get_keys(self):
+        self._check_that_store_was_read()
+        return list(self._keys)
+
+    def get_attributes(self, key):
+        return dict(self._attributes[self._get_index(key)])
+
+    def get_array_names(self, key):
+        return list(self._array_names[self._get_index(key)])
+
+    ##
+    # Gets a single array of a record; only this array is read from file.
+    # \date       2026-10-18 17:35:42+0000
+    #
+    # \param      self  The object
+    # \param      key   Key of record as tuple of strings
+    # \param      name  Name of array, string
+    #
+    # \return     numpy array
+    #
+    def get_array(self, key, name):
+        index = self._get_index(key)
+        if name not in self._array_names[index]:
+            raise ValueError("Array '%s' not available for record '%s'" % (
+                name, str(key)))
+        with zipfile.ZipFile(self._path_to_file, "r") as zf:
+            return self._read_npy_bytes(zf.read("%d/%s.npy" % (
+                self._indices[index], name)))
+
+    ##
+    # Gets the named array of all records (or the ones specified by their
+    # position in the list of keys)
+    # \date       2026-10-18 17:36:20+0000
+    #
+    # \param      self     The object
+    # \param      name     Name of array, string
+    # \param      indices  Indices of records; all records are used if None
+    #
+    # \return     List of numpy arrays
+    #
+    def get_arrays(self, name, indices=None):
+        self._check_that_store_was_read()
+        if indices is None:
+            indices = range(len(self._keys))
+        with zipfile.ZipFile(self._path_to_file, "r") as zf:
+            return [
+                self._read_npy_bytes(zf.read("%d/%s.npy" % (
+                    self._indices[i], name)))
+                for i in indices
+            ]
+
+    def _get_index(self, key):
+        self._check_that_store_was_read()
+        key = tuple(str(k) for k in key)
+
+        # Latest record in case of identical keys
+        indices = [i for i, k in enumerate(self._keys) if k == key]
+        if len(indices) == 0:
+            raise ValueError("Record '%s' not available in '%s'" % (
+                str(key), self._path_to_file))
+        return indices[-1]
+
+    def _check_that_store_was_read(self):
+        if self._keys is None:
+            raise RuntimeError("Execute 'read' or 'create' first")
+
+    @staticmethod
+    def _get_npy_bytes(nda):
+        buffer = io.BytesIO()
+        np.lib.format.write_array(
+            buffer, np.asarray(nda), allow_pickle=False)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _read_npy_bytes(data):
+        return np.lib.format.read_array(io.BytesIO(data), allow_pickle=False)
@@ -0,0 +1,307 @@
+##
+# \file stage_scheduler.py
+# \brief      Scheduler to execute pipeline stages given as directed acyclic
+#             graph.
+#
+# Stages whose dependencies are completed are executed concurrently. A stage
+# is skipped if all its outputs exist and neither its command nor its inputs
+# have changed since its last successful execution.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import os
+import hashlib
+import threading
+import multiprocessing.pool
+
+import six
+
+import pysitk.python_helper as ph
+
+
+##
+# Pipeline stage, i.e. a shell command or callable with associated inputs,
+# outputs and dependencies.
+# \date       2026-10-18 14:02:17+0000
+#
+class Stage(object):
+
+    ##
+    # Store stage information
+    # \date       2026-10-18 14:02:41+0000
+    #
+    # \param      self          The object
+    # \param      name          Unique name of stage, string
+    # \param      command       Shell command as string or callable returning
+    #                           an exit code (0 for success)
+    # \param      inputs        List of paths to input files or directories
+    # \param      outputs       List of paths to output files or directories
+    # \param      dependencies  List of stage names that need to be completed
+    #                           before this stage can be executed
+    # \param      required      If False, a failure of the stage only raises
+    #                           a warning, bool
+    # \param      signature     String identifying the parameters of a
+    #                           callable command; used for its hash
+    #
+    def __init__(self,
+                 name,
+                 command,
+                 inputs=[],
+                 outputs=[],
+                 dependencies=[],
+                 required=True,
+                 signature="",
+                 ):
+        self.name = name
+        self.command = command
+        self.signature = signature
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.dependencies = list(dependencies)
+        self.required = required
+
+    ##
+    # Gets the hash of the stage defined by its command (or signature) and
+    # the content of its inputs.
+    # \date       2026-10-18 14:03:20+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Hexadecimal digest, string
+    #
+    def get_hash(self):
+        md5 = hashlib.md5()
+        if isinstance(self.command, six.string_types):
+            md5.update(self.command.encode("utf-8"))
+        else:
+            md5.update(("%s %s" % (
+                self.name, self.signature)).encode("utf-8"))
+        for path in self.inputs:
+            md5.update(path.encode("utf-8"))
+            for path_to_file in self._get_files(path):
+                with open(path_to_file, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        md5.update(chunk)
+        return md5.hexdigest()
+
+    def is_output_existent(self):
+        return all(os.path.exists(p) for p in self.outputs)
+
+    def execute(self):
+        if isinstance(self.command, six.string_types):
+            return ph.execute_command(self.command)
+        return self.command()
+
+    @staticmethod
+    def _get_files(path):
+        if os.path.isdir(path):
+            paths = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                paths.extend([os.path.join(root, f) for f in sorted(files)])
+            return paths
+        if os.path.isfile(path):
+            return [path]
+        return []
+
+
+##
+# Scheduler executing stages according to their dependencies.
+# \date       2026-10-18 14:04:12+0000
+#
+class StageScheduler(object):
+
+    ##
+    # Store scheduler settings
+    # \date       2026-10-18 14:04:35+0000
+    #
+    # \param      self                The object
+    # \param      path_to_hashes      Path to json-file storing the hashes of
+    #                                 successfully executed stages; if None,
+    #                                 no stage is skipped
+    # \param      n_processes         Maximum number of concurrently executed
+    #                                 stages, int
+    # \param      skip_up_to_date     Skip stages with unchanged hash whose
+    #                                 outputs exist, bool
+    #
+    def __init__(self,
+                 path_to_hashes=None,
+                 n_processes=1,
+                 skip_up_to_date=True,
+                 ):
+        self._path_to_hashes = path_to_hashes
+        self._n_processes = n_processes
+        self._skip_up_to_date = skip_up_to_date
+
+        self._stages = []
+        self._computational_times = {}
+        self._status = {}
+        self._lock = threading.Lock()
+
+    ##
+    # Adds a stage; see Stage for a description of the arguments.
+    # \date       2026-10-18 14:05:02+0000
+    #
+    def add_stage(self, name, command, **kwargs):
+        if name in [s.name for s in self._stages]:
+            raise ValueError("Stage '%s' already exists" % name)
+        self._stages.append(Stage(name, command, **kwargs))
+
+    def get_stage_names(self):
+        return [s.name for s in self._stages]
+
+    ##
+    # Gets the computational times of the stages
+    # \date       2026-10-18 14:05:24+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary stage name -> computational time
+    #
+    def get_computational_times(self):
+        return dict(self._computational_times)
+
+    ##
+    # Gets the status of the stages, i.e. 'executed', 'skipped' or 'failed'.
+    # \date       2026-10-18 14:05:41+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary stage name -> status
+    #
+    def get_status(self):
+        return dict(self._status)
+
+    ##
+    # Execute all stages. Dependencies on stages which have not been added
+    # are considered to be completed already.
+    # \date       2026-10-18 14:06:13+0000
+    #
+    # \param      self  The object
+    #
+    def run(self):
+        names = self.get_stage_names()
+        pending = list(self._stages)
+        completed = set()
+        running = set()
+        errors = []
+
+        hashes = self._read_hashes()
+        condition = threading.Condition()
+        finished = []
+
+        def callback(name):
+            with condition:
+                finished.append(name)
+                condition.notify()
+
+        pool = multiprocessing.pool.ThreadPool(max(1, self._n_processes))
+        try:
+            while pending or running:
+                if not errors:
+                    ready = [
+                        s for s in pending
+                        if all(d in completed or d not in names
+                               for d in s.dependencies)
+                    ]
+                    for stage in ready:
+                        pending.remove(stage)
+                        running.add(stage.name)
+                        pool.apply_async(
+                            self._run_stage,
+                            (stage, hashes, errors),
+                            callback=callback)
+                elif not running:
+                    break
+
+                if not running:
+                    raise RuntimeError(
+                        "Stages '%s' have unresolvable dependencies" %
+                        "', '".join(s.name for s in pending))
+
+                with condition:
+                    while not finished:
+                        condition.wait()
+                    for name in finished:
+                        running.remove(name)
+                        completed.add(name)
+                    del finished[:]
+        finally:
+            pool.close()
+            pool.join()
+
+        if errors:
+            raise RuntimeError("Stage(s) failed: %s" % ", ".join(errors))
+
+    def print_computational_times(self):
+        for stage in self._stages:
+            if stage.name not in self._computational_times:
+                continue
+            print("Computational Time for Stage '%s' (%s): %s" % (
+                stage.name,
+                self._status[stage.name],
+                self._computational_times[stage.name]))
+
+    ##
+    # Execute single stage unless it is up to date. Runs in worker thread,
+    # hence exceptions are recorded in errors instead of being raised.
+    # \date       2026-10-18 14:07:02+0000
+    #
+    # \param      self    The object
+    # \param      stage   Stage object
+    # \param      hashes  Dictionary stage name -> hash of last execution
+    # \param      errors  List of names of failed stages
+    #
+    # \return     Stage name
+    #
+    def _run_stage(self, stage, hashes, errors):
+        time_start = ph.start_timing()
+        try:
+            stage_hash = stage.get_hash()
+            if self._skip_up_to_date and \
+                    hashes.get(stage.name) == stage_hash and \
+                    stage.is_output_existent():
+                ph.print_info("Stage '%s' is up to date" % stage.name)
+                status = "skipped"
+            else:
+                ph.print_info("Run stage '%s' ..." % stage.name)
+                exit_code = stage.execute()
+                if exit_code != 0:
+                    raise RuntimeError("exit code %s" % exit_code)
+                status = "executed"
+                with self._lock:
+                    hashes[stage.name] = stage.get_hash()
+                    self._write_hashes(hashes)
+        except Exception as e:
+            status = "failed"
+            if stage.required:
+                ph.print_warning("Stage '%s' failed: %s" % (stage.name, e))
+                with self._lock:
+                    errors.append(stage.name)
+            else:
+                ph.print_warning(
+                    "Stage '%s' failed (not required): %s" % (stage.name, e))
+
+        with self._lock:
+            self._status[stage.name] = status
+            self._computational_times[stage.name] = \
+                ph.stop_timing(time_start)
+
+        return stage.name
+
+    def _read_hashes(self):
+        if self._path_to_hashes is None or \
+                not ph.file_exists(self._path_to_hashes):
+            return {}
+        try:
+            return ph.read_dictionary_from_json(self._path_to_hashes)
+        except (IOError, ValueError):
+            return {}
+
+    def _write_hashes(self, hashes):
+        if self._path_to_hashes is None:
+            return
+        ph.write_dictionary_to_json(
+            hashes, self._path_to_hashes, verbose=False)
@@ -11,6 +11,8 @@
 #
 
 import six
+import copy
+import multiprocessing.pool
 import numpy as np
 import SimpleITK as sitk
 from abc import ABCMeta, abstractmethod
@@ -122,6 +124,9 @@ class VolumeToVolumeRegistration(RegistrationPipeline):
     # \param      reference            The reference
     # \param      registration_method  The registration method
     # \param      verbose              The verbose
+    # \param      registration_cache   RegistrationCache object to reuse
+    #                                  transforms of identical previous
+    #                                  registrations or None
     #
     def __init__(self,
                  stacks,
@@ -130,6 +135,7 @@ class VolumeToVolumeRegistration(RegistrationPipeline):
                  verbose=1,
                  viewer=VIEWER,
                  robust=False,
+                 registration_cache=None,
                  ):
         RegistrationPipeline.__init__(
             self,
@@ -140,6 +146,7 @@ class VolumeToVolumeRegistration(RegistrationPipeline):
             verbose=verbose,
         )
         self._robust = robust
+        self._registration_cache = registration_cache
 
     def _run(self):
 
@@ -154,26 +161,62 @@ class VolumeToVolumeRegistration(RegistrationPipeline):
                 ph.print_info(txt)
 
             if self._robust:
-                transform_initializer = tinit.TransformInitializer(
-                    fixed=self._reference,
-                    moving=self._stacks[i],
-                    similarity_measure="NCC",
-                    refine_pca_initializations=True,
-                )
-                transform_initializer.run()
-                transform_sitk = transform_initializer.get_transform_sitk()
-                transform_sitk = sitk.AffineTransform(
-                    transform_sitk.GetInverse())
+                transform_sitk = self._get_robust_transform_sitk(
+                    self._stacks[i])
 
             else:
                 self._registration_method.set_moving(self._reference)
                 self._registration_method.set_fixed(self._stacks[i])
-                self._registration_method.run()
-                transform_sitk = self._registration_method.get_registration_transform_sitk()
+                if self._registration_cache is not None:
+                    transform_sitk = self._registration_cache.run(
+                        self._registration_method)
+                else:
+                    self._registration_method.run()
+                    transform_sitk = self._registration_method.get_registration_transform_sitk()
 
             # Update position of stack
             self._stacks[i].update_motion_correction(transform_sitk)
 
+    ##
+    # Gets the stack transform based on the (cached) best PCA-based
+    # initialization refined by rigid registrations
+    # \date       2026-10-19 09:31:12+0000
+    #
+    # \param      self   The object
+    # \param      stack  Stack to be aligned with the reference
+    #
+    # \return     Transform as sitk.AffineTransform
+    #
+    def _get_robust_transform_sitk(self, stack):
+        if self._registration_cache is not None:
+            key = self._registration_cache.get_key(
+                fixed_sitk=self._reference.sitk,
+                moving_sitk=stack.sitk,
+                method="TransformInitializer",
+                fixed_sitk_mask=self._reference.sitk_mask,
+                moving_sitk_mask=stack.sitk_mask,
+                options="similarity_measure=NCC, "
+                "refine_pca_initializations=True",
+            )
+            transform_sitk = self._registration_cache.read_transform_sitk(key)
+            if transform_sitk is not None:
+                return sitk.AffineTransform(transform_sitk)
+
+        transform_initializer = tinit.TransformInitializer(
+            fixed=self._reference,
+            moving=stack,
+            similarity_measure="NCC",
+            refine_pca_initializations=True,
+        )
+        transform_initializer.run()
+        transform_sitk = transform_initializer.get_transform_sitk()
+        transform_sitk = sitk.AffineTransform(transform_sitk.GetInverse())
+
+        if self._registration_cache is not None:
+            self._registration_cache.write_transform_sitk(key, transform_sitk)
+
+        return transform_sitk
+
 
 ##
 # Class to perform Slice-To-Volume registration
@@ -193,6 +236,15 @@ class SliceToVolumeRegistration(RegistrationPipeline):
     # \param      verbose              The verbose
     # \param      print_prefix         Print at each iteration at the
     #                                  beginning, string
+    # \param      convergence_thresholds  Thresholds of slice transform
+    #                                  changes in mm and degrees. If given,
+    #                                  slices whose registration in the
+    #                                  previous run changed their position by
+    #                                  less than both thresholds are skipped
+    #                                  in this run. Skipped slices are
+    #                                  registered again in the next run to
+    #                                  confirm their convergence against the
+    #                                  updated reference, tuple of two floats
     #
     def __init__(self,
                  stacks,
@@ -203,6 +255,7 @@ class SliceToVolumeRegistration(RegistrationPipeline):
                  s2v_smoothing=None,
                  interleave=2,
                  viewer=VIEWER,
+                 convergence_thresholds=None,
                  ):
         RegistrationPipeline.__init__(
             self,
@@ -215,6 +268,12 @@ class SliceToVolumeRegistration(RegistrationPipeline):
         self._print_prefix = print_prefix
         self._s2v_smoothing = s2v_smoothing
         self._interleave = interleave
+        self._convergence_thresholds = convergence_thresholds
+
+        # Transform changes of the slices registered in the last run as
+        # dictionary (stack filename, slice number) -> (translation in mm,
+        # rotation in degrees)
+        self._slice_changes = {}
 
     def set_print_prefix(self, print_prefix):
         self._print_prefix = print_prefix
@@ -225,12 +284,84 @@ class SliceToVolumeRegistration(RegistrationPipeline):
     def get_s2v_smoothing(self):
         return self._s2v_smoothing
 
+    def set_convergence_thresholds(self, convergence_thresholds):
+        self._convergence_thresholds = convergence_thresholds
+
+    def get_convergence_thresholds(self):
+        return self._convergence_thresholds
+
+    ##
+    # Gets the transform changes of the slices registered in the last run.
+    # Slices skipped as converged are not included.
+    # \date       2026-10-18 22:52:30+0000
+    #
+    # \param      self  The object
+    #
+    # \return     Dictionary (stack filename, slice number) -> (translation
+    #             of slice center in mm, rotation angle in degrees)
+    #
+    def get_slice_changes(self):
+        return dict(self._slice_changes)
+
+    ##
+    # Query whether the registration of a slice in the previous run changed
+    # its position by less than the convergence thresholds
+    # \date       2026-10-18 22:53:12+0000
+    #
+    # \param      self           The object
+    # \param      slice_changes  Transform changes of the slices registered
+    #                            in the previous run as dictionary
+    # \param      stack          The stack as Stack object
+    # \param      slice          The slice as Slice object
+    #
+    # \return     True if slice is converged, False otherwise
+    #
+    def _is_converged(self, slice_changes, stack, slice):
+        if self._convergence_thresholds is None:
+            return False
+
+        key = (stack.get_filename(), slice.get_slice_number())
+        if key not in slice_changes:
+            return False
+
+        return all(c < t for c, t in zip(
+            slice_changes[key], self._convergence_thresholds))
+
+    ##
+    # Gets the change of slice position caused by a registration transform,
+    # i.e. the displacement of the slice center and the rotation angle.
+    # \date       2026-10-18 22:54:40+0000
+    #
+    # \param      transform_sitk  The registration transform as
+    #                             sitk.Transform object
+    # \param      slice           The slice as Slice object
+    #
+    # \return     Tuple of translation in mm and rotation angle in degrees
+    #
+    @staticmethod
+    def _get_transform_change(transform_sitk, slice):
+        center = slice.sitk.TransformContinuousIndexToPhysicalPoint(
+            [(n - 1) / 2. for n in slice.sitk.GetSize()])
+        translation = np.linalg.norm(
+            np.array(transform_sitk.TransformPoint(center)) - center)
+
+        matrix = np.array(transform_sitk.GetMatrix()).reshape(3, 3)
+        rotation = np.rad2deg(np.arccos(
+            np.clip((np.trace(matrix) - 1) / 2., -1, 1)))
+
+        return translation, rotation
+
     def _run(self):
 
         ph.print_title("Slice-to-Volume Registration")
 
         self._registration_method.set_moving(self._reference)
 
+        # Only changes measured in this run are kept. Hence, a slice skipped
+        # as converged is registered again in the next run.
+        slice_changes_previous = self._slice_changes
+        self._slice_changes = {}
+
         for i, stack in enumerate(self._stacks):
             slices = stack.get_slices()
 
@@ -243,13 +374,21 @@ class SliceToVolumeRegistration(RegistrationPipeline):
                         self._print_prefix,
                         i + 1, len(self._stacks), stack.get_filename(),
                         j + 1, len(slices))
+
+                # Converged slices are not registered again (robust motion
+                # estimation requires transforms of all slices)
+                if self._s2v_smoothing is None and \
+                        self._is_converged(
+                            slice_changes_previous, stack, slice_j):
+                    ph.print_info("%s (converged)" % txt)
+                    continue
+
                 if self._verbose:
                     ph.print_subtitle(txt)
                 else:
                     ph.print_info(txt)
 
-                self._registration_method.set_fixed(slice_j)
-                self._registration_method.run()
+                self._register_slice(slice_j)
 
                 # Store information on registration transform
                 transform_sitk = \
@@ -294,8 +433,7 @@ class SliceToVolumeRegistration(RegistrationPipeline):
                     else:
                         ph.print_info(txt)
 
-                    self._registration_method.set_fixed(slice_j)
-                    self._registration_method.run()
+                    self._register_slice(slice_j)
 
                     # Store information on registration transform
                     transform_sitk = \
@@ -319,9 +457,22 @@ class SliceToVolumeRegistration(RegistrationPipeline):
             # Update position of slice
             for slice in slices:
                 slice_number = slice.get_slice_number()
+                if slice_number not in transforms_sitk:
+                    continue
+
+                if self._s2v_smoothing is None:
+                    self._slice_changes[(
+                        stack.get_filename(), slice_number)] = \
+                        self._get_transform_change(
+                            transforms_sitk[slice_number], slice)
                 slice.update_motion_correction(transforms_sitk[slice_number])
 
 
+    def _register_slice(self, slice):
+        self._registration_method.set_fixed(slice)
+        self._registration_method.run()
+
+
 ##
 # Class to perform registration for the stack based on a specified set of
 # slices
@@ -341,6 +492,12 @@ class SliceSetToVolumeRegistration(RegistrationPipeline):
     #                                         index sets for all stacks
     # \param      verbose                     The verbose
     # \param      print_prefix                The print prefix
+    # \param      n_processes                 Number of threads to register
+    #                                         slice sets of the same
+    #                                         hierarchy level concurrently.
+    #                                         Each thread uses a (shallow)
+    #                                         copy of the registration
+    #                                         method, int
     #
     def __init__(self,
                  stack,
@@ -350,6 +507,7 @@ class SliceSetToVolumeRegistration(RegistrationPipeline):
                  verbose=1,
                  print_prefix="",
                  viewer=VIEWER,
+                 n_processes=1,
                  ):
         RegistrationPipeline.__init__(
             self,
@@ -362,53 +520,141 @@ class SliceSetToVolumeRegistration(RegistrationPipeline):
 
         self._print_prefix = print_prefix
         self._slice_set_indices = slice_set_indices
+        self._n_processes = n_processes
+
+        # Array views of stack and its mask shared by all slice sets
+        self._nda = None
+        self._nda_mask = None
 
+    ##
+    # Register all slice sets. Slice sets are processed level by level where
+    # the slice sets of one level are disjoint and, thus, can be registered
+    # concurrently. Each slice set is registered after all previous slice
+    # sets it shares slices with, as for sequential processing.
+    # \date       2026-10-18 22:10:43+0000
+    #
+    # \param      self   The object
+    # \param      debug  Check consistency of slice set positions, bool
+    #
     def _run(self, debug=1):
 
         stack = self._stacks[0]
         slices = stack.get_slices()
-        for i, indices in enumerate(self._slice_set_indices):
-            txt = "%s Split %d/%d -- Slices %s" % (
-                self._print_prefix, i + 1,
-                len(self._slice_set_indices), str(indices))
-            if self._verbose:
-                ph.print_subtitle(txt)
-            else:
-                ph.print_info(txt)
 
-                image = self._get_stack_subgroup(indices)
+        n_processes = max(1, self._n_processes)
+        registration_methods = [self._registration_method] + [
+            copy.copy(self._registration_method)
+            for k in range(1, n_processes)]
+        pool = multiprocessing.pool.ThreadPool(n_processes) \
+            if n_processes > 1 else None
+
+        self._nda = sitk.GetArrayViewFromImage(stack.sitk)
+        self._nda_mask = sitk.GetArrayViewFromImage(stack.sitk_mask)
+
+        try:
+            for level in self._get_hierarchy_levels():
+                images = []
+                for i in level:
+                    indices = self._slice_set_indices[i]
+                    txt = "%s Split %d/%d -- Slices %s" % (
+                        self._print_prefix, i + 1,
+                        len(self._slice_set_indices), str(indices))
+                    if self._verbose:
+                        ph.print_subtitle(txt)
+                    else:
+                        ph.print_info(txt)
 
-                if debug:
-                    first = np.linalg.norm(
-                        stack.get_slice(indices[0]).sitk.GetOrigin() -
-                        np.array(image.sitk[:, :, 0:1].GetOrigin()))
-                    last = np.linalg.norm(
-                        stack.get_slice(indices[-1]).sitk.GetOrigin() -
-                        np.array(image.sitk[:, :, -1:].GetOrigin()))
-                    if first > 1e-6:
-                        raise RuntimeError(
-                            "Hierarchical S2V: first slice position flawed")
-                    if last > 1e-6:
-                        raise RuntimeError(
-                            "Hierarchical S2V: last slice position flawed")
-
-                self._registration_method.set_fixed(image)
-                self._registration_method.run()
-                transform_sitk = self._registration_method.\
-                    get_registration_transform_sitk()
-
-                for j in indices:
-                    slices[j].update_motion_correction(transform_sitk)
-
-                # if debug:
-                #     image_after = self._get_stack_subgroup(indices)
-                #     ph.killall_itksnap()
-                #     print(stack.get_filename())
-                #     sitkh.show_stacks(
-                #         [self._reference, image, image_after],
-                #         label=["reference", "before", "after"]
-                #         # segmentation=image,
-                #     )
+                    image = self._get_stack_subgroup(indices)
+
+                    if debug:
+                        first = np.linalg.norm(
+                            stack.get_slice(indices[0]).sitk.GetOrigin() -
+                            np.array(image.sitk[:, :, 0:1].GetOrigin()))
+                        last = np.linalg.norm(
+                            stack.get_slice(indices[-1]).sitk.GetOrigin() -
+                            np.array(image.sitk[:, :, -1:].GetOrigin()))
+                        if first > 1e-6:
+                            raise RuntimeError(
+                                "Hierarchical S2V: first slice position "
+                                "flawed")
+                        if last > 1e-6:
+                            raise RuntimeError(
+                                "Hierarchical S2V: last slice position "
+                                "flawed")
+
+                    images.append(image)
+
+                # Distribute slice sets of level among registration methods
+                tasks = [
+                    (registration_methods[k], images[k::n_processes])
+                    for k in range(min(n_processes, len(images)))
+                ]
+                if pool is None:
+                    results = [self._register_images(t) for t in tasks]
+                else:
+                    results = pool.map(self._register_images, tasks)
+
+                transforms_sitk = [None] * len(images)
+                for k, result in enumerate(results):
+                    transforms_sitk[k::n_processes] = result
+
+                for i, transform_sitk in zip(level, transforms_sitk):
+                    for j in self._slice_set_indices[i]:
+                        slices[j].update_motion_correction(transform_sitk)
+
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            self._nda = None
+            self._nda_mask = None
+
+    ##
+    # Register images to reference using the given registration method
+    # \date       2026-10-18 22:12:20+0000
+    #
+    # \param      self  The object
+    # \param      task  Tuple of registration method and list of images as
+    #                   Stack objects
+    #
+    # \return     List of registration transforms as sitk.Transform objects
+    #
+    def _register_images(self, task):
+        registration_method, images = task
+
+        transforms_sitk = []
+        for image in images:
+            registration_method.set_fixed(image)
+            registration_method.run()
+            transforms_sitk.append(
+                registration_method.get_registration_transform_sitk())
+
+        return transforms_sitk
+
+    ##
+    # Gets the hierarchy levels of the slice sets. A slice set belongs to the
+    # level after the highest level of all previous slice sets sharing slices
+    # with it. Thus, slice sets of the same level are disjoint.
+    # \date       2026-10-18 22:13:51+0000
+    #
+    # \param      self  The object
+    #
+    # \return     List of levels, each a list of slice set positions
+    #
+    def _get_hierarchy_levels(self):
+        levels = []
+        slice_set_levels = []
+        for i, indices in enumerate(self._slice_set_indices):
+            level = 1 + max([-1] + [
+                slice_set_levels[k] for k in range(i)
+                if not set(indices).isdisjoint(self._slice_set_indices[k])
+            ])
+            slice_set_levels.append(level)
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(i)
+
+        return levels
 
     ##
     # Gets the bundled stack of selected slices.
@@ -439,11 +685,22 @@ class SliceSetToVolumeRegistration(RegistrationPipeline):
         #     indices[0]:indices[-1]+self._interleave:self._interleave]
 
         # Build image from selected slices
-        nda = sitk.GetArrayFromImage(stack.sitk)
-        nda_mask = sitk.GetArrayFromImage(stack.sitk_mask)
-
-        image_sitk = sitk.GetImageFromArray(nda[indices, :, :])
-        image_sitk_mask = sitk.GetImageFromArray(nda_mask[indices, :, :])
+        if self._nda is None:
+            nda = sitk.GetArrayViewFromImage(stack.sitk)
+            nda_mask = sitk.GetArrayViewFromImage(stack.sitk_mask)
+        else:
+            nda = self._nda
+            nda_mask = self._nda_mask
+
+        # Select equally spaced slices as view to copy data only once
+        selection = list(indices)
+        steps = np.diff(indices)
+        if len(indices) == 1 or (np.all(steps == steps[0]) and steps[0] > 0):
+            step = steps[0] if len(indices) > 1 else 1
+            selection = slice(indices[0], indices[-1] + 1, step)
+
+        image_sitk = sitk.GetImageFromArray(nda[selection, :, :])
+        image_sitk_mask = sitk.GetImageFromArray(nda_mask[selection, :, :])
 
         # Update stack/slice subgroup position in space according to first
         # slice which has undergone same motion as all remaining slices in the
@@ -566,6 +823,33 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
     # \param      interleave                     The interleave
     # \param      viewer                         The viewer
     # \param      sigma_sda_mask                 The sigma sda mask
+    # \param      checkpoint                     PipelineCheckpoint object to
+    #                                            write the pipeline state to
+    #                                            after each S2V-registration
+    #                                            and reconstruction step
+    #                                            (optional)
+    # \param      resume_stage                   Stage name of checkpoint the
+    #                                            cycles are resumed from, e.g.
+    #                                            's2v_cycle2'. Stacks and
+    #                                            reference are expected to
+    #                                            reflect the state of this
+    #                                            checkpoint (optional)
+    # \param      n_processes                    Number of threads for
+    #                                            hierarchical registration,
+    #                                            int
+    # \param      convergence_thresholds         Thresholds of slice
+    #                                            transform changes in mm and
+    #                                            degrees below which slices
+    #                                            are skipped in the next
+    #                                            cycle; skipped slices are
+    #                                            registered again in the
+    #                                            cycle after (optional),
+    #                                            tuple of two floats
+    # \param      use_early_termination          Stop cycles early once the
+    #                                            median slice transform
+    #                                            changes of a cycle are below
+    #                                            the convergence thresholds,
+    #                                            bool
     #
     def __init__(self,
                  stacks,
@@ -584,8 +868,17 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
                  interleave=3,
                  viewer=VIEWER,
                  sigma_sda_mask=1.,
+                 checkpoint=None,
+                 resume_stage=None,
+                 n_processes=1,
+                 convergence_thresholds=None,
+                 use_early_termination=False,
                  ):
 
+        if use_early_termination and convergence_thresholds is None:
+            raise ValueError(
+                "Early termination requires convergence thresholds")
+
         # Last volumetric reconstruction step is performed outside
         if len(alphas) != cycles - 1:
             raise ValueError(
@@ -617,6 +910,84 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
         self._use_hierarchical_registration = use_hierarchical_registration
         self._s2v_smoothing = s2v_smoothing
         self._interleave = interleave
+        self._checkpoint = checkpoint
+        self._resume_stage = resume_stage
+        self._n_processes = n_processes
+        self._convergence_thresholds = convergence_thresholds
+        self._use_early_termination = use_early_termination
+
+    ##
+    # Gets the cycle to start with and whether its S2V-registration step
+    # needs to be performed according to the stage to resume from.
+    # \date       2026-10-18 12:41:15+0000
+    #
+    # \param      self  The object
+    #
+    # \return     cycle to start with as int and flag whether registration
+    #             is required for this cycle as bool
+    #
+    def _get_cycle_start(self):
+        if self._resume_stage is None:
+            return 0, True
+
+        if self._resume_stage.startswith("s2v_cycle"):
+            return int(self._resume_stage[len("s2v_cycle"):]) - 1, False
+
+        if self._resume_stage.startswith("reconstruction_cycle"):
+            return int(self._resume_stage[len("reconstruction_cycle"):]), True
+
+        return 0, True
+
+    ##
+    # Query whether the median transform changes of the slices registered by
+    # the last slice-to-volume registration run are below the convergence
+    # thresholds. Slices skipped as converged in this run do not contribute.
+    # \date       2026-10-18 22:58:02+0000
+    #
+    # \param      self    The object
+    # \param      s2vreg  SliceToVolumeRegistration object after 'run'
+    #
+    # \return     True if converged, False otherwise
+    #
+    def _is_registration_converged(self, s2vreg):
+        slice_changes = s2vreg.get_slice_changes()
+        if len(slice_changes) == 0:
+            return False
+
+        median_changes = np.median(list(slice_changes.values()), axis=0)
+        return all(c < t for c, t in zip(
+            median_changes, self._convergence_thresholds))
+
+    def _write_checkpoint(self, stage, reference):
+        if self._checkpoint is not None:
+            self._checkpoint.write(stage, self._stacks, reference)
+
+    ##
+    # Reject misregistered slices and pass the remaining ones to the
+    # reconstruction method
+    # \date       2026-10-19 14:31:20+0000
+    #
+    # \param      self       The object
+    # \param      threshold  The outlier rejection threshold, float
+    #
+    def _reject_outliers(self, threshold):
+        ph.print_subtitle("Slice Outlier Rejection (%s < %g)" % (
+            self._threshold_measure, threshold))
+        outlier_rejector = outre.OutlierRejector(
+            stacks=self._stacks,
+            reference=self._reference,
+            threshold=threshold,
+            measure=self._threshold_measure,
+            verbose=True,
+        )
+        outlier_rejector.run()
+        self._reconstruction_method.set_stacks(
+            outlier_rejector.get_stacks())
+
+        if len(self._stacks) == 0:
+            raise RuntimeError(
+                "All slices of all stacks were rejected "
+                "as outliers. Volumetric reconstruction is aborted.")
 
     def _run(self):
 
@@ -628,13 +999,22 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
             registration_method=self._registration_method,
             verbose=False,
             interleave=self._interleave,
+            convergence_thresholds=self._convergence_thresholds,
         )
 
         reference = self._reference
 
-        for cycle in range(0, self._cycles):
+        cycle_start, register_cycle_start = self._get_cycle_start()
+
+        for cycle in range(cycle_start, self._cycles):
 
-            if cycle == 0 and self._use_hierarchical_registration:
+            is_restored = cycle == cycle_start and not register_cycle_start
+
+            if is_restored:
+                # S2V-registration and outlier rejection already performed
+                ph.print_info("Cycle %d/%d: S2V-registration restored from "
+                              "checkpoint" % (cycle + 1, self._cycles))
+            elif cycle == 0 and self._use_hierarchical_registration:
                 hs2vreg = HieararchicalSliceSetRegistration(
                     stacks=self._stacks,
                     reference=reference,
@@ -643,6 +1023,7 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
                     viewer=self._viewer,
                     min_slices=1,
                     verbose=False,
+                    n_processes=self._n_processes,
                 )
                 hs2vreg.run()
                 self._computational_time_registration += \
@@ -662,24 +1043,35 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
                 s2vreg.get_computational_time()
 
             # Reject misregistered slices
-            if self._outlier_rejection:
-                ph.print_subtitle("Slice Outlier Rejection (%s < %g)" % (
-                    self._threshold_measure, self._thresholds[cycle]))
-                outlier_rejector = outre.OutlierRejector(
-                    stacks=self._stacks,
-                    reference=self._reference,
-                    threshold=self._thresholds[cycle],
-                    measure=self._threshold_measure,
-                    verbose=True,
-                )
-                outlier_rejector.run()
-                self._reconstruction_method.set_stacks(
-                    outlier_rejector.get_stacks())
-
-                if len(self._stacks) == 0:
-                    raise RuntimeError(
-                        "All slices of all stacks were rejected "
-                        "as outliers. Volumetric reconstruction is aborted.")
+            if self._outlier_rejection and not is_restored:
+                self._reject_outliers(self._thresholds[cycle])
+
+            if not is_restored:
+                self._write_checkpoint("s2v_cycle%d" % (cycle + 1), reference)
+
+            # Stop if slice positions changed negligibly in this cycle. The
+            # outlier rejection of the final cycle is still performed so that
+            # the final reconstruction uses the same slices as without early
+            # termination; intermediate thresholds are not applied.
+            if self._use_early_termination and not is_restored and \
+                    cycle < self._cycles - 1 and \
+                    self._is_registration_converged(s2vreg):
+                ph.print_info(
+                    "Cycle %d/%d: Median slice transform changes below "
+                    "%g mm and %g degrees. Remaining cycles are skipped." % (
+                        cycle + 1, self._cycles,
+                        self._convergence_thresholds[0],
+                        self._convergence_thresholds[1]))
+                if self._outlier_rejection:
+                    ph.print_info(
+                        "Outlier rejection of final cycle is performed "
+                        "(%s < %g); skipped thresholds: %s" % (
+                            self._threshold_measure, self._thresholds[-1],
+                            self._thresholds[cycle + 1:-1]))
+                    self._reject_outliers(self._thresholds[-1])
+                    self._write_checkpoint(
+                        "s2v_cycle%d" % self._cycles, reference)
+                break
 
             # SRR step
             if cycle < self._cycles - 1:
@@ -720,6 +1112,9 @@ class TwoStepSliceToVolumeRegistrationReconstruction(
                 self._reconstructions.insert(0, st.Stack.from_stack(
                     reference, filename=filename))
 
+                self._write_checkpoint(
+                    "reconstruction_cycle%d" % (cycle + 1), reference)
+
                 if self._verbose:
                     sitkh.show_stacks(self._reconstructions,
                                       segmentation=self._reference,
@@ -747,6 +1142,9 @@ class HieararchicalSliceSetRegistration(RegistrationPipeline):
     # \param      min_slices           The minimum slices
     # \param      verbose              The verbose
     # \param      viewer               The viewer
+    # \param      n_processes          Number of threads to register slice
+    #                                  sets of the same hierarchy level
+    #                                  concurrently, int
     #
     def __init__(self,
                  stacks,
@@ -756,6 +1154,7 @@ class HieararchicalSliceSetRegistration(RegistrationPipeline):
                  min_slices=1,
                  verbose=1,
                  viewer=VIEWER,
+                 n_processes=1,
                  ):
 
         RegistrationPipeline.__init__(
@@ -768,6 +1167,7 @@ class HieararchicalSliceSetRegistration(RegistrationPipeline):
         )
         self._interleave = interleave
         self._min_slices = min_slices
+        self._n_processes = n_processes
 
     def _run(self, debug=0):
         ph.print_title(
@@ -779,34 +1179,45 @@ class HieararchicalSliceSetRegistration(RegistrationPipeline):
 
         for i_stack, stack in enumerate(self._stacks):
             n_slices = stack.get_number_of_slices()
+
+            # Splits of all interleave packages are registered together such
+            # that splits of the same hierarchy level are processed
+            # concurrently
+            indices_splits = []
             for i in range(self._interleave):
                 package = list(np.arange(i, n_slices, self._interleave))
                 if len(package) / 2 >= self._min_slices:
-                    indices_splits = self._recursive_split(
+                    indices_splits_package = self._recursive_split(
                         package, [], self._min_slices)
                 else:
-                    indices_splits = [package]
+                    indices_splits_package = [package]
 
-                prefix = "Hierarchical S2V-Reg: " \
-                    "Stack %d/%d (%s) -- Interleave %d/%d --" % (
-                        i_stack + 1, len(self._stacks), stack.get_filename(),
-                        i + 1, self._interleave,
-                    )
                 if debug:
                     ph.print_subtitle(
-                        "%s %d splits: %s" % (
-                            prefix, len(indices_splits), indices_splits),
+                        "Hierarchical S2V-Reg: Stack %d/%d (%s) -- "
+                        "Interleave %d/%d -- %d splits: %s" % (
+                            i_stack + 1, len(self._stacks),
+                            stack.get_filename(), i + 1, self._interleave,
+                            len(indices_splits_package),
+                            indices_splits_package),
                     )
+                indices_splits.extend(indices_splits_package)
 
-                ss2vreg = SliceSetToVolumeRegistration(
-                    print_prefix=prefix,
-                    stack=stack,
-                    reference=self._reference,
-                    registration_method=self._registration_method,
-                    slice_set_indices=indices_splits,
-                    verbose=self._verbose,
+            prefix = "Hierarchical S2V-Reg: " \
+                "Stack %d/%d (%s) --" % (
+                    i_stack + 1, len(self._stacks), stack.get_filename(),
                 )
-                ss2vreg.run()
+
+            ss2vreg = SliceSetToVolumeRegistration(
+                print_prefix=prefix,
+                stack=stack,
+                reference=self._reference,
+                registration_method=self._registration_method,
+                slice_set_indices=indices_splits,
+                verbose=self._verbose,
+                n_processes=self._n_processes,
+            )
+            ss2vreg.run()
 
     ##
     # Split list of arrays into halfs.
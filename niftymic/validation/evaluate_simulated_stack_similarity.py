@@ -13,6 +13,7 @@
 import SimpleITK as sitk
 import numpy as np
 import os
+import multiprocessing
 
 import pysitk.python_helper as ph
 from nsol.similarity_measures import SimilarityMeasures as \
@@ -20,6 +21,64 @@ from nsol.similarity_measures import SimilarityMeasures as \
 
 import niftymic.base.data_reader as dr
 from niftymic.utilities.input_arparser import InputArgparser
+from niftymic.validation.slice_similarity_measures import \
+    SliceSimilarityMeasures
+
+
+##
+# Evaluate the similarities between original and simulated stack for all
+# slices.
+#
+# Measures available in SliceSimilarityMeasures are evaluated for all slices
+# at once, the remaining ones slice by slice.
+# \date       2026-10-18 15:48:12+0000
+#
+# \param      nda_original   numpy data 3D array of original data
+# \param      nda_simulated  numpy data 3D array of simulated data
+# \param      nda_mask       numpy data 3D array of original mask
+# \param      measures       list of similarity measures, e.g. ["NCC", "SSIM"]
+#
+# \return     (N_slices x N_measures)-numpy array; nan for slices without
+#             mask voxels
+#
+def evaluate_similarities(nda_original, nda_simulated, nda_mask, measures):
+    nda_simulated = np.array(nda_simulated, dtype=np.float64)
+    nda_mask = nda_mask > 0
+    N_slices = nda_original.shape[0]
+
+    # zero slice, i.e. rejected during motion correction
+    nda_simulated[np.sum(np.abs(np.nan_to_num(
+        nda_simulated.reshape(N_slices, -1))), axis=1) < 1e-6] = np.nan
+
+    similarities = np.zeros((N_slices, len(measures)))
+    for m, measure in enumerate(measures):
+        if measure in SliceSimilarityMeasures.similarity_measures.keys():
+            similarities[:, m] = \
+                SliceSimilarityMeasures.similarity_measures[measure](
+                    nda_original, nda_simulated, nda_mask)
+        else:
+            for k in range(N_slices):
+                indices = np.where(nda_mask[k])
+                if len(indices[0]) > 0:
+                    similarities[k, m] = \
+                        SimilarityMeasures.similarity_measures[measure](
+                            nda_original[k][indices],
+                            nda_simulated[k][indices])
+                else:
+                    similarities[k, m] = np.nan
+
+    # Slices without mask voxels are not evaluated
+    similarities[np.sum(nda_mask.reshape(N_slices, -1), axis=1) == 0] = np.nan
+
+    return similarities
+
+
+##
+# Module-level function so that it can be executed by a multiprocessing.Pool.
+# \date       2026-10-18 15:48:55+0000
+#
+def _evaluate_similarities(evaluation):
+    return evaluate_similarities(*evaluation)
 
 
 def main():
@@ -52,6 +111,7 @@ def main():
         default=None
     )
     input_parser.add_slice_thicknesses(default=None)
+    input_parser.add_n_processes(default=1)
 
     args = input_parser.parse_args()
     input_parser.print_arguments(args)
@@ -92,16 +152,25 @@ def main():
             raise IOError("Images '%s' and '%s' do not occupy the same space!"
                           % (filenames_original[i], filenames_simulated[i]))
 
-    similarity_measures = {
-        m: SimilarityMeasures.similarity_measures[m] for m in args.measures
-    }
-    similarities = np.zeros(len(args.measures))
+    evaluations = [(
+        sitk.GetArrayFromImage(stacks_original[i].sitk),
+        sitk.GetArrayFromImage(stacks_simulated[i].sitk),
+        sitk.GetArrayFromImage(stacks_original[i].sitk_mask),
+        args.measures,
+    ) for i in range(len(stacks_original))]
 
-    for i in range(len(stacks_original)):
-        nda_3D_original = sitk.GetArrayFromImage(stacks_original[i].sitk)
-        nda_3D_simulated = sitk.GetArrayFromImage(stacks_simulated[i].sitk)
-        nda_3D_mask = sitk.GetArrayFromImage(stacks_original[i].sitk_mask)
+    if args.n_processes > 1 and len(evaluations) > 1:
+        pool = multiprocessing.Pool(
+            processes=min(args.n_processes, len(evaluations)))
+        try:
+            similarities = pool.map(_evaluate_similarities, evaluations)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        similarities = [_evaluate_similarities(e) for e in evaluations]
 
+    for i in range(len(stacks_original)):
         path_to_file = os.path.join(
             args.dir_output, "Similarity_%s.txt" %
             stacks_original[i].get_filename())
@@ -111,24 +180,7 @@ def main():
         text += "\n#\t" + ("\t").join(args.measures)
         text += "\n"
         ph.write_to_file(path_to_file, text, "w")
-        for k in range(nda_3D_original.shape[0]):
-            x_2D_original = nda_3D_original[k, :, :]
-            x_2D_simulated = nda_3D_simulated[k, :, :]
-
-            # zero slice, i.e. rejected during motion correction
-            if np.abs(x_2D_simulated).sum() < 1e-6:
-                x_2D_simulated[:] = np.nan
-            x_2D_mask = nda_3D_mask[k, :, :]
-
-            indices = np.where(x_2D_mask > 0)
-
-            for m, measure in enumerate(args.measures):
-                if len(indices[0]) > 0:
-                    similarities[m] = similarity_measures[measure](
-                        x_2D_original[indices], x_2D_simulated[indices])
-                else:
-                    similarities[m] = np.nan
-            ph.write_array_to_file(path_to_file, similarities.reshape(1, -1))
+        ph.write_array_to_file(path_to_file, similarities[i])
 
     return 0
 
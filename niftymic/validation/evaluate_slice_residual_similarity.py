@@ -46,6 +46,7 @@ def main():
     input_parser.add_verbose(default=0)
     input_parser.add_target_stack(default=None)
     input_parser.add_intensity_correction(default=1)
+    input_parser.add_n_processes(default=1)
     input_parser.add_slice_thicknesses(default=None)
     input_parser.add_option(
         option_string="--use-reference-mask", type=int, default=1)
@@ -89,30 +90,33 @@ def main():
     # ---------------------------Intensity Correction--------------------------
     if args.intensity_correction:
         ph.print_title("Intensity Correction")
-        intensity_corrector = ic.IntensityCorrection()
+        intensity_corrector = ic.IntensityCorrection(
+            n_processes=args.n_processes)
         intensity_corrector.use_individual_slice_correction(False)
         intensity_corrector.use_stack_mask(True)
         intensity_corrector.use_reference_mask(True)
         intensity_corrector.use_verbose(False)
 
+        indices = [i for i in range(len(stacks)) if i != target_stack_index]
+        intensity_corrector.run_linear_intensity_correction_stacks(
+            [stacks[i] for i in indices],
+            stacks[target_stack_index],
+            interpolator="NearestNeighbor",
+        )
+        stacks_corrected = intensity_corrector.get_intensity_corrected_stacks()
+        coefficients = \
+            intensity_corrector.get_intensity_correction_coefficients_stacks()
+
         for i, stack in enumerate(stacks):
             if i == target_stack_index:
                 ph.print_info("Stack %d (%s): Reference image. Skipped." % (
                     i + 1, stack.get_filename()))
                 continue
-            else:
-                ph.print_info("Stack %d (%s): Intensity Correction ... " % (
-                    i + 1, stack.get_filename()), newline=False)
-            intensity_corrector.set_stack(stack)
-            intensity_corrector.set_reference(
-                stacks[target_stack_index].get_resampled_stack(
-                    resampling_grid=stack.sitk,
-                    interpolator="NearestNeighbor",
-                ))
-            intensity_corrector.run_linear_intensity_correction()
-            stacks[i] = intensity_corrector.get_intensity_corrected_stack()
-            print("done (c1 = %g) " %
-                  intensity_corrector.get_intensity_correction_coefficients())
+            j = indices.index(i)
+            stacks[i] = stacks_corrected[j]
+            ph.print_info("Stack %d (%s): Intensity Correction ... "
+                          "done (c1 = %g) " % (
+                              i + 1, stack.get_filename(), coefficients[j]))
 
     # ----------------------- Slice Residual Similarity -----------------------
     reference = st.Stack.from_filename(args.reference, args.reference_mask)
@@ -128,6 +132,8 @@ def main():
     residual_evaluator.compute_slice_projections()
     residual_evaluator.evaluate_slice_similarities()
     residual_evaluator.write_slice_similarities(args.dir_output)
+    residual_evaluator.write_slice_similarities_to_results_store(
+        os.path.join(args.dir_output, "slice_similarities.zip"))
 
     elapsed_time = ph.stop_timing(time_start)
     ph.print_title("Summary")
@@ -3,7 +3,8 @@
 # \brief      Script to generate a pdf holding all side-by-side comparisons.
 #
 # This function takes the result of simulate_stacks_from_reconstruction.py as
-# input. The script relies on ImageMagick.
+# input. Side-by-side comparisons are rendered in-process with matplotlib
+# directly into a multi-page pdf, one page per slice.
 # \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
 # \date       November 2017
 #
@@ -11,144 +12,162 @@
 # Import libraries
 import SimpleITK as sitk
 import numpy as np
-import natsort
 import os
-import re
+import multiprocessing
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
 
 import pysitk.python_helper as ph
-from nsol.similarity_measures import SimilarityMeasures as \
-    SimilarityMeasures
 
 import niftymic.base.data_reader as dr
 from niftymic.utilities.input_arparser import InputArgparser
-from niftymic.definitions import DIR_TMP
 
 
 ##
-# Export a side-by-side comparison to a (pdf) file
+# Export a side-by-side comparison to a multi-page pdf file
 # \date       2017-11-28 23:28:12+0000
 #
-# \param      nda_original   numpy data 3D array of original data
+# \param      nda_original   numpy data 3D array of original data with
+#                            intensities in [0, 255]
 # \param      nda_projected  numpy data 3D array of projected/simulated data
-# \param      path_to_file   path to file, string
+#                            with intensities in [0, 255]
+# \param      path_to_file   path to pdf file, string
 # \param      resize         factor to resize images (otherwise they
 #                            might be very small depending on the FOV)
-# \param      extension      extension of images produced for tmp results.
+# \param      label_left     label of original slices, string
+# \param      label_right    label of projected slices, string
 #
 def export_comparison_to_file(nda_original,
                               nda_projected,
                               path_to_file,
                               resize,
-                              extension="png"):
-    dir_tmp = os.path.join(DIR_TMP, "ImageMagick")
-    ph.clear_directory(dir_tmp, verbose=False)
-    for k in range(nda_original.shape[0]):
-        ctr = k + 1
-
-        # Export as individual image side-by-side
-        _export_image_side_by_side(
-            nda_left=nda_original[k, :, :],
-            nda_right=nda_projected[k, :, :],
-            label_left="original",
-            label_right="projected",
-            path_to_file=os.path.join(
-                dir_tmp, "%03d.%s" % (ctr, extension)),
-            ctr=ctr,
-            resize=resize,
-            extension=extension,
-        )
-
-    # Combine all side-by-side images to single pdf
-    _export_pdf_from_side_by_side_images(
-        dir_tmp, path_to_file, extension=extension)
-    ph.print_info("Side-by-side comparison exported to '%s'" % path_to_file)
+                              label_left="original",
+                              label_right="projected",
+                              ):
+    ph.create_directory(os.path.dirname(os.path.abspath(path_to_file)))
+
+    with PdfPages(path_to_file) as pdf:
+        for k in range(nda_original.shape[0]):
+            fig = _get_figure_side_by_side(
+                nda_left=nda_original[k, :, :],
+                nda_right=nda_projected[k, :, :],
+                label_left=label_left,
+                label_right=label_right,
+                ctr=k + 1,
+                resize=resize,
+            )
+            pdf.savefig(fig, facecolor=fig.get_facecolor())
 
-    # Delete tmp directory
-    ph.delete_directory(dir_tmp, verbose=False)
+    ph.print_info("Side-by-side comparison exported to '%s'" % path_to_file)
 
 
 ##
-# Export a single side-by-side comparison of two images
-# \date       2017-11-28 23:30:23+0000
+# Get figure showing a single side-by-side comparison of two images.
+#
+# Figure is created without pyplot so that no GUI backend is involved and
+# several comparisons can be rendered concurrently.
+# \date       2026-10-18 15:41:07+0000
 #
-def _export_image_side_by_side(
+# \param      nda_left     2D numpy array shown on the left
+# \param      nda_right    2D numpy array shown on the right
+# \param      label_left   label of left image, string
+# \param      label_right  label of right image, string
+# \param      ctr          slice counter shown in the lower left corner
+# \param      resize       factor to resize images
+# \param      dpi          number of pixels per inch of one image pixel
+#                          (before resizing)
+#
+# \return     matplotlib Figure
+#
+def _get_figure_side_by_side(
         nda_left,
         nda_right,
         label_left,
         label_right,
-        path_to_file,
         ctr,
         resize,
-        extension,
         border=10,
         background="black",
         fill_ctr="orange",
         fill_label="white",
         pointsize=12,
+        dpi=72.,
 ):
+    ny, nx = nda_left.shape
+
+    # Layout in pixels: border | left | border | right | border with
+    # space for labels below the images
+    width = resize * nx
+    height = resize * ny
+    height_label = 2 * pointsize
+    fig_width = 2 * width + 3 * border
+    fig_height = height + height_label + 2 * border
+
+    fig = Figure(
+        figsize=(fig_width / dpi, fig_height / dpi),
+        dpi=dpi,
+        facecolor=background,
+    )
 
-    dir_output = os.path.join(DIR_TMP, "ImageMagick", "side-by-side")
-    ph.clear_directory(dir_output, verbose=False)
-
-    path_to_left = os.path.join(dir_output, "left.%s" % extension)
-    path_to_right = os.path.join(dir_output, "right.%s" % extension)
-
-    nda_left = np.round(np.array(nda_left)).astype(np.uint8)
-    nda_right = np.round(np.array(nda_right)).astype(np.uint8)
-    ph.write_image(nda_left, path_to_left, verbose=False)
-    ph.write_image(nda_right, path_to_right, verbose=False)
-
-    _resize_image(path_to_left, resize=resize)
-    _resize_image(path_to_right, resize=resize)
-
-    cmd_args = []
-    cmd_args.append("-geometry +%d+%d" % (border, border))
-    cmd_args.append("-background %s" % background)
-    cmd_args.append("-pointsize %s" % pointsize)
-    cmd_args.append("-fill %s" % fill_ctr)
-    cmd_args.append("-gravity SouthWest -draw \"text 0,0 '%d'\"" % ctr)
-    cmd_args.append("-fill %s" % fill_label)
-    cmd_args.append("-label '%s' %s" % (label_left, path_to_left))
-    cmd_args.append("-label '%s' %s" % (label_right, path_to_right))
-    cmd_args.append("%s" % path_to_file)
-    cmd = "montage %s" % (" ").join(cmd_args)
-    ph.execute_command(cmd, verbose=False)
+    for i, (nda, label) in enumerate(zip(
+            [nda_left, nda_right], [label_left, label_right])):
+        left = (border + i * (width + border)) / float(fig_width)
+        bottom = (border + height_label) / float(fig_height)
+        ax = fig.add_axes([
+            left, bottom, width / float(fig_width), height / float(fig_height)
+        ])
+        ax.imshow(nda, cmap="gray", vmin=0, vmax=255,
+                  interpolation="nearest", aspect="auto")
+        ax.set_axis_off()
+        ax.set_facecolor(background)
+        ax.text(0.5, -float(pointsize) / height, label,
+                transform=ax.transAxes,
+                horizontalalignment="center",
+                verticalalignment="top",
+                color=fill_label,
+                fontsize=pointsize,
+                )
+
+    fig.text(float(border) / fig_width, float(border) / fig_height,
+             "%d" % ctr,
+             horizontalalignment="left",
+             verticalalignment="bottom",
+             color=fill_ctr,
+             fontsize=pointsize,
+             )
+
+    return fig
 
 
 ##
-# Resize image
-# \date       2017-11-28 23:31:07+0000
+# Scale uniformly between 0 and 255 according to the simulated stack and
+# export side-by-side comparison. Module-level function so that it can be
+# executed by a multiprocessing.Pool.
+# \date       2026-10-18 15:42:30+0000
 #
-def _resize_image(path_to_file, resize):
-
-    factor = resize * 100
-    cmd_args = []
-    cmd_args.append("%s" % path_to_file)
-    cmd_args.append("-resize %dx%d%%\\!" % (factor, factor))
-    cmd = "convert %s %s" % ((" ").join(cmd_args), path_to_file)
-    ph.execute_command(cmd, verbose=False)
-
-
-##
-# Create single pdf from multiple side-by-side (png) images
-# \date       2017-11-28 23:33:46+0000
+# \param      comparison  tuple (nda_original, nda_simulated, path_to_file,
+#                         resize)
 #
-# \param      directory     Path to directory with side-by-side png images
-# \param      path_to_file  Path to combined pdf result
-# \param      extension     The extension
+# \return     path to exported pdf file
 #
-def _export_pdf_from_side_by_side_images(directory, path_to_file, extension):
+def _export_comparison(comparison):
+    nda_original, nda_simulated, path_to_file, resize = comparison
+    intensity_max = 255
+    intensity_min = 0
 
-    # Read all sidy-by-side (png) images in directory
-    pattern = "[a-zA-Z0-9_]+[.]%s" % extension
-    p = re.compile(pattern)
-    files = [os.path.join(directory, f)
-             for f in os.listdir(directory) if p.match(f)]
+    # Slices rejected during motion correction are not finite
+    scale = np.nanmax(nda_simulated)
+    nda_original = intensity_max * nda_original / scale
+    nda_simulated = intensity_max * nda_simulated / scale
 
-    # Convert consecutive sequence of images into single pdf
-    files = natsort.natsorted(files, key=lambda y: y.lower())
-    cmd = "convert %s %s" % ((" ").join(files), path_to_file)
-    ph.execute_command(cmd, verbose=False)
+    nda_simulated = np.clip(nda_simulated, intensity_min, intensity_max)
+    nda_original = np.clip(nda_original, intensity_min, intensity_max)
+
+    export_comparison_to_file(
+        nda_original, nda_simulated, path_to_file, resize=resize)
+
+    return path_to_file
 
 
 def main():
@@ -183,6 +202,7 @@ def main():
         help="Factor to resize images (otherwise they might be very small "
         "depending on the FOV)",
         default=3)
+    input_parser.add_n_processes(default=1)
 
     args = input_parser.parse_args()
     input_parser.print_arguments(args)
@@ -221,31 +241,29 @@ def main():
 
     # ---------------------Create side-by-side comparisons---------------------
     ph.print_title("Create side-by-side comparisons")
-    intensity_max = 255
-    intensity_min = 0
-    for i in range(len(stacks_original)):
-        ph.print_subtitle("Stack %d/%d" % (i + 1, len(stacks_original)))
-        nda_3D_original = sitk.GetArrayFromImage(stacks_original[i].sitk)
-        nda_3D_simulated = sitk.GetArrayFromImage(stacks_simulated[i].sitk)
-
-        # Scale uniformly between 0 and 255 according to the simulated stack
-        # for export to png
-        scale = np.max(nda_3D_simulated)
-        nda_3D_original = intensity_max * nda_3D_original / scale
-        nda_3D_simulated = intensity_max * nda_3D_simulated / scale
-
-        nda_3D_simulated = np.clip(
-            nda_3D_simulated, intensity_min, intensity_max)
-        nda_3D_original = np.clip(
-            nda_3D_original, intensity_min, intensity_max)
-
-        filename = stacks_original[i].get_filename()
-        path_to_file = os.path.join(args.dir_output, "%s.pdf" % filename)
-
-        # Export side-by-side comparison of each stack to a pdf file
-        export_comparison_to_file(
-            nda_3D_original, nda_3D_simulated, path_to_file,
-            resize=args.resize)
+    comparisons = [(
+        sitk.GetArrayFromImage(stacks_original[i].sitk),
+        sitk.GetArrayFromImage(stacks_simulated[i].sitk),
+        os.path.join(args.dir_output,
+                     "%s.pdf" % stacks_original[i].get_filename()),
+        args.resize,
+    ) for i in range(len(stacks_original))]
+
+    # Export side-by-side comparison of each stack to a pdf file
+    if args.n_processes > 1 and len(comparisons) > 1:
+        pool = multiprocessing.Pool(
+            processes=min(args.n_processes, len(comparisons)))
+        try:
+            pool.map(_export_comparison, comparisons)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for comparison in comparisons:
+            _export_comparison(comparison)
+
+    return 0
+
 
 if __name__ == '__main__':
     main()
@@ -19,6 +19,7 @@ from nsol.similarity_measures import SimilarityMeasures as \
 import pysitk.python_helper as ph
 
 import niftymic.reconstruction.linear_operators as lin_op
+from niftymic.utilities.results_store import ResultsStore
 import niftymic.base.exceptions as exceptions
 
 
@@ -223,6 +224,53 @@ class ImageSimilarityEvaluator(object):
         for i_m, m in enumerate(self._measures):
             self._similarities[m] = similarities_nda[:, i_m]
 
+    ##
+    # Writes the evaluated similarities to a single results store file; one
+    # record per stack holding the similarity of each measure.
+    # \date       2026-10-18 17:54:40+0000
+    #
+    # \param      self          The object
+    # \param      path_to_file  path to results store file, string
+    #
+    def write_similarities_to_results_store(self, path_to_file):
+        results_store = ResultsStore(path_to_file)
+        results_store.create({
+            "reference": self._reference.get_filename(),
+            "use_reference_mask": int(self._use_reference_mask),
+            "measures": list(self._measures),
+            "time_stamp": ph.get_time_stamp(),
+        })
+
+        for i_stack, stack in enumerate(self._stacks):
+            results_store.add_record(
+                key=[stack.get_filename()],
+                arrays={
+                    m: np.array(self._similarities[m][i_stack])
+                    for m in self._measures
+                })
+
+        if self._verbose:
+            ph.print_info("File '%s' written" % path_to_file)
+
+    ##
+    # Reads similarities from results store file.
+    # \date       2026-10-18 17:55:21+0000
+    #
+    # \param      self          The object
+    # \param      path_to_file  path to results store file, string
+    #
+    def read_similarities_from_results_store(self, path_to_file):
+        results_store = ResultsStore(path_to_file)
+        results_store.read()
+
+        self._measures = results_store.get_info()["measures"]
+        keys = results_store.get_keys()
+
+        self._similarities = {}
+        self._similarities["filenames"] = [key[0] for key in keys]
+        for m in self._measures:
+            self._similarities[m] = np.array(results_store.get_arrays(m))
+
     def _get_filename_paths(self, directory):
 
         # Define filename paths
@@ -21,7 +21,11 @@ from nsol.similarity_measures import SimilarityMeasures as \
 import pysitk.python_helper as ph
 import pysitk.statistics_helper as sh
 
+import niftymic.base.slice as sl
 import niftymic.reconstruction.linear_operators as lin_op
+from niftymic.utilities.results_store import ResultsStore
+from niftymic.validation.slice_similarity_measures import \
+    SliceSimilarityMeasures
 import niftymic.base.exceptions as exceptions
 
 
@@ -62,7 +66,8 @@ class ResidualEvaluator(object):
         self._use_reference_mask = use_reference_mask
         self._verbose = verbose
 
-        self._slice_projections = None
+        self._slice_projections_nda = None
+        self._slice_projections_nda_mask = None
         self._similarities = None
         self._slice_similarities = None
         self._init_value = np.nan
@@ -133,7 +138,30 @@ class ResidualEvaluator(object):
     #             ]
     #
     def get_slice_projections(self):
-        return self._slice_projections
+        if self._slice_projections_nda is None:
+            raise exceptions.ObjectNotCreated("compute_slice_projections")
+
+        slice_projections = [None] * len(self._stacks)
+        for i_stack, stack in enumerate(self._stacks):
+            N_slices = self._get_original_number_of_slices(stack)
+            slice_projections[i_stack] = [self._init_value] * N_slices
+            for slice in stack.get_slices():
+                slice_projections[i_stack][slice.get_slice_number()] = \
+                    self._get_slice_projection(i_stack, slice)
+        return slice_projections
+
+    ##
+    # Gets the slice projections as arrays.
+    # \date       2026-10-18 14:46:31+0000
+    #
+    # \param      self  The object
+    #
+    # \return     The slice projections and their masks as lists of numpy
+    #             arrays, one (N_slices x ny x nx)-array per stack. Masks
+    #             are None in case the reference holds a unity mask.
+    #
+    def get_slice_projections_nda(self):
+        return self._slice_projections_nda, self._slice_projections_nda_mask
 
     ##
     # Calculates the slice simulations/projections from the reference given the
@@ -147,15 +175,12 @@ class ResidualEvaluator(object):
     def compute_slice_projections(self):
 
         linear_operators = lin_op.LinearOperators()
-        self._slice_projections = [None] * len(self._stacks)
+        self._slice_projections_nda = [None] * len(self._stacks)
+        self._slice_projections_nda_mask = [None] * len(self._stacks)
 
         for i_stack, stack in enumerate(self._stacks):
-            slices = stack.get_slices()
-
             N_slices = self._get_original_number_of_slices(stack)
 
-            self._slice_projections[i_stack] = [self._init_value] * N_slices
-
             if self._verbose:
                 ph.print_info(
                     "Stack %d/%d: Compute slice projections ... " % (
@@ -164,10 +189,12 @@ class ResidualEvaluator(object):
 
             # Compute slice projections based on assumed slice acquisition
             # protocol
-            for slice in slices:
-                i_slice = slice.get_slice_number()
-                self._slice_projections[i_stack][i_slice] = linear_operators.A(
-                    self._reference, slice)
+            self._slice_projections_nda[i_stack], \
+                self._slice_projections_nda_mask[i_stack] = \
+                linear_operators.A_stack(
+                    self._reference, stack,
+                    N_slices=N_slices,
+                    default_pixel_value=self._init_value)
 
             if self._verbose:
                 print("done")
@@ -180,17 +207,21 @@ class ResidualEvaluator(object):
     # \param      self  The object
     #
     def evaluate_slice_similarities(self):
-        if self._slice_projections is None:
+        if self._slice_projections_nda is None:
             raise exceptions.ObjectNotCreated("compute_slice_projections")
 
         self._slice_similarities = {
             stack.get_filename(): {} for stack in self._stacks
         }
 
-        similarity_measures = {
-            m: SimilarityMeasures.similarity_measures[m]
-            for m in self._measures
-        }
+        # Measures which can be evaluated for all slices at once
+        measures_vectorized = [
+            m for m in self._measures
+            if m in SliceSimilarityMeasures.similarity_measures
+        ]
+        measures_sliced = [
+            m for m in self._measures if m not in measures_vectorized
+        ]
 
         for i_stack, stack in enumerate(self._stacks):
             slices = stack.get_slices()
@@ -205,46 +236,85 @@ class ResidualEvaluator(object):
                         i_stack + 1, len(self._stacks)),
                     newline=False)
 
-            for slice in slices:
-                i_slice = slice.get_slice_number()
-                slice_nda = np.squeeze(sitk.GetArrayFromImage(slice.sitk))
-                slice_proj_nda = np.squeeze(sitk.GetArrayFromImage(
-                    self._slice_projections[i_stack][i_slice].sitk))
-
-                mask_nda = np.ones_like(slice_nda)
-
-                if self._use_slice_masks:
-                    mask_nda *= np.squeeze(
-                        sitk.GetArrayFromImage(slice.sitk_mask))
-                if self._use_reference_mask:
-                    mask_nda *= np.squeeze(
-                        sitk.GetArrayFromImage(
-                            self._slice_projections[i_stack][i_slice].sitk_mask))
-                indices = np.where(mask_nda > 0)
-
-                if len(indices[0]) > 0:
-                    for m in self._measures:
-                        try:
-                            self._slice_similarities[stack_name][m][i_slice] = \
-                                similarity_measures[m](
-                                    slice_nda[indices], slice_proj_nda[indices])
-                        except ValueError as e:
-                            # Error in case only a few/to less non-zero entries
-                            # exist
-                            if m == "SSIM":
-                                self._slice_similarities[
-                                    stack_name][m][i_slice] = \
-                                    SimilarityMeasures.UNDEF[m]
-                            else:
-                                raise ValueError(e.message)
-                else:
-                    for m in self._measures:
-                        self._slice_similarities[
-                            stack_name][m][i_slice] = \
+            if len(slices) == 0:
+                if self._verbose:
+                    print("done")
+                continue
+
+            # Stack original slices and their masks ordered by slice number
+            slice_numbers = [s.get_slice_number() for s in slices]
+            slices_nda = np.array([
+                sitk.GetArrayViewFromImage(s.sitk)[0] for s in slices])
+            slices_proj_nda = \
+                self._slice_projections_nda[i_stack][slice_numbers]
+
+            mask_nda = np.ones(slices_nda.shape, dtype=bool)
+            if self._use_slice_masks:
+                for j, slice in enumerate(slices):
+                    if not slice.is_unity_mask():
+                        mask_nda[j] = sitk.GetArrayViewFromImage(
+                            slice.sitk_mask)[0] > 0
+            if self._use_reference_mask and \
+                    self._slice_projections_nda_mask[i_stack] is not None:
+                mask_nda &= self._slice_projections_nda_mask[i_stack][
+                    slice_numbers] > 0
+            is_defined = np.any(mask_nda.reshape(len(slices), -1), axis=1)
+
+            for m in measures_vectorized:
+                similarities = \
+                    SliceSimilarityMeasures.similarity_measures[m](
+                        slices_nda, slices_proj_nda, mask_nda)
+                similarities[~is_defined] = SimilarityMeasures.UNDEF[m]
+                self._slice_similarities[stack_name][m][slice_numbers] = \
+                    similarities
+
+            for j, i_slice in enumerate(slice_numbers):
+                for m in measures_sliced:
+                    if not is_defined[j]:
+                        self._slice_similarities[stack_name][m][i_slice] = \
                             SimilarityMeasures.UNDEF[m]
+                        continue
+                    indices = np.where(mask_nda[j])
+                    try:
+                        self._slice_similarities[stack_name][m][i_slice] = \
+                            SimilarityMeasures.similarity_measures[m](
+                                slices_nda[j][indices],
+                                slices_proj_nda[j][indices])
+                    except ValueError as e:
+                        # Error in case only a few/to less non-zero entries
+                        # exist
+                        if m == "SSIM":
+                            self._slice_similarities[
+                                stack_name][m][i_slice] = \
+                                SimilarityMeasures.UNDEF[m]
+                        else:
+                            raise ValueError(e.message)
             if self._verbose:
                 print("done")
 
+    def _get_slice_projection(self, i_stack, slice):
+        i_slice = slice.get_slice_number()
+
+        slice_sitk = sitk.GetImageFromArray(
+            self._slice_projections_nda[i_stack][i_slice:i_slice + 1])
+        slice_sitk.CopyInformation(slice.sitk)
+
+        if self._slice_projections_nda_mask[i_stack] is not None:
+            slice_sitk_mask = sitk.GetImageFromArray(
+                self._slice_projections_nda_mask[i_stack][
+                    i_slice:i_slice + 1])
+            slice_sitk_mask.CopyInformation(slice.sitk)
+        else:
+            slice_sitk_mask = None
+
+        return sl.Slice.from_sitk_image(
+            slice_sitk=slice_sitk,
+            slice_number=i_slice,
+            filename=slice.get_filename(),
+            slice_sitk_mask=slice_sitk_mask,
+            slice_thickness=slice.get_slice_thickness(),
+        )
+
     ##
     # Writes the computed slice similarities for all stacks to output directory
     # \date       2018-01-19 17:42:27+0000
@@ -271,6 +341,52 @@ class ResidualEvaluator(object):
                 array[:, i_m] = self._slice_similarities[stack_name][m]
             ph.write_array_to_file(path_to_file, array, verbose=self._verbose)
 
+    ##
+    # Writes the computed slice similarities for all stacks to a single
+    # results store file; one record per stack holding an array per measure.
+    # \date       2026-10-18 17:52:31+0000
+    #
+    # \param      self          The object
+    # \param      path_to_file  path to results store file, string
+    #
+    def write_slice_similarities_to_results_store(self, path_to_file):
+        results_store = ResultsStore(path_to_file)
+        results_store.create({
+            "measures": list(self._measures),
+            "time_stamp": ph.get_time_stamp(),
+        })
+
+        for stack in self._stacks:
+            stack_name = stack.get_filename()
+            N_slices = self._get_original_number_of_slices(stack)
+            arrays = {}
+            for m in self._measures:
+                arrays[m] = np.ones(N_slices) * self._init_value
+                arrays[m][:] = self._slice_similarities[stack_name][m]
+            results_store.add_record(key=[stack_name], arrays=arrays)
+
+        if self._verbose:
+            ph.print_info("File '%s' written" % path_to_file)
+
+    ##
+    # Reads computed slice similarities from results store file.
+    # \date       2026-10-18 17:53:12+0000
+    #
+    # \param      self          The object
+    # \param      path_to_file  path to results store file, string
+    # \post       self._slice_similarities updated
+    #
+    def read_slice_similarities_from_results_store(self, path_to_file):
+        results_store = ResultsStore(path_to_file)
+        results_store.read()
+
+        self._measures = results_store.get_info()["measures"]
+        self._slice_similarities = {}
+        for key in results_store.get_keys():
+            self._slice_similarities[key[0]] = {
+                m: results_store.get_array(key, m) for m in self._measures
+            }
+
     ##
     # Reads computed slice similarities for all files in directory.
     # \date       2018-01-19 17:42:54+0000
@@ -98,32 +98,19 @@ def main():
 
     for i, stack in enumerate(stacks):
 
-        # initialize image data array(s)
-        nda = np.zeros_like(sitk.GetArrayFromImage(stack.sitk))
-        nda[:] = np.nan
-
-        if args.reconstruction_mask:
-            nda_mask = np.zeros_like(sitk.GetArrayFromImage(stack.sitk_mask))
-
-        slices = stack.get_slices()
-        kept_indices = [s.get_slice_number() for s in slices]
-
         # Fill stack information "as if slice was acquired consecutively"
         # Therefore, simulated stack slices correspond to acquired slices
         # (in case motion correction was correct)
-        for j in range(nda.shape[0]):
-            if j in kept_indices:
-                index = kept_indices.index(j)
-                simulated_slice = linear_operators.A(
-                    reconstruction,
-                    slices[index],
-                    interpolator_mask=args.interpolator_mask
-                )
-                nda[j, :, :] = sitk.GetArrayFromImage(simulated_slice.sitk)
-
-                if args.reconstruction_mask:
-                    nda_mask[j, :, :] = sitk.GetArrayFromImage(
-                        simulated_slice.sitk_mask)
+        N_slices = stack.sitk.GetSize()[-1]
+        nda, nda_mask = linear_operators.A_stack(
+            reconstruction, stack, default_pixel_value=np.nan)
+        nda = nda[0:N_slices]
+
+        if args.reconstruction_mask:
+            if nda_mask is None:
+                nda_mask = np.ones_like(nda)
+            nda_mask = nda_mask[0:N_slices].astype(
+                sitk.GetArrayViewFromImage(stack.sitk_mask).dtype)
 
         # Create nifti image with same image header as original stack
         simulated_stack_sitk = sitk.GetImageFromArray(nda)
@@ -105,6 +105,7 @@ class StaticSliceAcquisition(SliceAcqusition):
 
         self._output = st.Stack.from_sitk_image(
             image_sitk=output_sitk,
+            slice_thickness=self._stack_slice.get_slice_thickness(),
             image_sitk_mask=self._stack_slice.sitk_mask,
             filename=self._stack_slice.get_filename()
         )
@@ -6,6 +6,7 @@
 # \date       Feb 2019
 #
 
+import multiprocessing
 import numpy as np
 import SimpleITK as sitk
 
@@ -16,11 +17,32 @@ import SimpleITK as sitk
 #
 class SliceCoverage(object):
 
-    def __init__(self, stacks, reconstruction_sitk):
+    ##
+    # Store data to compute slice coverage
+    # \date       2026-10-18 16:40:12+0000
+    #
+    # \param      self                 The object
+    # \param      stacks               List of Stack objects
+    # \param      reconstruction_sitk  Reconstruction space as sitk.Image
+    # \param      use_stack_coverages  Compute and keep the coverage of each
+    #                                  stack individually, bool
+    # \param      n_processes          Number of processes to compute the
+    #                                  coverages of multiple stacks
+    #                                  concurrently, int
+    #
+    def __init__(self,
+                 stacks,
+                 reconstruction_sitk,
+                 use_stack_coverages=False,
+                 n_processes=1,
+                 ):
         self._stacks = stacks
         self._reconstruction_sitk = reconstruction_sitk
+        self._use_stack_coverages = use_stack_coverages
+        self._n_processes = n_processes
 
         self._coverage_sitk = None
+        self._coverages_sitk_stacks = None
 
     ##
     # Gets the slice coverage as Image. The (integer) intensity values reflect
@@ -36,59 +58,186 @@ class SliceCoverage(object):
             raise RuntimeError("Execute 'run' first")
         return sitk.Image(self._coverage_sitk)
 
+    ##
+    # Gets the slice coverage of each stack individually; requires
+    # use_stack_coverages=True.
+    # \date       2026-10-18 16:40:51+0000
+    #
+    # \param      self  The object
+    #
+    # \return     List of slice coverages as sitk.Image uint8 images.
+    #
+    def get_coverages_sitk_stacks(self):
+        if self._coverages_sitk_stacks is None:
+            raise RuntimeError(
+                "Execute 'run' with 'use_stack_coverages=True' first")
+        return [sitk.Image(c) for c in self._coverages_sitk_stacks]
+
     ##
     # Compute slice coverage
+    #
+    # Each slice only updates the reconstruction voxels within the bounding
+    # box of its footprint. Slice contributions are accumulated in a single
+    # array (per stack if stack coverages are used or stacks are processed
+    # concurrently).
     # \date       2019-02-23 21:19:55+0000
     #
     # \param      self  The object
     #
     def run(self):
 
-        # create zero image
-        coverage_sitk = sitk.Image(self._reconstruction_sitk) * 0
-
-        for i, stack in enumerate(self._stacks):
-            print("Slices of stack %d/%d ... " % (i + 1, len(self._stacks)))
-
-            # Add each individual slice contribution
-            for slice in stack.get_slices():
-                coverage_sitk = self._add_slice_contribution(
-                    slice, coverage_sitk)
-
-        # Cast to unsigned integer
-        self._coverage_sitk = sitk.Cast(coverage_sitk, sitk.sitkUInt8)
+        geometry = _get_image_geometry(self._reconstruction_sitk)
+        shape = self._reconstruction_sitk.GetSize()[::-1]
+        coverage_inputs = [
+            (geometry, [self._get_slice_geometry(s)
+                        for s in stack.get_slices()])
+            for stack in self._stacks
+        ]
+
+        nda = np.zeros(shape, dtype=np.uint16)
+        ndas_stacks = []
+
+        n_processes = max(1, min(self._n_processes, len(self._stacks)))
+        if n_processes > 1:
+            print("Slices of %d stacks ... " % len(self._stacks))
+            pool = multiprocessing.Pool(n_processes)
+            try:
+                for nda_stack in pool.imap(_get_stack_coverage,
+                                           coverage_inputs):
+                    nda += nda_stack
+                    if self._use_stack_coverages:
+                        ndas_stacks.append(nda_stack)
+            finally:
+                pool.close()
+                pool.join()
+
+        else:
+            for i, coverage_input in enumerate(coverage_inputs):
+                print("Slices of stack %d/%d ... " % (
+                    i + 1, len(self._stacks)))
+                if self._use_stack_coverages:
+                    nda_stack = _get_stack_coverage(coverage_input)
+                    nda += nda_stack
+                    ndas_stacks.append(nda_stack)
+                else:
+                    _add_stack_coverage(nda, coverage_input)
+
+        self._coverage_sitk = self._get_coverage_sitk(nda)
+        if self._use_stack_coverages:
+            self._coverages_sitk_stacks = [
+                self._get_coverage_sitk(n) for n in ndas_stacks]
 
     ##
-    # Adds a slice contribution.
-    # \date       2019-02-23 21:27:12+0000
+    # Gets the slice geometry whereby the spacing in through-plane direction
+    # corresponds to the slice thickness.
+    # \date       2026-10-18 16:42:20+0000
     #
-    # \param      slice          Slice as sl.Slice object
-    # \param      coverage_sitk  sitk.Image reflecting the current iteration of
-    #                            slice coverage
+    # \param      slice  Slice as sl.Slice object
     #
-    # \return     Updated slice contribution, sitk.Image
+    # \return     tuple of size, spacing, origin and direction
     #
     @staticmethod
-    def _add_slice_contribution(slice, coverage_sitk):
-
-        #
-        slice_sitk = sitk.Image(slice.sitk)
-        spacing = np.array(slice_sitk.GetSpacing())
+    def _get_slice_geometry(slice):
+        spacing = np.array(slice.sitk.GetSpacing())
         spacing[-1] = slice.get_slice_thickness()
-        slice_sitk.SetSpacing(spacing)
-
-        contrib_nda = sitk.GetArrayFromImage(slice_sitk)
-        contrib_nda[:] = 1
-        contrib_sitk = sitk.GetImageFromArray(contrib_nda)
-        contrib_sitk.CopyInformation(slice_sitk)
-
-        coverage_sitk += sitk.Resample(
-            contrib_sitk,
-            coverage_sitk,
-            sitk.Euler3DTransform(),
-            sitk.sitkNearestNeighbor,
-            0,
-            coverage_sitk.GetPixelIDValue(),
-        )
+        size, _, origin, direction = _get_image_geometry(slice.sitk)
+        return size, spacing, origin, direction
 
+    ##
+    # Cast (clipped) slice coverage to uint8 image in reconstruction space
+    # \date       2026-10-18 16:42:53+0000
+    #
+    def _get_coverage_sitk(self, nda):
+        coverage_sitk = sitk.GetImageFromArray(
+            np.minimum(nda, np.iinfo(np.uint8).max).astype(np.uint8))
+        coverage_sitk.CopyInformation(self._reconstruction_sitk)
         return coverage_sitk
+
+
+def _get_image_geometry(image_sitk):
+    return (
+        np.array(image_sitk.GetSize()),
+        np.array(image_sitk.GetSpacing()),
+        np.array(image_sitk.GetOrigin()),
+        np.array(image_sitk.GetDirection()).reshape(3, 3),
+    )
+
+
+##
+# Gets the slice coverage of a single stack.
+#
+# Module-level function so that it can be executed by a multiprocessing pool.
+# \date       2026-10-18 16:43:31+0000
+#
+# \param      coverage_input  tuple of reconstruction geometry and list of
+#                             slice geometries
+#
+# \return     Slice coverage as uint16 numpy array
+#
+def _get_stack_coverage(coverage_input):
+    geometry = coverage_input[0]
+    nda = np.zeros(geometry[0][::-1], dtype=np.uint16)
+    _add_stack_coverage(nda, coverage_input)
+    return nda
+
+
+##
+# Adds the slice contributions of a stack to the accumulator.
+#
+# A reconstruction voxel is covered by a slice if its center, mapped to the
+# continuous slice index c, satisfies -0.5 <= c < size - 0.5 in each
+# dimension (i.e. nearest neighbour resampling of the slice footprint onto the
+# reconstruction grid). Only the voxels within the bounding box of the slice
+# footprint are evaluated.
+# \date       2026-10-18 16:44:02+0000
+#
+# \param      nda             Accumulator in reconstruction space as numpy
+#                             array (z, y, x), updated in-place
+# \param      coverage_input  tuple of reconstruction geometry and list of
+#                             slice geometries
+#
+def _add_stack_coverage(nda, coverage_input):
+    (size, spacing, origin, direction), slices_geometry = coverage_input
+
+    # Reconstruction index -> physical point
+    R = direction.dot(np.diag(spacing))
+
+    corners = np.array([
+        [x, y, z] for x in [0, 1] for y in [0, 1] for z in [0, 1]
+    ], dtype=float)
+
+    for slice_size, slice_spacing, slice_origin, slice_direction in \
+            slices_geometry:
+
+        # Reconstruction index -> continuous slice index: c = M * i + t
+        S_inv = np.diag(1. / slice_spacing).dot(
+            np.linalg.inv(slice_direction))
+        M = S_inv.dot(R)
+        t = S_inv.dot(origin - slice_origin)
+
+        # Bounding box of slice footprint in reconstruction index space
+        corners_slice = corners * slice_size - 0.5
+        corners_rec = np.linalg.solve(M, (corners_slice - t).T).T
+        index_min = np.maximum(
+            np.floor(corners_rec.min(axis=0)).astype(int), 0)
+        index_max = np.minimum(
+            np.ceil(corners_rec.max(axis=0)).astype(int), size - 1)
+        if np.any(index_max < index_min):
+            continue
+
+        x, y, z = [np.arange(index_min[d], index_max[d] + 1)
+                   for d in range(3)]
+
+        # Continuous slice index of all voxels within bounding box (z, y, x)
+        c = [
+            M[d, 0] * x[np.newaxis, np.newaxis, :] +
+            M[d, 1] * y[np.newaxis, :, np.newaxis] +
+            M[d, 2] * z[:, np.newaxis, np.newaxis] +
+            t[d]
+            for d in range(3)
+        ]
+        inside = np.ones((z.size, y.size, x.size), dtype=bool)
+        for d in range(3):
+            inside &= (c[d] >= -0.5) & (c[d] < slice_size[d] - 0.5)
+
+        nda[z[0]:z[-1] + 1, y[0]:y[-1] + 1, x[0]:x[-1] + 1] += inside
@@ -0,0 +1,159 @@
+##
+# \file slice_similarity_measures.py
+# \brief      Collection of similarity (and dissimilarity) functions evaluated
+#             for all slices of a stack at once.
+#
+# Same definitions as in nsol.similarity_measures but computed for stacked
+# (N_slices x ny x nx)-arrays whereby each slice only considers the voxels
+# within its mask.
+#
+# \author     Michael Ebner (michael.ebner.14@ucl.ac.uk)
+# \date       October 2026
+#
+
+import numpy as np
+
+
+class SliceSimilarityMeasures(object):
+
+    ##
+    # Compute sum of squared differences for each slice
+    # \date       2026-10-18 15:02:11+0000
+    #
+    # \param      x      (N_slices x ny x nx)-numpy data array
+    # \param      x_ref  reference numpy data array of same shape
+    # \param      mask   boolean numpy array of same shape
+    #
+    # \return     sum of squared differences as N_slices-array
+    #
+    @staticmethod
+    def sum_of_squared_differences(x, x_ref, mask):
+        x, x_ref = SliceSimilarityMeasures._get_masked(x, x_ref, mask)
+        return SliceSimilarityMeasures._sum(np.square(x - x_ref))
+
+    ##
+    # Compute mean of absolute error for each slice
+    # \date       2026-10-18 15:02:32+0000
+    #
+    # \param      x      (N_slices x ny x nx)-numpy data array
+    # \param      x_ref  reference numpy data array of same shape
+    # \param      mask   boolean numpy array of same shape
+    #
+    # \return     mean of absolute error as N_slices-array
+    #
+    @staticmethod
+    def mean_absolute_error(x, x_ref, mask):
+        x, x_ref = SliceSimilarityMeasures._get_masked(x, x_ref, mask)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return SliceSimilarityMeasures._sum(np.abs(x - x_ref)) / \
+                SliceSimilarityMeasures._sum(mask)
+
+    ##
+    # Compute mean of squared error for each slice
+    # \date       2026-10-18 15:02:50+0000
+    #
+    # \param      x      (N_slices x ny x nx)-numpy data array
+    # \param      x_ref  reference numpy data array of same shape
+    # \param      mask   boolean numpy array of same shape
+    #
+    # \return     mean of squared error as N_slices-array
+    #
+    @staticmethod
+    def mean_squared_error(x, x_ref, mask):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return SliceSimilarityMeasures.sum_of_squared_differences(
+                x, x_ref, mask) / SliceSimilarityMeasures._sum(mask)
+
+    ##
+    # Compute root mean square error for each slice
+    # \date       2026-10-18 15:03:07+0000
+    #
+    # \param      x      (N_slices x ny x nx)-numpy data array
+    # \param      x_ref  reference numpy data array of same shape
+    # \param      mask   boolean numpy array of same shape
+    #
+    # \return     root mean square error as N_slices-array
+    #
+    @staticmethod
+    def root_mean_square_error(x, x_ref, mask):
+        return np.sqrt(
+            SliceSimilarityMeasures.mean_squared_error(x, x_ref, mask))
+
+    ##
+    # Compute peak signal to noise ratio for each slice (non-symmetric)
+    # \date       2026-10-18 15:03:25+0000
+    #
+    # \param      x      (N_slices x ny x nx)-numpy data array
+    # \param      x_ref  reference numpy data array of same shape
+    # \param      mask   boolean numpy array of same shape
+    #
+    # \return     peak signal to noise ratio as N_slices-array
+    #
+    @staticmethod
+    def peak_signal_to_noise_ratio(x, x_ref, mask):
+        mse = SliceSimilarityMeasures.mean_squared_error(x, x_ref, mask)
+        x_ref_max = np.max(
+            np.where(mask, x_ref, -np.inf).reshape(mask.shape[0], -1),
+            axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 10 * np.log10(x_ref_max ** 2 / mse)
+
+    ##
+    # Compute normalized cross correlation for each slice (symmetric)
+    # \date       2026-10-18 15:03:51+0000
+    #
+    # \param      x      (N_slices x ny x nx)-numpy data array
+    # \param      x_ref  reference numpy data array of same shape
+    # \param      mask   boolean numpy array of same shape
+    #
+    # \return     Normalized cross correlation as N_slices-array with values
+    #             between -1 and 1
+    #
+    @staticmethod
+    def normalized_cross_correlation(x, x_ref, mask):
+        x, x_ref = SliceSimilarityMeasures._get_masked(x, x_ref, mask)
+        n = SliceSimilarityMeasures._sum(mask)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shape = (-1, ) + (1, ) * (x.ndim - 1)
+            x_mean = (SliceSimilarityMeasures._sum(x) / n).reshape(shape)
+            x_ref_mean = (
+                SliceSimilarityMeasures._sum(x_ref) / n).reshape(shape)
+
+            x = np.where(mask, x - x_mean, 0)
+            x_ref = np.where(mask, x_ref - x_ref_mean, 0)
+
+            # Standard deviations with ddof=1
+            x_std = np.sqrt(
+                SliceSimilarityMeasures._sum(np.square(x)) / (n - 1))
+            x_ref_std = np.sqrt(
+                SliceSimilarityMeasures._sum(np.square(x_ref)) / (n - 1))
+
+            ncc = SliceSimilarityMeasures._sum(x * x_ref)
+            ncc /= n * x_std * x_ref_std
+
+        return ncc
+
+    ##
+    # Set voxels outside the mask to zero so that they do not contribute,
+    # even if not finite.
+    # \date       2026-10-18 15:04:20+0000
+    #
+    @staticmethod
+    def _get_masked(x, x_ref, mask):
+        if x.shape != x_ref.shape or x.shape != mask.shape:
+            raise ValueError("Input data shapes do not match")
+        return np.where(mask, x, 0), np.where(mask, x_ref, 0)
+
+    @staticmethod
+    def _sum(x):
+        return np.sum(x.reshape(x.shape[0], -1), axis=1, dtype=np.float64)
+
+    similarity_measures = {
+        "SSD": sum_of_squared_differences.__func__,
+        "MAE": mean_absolute_error.__func__,
+        "MSE": mean_squared_error.__func__,
+        "RMSE": root_mean_square_error.__func__,
+        "PSNR": peak_signal_to_noise_ratio.__func__,
+        "NCC": normalized_cross_correlation.__func__,
+    }
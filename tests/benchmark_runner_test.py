@@ -0,0 +1,85 @@
+##
+# \file benchmark_runner_test.py
+#  \brief  Class containing unit tests for module BenchmarkRunner
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import os
+import json
+import unittest
+
+import numpy as np
+import SimpleITK as sitk
+
+import pysitk.python_helper as ph
+
+from niftymic.benchmark.benchmark_runner import BenchmarkRunner
+from niftymic.benchmark.synthetic_data import SyntheticData
+from niftymic.definitions import DIR_TMP
+
+
+class BenchmarkRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_tmp = os.path.join(DIR_TMP, "benchmark_runner")
+        ph.clear_directory(self.dir_tmp)
+
+    def test_synthetic_data(self):
+        synthetic_data = SyntheticData(n_stacks=3, n_slices=6, hr_size=16)
+        synthetic_data.run()
+
+        hr_volume = synthetic_data.get_hr_volume()
+        self.assertEqual(hr_volume.sitk.GetSize(), (16, 16, 16))
+
+        stacks = synthetic_data.get_stacks()
+        self.assertEqual(len(stacks), 3)
+        for stack in stacks:
+            self.assertEqual(stack.sitk.GetSize(), (16, 16, 6))
+            self.assertEqual(len(stack.get_slices()), 6)
+            self.assertGreater(sitk.GetArrayFromImage(stack.sitk).max(), 0)
+
+        self.assertEqual(synthetic_data.get_problem_size(), {
+            "n_slice_voxels": 3 * 6 * 16 ** 2,
+            "n_hr_voxels": 16 ** 3,
+        })
+
+    def test_run_write_compare_benchmarks(self):
+        sizes = [
+            {"n_stacks": n_stacks, "n_slices": 4, "hr_size": 12}
+            for n_stacks in [1, 2]
+        ]
+        benchmark_runner = BenchmarkRunner(
+            benchmarks=["stack_copy"],
+            sizes=sizes,
+            repeats=2,
+            use_subprocesses=False,
+            verbose=False,
+        )
+        benchmark_runner.run()
+
+        path_to_file = os.path.join(self.dir_tmp, "benchmarks.json")
+        benchmark_runner.write_results(path_to_file)
+        with open(path_to_file) as json_file:
+            results = json.load(json_file)
+
+        self.assertEqual(len(results["results"]), 2)
+        for record in results["results"]:
+            self.assertEqual(record["benchmark"], "stack_copy")
+            self.assertEqual(len(record["wall_times"]), 2)
+            self.assertAlmostEqual(
+                record["wall_time_min"], np.min(record["wall_times"]))
+        self.assertIn("n_stacks", results["scaling"]["stack_copy"])
+
+        # No regressions compared against itself
+        self.assertEqual(
+            benchmark_runner.get_regressions(path_to_file), [])
+
+        # All records are regressions for negative tolerance
+        self.assertEqual(len(benchmark_runner.get_regressions(
+            path_to_file, tolerance=-1)), 2)
+
+    def test_unknown_benchmark(self):
+        self.assertRaises(ValueError, lambda: BenchmarkRunner(
+            benchmarks=["whatevertestasdfsfasdasf"]))
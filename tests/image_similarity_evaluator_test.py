@@ -58,6 +58,20 @@ class ImageSimilarityEvaluatorTest(unittest.TestCase):
             error = np.linalg.norm(rho_res - rho_res1)
             self.assertAlmostEqual(error, 0, places=self.precision)
 
+        path_to_file = os.path.join(DIR_TMP, "similarities.zip")
+        residual_evaluator.write_similarities_to_results_store(path_to_file)
+        similarities2 = ise.ImageSimilarityEvaluator()
+        similarities2.read_similarities_from_results_store(path_to_file)
+        similarities2 = similarities2.get_similarities()
+
+        self.assertEqual(
+            similarities["filenames"], similarities2["filenames"])
+        for m in residual_evaluator.get_measures():
+            rho_res = similarities[m]
+            rho_res2 = similarities2[m]
+            error = np.linalg.norm(rho_res - rho_res2)
+            self.assertAlmostEqual(error, 0, places=self.precision)
+
     def test_results_not_created(self):
         residual_evaluator = ise.ImageSimilarityEvaluator()
 
@@ -121,3 +121,111 @@ class IntensityCorrectionTest(unittest.TestCase):
         nda_diff = ic_values - ic_values_est
         self.assertEqual(np.round(
             np.linalg.norm(nda_diff), decimals=self.accuracy), 0)
+
+    def test_individual_slice_correction_of_motion_corrected_stack(self):
+        shape_z = 6
+        random_state = np.random.RandomState(0)
+        nda_3D = 100 * random_state.rand(shape_z, 30, 40)
+        stack_sitk = sitk.GetImageFromArray(nda_3D)
+        stack = st.Stack.from_sitk_image(
+            image_sitk=stack_sitk,
+            filename="stack",
+            slice_thickness=stack_sitk.GetSpacing()[-1],
+        )
+
+        nda_3D_corruped = np.zeros_like(nda_3D)
+        for i in range(0, shape_z):
+            nda_3D_corruped[i, :, :] = (nda_3D[i, :, :] - 10 * i) / (i + 1.)
+        stack_corrupted_sitk = sitk.GetImageFromArray(nda_3D_corruped)
+        stack_corrupted = st.Stack.from_sitk_image(
+            image_sitk=stack_corrupted_sitk,
+            filename="stack_corrupted",
+            slice_thickness=stack_corrupted_sitk.GetSpacing()[-1],
+        )
+
+        # Delete and move slices
+        stack_corrupted.delete_slice(stack_corrupted.get_slices()[1])
+        transform_sitk = sitk.Euler3DTransform()
+        transform_sitk.SetTranslation((1, 2, 3))
+        slice_moved = stack_corrupted.get_slices()[2]
+        slice_moved.update_motion_correction(transform_sitk)
+
+        intensity_correction = ic.IntensityCorrection(
+            stack=stack_corrupted,
+            reference=stack,
+            use_individual_slice_correction=True,
+            use_verbose=self.use_verbose)
+        intensity_correction.run_affine_intensity_correction()
+        stack_corrected = intensity_correction.get_intensity_corrected_stack()
+
+        ic_values = np.array([(i + 1, 10 * i) for i in range(0, shape_z)])
+        ic_values_est = intensity_correction.get_intensity_correction_coefficients()
+        self.assertAlmostEqual(
+            np.linalg.norm(ic_values - ic_values_est), 0,
+            places=self.accuracy)
+
+        self.assertEqual(stack_corrected.get_deleted_slice_numbers(), [1])
+        for slice_corrupted, slice_corrected in zip(
+                stack_corrupted.get_slices(), stack_corrected.get_slices()):
+            slice_number = slice_corrected.get_slice_number()
+            self.assertEqual(slice_corrupted.get_slice_number(), slice_number)
+            self.assertEqual(slice_corrupted.sitk.GetOrigin(),
+                             slice_corrected.sitk.GetOrigin())
+            nda_diff = nda_3D[slice_number] - \
+                sitk.GetArrayFromImage(slice_corrected.sitk)[0]
+            self.assertAlmostEqual(
+                np.linalg.norm(nda_diff), 0, places=self.accuracy)
+
+    def test_intensity_correction_stacks_vs_resampled_reference(self):
+        random_state = np.random.RandomState(0)
+
+        def get_stack(shape, spacing, origin, filename):
+            image_sitk = sitk.GetImageFromArray(100 * random_state.rand(*shape))
+            image_sitk.SetSpacing(spacing)
+            image_sitk.SetOrigin(origin)
+            mask_sitk = sitk.GetImageFromArray(
+                (random_state.rand(*shape) > 0.3).astype(np.uint8))
+            mask_sitk.CopyInformation(image_sitk)
+            return st.Stack.from_sitk_image(
+                image_sitk=image_sitk,
+                image_sitk_mask=mask_sitk,
+                filename=filename,
+                slice_thickness=float(spacing[-1]),
+            )
+
+        reference = get_stack((10, 40, 40), (1., 1., 3.), (0, 0, 0), "ref")
+        stacks = [
+            get_stack((12, 36, 36), (1.1, 1.1, 2.5), (i, 2, -1), "stack%d" % i)
+            for i in range(3)
+        ]
+
+        for n_processes in [1, 2]:
+            intensity_correction = ic.IntensityCorrection(
+                n_processes=n_processes)
+            intensity_correction.run_affine_intensity_correction_stacks(
+                stacks, reference, interpolator="NearestNeighbor")
+            stacks_corrected = \
+                intensity_correction.get_intensity_corrected_stacks()
+            coefficients = \
+                intensity_correction.get_intensity_correction_coefficients_stacks()
+
+            for i, stack in enumerate(stacks):
+                intensity_correction_ = ic.IntensityCorrection(
+                    stack=stack,
+                    reference=reference.get_resampled_stack(
+                        resampling_grid=stack.sitk,
+                        interpolator="NearestNeighbor"))
+                intensity_correction_.run_affine_intensity_correction()
+                stack_corrected = \
+                    intensity_correction_.get_intensity_corrected_stack()
+
+                self.assertAlmostEqual(
+                    np.linalg.norm(
+                        coefficients[i] -
+                        intensity_correction_.get_intensity_correction_coefficients()),
+                    0, places=self.accuracy)
+                self.assertAlmostEqual(
+                    np.linalg.norm(
+                        sitk.GetArrayFromImage(stacks_corrected[i].sitk) -
+                        sitk.GetArrayFromImage(stack_corrected.sitk)),
+                    0, places=self.accuracy)
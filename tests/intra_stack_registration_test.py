@@ -14,9 +14,12 @@ import unittest
 import sys
 import os
 from scipy.ndimage import imread
+from scipy.ndimage import shift
+from scipy.optimize import minimize
 
 import pysitk.simple_itk_helper as sitkh
 import pysitk.python_helper as ph
+from nsol.loss_functions import LossFunctions as lf
 
 # Import modules
 import niftymic.base.stack as st
@@ -147,6 +150,207 @@ class IntraStackRegistrationTest(unittest.TestCase):
     def setUp(self):
         pass
 
+    ##
+    # Test that warping all slices at once yields the same slices as
+    # sitk.Resample and that the analytic transform Jacobians are correct.
+    # \date       2026-10-18 19:31:27+0000
+    #
+    # \param      self  The object
+    #
+    def test_warp_slices(self):
+
+        # Smooth random stack with non-trivial geometry
+        np.random.seed(0)
+        nda = np.random.rand(5, 20, 24)
+        stack_sitk = sitk.SmoothingRecursiveGaussian(
+            sitk.GetImageFromArray(nda), 1.5)
+        stack_sitk.SetSpacing((1.2, 0.8, 3.))
+        stack_sitk.SetOrigin((10., -5., 2.))
+        rotation_sitk = sitk.Euler3DTransform()
+        rotation_sitk.SetRotation(0.1, -0.2, 0.3)
+        stack_sitk.SetDirection(rotation_sitk.GetMatrix())
+        stack_sitk_mask = sitk.BinaryThreshold(stack_sitk, 0.5, 1.)
+        stack = st.Stack.from_sitk_image(
+            stack_sitk, slice_thickness=3., filename="stack",
+            image_sitk_mask=stack_sitk_mask)
+
+        parameters_noise = {
+            "rigid": np.array([0.1, 1., 1.]),
+            "similarity": np.array([0.05, 0.1, 1., 1.]),
+            "affine": np.array([0.05, 0.05, 0.05, 0.05, 1., 1.]),
+        }
+        for transform_type in ["rigid", "similarity", "affine"]:
+            inplane_registration = inplanereg.IntraStackRegistration(
+                stack,
+                use_stack_mask=True,
+                transform_type=transform_type,
+                interpolator="Linear",
+            )
+            inplane_registration._run_registration_pipeline_initialization()
+            parameters = inplane_registration.get_parameters() + \
+                np.random.randn(stack.get_number_of_slices(),
+                                parameters_noise[transform_type].size) * \
+                parameters_noise[transform_type]
+
+            slices_nda = inplane_registration._get_warped_slices_nda(
+                parameters)
+            slices_nda_mask = \
+                inplane_registration._get_warped_slices_nda_mask(parameters)
+            dT_nda = inplane_registration._get_transform_jacobians[
+                transform_type](parameters)
+
+            points = \
+                inplane_registration._slice_grid_2D_points_centered + \
+                inplane_registration._transforms_2D_centers[:, np.newaxis]
+
+            for i, slice_2D in enumerate(inplane_registration._slices_2D):
+                transform_sitk = inplane_registration._new_transform_sitk[
+                    transform_type]()
+                transform_sitk.SetFixedParameters(
+                    inplane_registration._transforms_2D_sitk[i].
+                    GetFixedParameters())
+                transform_sitk.SetParameters(parameters[i, :])
+
+                # Compare warped slices with sitk.Resample
+                slice_sitk = sitk.Resample(
+                    slice_2D.sitk,
+                    inplane_registration._slice_grid_2D_sitk,
+                    transform_sitk,
+                    sitk.sitkLinear)
+                slice_sitk_mask = sitk.Resample(
+                    slice_2D.sitk_mask,
+                    inplane_registration._slice_grid_2D_sitk,
+                    transform_sitk,
+                    sitk.sitkNearestNeighbor)
+                self.assertAlmostEqual(np.max(np.abs(
+                    slices_nda[i] - sitk.GetArrayFromImage(slice_sitk))),
+                    0, places=self.accuracy)
+                self.assertEqual(np.sum(np.abs(
+                    slices_nda_mask[i] -
+                    sitk.GetArrayFromImage(slice_sitk_mask))), 0)
+
+                # Compare transform Jacobians with finite differences
+                epsilon = 1e-6
+                for j in [0, 50, 200]:
+                    for k in range(parameters.shape[1]):
+                        parameters_plus = np.array(parameters[i, :])
+                        parameters_plus[k] += epsilon
+                        transform_sitk.SetParameters(parameters_plus)
+                        point_plus = np.array(
+                            transform_sitk.TransformPoint(points[i, j]))
+                        parameters_minus = np.array(parameters[i, :])
+                        parameters_minus[k] -= epsilon
+                        transform_sitk.SetParameters(parameters_minus)
+                        point_minus = np.array(
+                            transform_sitk.TransformPoint(points[i, j]))
+                        dT_fd = (point_plus - point_minus) / (2 * epsilon)
+                        self.assertAlmostEqual(np.max(np.abs(
+                            dT_nda[i, j, :, k] - dT_fd)),
+                            0, places=4)
+
+    ##
+    # Test that sharing warped slices between residual and Jacobian
+    # evaluations and memoizing the residual for scipy.optimize.minimize
+    # yield the same residuals, Jacobians and optimization results as
+    # uncached evaluations.
+    # \date       2026-10-19 10:21:45+0000
+    #
+    # \param      self  The object
+    #
+    def test_cached_residual_and_jacobian_evaluations(self):
+
+        np.random.seed(0)
+        stacks = []
+        for sigma in [1.5, 2.]:
+            stack_sitk = sitk.SmoothingRecursiveGaussian(
+                sitk.GetImageFromArray(np.random.rand(5, 20, 24)), sigma)
+            stack_sitk.SetSpacing((1.2, 0.8, 3.))
+            stacks.append(st.Stack.from_sitk_image(
+                stack_sitk, slice_thickness=3., filename="stack",
+                image_sitk_mask=sitk.BinaryThreshold(stack_sitk, 0.5, 1.)))
+
+        inplane_registration = inplanereg.IntraStackRegistration(
+            stacks[0],
+            reference=stacks[1],
+            use_stack_mask=True,
+            use_reference_mask=True,
+            transform_type="rigid",
+            interpolator="Linear",
+            alpha_neighbour=1,
+            alpha_reference=1,
+        )
+        inplane_registration._run_registration_pipeline_initialization()
+        residual = inplane_registration._get_residual_call()
+        jacobian = inplane_registration._get_jacobian_residual_call()
+
+        # Evaluation without warped slices shared between calls
+        def uncached(call, x):
+            inplane_registration._warped_slices_2D_cache = {}
+            return np.array(call(x))
+
+        x0 = inplane_registration._parameters0_vec.flatten()
+        x1 = x0 + np.random.randn(x0.size) * 0.5
+        x2 = x0 + np.random.randn(x0.size) * 0.5
+
+        # Shared cache with alternating parameters and calls
+        for call, x in [(residual, x1), (jacobian, x1), (residual, x2),
+                        (jacobian, x1), (residual, x1), (jacobian, x2)]:
+            nda = np.array(call(x))
+            self.assertEqual(np.sum(np.abs(nda - uncached(call, x))), 0)
+
+        # Memoized residual as used for scipy.optimize.minimize
+        n_evaluations = [0]
+
+        def residual_counted(x):
+            n_evaluations[0] += 1
+            return residual(x)
+        residual_memoized = \
+            inplane_registration._get_call_cached_for_last_parameters(
+                residual_counted)
+        for x in [x1, x1, x2, x1]:
+            self.assertEqual(np.sum(np.abs(
+                residual_memoized(x) - uncached(residual, x))), 0)
+        self.assertEqual(n_evaluations[0], 3)
+
+        # Same optimization result as with uncached cost and gradient
+        x_memoized = inplane_registration._run_optimizer_minimize(
+            fun=residual, jac=jacobian, x0=x1, method="L-BFGS-B",
+            loss="soft_l1", iter_max=5, verbose=0, x_scale=None)
+        x_uncached = minimize(
+            method="L-BFGS-B",
+            fun=lambda x: lf.get_ell2_cost_from_residual(
+                uncached(residual, x), loss="soft_l1"),
+            jac=lambda x: lf.get_gradient_ell2_cost_from_residual(
+                uncached(residual, x), uncached(jacobian, x),
+                loss="soft_l1"),
+            x0=x1,
+            options={"maxiter": 5, "disp": 0},
+        ).x
+        self.assertEqual(np.sum(np.abs(x_memoized - x_uncached)), 0)
+
+    ##
+    # Stack of smooth blobs with non-trivial geometry
+    # \date       2026-10-19 14:02:11+0000
+    #
+    # \param      self  The object
+    #
+    # \return     The stack as sitk.Image object
+    #
+    def _get_blob_stack_sitk(self):
+        z, y, x = np.meshgrid(
+            np.arange(5), np.arange(40), np.arange(48), indexing="ij")
+        nda = np.zeros((5, 40, 48))
+        for center in np.random.uniform(10, 30, size=(6, 2)):
+            nda += 100 * np.exp(-((y - center[0]) ** 2 +
+                                  (x - center[1] - z) ** 2) / 20.)
+        stack_sitk = sitk.GetImageFromArray(nda)
+        stack_sitk.SetSpacing((1.2, 0.8, 3.))
+        stack_sitk.SetOrigin((10., -5., 2.))
+        rotation_sitk = sitk.Euler3DTransform()
+        rotation_sitk.SetRotation(0.1, -0.2, 0.3)
+        stack_sitk.SetDirection(rotation_sitk.GetMatrix())
+        return stack_sitk
+
     ##
     #       Test whether the function
     #             _get_initial_transforms_and_parameters_geometry_moments
@@ -155,6 +359,136 @@ class IntraStackRegistrationTest(unittest.TestCase):
     #
     # \param      self  The object
     #
+    def test_multiresolution_framework(self):
+
+        # Stack of smooth blobs with non-trivial geometry
+        np.random.seed(0)
+        stack_sitk = self._get_blob_stack_sitk()
+        stack = st.Stack.from_sitk_image(
+            stack_sitk, slice_thickness=3., filename="stack")
+
+        # Slices at coarse level coincide with every second voxel of slices
+        inplane_registration = inplanereg.IntraStackRegistration(stack)
+        stack_level = inplane_registration._get_stack_at_resolution_level(
+            stack, shrink_factor=2, smoothing_sigma=0)
+        for slice_3D, slice_3D_level in zip(
+                stack.get_slices(), stack_level.get_slices()):
+            self.assertEqual(np.sum(np.abs(
+                sitk.GetArrayFromImage(slice_3D.sitk)[:, ::2, ::2] -
+                sitk.GetArrayFromImage(slice_3D_level.sitk))), 0)
+            for index in [(0, 0, 0), (3, 5, 0)]:
+                point = slice_3D.sitk.TransformIndexToPhysicalPoint(
+                    [2 * index[0], 2 * index[1], 0])
+                point_level = \
+                    slice_3D_level.sitk.TransformIndexToPhysicalPoint(index)
+                self.assertAlmostEqual(np.max(np.abs(
+                    np.array(point) - point_level)), 0, places=self.accuracy)
+
+        # Shift slices in-plane and register them to the original stack
+        shifts = np.random.uniform(-2, 2, size=(5, 2))
+        nda_shifted = sitk.GetArrayFromImage(stack_sitk)
+        for i in range(nda_shifted.shape[0]):
+            nda_shifted[i] = shift(nda_shifted[i], shifts[i], order=3)
+        stack_shifted_sitk = sitk.GetImageFromArray(nda_shifted)
+        stack_shifted_sitk.CopyInformation(stack_sitk)
+        stack_shifted = st.Stack.from_sitk_image(
+            stack_shifted_sitk, slice_thickness=3., filename="stack_shifted")
+
+        inplane_registration = inplanereg.IntraStackRegistration(
+            stack=stack_shifted,
+            reference=stack,
+            transform_type="rigid",
+            alpha_neighbour=0,
+            alpha_reference=1,
+            alpha_parameter=0,
+            optimizer="least_squares",
+            optimizer_loss="linear",
+            optimizer_iter_max=30,
+            use_multiresolution_framework=True,
+            shrink_factors=[4, 2, 1],
+            smoothing_sigmas=[2, 1, 0],
+        )
+        inplane_registration.run()
+        parameters = inplane_registration.get_parameters()
+
+        # Translations in physical units of in-plane image axes
+        translations = shifts[:, ::-1] * np.array(stack_sitk.GetSpacing()[0:2])
+        self.assertLess(
+            np.max(np.abs(parameters[:, 1:] - translations)), 0.2)
+
+    ##
+    # Test that resolution levels of a stack with deleted slices keep the
+    # slice data and the deleted slices of the original stack
+    # \date       2026-10-19 14:05:48+0000
+    #
+    # \param      self  The object
+    #
+    def test_multiresolution_framework_deleted_slices(self):
+
+        np.random.seed(0)
+        stack_sitk = self._get_blob_stack_sitk()
+        nda = sitk.GetArrayFromImage(stack_sitk)
+        slice_numbers_deleted = [0, 3]
+
+        # Shift slices in-plane and delete some of them
+        shifts = np.random.uniform(-2, 2, size=(5, 2))
+        nda_shifted = np.array(nda)
+        for i in range(nda_shifted.shape[0]):
+            nda_shifted[i] = shift(nda_shifted[i], shifts[i], order=3)
+        stack_shifted_sitk = sitk.GetImageFromArray(nda_shifted)
+        stack_shifted_sitk.CopyInformation(stack_sitk)
+        stack_shifted = st.Stack.from_sitk_image(
+            stack_shifted_sitk, slice_thickness=3., filename="stack_shifted")
+        for slice_3D in stack_shifted.get_slices():
+            if slice_3D.get_slice_number() in slice_numbers_deleted:
+                stack_shifted.delete_slice(slice_3D)
+
+        inplane_registration = inplanereg.IntraStackRegistration(
+            stack_shifted)
+        stack_level = inplane_registration._get_stack_at_resolution_level(
+            stack_shifted, shrink_factor=2, smoothing_sigma=0)
+        self.assertEqual(
+            [s.get_slice_number() for s in stack_level.get_slices()],
+            [s.get_slice_number() for s in stack_shifted.get_slices()])
+        self.assertEqual(
+            stack_level.get_deleted_slice_numbers(), slice_numbers_deleted)
+        for slice_3D_level in stack_level.get_slices():
+            k = slice_3D_level.get_slice_number()
+            self.assertEqual(np.sum(np.abs(
+                nda_shifted[k:k + 1, ::2, ::2] -
+                sitk.GetArrayFromImage(slice_3D_level.sitk))), 0)
+
+        # Register remaining slices to the original stack. The reference fit
+        # term compares the i-th slice with the i-th reference slice, hence
+        # only the last slice is deleted here.
+        stack_shifted = st.Stack.from_sitk_image(
+            stack_shifted_sitk, slice_thickness=3., filename="stack_shifted")
+        stack_shifted.delete_slice(stack_shifted.get_slices()[-1])
+        inplane_registration = inplanereg.IntraStackRegistration(
+            stack=stack_shifted,
+            reference=st.Stack.from_sitk_image(
+                stack_sitk, slice_thickness=3., filename="stack"),
+            transform_type="rigid",
+            alpha_neighbour=0,
+            alpha_reference=1,
+            alpha_parameter=0,
+            optimizer="least_squares",
+            optimizer_loss="linear",
+            optimizer_iter_max=30,
+            use_multiresolution_framework=True,
+            shrink_factors=[4, 2, 1],
+            smoothing_sigmas=[2, 1, 0],
+        )
+        inplane_registration.run()
+        parameters = inplane_registration.get_parameters()
+
+        slice_numbers = [
+            s.get_slice_number() for s in stack_shifted.get_slices()]
+        translations = shifts[slice_numbers, ::-1] * \
+            np.array(stack_sitk.GetSpacing()[0:2])
+        self.assertLess(
+            np.max(np.abs(parameters[:, 1:] - translations)), 0.2)
+
     def test_initial_transform_computation_1(self):
 
         # Create stack of slice with only a dot in the middle
@@ -140,3 +140,36 @@ class LinearOperatorsTest(unittest.TestCase):
                 sitk.GetArrayFromImage(res_sitk - ref_sitk))
             self.assertAlmostEqual(np.linalg.norm(
                 nda_diff), 0, places=self.precision)
+
+    ##
+    # Test that batched forward simulation of all slices of a stack matches
+    # the forward simulation of individual slices
+    # \date       2026-10-18 14:52:40+0000
+    #
+    def test_forward_operator_stack_batched(self):
+
+        stack = st.Stack.from_filename(
+            self.path_to_file,
+            ph.append_to_filename(self.path_to_file, self.suffix_mask))
+        stack.delete_slice(stack.get_slices()[1])
+        reconstruction = st.Stack.from_filename(
+            self.path_to_recon, self.path_to_recon_mask)
+
+        linear_operators = lin_op.LinearOperators()
+        nda, nda_mask = linear_operators.A_stack(
+            reconstruction, stack, default_pixel_value=np.nan)
+
+        self.assertTrue(np.all(np.isnan(nda[1])))
+        for slice in stack.get_slices():
+            simulated_slice = linear_operators.A(reconstruction, slice)
+            i_slice = slice.get_slice_number()
+
+            error = np.linalg.norm(
+                sitk.GetArrayFromImage(simulated_slice.sitk)[0] -
+                nda[i_slice])
+            self.assertAlmostEqual(error, 0, places=self.precision)
+
+            error = np.linalg.norm(
+                sitk.GetArrayFromImage(simulated_slice.sitk_mask)[0] -
+                nda_mask[i_slice])
+            self.assertAlmostEqual(error, 0, places=self.precision)
@@ -0,0 +1,69 @@
+##
+# \file n4_bias_field_correction_test.py
+#  \brief  Class containing unit tests for module N4BiasFieldCorrection
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import SimpleITK as sitk
+import numpy as np
+import unittest
+
+import niftymic.base.stack as st
+import niftymic.utilities.n4_bias_field_correction as n4bfc
+
+
+class N4BiasFieldCorrectionTest(unittest.TestCase):
+
+    accuracy = 6
+
+    def _get_stacks(self):
+        stacks = []
+        for i in range(2):
+            z, y, x = np.mgrid[0:4, 0:48, 0:48]
+            nda = 100. * (1 + 0.3 * (x + i * y) / 48.)
+            image_sitk = sitk.GetImageFromArray(nda)
+            image_sitk.SetSpacing((0.8, 0.8, 3.))
+            stacks.append(st.Stack.from_sitk_image(
+                image_sitk, filename="stack%d" % i, slice_thickness=3.))
+        return stacks
+
+    @staticmethod
+    def _get_coefficient_of_variation(stack):
+        nda = sitk.GetArrayFromImage(stack.sitk)
+        return nda.std() / nda.mean()
+
+    def test_shrink_factor(self):
+        stacks = self._get_stacks()
+
+        bias_field_corrector = n4bfc.N4BiasFieldCorrection(shrink_factor=2)
+        bias_field_corrector.run_bias_field_correction_stacks(stacks)
+        stacks_corrected = \
+            bias_field_corrector.get_bias_field_corrected_stacks()
+
+        for stack, stack_corrected in zip(stacks, stacks_corrected):
+            self.assertEqual(stack.sitk.GetSize(),
+                             stack_corrected.sitk.GetSize())
+            self.assertEqual(stack.get_filename(),
+                             stack_corrected.get_filename())
+            self.assertLess(
+                self._get_coefficient_of_variation(stack_corrected),
+                0.2 * self._get_coefficient_of_variation(stack))
+
+    def test_parallel_vs_serial(self):
+        stacks = self._get_stacks()
+
+        ndas = []
+        for n_processes in [1, 2]:
+            bias_field_corrector = n4bfc.N4BiasFieldCorrection(
+                n_processes=n_processes)
+            bias_field_corrector.run_bias_field_correction_stacks(stacks)
+            ndas.append([
+                sitk.GetArrayFromImage(s.sitk) for s in
+                bias_field_corrector.get_bias_field_corrected_stacks()])
+
+        for nda1, nda2 in zip(*ndas):
+            self.assertAlmostEqual(
+                np.linalg.norm(nda1 - nda2) / np.linalg.norm(nda1),
+                0, places=self.accuracy)
@@ -0,0 +1,194 @@
+##
+# \file parameter_study_runner_test.py
+#  \brief  Class containing unit tests for module ParameterStudyRunner
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import os
+import unittest
+
+import numpy as np
+
+import pysitk.python_helper as ph
+import nsol.deconvolution_solver_parameter_study_interface as \
+    deconv_interface
+from nsol.reader_parameter_study import ReaderParameterStudy
+
+from niftymic.definitions import DIR_TMP
+from niftymic.utilities.parameter_study_runner import \
+    ParameterStudyRunner, ReaderParameterStudyResultsStore
+
+
+class ParameterStudyRunnerTest(unittest.TestCase):
+
+    accuracy = 6
+
+    def setUp(self):
+        self.dir_tmp = os.path.join(DIR_TMP, "parameter_study_runner")
+        ph.clear_directory(self.dir_tmp)
+
+        random_state = np.random.RandomState(0)
+        self.A = random_state.rand(60, 40)
+        self.D = np.diff(np.eye(40), axis=0)
+        self.x_ref = random_state.rand(40)
+        self.b = self.A.dot(self.x_ref)
+
+    def _get_parameter_study(self, dir_output, minimizer="lsmr"):
+        parameter_study_interface = \
+            deconv_interface.DeconvolutionParameterStudyInterface(
+                A=lambda x: self.A.dot(x),
+                A_adj=lambda x: self.A.T.dot(x),
+                D=lambda x: self.D.dot(x),
+                D_adj=lambda x: self.D.T.dot(x),
+                b=self.b,
+                x0=np.zeros(40),
+                alpha=0.1,
+                x_scale=1,
+                data_loss="linear",
+                data_loss_scale=1,
+                iter_max=5,
+                minimizer=minimizer,
+                iterations=5,
+                measures=["RMSE"],
+                dimension=1,
+                L2=4,
+                reconstruction_type="TK1L2",
+                rho=0.1,
+                dir_output=dir_output,
+                parameters={
+                    "alpha": [0.3, 0.01, 0.1, 0.05],
+                    "iter_max": [3, 6],
+                },
+                name="study",
+                reconstruction_info={},
+                x_ref=self.x_ref,
+                x_ref_mask=None,
+                tv_solver="PD",
+                verbose=0,
+                append=False,
+            )
+        parameter_study_interface.set_up_parameter_study()
+        return parameter_study_interface.get_parameter_study()
+
+    def _read_study(self, dir_output):
+        reader_parameter_study = ReaderParameterStudy(
+            directory=dir_output, name="study")
+        reader_parameter_study.read_study()
+        return reader_parameter_study
+
+    def _assert_studies_equal(self, dir_output1, dir_output2):
+        study1 = self._read_study(dir_output1)
+        study2 = self._read_study(dir_output2)
+
+        self.assertEqual(
+            study1.get_parameters_to_line(), study2.get_parameters_to_line())
+
+        reconstructions1 = study1.get_reconstructions()
+        reconstructions2 = study2.get_reconstructions()
+        self.assertEqual(
+            sorted(reconstructions1.keys()), sorted(reconstructions2.keys()))
+        for k in reconstructions1.keys():
+            self.assertAlmostEqual(
+                np.max(np.abs(reconstructions1[k].astype(float) -
+                              reconstructions2[k])), 0,
+                places=self.accuracy)
+
+    def test_concurrent_vs_sequential_parameter_study(self):
+        dir_sequential = os.path.join(self.dir_tmp, "sequential")
+        dir_concurrent = os.path.join(self.dir_tmp, "concurrent")
+
+        self._get_parameter_study(dir_sequential).run()
+        ParameterStudyRunner(
+            self._get_parameter_study(dir_concurrent),
+            n_processes=3).run()
+
+        self._assert_studies_equal(dir_sequential, dir_concurrent)
+
+    def test_warm_start_parameter_study(self):
+        dir_sequential = os.path.join(self.dir_tmp, "sequential")
+        dir_warm_start = os.path.join(self.dir_tmp, "warm_start")
+
+        # lsmr does not depend on the initial value
+        self._get_parameter_study(dir_sequential).run()
+        ParameterStudyRunner(
+            self._get_parameter_study(dir_warm_start),
+            n_processes=3,
+            use_warm_start=True).run()
+
+        self._assert_studies_equal(dir_sequential, dir_warm_start)
+
+    def test_warm_start_parameter_study_x0_dependent(self):
+        dir_cold_start = os.path.join(self.dir_tmp, "cold_start")
+        dir_warm_start = os.path.join(self.dir_tmp, "warm_start")
+        minimizer = "L-BFGS-B"
+
+        self._get_parameter_study(dir_cold_start, minimizer=minimizer).run()
+        ParameterStudyRunner(
+            self._get_parameter_study(dir_warm_start, minimizer=minimizer),
+            n_processes=2,
+            use_warm_start=True).run()
+        study_cold_start = self._read_study(dir_cold_start)
+        study_warm_start = self._read_study(dir_warm_start)
+
+        # Each chain of increasing alphas (for fixed iter_max) starts from
+        # the solution obtained for the previous alpha
+        solver = self._get_parameter_study(
+            os.path.join(self.dir_tmp, "reference"),
+            minimizer=minimizer)._solver
+        parameters_to_line = study_warm_start.get_parameters_to_line()
+        reconstructions = study_warm_start.get_reconstructions()
+        reconstructions_cold_start = study_cold_start.get_reconstructions()
+        for iter_max in [3, 6]:
+            x = np.zeros(40)
+            for k, alpha in enumerate([0.01, 0.05, 0.1, 0.3]):
+                solver.set_alpha(alpha)
+                solver.set_iter_max(iter_max)
+                solver.set_x0(x)
+                solver.run()
+                x = solver.get_x()
+
+                line = str(parameters_to_line[(str(alpha), str(iter_max))])
+                self.assertAlmostEqual(np.max(np.abs(
+                    reconstructions[line].astype(float) - x)), 0, places=2)
+
+                # Warm start differs from cold start for chained alphas
+                if k > 0:
+                    self.assertGreater(np.max(np.abs(
+                        reconstructions[line].astype(float) -
+                        reconstructions_cold_start[line])), 1e-2)
+
+    def test_read_results_store(self):
+        dir_output = os.path.join(self.dir_tmp, "results_store")
+        ParameterStudyRunner(
+            self._get_parameter_study(dir_output),
+            n_processes=2).run()
+
+        study = self._read_study(dir_output)
+        study1 = ReaderParameterStudyResultsStore(
+            directory=dir_output, name="study")
+        study1.read_study()
+
+        self.assertEqual(
+            sorted(study.get_measures()), sorted(study1.get_measures()))
+        self.assertEqual(study.get_parameters(), study1.get_parameters())
+        self.assertEqual(
+            study.get_parameters_to_line(), study1.get_parameters_to_line())
+        self.assertEqual(
+            study.get_line_to_parameter_labels(),
+            study1.get_line_to_parameter_labels())
+
+        for measure in study.get_measures():
+            self.assertAlmostEqual(
+                np.max(np.abs(study.get_results(measure) -
+                              study1.get_results(measure))), 0,
+                places=self.accuracy)
+
+        reconstructions = study.get_reconstructions()
+        reconstructions1 = study1.get_reconstructions()
+        self.assertEqual(
+            sorted(reconstructions.keys()), sorted(reconstructions1.keys()))
+        for k in reconstructions.keys():
+            self.assertEqual(
+                np.sum(np.abs(reconstructions[k] - reconstructions1[k])), 0)
@@ -0,0 +1,132 @@
+##
+# \file pipeline_checkpoint_test.py
+#  \brief  Class containing unit tests for module PipelineCheckpoint
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import SimpleITK as sitk
+import numpy as np
+import unittest
+import os
+
+import pysitk.python_helper as ph
+
+import niftymic.base.stack as st
+import niftymic.validation.motion_simulator as ms
+import niftymic.utilities.pipeline_checkpoint as pc
+
+from niftymic.definitions import DIR_TMP
+
+
+class PipelineCheckpointTest(unittest.TestCase):
+
+    accuracy = 10
+
+    def setUp(self):
+        self.dir_checkpoints = os.path.join(DIR_TMP, "checkpoints")
+        ph.clear_directory(self.dir_checkpoints)
+
+    def _get_stacks(self):
+        stacks = []
+        for i in range(2):
+            nda = np.random.RandomState(i).rand(6, 20, 30)
+            image_sitk = sitk.GetImageFromArray(nda)
+            image_sitk.SetSpacing((0.8, 0.8, 3.))
+            stacks.append(st.Stack.from_sitk_image(
+                image_sitk, filename="stack%d" % i, slice_thickness=3.))
+        return stacks
+
+    def _assert_equal_transforms(self, transforms1, transforms2):
+        self.assertEqual(len(transforms1), len(transforms2))
+        for t1, t2 in zip(transforms1, transforms2):
+            nda1 = np.concatenate(
+                (t1.GetMatrix(), t1.GetTranslation(), t1.GetCenter()))
+            nda2 = np.concatenate(
+                (t2.GetMatrix(), t2.GetTranslation(), t2.GetCenter()))
+            self.assertAlmostEqual(
+                np.linalg.norm(nda1 - nda2), 0, places=self.accuracy)
+
+    def test_write_and_restore(self):
+
+        stacks = self._get_stacks()
+
+        motion_simulator = ms.RandomRigidMotionSimulator(
+            dimension=3,
+            angle_max_deg=20,
+            translation_max=30)
+        motion_simulator.simulate_motion(seed=0, simulations=7)
+        transforms_sitk = motion_simulator.get_transforms_sitk()
+
+        # Stack and slice motion corrections
+        stacks[0].update_motion_correction(transforms_sitk[0])
+        for i, slice in enumerate(stacks[1].get_slices()):
+            slice.update_motion_correction(transforms_sitk[i + 1])
+        stacks[1].delete_slice(stacks[1].get_slice(2))
+
+        nda_mask = np.zeros((10, 10, 10), dtype=np.uint8)
+        nda_mask[2:8, 2:8, 2:8] = 1
+        reconstruction_sitk = sitk.GetImageFromArray(
+            np.random.rand(10, 10, 10))
+        reconstruction_sitk.SetSpacing((1.2, 1.2, 1.2))
+        reconstruction_sitk.SetOrigin((3., -4., 5.))
+        reconstruction_sitk_mask = sitk.GetImageFromArray(nda_mask)
+        reconstruction_sitk_mask.CopyInformation(reconstruction_sitk)
+        reconstruction = st.Stack.from_sitk_image(
+            reconstruction_sitk,
+            image_sitk_mask=reconstruction_sitk_mask,
+            filename="recon",
+            slice_thickness=1.2)
+
+        checkpoint = pc.PipelineCheckpoint(self.dir_checkpoints, verbose=0)
+        checkpoint.write("v2v", stacks)
+        checkpoint.write("s2v_cycle1", stacks, reconstruction)
+        self.assertEqual(checkpoint.get_stages(), ["v2v", "s2v_cycle1"])
+
+        # Restore state on fresh stacks
+        stacks_restored = self._get_stacks()
+        checkpoint = pc.PipelineCheckpoint(self.dir_checkpoints, verbose=0)
+        self.assertEqual(checkpoint.get_latest_stage(), "s2v_cycle1")
+        checkpoint.read()
+        checkpoint.update_stack_positions(stacks_restored)
+        stacks_restored = checkpoint.update_slices(stacks_restored)
+
+        for stack, stack_restored in zip(stacks, stacks_restored):
+            for i in range(2):
+                self._assert_equal_transforms(
+                    stack.get_registration_history()[i],
+                    stack_restored.get_registration_history()[i])
+            self.assertEqual(
+                stack.get_deleted_slice_numbers(),
+                stack_restored.get_deleted_slice_numbers())
+            for slice, slice_restored in zip(
+                    stack.get_slices(), stack_restored.get_slices()):
+                self.assertEqual(slice.get_slice_number(),
+                                 slice_restored.get_slice_number())
+                for i in range(2):
+                    self._assert_equal_transforms(
+                        slice.get_registration_history()[i],
+                        slice_restored.get_registration_history()[i])
+                self.assertAlmostEqual(
+                    np.linalg.norm(
+                        np.array(slice.sitk.GetOrigin()) -
+                        np.array(slice_restored.sitk.GetOrigin())),
+                    0, places=self.accuracy)
+
+        reconstruction_restored = checkpoint.get_reconstruction()
+        self.assertEqual(reconstruction_restored.get_filename(), "recon")
+        self.assertAlmostEqual(
+            np.linalg.norm(
+                sitk.GetArrayFromImage(reconstruction.sitk) -
+                sitk.GetArrayFromImage(reconstruction_restored.sitk)),
+            0, places=self.accuracy)
+        self.assertEqual(
+            sitk.GetArrayFromImage(reconstruction_restored.sitk_mask).sum(),
+            nda_mask.sum())
+        self.assertEqual(reconstruction_restored.sitk.GetOrigin(),
+                         reconstruction.sitk.GetOrigin())
+
+        # Checkpoint without reconstruction
+        checkpoint.read(stage="v2v")
+        self.assertIsNone(checkpoint.get_reconstruction())
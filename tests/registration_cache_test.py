@@ -0,0 +1,144 @@
+##
+# \file registration_cache_test.py
+#  \brief  Class containing unit tests for module RegistrationCache
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import SimpleITK as sitk
+import numpy as np
+import unittest
+import os
+
+import pysitk.python_helper as ph
+
+import niftymic.base.stack as st
+import niftymic.registration.registration_cache as regcache
+import niftymic.registration.simple_itk_registration as regsitk
+import niftymic.utilities.volumetric_reconstruction_pipeline as pipeline
+from niftymic.benchmark.synthetic_data import SyntheticData
+
+from niftymic.definitions import DIR_TMP
+
+
+class RegistrationCacheTest(unittest.TestCase):
+
+    precision = 10
+
+    def setUp(self):
+        self.dir_cache = os.path.join(DIR_TMP, "registration_cache")
+        ph.clear_directory(self.dir_cache)
+
+        synthetic_data = SyntheticData(n_stacks=2, n_slices=8, hr_size=24)
+        synthetic_data.run()
+        self.hr_volume = synthetic_data.get_hr_volume()
+        self.stacks = synthetic_data.get_stacks()
+
+    def _get_registration_method(self, metric="Correlation"):
+        return regsitk.SimpleItkRegistration(
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            registration_type="Rigid",
+            interpolator="Linear",
+            metric=metric,
+            optimizer="ConjugateGradientLineSearch",
+            optimizer_params={
+                "learningRate": 1,
+                "numberOfIterations": 5,
+                "lineSearchUpperLimit": 2,
+            },
+            scales_estimator="Jacobian",
+        )
+
+    def _get_cached_transforms(self):
+        return [f for f in os.listdir(self.dir_cache) if f.endswith(".tfm")]
+
+    def test_key(self):
+        registration_cache = regcache.RegistrationCache(self.dir_cache)
+        stack = self.stacks[0]
+
+        registration_method = self._get_registration_method()
+        registration_method.set_fixed(stack)
+        registration_method.set_moving(self.hr_volume)
+        key = registration_cache.get_key_from_registration_method(
+            registration_method)
+
+        # Same key for identical images and settings
+        registration_method = self._get_registration_method()
+        registration_method.set_fixed(st.Stack.from_stack(stack))
+        registration_method.set_moving(st.Stack.from_stack(self.hr_volume))
+        registration_method.use_verbose(True)
+        self.assertEqual(
+            registration_cache.get_key_from_registration_method(
+                registration_method), key)
+
+        # Different settings
+        registration_method.set_metric("MeanSquares")
+        self.assertNotEqual(
+            registration_cache.get_key_from_registration_method(
+                registration_method), key)
+
+        # Different image position
+        registration_method = self._get_registration_method()
+        stack_moved = st.Stack.from_stack(stack)
+        stack_moved.update_motion_correction(
+            sitk.Euler3DTransform((0, 0, 0), 0, 0, 0.1, (0, 0, 0)))
+        registration_method.set_fixed(stack_moved)
+        registration_method.set_moving(self.hr_volume)
+        self.assertNotEqual(
+            registration_cache.get_key_from_registration_method(
+                registration_method), key)
+
+        # Different initial transform
+        kwargs = {
+            "fixed_sitk": stack.sitk,
+            "moving_sitk": self.hr_volume.sitk,
+            "method": "RegAladin",
+        }
+        key = registration_cache.get_key(**kwargs)
+        self.assertNotEqual(registration_cache.get_key(
+            transform_init_sitk=sitk.Euler3DTransform(), **kwargs), key)
+        self.assertNotEqual(registration_cache.get_key(
+            fixed_sitk_mask=stack.sitk_mask, **kwargs), key)
+
+    def test_volume_to_volume_registration(self):
+        registration_cache = regcache.RegistrationCache(
+            self.dir_cache, verbose=False)
+
+        transforms_sitk = []
+        for i in range(2):
+            stacks = [st.Stack.from_stack(s) for s in self.stacks]
+            registration_method = self._get_registration_method()
+            v2vreg = pipeline.VolumeToVolumeRegistration(
+                stacks=stacks,
+                reference=self.hr_volume,
+                registration_method=registration_method,
+                registration_cache=registration_cache,
+                verbose=False,
+            )
+            v2vreg.run()
+            transforms_sitk.append([
+                s.get_registration_history()[1][-1] for s in stacks])
+            self.assertEqual(
+                len(self._get_cached_transforms()), len(self.stacks))
+
+            # Registration is only run if not cached already
+            self.assertEqual(
+                registration_method.get_computational_time() ==
+                ph.get_zero_time(), i == 1)
+
+        for t1, t2 in zip(*transforms_sitk):
+            nda1 = np.concatenate((t1.GetMatrix(), t1.GetTranslation()))
+            nda2 = np.concatenate((t2.GetMatrix(), t2.GetTranslation()))
+            self.assertAlmostEqual(
+                np.max(np.abs(nda1 - nda2)), 0, places=self.precision)
+
+        # Changed settings require new registrations
+        registration_method = self._get_registration_method(
+            metric="MeanSquares")
+        registration_method.set_fixed(self.stacks[0])
+        registration_method.set_moving(self.hr_volume)
+        registration_cache.run(registration_method)
+        self.assertEqual(
+            len(self._get_cached_transforms()), len(self.stacks) + 1)
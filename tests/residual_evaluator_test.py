@@ -59,6 +59,24 @@ class ResidualEvaluatorTest(unittest.TestCase):
                 error = np.linalg.norm(rho_res - rho_res1)
                 self.assertAlmostEqual(error, 0, places=self.precision)
 
+        path_to_file = os.path.join(self.dir_tmp, "slice_similarities.zip")
+        residual_evaluator.write_slice_similarities_to_results_store(
+            path_to_file)
+        residual_evaluator2 = res_ev.ResidualEvaluator()
+        residual_evaluator2.read_slice_similarities_from_results_store(
+            path_to_file)
+        slice_similarities2 = residual_evaluator2.get_slice_similarities()
+
+        self.assertEqual(
+            sorted(slice_similarities.keys()),
+            sorted(slice_similarities2.keys()))
+        for stack_name in slice_similarities.keys():
+            for m in slice_similarities[stack_name].keys():
+                rho_res = np.nan_to_num(slice_similarities[stack_name][m])
+                rho_res2 = np.nan_to_num(slice_similarities2[stack_name][m])
+                error = np.linalg.norm(rho_res - rho_res2)
+                self.assertAlmostEqual(error, 0, places=self.precision)
+
     def test_slice_projections_not_created(self):
         paths_to_stacks = [
             os.path.join(
@@ -0,0 +1,132 @@
+##
+# \file results_store_test.py
+#  \brief  Class containing unit tests for module ResultsStore
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import os
+import zipfile
+import unittest
+import warnings
+
+import numpy as np
+
+import pysitk.python_helper as ph
+
+from niftymic.definitions import DIR_TMP
+from niftymic.utilities.results_store import ResultsStore
+
+
+class ResultsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_tmp = os.path.join(DIR_TMP, "results_store")
+        ph.clear_directory(self.dir_tmp)
+        self.path_to_file = os.path.join(self.dir_tmp, "results.zip")
+
+        random_state = np.random.RandomState(0)
+        self.records = {
+            ("0.1", "linear"): {
+                "NCC": random_state.rand(10),
+                "x": random_state.rand(4, 5).astype(np.float16),
+            },
+            ("0.2", "linear"): {
+                "NCC": random_state.rand(10),
+                "x": random_state.rand(4, 5).astype(np.float16),
+            },
+        }
+
+    def test_write_read_records(self):
+        info = {"parameters": ["alpha", "data_loss"], "shape": [4, 5]}
+
+        results_store = ResultsStore(self.path_to_file)
+        results_store.create(info)
+        for key in sorted(self.records.keys()):
+            results_store.add_record(
+                key, self.records[key], attributes={"time": key[0]})
+
+        results_store1 = ResultsStore(self.path_to_file)
+        results_store1.read()
+
+        self.assertEqual(results_store1.get_info(), info)
+        self.assertEqual(
+            results_store1.get_keys(), sorted(self.records.keys()))
+
+        for key in self.records.keys():
+            self.assertEqual(
+                results_store1.get_attributes(key), {"time": key[0]})
+            for name, nda in self.records[key].items():
+                nda1 = results_store1.get_array(key, name)
+                self.assertEqual(nda1.dtype, nda.dtype)
+                self.assertEqual(nda1.shape, nda.shape)
+                self.assertEqual(np.sum(np.abs(nda1 - nda)), 0)
+
+        ndas = results_store1.get_arrays("NCC")
+        self.assertEqual(len(ndas), len(self.records))
+        for key, nda in zip(sorted(self.records.keys()), ndas):
+            self.assertEqual(np.sum(np.abs(self.records[key]["NCC"] - nda)), 0)
+
+    def test_append_records(self):
+        keys = sorted(self.records.keys())
+
+        results_store = ResultsStore(self.path_to_file)
+        results_store.create()
+        results_store.add_record(keys[0], self.records[keys[0]])
+
+        results_store1 = ResultsStore(self.path_to_file)
+        results_store1.add_record(keys[1], self.records[keys[1]])
+
+        results_store.read()
+        self.assertEqual(results_store.get_keys(), keys)
+
+        # Identical key refers to latest record
+        results_store.add_record(keys[0], self.records[keys[1]])
+        self.assertEqual(results_store.get_keys(), keys + [keys[0]])
+        nda = results_store.get_array(keys[0], "NCC")
+        self.assertEqual(np.sum(np.abs(self.records[keys[1]]["NCC"] - nda)), 0)
+
+        # Unknown records and arrays
+        self.assertRaises(ValueError, lambda: results_store.get_array(
+            ("0.3", "linear"), "NCC"))
+        self.assertRaises(ValueError, lambda: results_store.get_array(
+            keys[0], "SSIM"))
+
+    def test_append_after_incomplete_record(self):
+        keys = sorted(self.records.keys())
+
+        results_store = ResultsStore(self.path_to_file)
+        results_store.create()
+        results_store.add_record(keys[0], self.records[keys[0]])
+
+        # Interrupted run: arrays written but no record.json
+        with zipfile.ZipFile(self.path_to_file, "a") as zf:
+            zf.writestr("1/NCC.npy", ResultsStore._get_npy_bytes(
+                np.zeros(3)))
+
+        results_store = ResultsStore(self.path_to_file)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            results_store.add_record(keys[1], self.records[keys[1]])
+
+        results_store1 = ResultsStore(self.path_to_file)
+        results_store1.read()
+        self.assertEqual(results_store1.get_keys(), keys)
+        for key, nda in zip(keys, results_store1.get_arrays("NCC")):
+            self.assertEqual(
+                np.sum(np.abs(self.records[key]["NCC"] - nda)), 0)
+            self.assertEqual(np.sum(np.abs(
+                self.records[key]["NCC"] -
+                results_store1.get_array(key, "NCC"))), 0)
+
+        with zipfile.ZipFile(self.path_to_file, "r") as zf:
+            names = zf.namelist()
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_store_not_created(self):
+        results_store = ResultsStore(
+            os.path.join(self.dir_tmp, "whatevertestasdfsfasdasf.zip"))
+        self.assertRaises(IOError, lambda: results_store.read())
+        self.assertRaises(IOError, lambda: results_store.add_record(
+            ("0.1",), {"NCC": np.zeros(1)}))
@@ -11,17 +11,30 @@
 
 import unittest
 
+from benchmark_runner_test import *
 from brain_stripping_test import *
 from case_study_fetal_brain_test import *
 from data_reader_test import *
 from image_similarity_evaluator_test import *
 from intensity_correction_test import *
 from linear_operators_test import *
+from n4_bias_field_correction_test import *
 from niftyreg_test import *
+from parameter_study_runner_test import *
+from pipeline_checkpoint_test import *
+from registration_cache_test import *
 from residual_evaluator_test import *
+from results_store_test import *
 from segmentation_propagation_test import *
+from simple_itk_registration_test import *
 from simulator_slice_acquisition_test import *
+from slice_coverage_test import *
+from slice_similarity_measures_test import *
 from stack_test import *
+from stack_transforms_test import *
+from stage_scheduler_test import *
+from transform_initializer_test import *
+from volumetric_reconstruction_pipeline_test import *
 
 # from parameter_normalization_test import *
 # from cpp_itk_registration_test import *  # TBC
@@ -0,0 +1,312 @@
+##
+# \file simple_itk_registration_test.py
+#  \brief  Class containing unit tests for module SimpleItkRegistration
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import unittest
+import itertools
+
+import numpy as np
+import SimpleITK as sitk
+
+import simplereg.simple_itk_registration
+
+import niftymic.base.stack as st
+import niftymic.registration.simple_itk_registration as regsitk
+from niftymic.benchmark.synthetic_data import SyntheticData
+
+
+class SimpleItkRegistrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+
+        synthetic_data = SyntheticData(n_stacks=1, n_slices=6, hr_size=24)
+        synthetic_data.run()
+        self.hr_volume = synthetic_data.get_hr_volume()
+        self.stack = synthetic_data.get_stacks()[0]
+
+        self.options = {
+            "interpolator": "Linear",
+            "metric": "Correlation",
+            "optimizer": "ConjugateGradientLineSearch",
+            "optimizer_params": {
+                "learningRate": 1,
+                "numberOfIterations": 10,
+                "lineSearchUpperLimit": 2,
+            },
+            "initializer_type": "SelfGEOMETRY",
+        }
+
+    def test_slice_registrations_with_reused_registration_method(self):
+
+        registration = regsitk.SimpleItkRegistration(
+            moving=self.hr_volume,
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            registration_type="Rigid",
+            scales_estimator="Jacobian",
+            **self.options)
+
+        registration_method_sitk = None
+        for slice in self.stack.get_slices():
+            registration.set_fixed(slice)
+            registration.run()
+            transform_sitk = registration.get_registration_transform_sitk()
+
+            # Registration method is only set up for first slice
+            if registration_method_sitk is None:
+                registration_method_sitk = \
+                    registration._registration_method_sitk
+            self.assertIs(
+                registration._registration_method_sitk,
+                registration_method_sitk)
+
+            # Same result as registration method set up for each slice
+            registration_simplereg = \
+                simplereg.simple_itk_registration.SimpleItkRegistration(
+                    fixed_sitk=slice.sitk,
+                    moving_sitk=self.hr_volume.sitk,
+                    fixed_sitk_mask=slice.sitk_mask,
+                    moving_sitk_mask=self.hr_volume.sitk_mask,
+                    registration_type="Rigid",
+                    optimizer_scales="Jacobian",
+                    verbose=False,
+                    **self.options)
+            registration_simplereg.run()
+            transform_simplereg_sitk = \
+                registration_simplereg.get_registration_transform_sitk()
+
+            self.assertIsInstance(transform_sitk, sitk.Euler3DTransform)
+            self.assertAlmostEqual(np.max(np.abs(
+                np.array(transform_sitk.GetParameters()) -
+                transform_simplereg_sitk.GetParameters())),
+                0, places=self.precision)
+            self.assertAlmostEqual(np.max(np.abs(
+                np.array(transform_sitk.GetFixedParameters()) -
+                transform_simplereg_sitk.GetFixedParameters())),
+                0, places=self.precision)
+
+    def test_registration_method_update(self):
+
+        registration = regsitk.SimpleItkRegistration(
+            fixed=self.stack.get_slice(2),
+            moving=self.hr_volume,
+            registration_type="Affine",
+            **self.options)
+        registration.run()
+        registration_method_sitk = registration._registration_method_sitk
+
+        # New moving image
+        registration.set_moving(st.Stack.from_stack(self.hr_volume))
+        registration.run()
+        self.assertIsNot(
+            registration._registration_method_sitk, registration_method_sitk)
+        registration_method_sitk = registration._registration_method_sitk
+
+        # Changed setting
+        registration.set_metric("MeanSquares")
+        registration.run()
+        self.assertIsNot(
+            registration._registration_method_sitk, registration_method_sitk)
+        self.assertIsInstance(
+            registration.get_registration_transform_sitk(),
+            sitk.AffineTransform)
+
+    def test_slice_registrations_with_shared_moving_pyramid(self):
+
+        registration = regsitk.SimpleItkRegistration(
+            moving=self.hr_volume,
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            registration_type="Rigid",
+            scales_estimator="Jacobian",
+            use_multiresolution_framework=True,
+            shrink_factors=[4, 2, 1],
+            smoothing_sigmas=[2, 1, 0],
+            **self.options)
+
+        moving_sitk_pyramid = None
+        for slice in self.stack.get_slices():
+            registration.set_fixed(slice)
+            registration.run()
+            self.assertIsInstance(
+                registration.get_registration_transform_sitk(),
+                sitk.Euler3DTransform)
+
+            # Smoothed moving images are only computed for first slice
+            if moving_sitk_pyramid is None:
+                moving_sitk_pyramid = registration._moving_sitk_pyramid[1]
+            self.assertIs(
+                registration._moving_sitk_pyramid[1], moving_sitk_pyramid)
+
+        self.assertEqual(len(moving_sitk_pyramid), 3)
+        self.assertIs(moving_sitk_pyramid[2], self.hr_volume.sitk)
+
+        # Smoothing as in SimpleITK's multiresolution framework
+        nda = sitk.GetArrayFromImage(moving_sitk_pyramid[0])
+        nda_ref = sitk.GetArrayFromImage(sitk.SmoothingRecursiveGaussian(
+            self.hr_volume.sitk, 2.))
+        self.assertAlmostEqual(
+            np.max(np.abs(nda - nda_ref)), 0, places=self.precision)
+
+        # Slice is not shrunk in through-plane direction
+        fixed_sitk, fixed_sitk_mask = registration._get_fixed_sitk_at_level(
+            4, 2)
+        size = np.array(self.stack.get_slice(0).sitk.GetSize())
+        self.assertEqual(fixed_sitk.GetSize(), tuple(
+            int(n) for n in [size[0] // 4, size[1] // 4, 1]))
+        self.assertEqual(fixed_sitk.GetSize(), fixed_sitk_mask.GetSize())
+
+        # Number of levels must match
+        registration = regsitk.SimpleItkRegistration(
+            fixed=self.stack.get_slice(2),
+            moving=self.hr_volume,
+            use_multiresolution_framework=True,
+            shrink_factors=[4, 2, 1],
+            smoothing_sigmas=[1, 0],
+            **self.options)
+        self.assertRaises(ValueError, registration.run)
+
+    def test_moving_updated_in_place(self):
+
+        registration = regsitk.SimpleItkRegistration(
+            fixed=self.stack.get_slice(2),
+            moving=self.hr_volume,
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            registration_type="Rigid",
+            scales_estimator="Jacobian",
+            **self.options)
+        registration.run()
+        registration_method_sitk = registration._registration_method_sitk
+
+        # Update moving image and mask in place as done for the
+        # reconstruction between two slice-to-volume registration cycles
+        moving_sitk_mask = sitk.BinaryErode(
+            sitk.Cast(self.hr_volume.sitk_mask, sitk.sitkUInt8), [3] * 3)
+        self.hr_volume.sitk = sitk.Cast(
+            sitk.SmoothingRecursiveGaussian(self.hr_volume.sitk, 1.),
+            self.hr_volume.sitk.GetPixelIDValue())
+        self.hr_volume.sitk_mask = sitk.Cast(
+            moving_sitk_mask, self.hr_volume.sitk_mask.GetPixelIDValue())
+        registration.run()
+        self.assertIsNot(
+            registration._registration_method_sitk, registration_method_sitk)
+        transform_sitk = registration.get_registration_transform_sitk()
+
+        # Same result as fresh registration method
+        registration = regsitk.SimpleItkRegistration(
+            fixed=self.stack.get_slice(2),
+            moving=self.hr_volume,
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            registration_type="Rigid",
+            scales_estimator="Jacobian",
+            **self.options)
+        registration.run()
+        transform_ref_sitk = registration.get_registration_transform_sitk()
+        self.assertAlmostEqual(np.max(np.abs(
+            np.array(transform_sitk.GetParameters()) -
+            transform_ref_sitk.GetParameters())),
+            0, places=self.precision)
+
+    def test_moving_region(self):
+        search_range = 3.
+        registration = regsitk.SimpleItkRegistration(
+            moving=self.hr_volume,
+            search_range=search_range,
+            **self.options)
+
+        direction = np.array(self.hr_volume.sitk.GetDirection()).reshape(3, 3)
+        size = np.array(self.hr_volume.sitk.GetSize())
+        for slice_j in self.stack.get_slices()[2:4]:
+            registration.set_fixed(slice_j)
+            transform_sitk = sitk.Euler3DTransform()
+            transform_sitk.SetTranslation((1, -2, 0.5))
+            region = registration._get_moving_region(
+                self.hr_volume.sitk, transform_sitk)
+            moving_sitk = self.hr_volume.sitk[region]
+
+            # Moving image is cropped to a slab around the slice
+            self.assertLess(np.prod(moving_sitk.GetSize()), np.prod(size))
+
+            # Points within search range of mapped slice corners are covered
+            size_cropped = np.array(moving_sitk.GetSize())
+            for corner in itertools.product(
+                    *[[-0.5, n - 0.5] for n in slice_j.sitk.GetSize()]):
+                point = np.array(transform_sitk.TransformPoint(
+                    slice_j.sitk.TransformContinuousIndexToPhysicalPoint(
+                        corner)))
+                for offset in np.concatenate(
+                        [direction.T, -direction.T]) * search_range:
+                    index = np.array(self.hr_volume.sitk.
+                                     TransformPhysicalPointToContinuousIndex(
+                                         point + offset))
+                    if np.any(index < 0) or np.any(index > size - 1):
+                        continue
+                    index = np.array(
+                        moving_sitk.TransformPhysicalPointToContinuousIndex(
+                            point + offset))
+                    self.assertTrue(np.all(index >= 0))
+                    self.assertTrue(np.all(index <= size_cropped - 1))
+
+        # No cropping without search range
+        registration.set_search_range(None)
+        self.assertIsNone(registration._get_moving_region(
+            self.hr_volume.sitk, transform_sitk))
+
+    def test_slice_registrations_with_search_range(self):
+
+        for use_multiresolution_framework in [False, True]:
+            transforms_sitk = []
+            for search_range in [None, 30.]:
+                registration = regsitk.SimpleItkRegistration(
+                    moving=self.hr_volume,
+                    use_fixed_mask=True,
+                    use_moving_mask=True,
+                    registration_type="Rigid",
+                    scales_estimator="Jacobian",
+                    use_multiresolution_framework=(
+                        use_multiresolution_framework),
+                    shrink_factors=[2, 1],
+                    smoothing_sigmas=[1, 0],
+                    search_range=search_range,
+                    **self.options)
+
+                registration_method_sitk = None
+                moving_sitk_pyramid = None
+                for slice in self.stack.get_slices():
+                    registration.set_fixed(slice)
+                    registration.run()
+                    transforms_sitk.append(
+                        registration.get_registration_transform_sitk())
+                    if search_range is not None:
+                        self.assertIsNotNone(registration._get_moving_region(
+                            self.hr_volume.sitk, sitk.Euler3DTransform()))
+
+                    # Set-up and smoothed moving images are shared by all
+                    # slices; only the moving images passed to SimpleITK
+                    # are cropped
+                    if registration_method_sitk is None:
+                        registration_method_sitk = \
+                            registration._registration_method_sitk
+                        if use_multiresolution_framework:
+                            moving_sitk_pyramid = \
+                                registration._moving_sitk_pyramid[1]
+                    self.assertIs(registration._registration_method_sitk,
+                                  registration_method_sitk)
+                    if use_multiresolution_framework:
+                        self.assertIs(registration._moving_sitk_pyramid[1],
+                                      moving_sitk_pyramid)
+
+            # Same result as without cropping
+            n_slices = self.stack.get_number_of_slices()
+            for t1, t2 in zip(transforms_sitk[:n_slices],
+                              transforms_sitk[n_slices:]):
+                self.assertAlmostEqual(np.max(np.abs(
+                    np.array(t1.GetParameters()) - t2.GetParameters())),
+                    0, places=5)
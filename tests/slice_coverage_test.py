@@ -0,0 +1,83 @@
+##
+# \file slice_coverage_test.py
+#  \brief  Class containing unit tests for module SliceCoverage
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import SimpleITK as sitk
+import numpy as np
+import unittest
+
+import niftymic.base.stack as st
+import niftymic.validation.slice_coverage as sc
+
+
+class SliceCoverageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.reconstruction_sitk = sitk.Image(40, 40, 30, sitk.sitkFloat64)
+        self.reconstruction_sitk.SetOrigin((-5, -5, -5))
+
+        self.stacks = []
+        for i, rotation in enumerate([(0, 0, 0), (np.pi / 2, 0, 0.1)]):
+            image_sitk = sitk.GetImageFromArray(np.ones((8, 30, 30)))
+            image_sitk.SetSpacing((1.1, 1.1, 3.5))
+            image_sitk.SetOrigin((i, 30 * i, 2 * i))
+            transform_sitk = sitk.Euler3DTransform()
+            transform_sitk.SetRotation(*rotation)
+            image_sitk.SetDirection(transform_sitk.GetMatrix())
+            self.stacks.append(st.Stack.from_sitk_image(
+                image_sitk, filename="stack%d" % i, slice_thickness=3.5))
+
+        # Move some slices
+        transform_sitk = sitk.Euler3DTransform()
+        transform_sitk.SetRotation(0.1, -0.2, 0.05)
+        transform_sitk.SetTranslation((1, -2, 0.5))
+        for slice in self.stacks[0].get_slices()[::3]:
+            slice.update_motion_correction(transform_sitk)
+
+    ##
+    # Slice coverage obtained by resampling each slice onto the
+    # reconstruction grid.
+    # \date       2026-10-18 16:50:31+0000
+    #
+    def _get_coverage_by_resampling(self, stacks):
+        nda = np.zeros(self.reconstruction_sitk.GetSize()[::-1])
+        for stack in stacks:
+            for slice in stack.get_slices():
+                slice_sitk = sitk.Image(slice.sitk) * 0 + 1
+                spacing = np.array(slice_sitk.GetSpacing())
+                spacing[-1] = slice.get_slice_thickness()
+                slice_sitk.SetSpacing(spacing)
+                nda += sitk.GetArrayFromImage(sitk.Resample(
+                    slice_sitk,
+                    self.reconstruction_sitk,
+                    sitk.Euler3DTransform(),
+                    sitk.sitkNearestNeighbor,
+                    0,
+                ))
+        return nda
+
+    def test_coverage(self):
+        nda_ref = self._get_coverage_by_resampling(self.stacks)
+        self.assertGreater(nda_ref.max(), 1)
+
+        for n_processes in [1, 2]:
+            slice_coverage = sc.SliceCoverage(
+                self.stacks,
+                self.reconstruction_sitk,
+                use_stack_coverages=True,
+                n_processes=n_processes,
+            )
+            slice_coverage.run()
+
+            nda = sitk.GetArrayFromImage(slice_coverage.get_coverage_sitk())
+            self.assertEqual(np.sum(np.abs(nda - nda_ref)), 0)
+
+            coverages_sitk = slice_coverage.get_coverages_sitk_stacks()
+            for stack, coverage_sitk in zip(self.stacks, coverages_sitk):
+                nda_stack = sitk.GetArrayFromImage(coverage_sitk)
+                nda_stack_ref = self._get_coverage_by_resampling([stack])
+                self.assertEqual(np.sum(np.abs(nda_stack - nda_stack_ref)), 0)
@@ -0,0 +1,39 @@
+##
+# \file slice_similarity_measures_test.py
+#  \brief  Class containing unit tests for module SliceSimilarityMeasures
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import numpy as np
+import unittest
+
+from nsol.similarity_measures import SimilarityMeasures as \
+    SimilarityMeasures
+
+from niftymic.validation.slice_similarity_measures import \
+    SliceSimilarityMeasures
+
+
+class SliceSimilarityMeasuresTest(unittest.TestCase):
+
+    accuracy = 10
+
+    def test_against_single_slice_evaluation(self):
+        random_state = np.random.RandomState(0)
+        x = random_state.rand(5, 20, 30)
+        x_ref = x + 0.2 * random_state.rand(5, 20, 30)
+        mask = random_state.rand(5, 20, 30) > 0.3
+
+        # Values outside the mask must not contribute
+        x[~mask] = np.nan
+
+        for m, measure in SliceSimilarityMeasures.similarity_measures.items():
+            similarities = measure(x, x_ref, mask)
+            for i in range(x.shape[0]):
+                indices = np.where(mask[i])
+                similarity = SimilarityMeasures.similarity_measures[m](
+                    x[i][indices], x_ref[i][indices])
+                self.assertAlmostEqual(
+                    similarities[i], similarity, places=self.accuracy)
@@ -201,3 +201,41 @@ class StackTest(unittest.TestCase):
                 transformations_dic[stack.get_filename()][j].GetParameters())
             self.assertAlmostEqual(
                 np.max(np.abs(params - params_2)), 0, places=16)
+
+    def test_unity_mask(self):
+
+        nda = np.random.rand(5, 20, 30)
+        image_sitk = sitk.GetImageFromArray(nda)
+        image_sitk.SetSpacing((0.8, 0.8, 3.))
+
+        stack = st.Stack.from_sitk_image(image_sitk, slice_thickness=3.)
+
+        # Unity mask is kept implicit for stack and slices
+        self.assertTrue(stack.is_unity_mask())
+        self.assertTrue(all(s.is_unity_mask() for s in stack.get_slices()))
+        self.assertTrue(st.Stack.from_stack(stack).is_unity_mask())
+
+        # Materialized unity mask follows the motion-corrected stack position
+        motion_simulator = ms.RandomRigidMotionSimulator(
+            dimension=3,
+            angle_max_deg=20,
+            translation_max=30)
+        motion_simulator.simulate_motion(seed=0, simulations=1)
+        stack.update_motion_correction(
+            motion_simulator.get_transforms_sitk()[0])
+        mask_sitk = stack.sitk_mask
+        self.assertEqual(sitk.GetArrayFromImage(mask_sitk).min(), 1)
+        self.assertAlmostEqual(
+            np.max(np.abs(np.array(mask_sitk.GetOrigin()) -
+                          np.array(stack.sitk.GetOrigin()))),
+            0, places=10)
+        self.assertTrue(stack.is_unity_mask())
+
+        # Explicitly set mask is not considered as unity mask
+        nda_mask = np.zeros_like(nda, dtype=np.uint8)
+        nda_mask[:, 5:15, 10:20] = 1
+        mask_sitk = sitk.GetImageFromArray(nda_mask)
+        stack = st.Stack.from_sitk_image(
+            image_sitk, slice_thickness=3., image_sitk_mask=mask_sitk)
+        self.assertFalse(stack.is_unity_mask())
+        self.assertFalse(any(s.is_unity_mask() for s in stack.get_slices()))
@@ -0,0 +1,121 @@
+##
+# \file stack_transforms_test.py
+#  \brief  Class containing unit tests for module StackTransforms
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import SimpleITK as sitk
+import numpy as np
+import unittest
+import os
+
+import pysitk.python_helper as ph
+
+import niftymic.base.stack as st
+import niftymic.base.data_reader as dr
+import niftymic.base.stack_transforms as stt
+import niftymic.utilities.motion_updater as mu
+import niftymic.validation.motion_simulator as ms
+
+from niftymic.definitions import DIR_TMP
+
+
+class StackTransformsTest(unittest.TestCase):
+
+    accuracy = 8
+
+    def setUp(self):
+        self.dir_tmp = os.path.join(DIR_TMP, "stack_transforms")
+
+    def _get_stack(self):
+        nda = np.random.RandomState(0).rand(6, 20, 30)
+        image_sitk = sitk.GetImageFromArray(nda)
+        image_sitk.SetSpacing((0.8, 0.8, 3.))
+        return st.Stack.from_sitk_image(
+            image_sitk, filename="stack", slice_thickness=3.)
+
+    def _get_motion_corrected_stack(self):
+        stack = self._get_stack()
+
+        motion_simulator = ms.RandomRigidMotionSimulator(
+            dimension=3,
+            angle_max_deg=20,
+            translation_max=30)
+        motion_simulator.simulate_motion(seed=1, simulations=7)
+        transforms_sitk = motion_simulator.get_transforms_sitk()
+
+        stack.update_motion_correction(transforms_sitk[0])
+        for i, slice in enumerate(stack.get_slices()):
+            slice.update_motion_correction(transforms_sitk[i + 1])
+        stack.delete_slice(stack.get_slice(3))
+
+        return stack
+
+    def _assert_equal_slices(self, stack1, stack2):
+        self.assertEqual(
+            [s.get_slice_number() for s in stack1.get_slices()],
+            [s.get_slice_number() for s in stack2.get_slices()])
+        for slice1, slice2 in zip(stack1.get_slices(), stack2.get_slices()):
+            for attr in ["GetOrigin", "GetDirection"]:
+                self.assertAlmostEqual(
+                    np.linalg.norm(
+                        np.array(getattr(slice1.sitk, attr)()) -
+                        np.array(getattr(slice2.sitk, attr)())),
+                    0, places=self.accuracy)
+
+    def test_motion_updater_tfm_vs_npz(self):
+        stack = self._get_motion_corrected_stack()
+
+        stacks_updated = []
+        for transforms_format in ["tfm", "npz"]:
+            directory = os.path.join(self.dir_tmp, transforms_format)
+            ph.clear_directory(directory)
+            stack.write(
+                directory,
+                write_stack=False,
+                write_transforms=True,
+                transforms_format=transforms_format,
+            )
+            motion_updater = mu.MotionUpdater(
+                stacks=[self._get_stack()],
+                dir_motion_correction=directory)
+            motion_updater.run()
+            stacks_updated.append(motion_updater.get_data()[0])
+
+        self._assert_equal_slices(stack, stacks_updated[0])
+        self._assert_equal_slices(stacks_updated[0], stacks_updated[1])
+
+        # Same slice transforms read from either format
+        transforms_reader = dr.SliceTransformationDirectoryReader(
+            os.path.join(self.dir_tmp, "npz"))
+        transforms_reader.read_data()
+        transforms_sitk = transforms_reader.get_data()["stack"]
+        self.assertEqual(sorted(transforms_sitk.keys()), [0, 1, 2, 4, 5])
+
+    def test_registration_history(self):
+        stack = self._get_motion_corrected_stack()
+        path_to_file = os.path.join(self.dir_tmp, "history", "stack.npz")
+
+        stt.StackTransforms.from_stack(stack).write(path_to_file)
+        stack_transforms = stt.StackTransforms.from_filename(path_to_file)
+
+        self.assertEqual(stack_transforms.get_filename(), "stack")
+        self.assertEqual(stack_transforms.get_deleted_slice_numbers(), [3])
+
+        histories = stack_transforms.get_slice_registration_histories()
+        for slice in stack.get_slices():
+            history = slice.get_registration_history()
+            history_read = histories[slice.get_slice_number()]
+            for transforms, transforms_read in zip(history, history_read):
+                self.assertEqual(len(transforms), len(transforms_read))
+                for t, t_read in zip(transforms, transforms_read):
+                    self.assertAlmostEqual(
+                        np.linalg.norm(
+                            np.array(t.GetMatrix()) -
+                            np.array(t_read.GetMatrix())) +
+                        np.linalg.norm(
+                            np.array(t.GetTranslation()) -
+                            np.array(t_read.GetTranslation())),
+                        0, places=self.accuracy)
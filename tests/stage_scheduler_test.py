@@ -0,0 +1,90 @@
+##
+# \file stage_scheduler_test.py
+#  \brief  Class containing unit tests for module StageScheduler
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import unittest
+import os
+
+import pysitk.python_helper as ph
+
+import niftymic.utilities.stage_scheduler as stsch
+
+from niftymic.definitions import DIR_TMP
+
+
+class StageSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_tmp = os.path.join(DIR_TMP, "stage_scheduler")
+        ph.clear_directory(self.dir_tmp)
+        self.path_to_hashes = os.path.join(self.dir_tmp, "stages.json")
+        self.executed = []
+
+    def _get_stage(self, name, path_to_output, text):
+        def command():
+            self.executed.append(name)
+            ph.write_to_file(path_to_output, text, verbose=False)
+            return 0
+        return command
+
+    def _get_scheduler(self, text="a"):
+        path_to_a = os.path.join(self.dir_tmp, "a.txt")
+        path_to_b = os.path.join(self.dir_tmp, "b.txt")
+        path_to_c = os.path.join(self.dir_tmp, "c.txt")
+
+        scheduler = stsch.StageScheduler(
+            path_to_hashes=self.path_to_hashes, n_processes=2)
+        scheduler.add_stage(
+            "c", self._get_stage("c", path_to_c, "c"),
+            inputs=[path_to_a, path_to_b],
+            outputs=[path_to_c],
+            dependencies=["a", "b"])
+        scheduler.add_stage(
+            "a", self._get_stage("a", path_to_a, text),
+            outputs=[path_to_a])
+        scheduler.add_stage(
+            "b", self._get_stage("b", path_to_b, "b"),
+            outputs=[path_to_b])
+        return scheduler
+
+    def test_dependencies_and_skipping(self):
+        scheduler = self._get_scheduler()
+        scheduler.run()
+        self.assertEqual(sorted(self.executed[0:2]), ["a", "b"])
+        self.assertEqual(self.executed[2], "c")
+        self.assertEqual(
+            scheduler.get_status(), {s: "executed" for s in "abc"})
+
+        # All stages are up to date
+        self.executed = []
+        scheduler = self._get_scheduler()
+        scheduler.run()
+        self.assertEqual(self.executed, [])
+        self.assertEqual(
+            scheduler.get_status(), {s: "skipped" for s in "abc"})
+
+        # Changed output of 'a' triggers re-execution of 'c'
+        ph.write_to_file(
+            os.path.join(self.dir_tmp, "a.txt"), "changed", verbose=False)
+        scheduler = self._get_scheduler()
+        scheduler.run()
+        self.assertEqual(self.executed, ["c"])
+
+    def test_failure(self):
+        scheduler = stsch.StageScheduler()
+        scheduler.add_stage("fail", lambda: 1)
+        scheduler.add_stage(
+            "dependent", self._get_stage("dependent", "x", "x"),
+            dependencies=["fail"])
+        self.assertRaises(RuntimeError, scheduler.run)
+        self.assertEqual(self.executed, [])
+
+        # Failure of a stage which is not required only raises a warning
+        scheduler = stsch.StageScheduler()
+        scheduler.add_stage("fail", lambda: 1, required=False)
+        scheduler.run()
+        self.assertEqual(scheduler.get_status(), {"fail": "failed"})
@@ -0,0 +1,123 @@
+##
+# \file transform_initializer_test.py
+#  \brief  Class containing unit tests for module TransformInitializer
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import unittest
+
+import numpy as np
+import SimpleITK as sitk
+
+import niftymic.base.stack as st
+import niftymic.registration.transform_initializer as tinit
+import niftymic.validation.image_similarity_evaluator as ise
+from niftymic.benchmark.synthetic_data import SyntheticData
+
+
+class TransformInitializerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+
+        synthetic_data = SyntheticData(n_stacks=1, n_slices=16, hr_size=32)
+        synthetic_data.run()
+        self.hr_volume = synthetic_data.get_hr_volume()
+        self.stack = synthetic_data.get_stacks()[0]
+
+    def test_physical_points(self):
+        image_sitk = self.stack.sitk
+        indices = np.array(np.where(
+            sitk.GetArrayFromImage(self.stack.sitk_mask) > 0))[::-1, :]
+
+        points = tinit.TransformInitializer.get_physical_points(
+            image_sitk, indices)
+        points_ref = np.array([
+            image_sitk.TransformIndexToPhysicalPoint(
+                [int(j) for j in indices[:, i]])
+            for i in range(indices.shape[1])
+        ]).transpose()
+        self.assertAlmostEqual(
+            np.max(np.abs(points - points_ref)), 0, places=self.precision)
+
+        continuous_indices = \
+            tinit.TransformInitializer.get_continuous_indices(
+                image_sitk, points)
+        self.assertAlmostEqual(
+            np.max(np.abs(continuous_indices - indices)), 0,
+            places=self.precision)
+
+    def test_best_transform_similarities(self):
+        random_state = np.random.RandomState(0)
+        transformations = []
+        for i in range(4):
+            transform_sitk = sitk.Euler3DTransform()
+            transform_sitk.SetCenter(random_state.randn(3) * 5)
+            transform_sitk.SetRotation(*(random_state.randn(3) * 0.3))
+            transform_sitk.SetTranslation(random_state.randn(3) * 5)
+            transformations.append(transform_sitk)
+
+        for measure in ["NCC", "NMI"]:
+            # Similarities as evaluated on warped images
+            warps = [
+                st.Stack.from_sitk_image(
+                    sitk.Resample(
+                        self.hr_volume.sitk,
+                        self.stack.sitk,
+                        transform_sitk,
+                        sitk.sitkLinear),
+                    extract_slices=False,
+                    slice_thickness=self.stack.get_slice_thickness())
+                for transform_sitk in transformations
+            ]
+            image_similarity_evaluator = ise.ImageSimilarityEvaluator(
+                stacks=warps,
+                reference=self.stack,
+                measures=[measure],
+                use_reference_mask=True,
+                verbose=False,
+            )
+            image_similarity_evaluator.compute_similarities()
+            similarities = \
+                image_similarity_evaluator.get_similarities()[measure]
+
+            transform_initializer = tinit.TransformInitializer(
+                fixed=self.stack,
+                moving=self.hr_volume,
+                similarity_measure=measure,
+                max_samples=None,
+            )
+            transform_sitk = transform_initializer._get_best_transform(
+                transformations)
+            self.assertIs(
+                transform_sitk, transformations[np.argmax(similarities)])
+
+    def test_run(self):
+        # Moving image is rotated copy of fixed image
+        transform_sitk = sitk.Euler3DTransform()
+        transform_sitk.SetCenter(
+            self.hr_volume.sitk.TransformContinuousIndexToPhysicalPoint(
+                [n / 2. for n in self.hr_volume.sitk.GetSize()]))
+        transform_sitk.SetRotation(0.2, -0.1, 0.3)
+        moving = st.Stack.from_sitk_image(
+            image_sitk=sitk.Resample(
+                self.hr_volume.sitk, transform_sitk.GetInverse()),
+            image_sitk_mask=sitk.Resample(
+                self.hr_volume.sitk_mask, transform_sitk.GetInverse(),
+                sitk.sitkNearestNeighbor),
+            slice_thickness=self.hr_volume.get_slice_thickness(),
+            extract_slices=False,
+        )
+
+        transform_initializer = tinit.TransformInitializer(
+            fixed=self.hr_volume,
+            moving=moving,
+        )
+        transform_initializer.run()
+        matrix = np.array(
+            transform_initializer.get_transform_sitk().GetMatrix())
+        self.assertLess(np.max(np.abs(
+            matrix - np.array(transform_sitk.GetMatrix()))),
+            0.1)
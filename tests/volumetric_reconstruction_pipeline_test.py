@@ -0,0 +1,231 @@
+##
+# \file volumetric_reconstruction_pipeline_test.py
+#  \brief  Class containing unit tests for module
+#          volumetric_reconstruction_pipeline
+#
+#  \author Michael Ebner (michael.ebner.14@ucl.ac.uk)
+#  \date October 2026
+
+
+import unittest
+
+import numpy as np
+import SimpleITK as sitk
+
+import niftymic.base.stack as st
+import niftymic.registration.simple_itk_registration as regsitk
+import niftymic.utilities.volumetric_reconstruction_pipeline as pipeline
+from niftymic.benchmark.synthetic_data import SyntheticData
+
+
+class VolumetricReconstructionPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.precision = 7
+
+        synthetic_data = SyntheticData(n_stacks=2, n_slices=8, hr_size=32)
+        synthetic_data.run()
+        self.hr_volume = synthetic_data.get_hr_volume()
+        self.stacks = synthetic_data.get_stacks()
+
+    def _get_registration_method(self):
+        return regsitk.SimpleItkRegistration(
+            use_fixed_mask=True,
+            use_moving_mask=True,
+            interpolator="Linear",
+            metric="Correlation",
+            initializer_type="SelfGEOMETRY",
+            optimizer="ConjugateGradientLineSearch",
+            optimizer_params={
+                "learningRate": 1,
+                "numberOfIterations": 10,
+                "lineSearchUpperLimit": 2,
+            },
+            scales_estimator="Jacobian",
+        )
+
+    def test_slice_to_volume_registration_with_search_range(self):
+        transforms = []
+        for search_range in [None, 30.]:
+            stacks = [st.Stack.from_stack(stack) for stack in self.stacks]
+            registration_method = self._get_registration_method()
+            registration_method.set_search_range(search_range)
+            s2v = pipeline.SliceToVolumeRegistration(
+                stacks=stacks,
+                reference=self.hr_volume,
+                registration_method=registration_method,
+                verbose=False,
+            )
+            s2v.run()
+
+            # Registration set-up is shared by all slices
+            self.assertIs(
+                registration_method._registration_method_sitk_moving[0],
+                self.hr_volume.sitk)
+            transforms.append(np.array([
+                s.get_motion_correction_transform().GetParameters()
+                for stack in stacks for s in stack.get_slices()
+            ]))
+
+        self.assertAlmostEqual(
+            np.max(np.abs(transforms[0] - transforms[1])), 0,
+            places=self.precision)
+
+    def test_hierarchy_levels(self):
+        ss2v = pipeline.SliceSetToVolumeRegistration(
+            stack=self.stacks[0],
+            reference=self.hr_volume,
+            registration_method=self._get_registration_method(),
+            slice_set_indices=[
+                [0, 2, 4, 6], [1, 3, 5, 7],
+                [0, 2], [4, 6], [0], [2], [4], [6],
+                [1, 3], [5, 7], [1], [3], [5], [7]],
+        )
+        self.assertEqual(ss2v._get_hierarchy_levels(), [
+            [0, 1], [2, 3, 8, 9], [4, 5, 6, 7, 10, 11, 12, 13]])
+
+    def test_hierarchical_slice_set_registration_in_parallel(self):
+        transforms = []
+        for n_processes in [1, 3]:
+            # Slices positioned according to stack geometry
+            stacks = [
+                st.Stack.from_sitk_image(
+                    image_sitk=stack.sitk,
+                    slice_thickness=stack.get_slice_thickness(),
+                    filename=stack.get_filename(),
+                    image_sitk_mask=stack.sitk_mask)
+                for stack in self.stacks
+            ]
+            hs2v = pipeline.HieararchicalSliceSetRegistration(
+                stacks=stacks,
+                reference=self.hr_volume,
+                registration_method=self._get_registration_method(),
+                interleave=2,
+                verbose=False,
+                n_processes=n_processes,
+            )
+            hs2v.run()
+            transforms.append(np.array([
+                s.get_motion_correction_transform().GetParameters()
+                for stack in stacks for s in stack.get_slices()
+            ]))
+
+        self.assertAlmostEqual(
+            np.max(np.abs(transforms[0] - transforms[1])), 0,
+            places=self.precision)
+
+    def test_stack_subgroup(self):
+        stack = self.stacks[0]
+        ss2v = pipeline.SliceSetToVolumeRegistration(
+            stack=stack,
+            reference=self.hr_volume,
+            registration_method=self._get_registration_method(),
+            slice_set_indices=[],
+        )
+        nda = sitk.GetArrayFromImage(stack.sitk)
+        nda_mask = sitk.GetArrayFromImage(stack.sitk_mask)
+        for indices in [[1, 3, 5, 7], [2], [0, 1, 5]]:
+            image = ss2v._get_stack_subgroup(indices)
+            self.assertEqual(np.sum(np.abs(
+                sitk.GetArrayFromImage(image.sitk) - nda[indices])), 0)
+            self.assertEqual(np.sum(np.abs(
+                sitk.GetArrayFromImage(image.sitk_mask) -
+                nda_mask[indices])), 0)
+            self.assertAlmostEqual(np.max(np.abs(
+                np.array(image.sitk.GetOrigin()) -
+                stack.get_slice(indices[0]).sitk.GetOrigin())), 0,
+                places=self.precision)
+
+    def test_transform_change(self):
+        slice_j = self.stacks[0].get_slice(4)
+        center = np.array(
+            slice_j.sitk.TransformContinuousIndexToPhysicalPoint(
+                [(n - 1) / 2. for n in slice_j.sitk.GetSize()]))
+
+        transform_sitk = sitk.Euler3DTransform()
+        transform_sitk.SetCenter(center)
+        transform_sitk.SetRotation(0, 0, np.deg2rad(10))
+        transform_sitk.SetTranslation((0, 3, -4))
+
+        translation, rotation = \
+            pipeline.SliceToVolumeRegistration._get_transform_change(
+                transform_sitk, slice_j)
+        self.assertAlmostEqual(translation, 5, places=self.precision)
+        self.assertAlmostEqual(rotation, 10, places=self.precision)
+
+    def test_slice_to_volume_registration_with_convergence(self):
+        stacks = [st.Stack.from_stack(stack) for stack in self.stacks]
+        s2v = pipeline.SliceToVolumeRegistration(
+            stacks=stacks,
+            reference=self.hr_volume,
+            registration_method=self._get_registration_method(),
+            verbose=False,
+            convergence_thresholds=(0, 0),
+        )
+        s2v.run()
+        slice_changes = s2v.get_slice_changes()
+        self.assertEqual(
+            len(slice_changes),
+            sum(stack.get_number_of_slices() for stack in stacks))
+
+        two_step = pipeline.TwoStepSliceToVolumeRegistrationReconstruction(
+            stacks=stacks,
+            reference=self.hr_volume,
+            registration_method=self._get_registration_method(),
+            reconstruction_method=None,
+            alphas=[0.1, 0.1],
+            cycles=3,
+            convergence_thresholds=(1e3, 1e3),
+            use_early_termination=True,
+        )
+        self.assertTrue(two_step._is_registration_converged(s2v))
+        two_step._convergence_thresholds = (0, 0)
+        self.assertFalse(two_step._is_registration_converged(s2v))
+
+        # All slices are registered again
+        s2v.run()
+        self.assertNotEqual(s2v.get_slice_changes(), slice_changes)
+
+        # Converged slices are skipped in the next run ...
+        s2v.set_convergence_thresholds((1e3, 1e3))
+        parameters = [
+            s.get_motion_correction_transform().GetParameters()
+            for stack in stacks for s in stack.get_slices()]
+        s2v.run()
+        self.assertEqual(s2v.get_slice_changes(), {})
+        self.assertEqual(parameters, [
+            s.get_motion_correction_transform().GetParameters()
+            for stack in stacks for s in stack.get_slices()])
+
+        # ... and registered again in the run after
+        s2v.run()
+        self.assertEqual(
+            len(s2v.get_slice_changes()),
+            sum(stack.get_number_of_slices() for stack in stacks))
+        self.assertNotEqual(parameters, [
+            s.get_motion_correction_transform().GetParameters()
+            for stack in stacks for s in stack.get_slices()])
+
+    def test_early_termination_with_outlier_rejection(self):
+        stacks = [st.Stack.from_stack(stack) for stack in self.stacks]
+        two_step = pipeline.TwoStepSliceToVolumeRegistrationReconstruction(
+            stacks=stacks,
+            reference=self.hr_volume,
+            registration_method=self._get_registration_method(),
+            reconstruction_method=None,
+            alphas=[0.1, 0.1, 0.1],
+            cycles=4,
+            outlier_rejection=True,
+            thresholds=[0.5, 0.6, 0.7, 0.8],
+            convergence_thresholds=(1e3, 1e3),
+            use_early_termination=True,
+        )
+
+        # Record outlier rejection thresholds
+        thresholds = []
+        two_step._reject_outliers = thresholds.append
+        two_step.run()
+
+        # Outlier rejection of the final cycle follows the one of the
+        # converged cycle
+        self.assertEqual(thresholds, [0.5, 0.8])